@@ -0,0 +1,84 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from app.utils.database import Database, READINESS_BUCKET
+from app.services.role_resolver import RoleResolver
+from app.dependencies import get_db, get_role_resolver, require_admin
+
+router = APIRouter()
+
+
+@router.get("/analytics/roles/{role}")
+async def get_role_analytics(
+    role: str,
+    top: int = Query(10, ge=1, le=100),
+    db: Database = Depends(get_db),
+    resolver: RoleResolver = Depends(get_role_resolver)
+):
+    """Readiness and skill gap statistics of everyone targeting a role
+
+    Served from stats maintained on every skill analysis write, so the
+    cost does not grow with the number of analyses. Equivalent spellings
+    of a role share its stats.
+
+    Args:
+        role: Target role (free text)
+        top: Number of most common missing skills to return
+
+    Returns:
+        Analysis count, average readiness, readiness histogram and the
+        most common missing skills
+    """
+    try:
+        match = resolver.resolve(role)
+        stats = await db.get_role_analytics(match.key)
+        if not stats or stats.get("count", 0) <= 0:
+            raise HTTPException(status_code=404, detail="No analyses for this role yet")
+
+        count = stats["count"]
+        histogram = stats.get("readiness_histogram") or {}
+        skill_names = stats.get("skill_names") or {}
+        missing = sorted(
+            ((field, n) for field, n in (stats.get("missing_skills") or {}).items() if n > 0),
+            key=lambda item: (-item[1], item[0])
+        )[:top]
+        return {
+            "role": match.name,
+            "role_key": match.key,
+            "analyses": count,
+            "average_readiness": round(stats.get("readiness_sum", 0) / count, 1),
+            "readiness_distribution": [
+                {
+                    "range": f"{low}-{100 if low + READINESS_BUCKET >= 100 else low + READINESS_BUCKET - 1}",
+                    "count": histogram.get(str(low), 0)
+                }
+                for low in range(0, 100, READINESS_BUCKET)
+            ],
+            "top_missing_skills": [
+                {"skill": skill_names.get(field, field), "count": n, "share": round(n / count * 100, 1)}
+                for field, n in missing
+            ],
+            "updated_at": stats.get("updated_at")
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/analytics/rebuild", dependencies=[Depends(require_admin)])
+async def rebuild_role_analytics(
+    db: Database = Depends(get_db),
+    resolver: RoleResolver = Depends(get_role_resolver)
+):
+    """Recompute role analytics from all skill analyses (admin only)
+
+    Used as a consistency check: the response lists the roles whose
+    incrementally maintained stats had drifted and were corrected.
+
+    Returns:
+        Number of analyses and roles, and the drifted role keys
+    """
+    try:
+        return await db.rebuild_role_analytics(resolver.canonical_key)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,144 @@
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from app.utils.database import Database
+from app.services.batch_ingest import ResumeBatchIngestor
+from app.services.resume_parser import ResumeParser
+from app.dependencies import get_db, get_resume_parser
+from app.utils.responses import dumps
+from bson import ObjectId
+from pathlib import Path
+from typing import List, Tuple
+import asyncio
+import logging
+import os
+import shutil
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+UPLOAD_DIR = Path("uploads")
+UPLOAD_DIR.mkdir(exist_ok=True)
+
+MAX_BATCH_FILES = int(os.getenv("BATCH_MAX_FILES", 500))
+MAX_FILE_BYTES = int(float(os.getenv("BATCH_MAX_FILE_MB", 10)) * 1024 * 1024)
+
+
+def _event(data: dict) -> bytes:
+    """Encode one status event as a newline-delimited JSON line"""
+    return dumps(data) + b"\n"
+
+
+def _copy_limited(source, target: Path) -> bool:
+    """Copy at most MAX_FILE_BYTES; False (and no file) if it is larger"""
+    copied = 0
+    with target.open("wb") as buffer:
+        while chunk := source.read(1024 * 1024):
+            copied += len(chunk)
+            if copied > MAX_FILE_BYTES:
+                break
+            buffer.write(chunk)
+    if copied > MAX_FILE_BYTES:
+        target.unlink()
+        return False
+    return True
+
+
+def _stage_uploads(uploads: List[UploadFile], batch_dir: Path) -> Tuple[List[Tuple[str, Path]], List[dict]]:
+    """Write PDFs (loose or inside zip archives) to batch_dir
+
+    Returns:
+        (accepted (filename, path) pairs, rejected file events)
+    """
+    accepted, rejected = [], []
+
+    def add(name: str, source):
+        if len(accepted) >= MAX_BATCH_FILES:
+            rejected.append({"file": name, "status": "error", "detail": f"Batch limit of {MAX_BATCH_FILES} files reached"})
+            return
+        # Member names come from the client: keep only the base name
+        target = batch_dir / f"{len(accepted):05d}_{Path(name).name}"
+        if _copy_limited(source, target):
+            accepted.append((name, target))
+        else:
+            rejected.append({"file": name, "status": "error", "detail": "File too large"})
+
+    for upload in uploads:
+        filename = upload.filename or ""
+        if filename.lower().endswith(".pdf"):
+            add(filename, upload.file)
+        elif filename.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(upload.file) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                            continue
+                        if not member.filename.lower().endswith(".pdf"):
+                            rejected.append({"file": member.filename, "status": "error", "detail": "Only PDF files are allowed"})
+                            continue
+                        with archive.open(member) as source:
+                            add(member.filename, source)
+            except zipfile.BadZipFile:
+                rejected.append({"file": filename, "status": "error", "detail": "Invalid zip archive"})
+        else:
+            rejected.append({"file": filename, "status": "error", "detail": "Only PDF or zip files are allowed"})
+    return accepted, rejected
+
+
+async def _run_batch(batch_id: str, batch_dir: Path, files: List[Tuple[str, Path]], rejected: List[dict],
+                     ingestor: ResumeBatchIngestor):
+    try:
+        yield _event({"status": "accepted", "batch_id": batch_id, "files": len(files), "rejected": len(rejected)})
+        for event in rejected:
+            yield _event(event)
+        async for event in ingestor.ingest(files, batch_id):
+            yield _event(event)
+    finally:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+@router.post("/resumes/batch")
+async def ingest_resumes(
+    files: List[UploadFile] = File(...),
+    db: Database = Depends(get_db),
+    resume_parser: ResumeParser = Depends(get_resume_parser)
+):
+    """Parse and store many resumes at once
+
+    Accepts any mix of PDF files and zip archives of PDFs (up to
+    BATCH_MAX_FILES resumes). Streams newline-delimited JSON: an
+    "accepted" line with the batch_id, then per-file "parsed", "saved"
+    (with user_id) or "error" lines as they happen, and a final "done"
+    line with a summary.
+    """
+    batch_id = str(ObjectId())
+    batch_dir = UPLOAD_DIR / f"batch_{batch_id}"
+    batch_dir.mkdir()
+    try:
+        accepted, rejected = await asyncio.to_thread(_stage_uploads, files, batch_dir)
+    except Exception as e:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        logger.error(f"Error staging batch upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not accepted:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail={"message": "No PDF resumes in upload", "rejected": rejected})
+
+    logger.info(f"Batch {batch_id}: {len(accepted)} resumes accepted, {len(rejected)} rejected")
+    return StreamingResponse(
+        _run_batch(batch_id, batch_dir, accepted, rejected, ResumeBatchIngestor(db, resume_parser)),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/resumes/batch/{batch_id}")
+async def get_batch(batch_id: str, db: Database = Depends(get_db)):
+    """Resumes saved so far by a batch (e.g. after the stream was interrupted)"""
+    try:
+        resumes = await db.get_batch_resumes(batch_id)
+        return {"batch_id": batch_id, "saved": len(resumes), "resumes": resumes}
+    except Exception as e:
+        logger.error(f"Error getting batch {batch_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
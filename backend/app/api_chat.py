@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.utils.database import Database
 from app.services.ai_service import AIService
 from app.dependencies import get_db, get_ai_service
+from app.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -33,7 +34,8 @@ async def chat_with_ai(
         # Get roadmap context if available
         context = ""
         if chat.roadmap_id:
-            roadmap = await db.get_roadmap_by_id(chat.roadmap_id)
+            # Only metadata is used for context, so weeks are not loaded
+            roadmap = await db.get_roadmap_by_id(chat.roadmap_id, weeks=[])
             if roadmap:
                 context = f"""
 User's Target Role: {roadmap.get('target_role', 'Unknown')}
@@ -96,7 +98,7 @@ async def get_chat_history(
     """Get chat history for a user"""
     try:
         history = await db.get_chat_history(user_id, roadmap_id)
-        return {"history": history}
+        return FastJSONResponse({"history": history})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -3,8 +3,10 @@ from pydantic import BaseModel
 from typing import List, Optional
 from app.utils.database import Database
 from app.services.ai_service import AIService
-from app.dependencies import get_db, get_ai_service
-from bson import ObjectId
+from app.services.role_cache import RoleCache
+from app.dependencies import get_db, get_ai_service, get_role_cache
+from app.utils.responses import FastJSONResponse
+from datetime import datetime
 
 router = APIRouter()
 
@@ -31,10 +33,12 @@ async def generate_interview(
     user_id: str, 
     request: InterviewRequest,
     db: Database = Depends(get_db),
-    ai_service: AIService = Depends(get_ai_service)
+    role_cache: RoleCache = Depends(get_role_cache)
 ):
     """Generate new interview session with questions
     
+    Questions come from the role's shared pool once it is full.
+    
     Args:
         user_id: User identifier
         request: Interview generation parameters
@@ -43,8 +47,8 @@ async def generate_interview(
         Session with generated questions
     """
     try:
-        # Generate questions using AI
-        questions = await ai_service.generate_interview_questions(
+        # Generate questions using AI, or draw them from the role's pool
+        questions = await role_cache.interview_questions(
             target_role=request.target_role,
             difficulty=request.difficulty,
             count=request.question_count
@@ -131,18 +135,8 @@ async def submit_answers(
         # Calculate overall score percentage
         overall_score = round((total_score / (len(submission.answers) * 10)) * 100, 1)
         
-        # Update session with answers and evaluations
-        
-        await db.db.interview_sessions.update_one(
-            {"_id": ObjectId(session_id)},
-            {
-                "$set": {
-                    "questions": session["questions"],
-                    "overall_score": overall_score,
-                    "status": "completed"
-                }
-            }
-        )
+        # Update session with answers and evaluations (and the user's stats)
+        await db.complete_interview_session(session_id, session["questions"], overall_score)
         
         return {
             "session_id": session_id,
@@ -151,6 +145,81 @@ async def submit_answers(
             "total_questions": len(submission.answers)
         }
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _score_summary(entry: dict) -> dict:
+    count = entry.get("count", 0)
+    recent = entry.get("recent") or []
+    return {
+        "count": count,
+        "average": round(entry.get("score_sum", 0) / count, 1) if count else None,
+        "rolling_average": round(sum(recent) / len(recent), 1) if recent else None
+    }
+
+
+@router.get("/interview/stats/{user_id}")
+async def get_interview_stats(
+    user_id: str,
+    db: Database = Depends(get_db)
+):
+    """Get interview progress statistics
+    
+    Maintained on every completed session, so this reads one small
+    document instead of the session history.
+    
+    Args:
+        user_id: User identifier
+        
+    Returns:
+        Session count, average/best/latest score, recent score trend,
+        averages per category and difficulty, weakest category and streak
+    """
+    try:
+        stats = await db.get_interview_stats(user_id) or {}
+        sessions = stats.get("sessions", 0)
+        categories = [
+            {"category": entry.get("name", field), **_score_summary(entry)}
+            for field, entry in (stats.get("categories") or {}).items()
+        ]
+        difficulties = [
+            {"difficulty": field, **_score_summary(entry)}
+            for field, entry in (stats.get("difficulties") or {}).items()
+        ]
+        weakest = min(
+            (entry for entry in categories if entry["rolling_average"] is not None),
+            key=lambda entry: entry["rolling_average"],
+            default=None
+        )
+
+        # A streak is current while the last practice was today or yesterday
+        streak = stats.get("streak") or {}
+        current = streak.get("current", 0)
+        if streak.get("last_day"):
+            days_since = (datetime.now().date() - datetime.fromisoformat(streak["last_day"]).date()).days
+            if days_since > 1:
+                current = 0
+
+        return FastJSONResponse({
+            "user_id": user_id,
+            "sessions": sessions,
+            "average_score": round(stats.get("score_sum", 0) / sessions, 1) if sessions else None,
+            "best_score": stats.get("best_score"),
+            "latest": stats.get("latest"),
+            "recent_scores": stats.get("recent_scores", []),
+            "categories": sorted(categories, key=lambda entry: entry["category"]),
+            "difficulties": sorted(difficulties, key=lambda entry: entry["difficulty"]),
+            "weakest_category": weakest["category"] if weakest else None,
+            "streak": {
+                "current": current,
+                "longest": streak.get("longest", 0),
+                "last_practice_day": streak.get("last_day")
+            }
+        })
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -172,7 +241,7 @@ async def get_interview_history(
     """
     try:
         sessions = await db.get_interview_sessions(user_id, limit=limit)
-        return {"sessions": sessions}
+        return FastJSONResponse({"sessions": sessions})
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -197,7 +266,7 @@ async def get_session_details(
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        return session
+        return FastJSONResponse(session)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
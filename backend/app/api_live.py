@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
+import asyncio
+import logging
+import os
+from app.utils.change_feed import ChangeFeed
+from app.utils.database import Database
+from app.utils.metrics import LIVE_CONNECTIONS
+from app.dependencies import get_change_feed, get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Idle connections get a ping this often (keeps proxies from closing them)
+PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", 30))
+# Per worker; further clients are told to retry later (close code 1013)
+MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", 1000))
+
+
+async def _wait_for_disconnect(websocket: WebSocket, subscription):
+    """Read (and ignore) client messages until the socket closes"""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except Exception:
+        pass
+    finally:
+        subscription.close()
+
+
+@router.websocket("/ws/dashboard/{user_id}")
+async def dashboard_updates(
+    websocket: WebSocket,
+    user_id: str,
+    feed: ChangeFeed = Depends(get_change_feed),
+    db: Database = Depends(get_db)
+):
+    """Push a small event whenever the user's roadmaps, skill analysis or interview sessions change
+
+    Messages are JSON objects:
+        {"type": "subscribed", "source": "change_stream" | "local"}  once, after connecting
+        {"type": "change", "collection": ..., "operation": ..., "id": ...}
+        {"type": "resync"}  events were missed; refetch everything
+        {"type": "ping"}    sent when idle
+
+    On a change the client refetches the affected view with
+    since_version and receives only a JSON Patch.
+
+    Args:
+        user_id: User whose changes are followed
+    """
+    try:
+        await feed.start(db)
+    except Exception as e:
+        logger.error(f"Error starting change feed: {e}")
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    if feed.source == "off":
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Live updates are disabled")
+        return
+    if feed.connections >= MAX_CONNECTIONS:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many connections")
+        return
+
+    subscription = feed.subscribe(user_id)
+    await websocket.accept()
+    LIVE_CONNECTIONS.inc()
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket, subscription))
+    try:
+        await websocket.send_json({"type": "subscribed", "source": feed.source})
+        while True:
+            event = await subscription.get(PING_INTERVAL)
+            if event is None:
+                break
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Live update connection for {user_id} failed: {e}")
+    finally:
+        feed.unsubscribe(subscription)
+        receiver.cancel()
+        LIVE_CONNECTIONS.dec()
+        if websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await websocket.close()
+            except Exception:
+                pass
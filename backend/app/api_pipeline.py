@@ -0,0 +1,145 @@
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from app.utils.database import Database
+from app.services.ai_service import ROADMAP_MODES, AIService
+from app.services.resume_parser import ResumeParser
+from app.services.role_cache import RoleCache
+from app.dependencies import get_db, get_ai_service, get_resume_parser, get_role_cache, get_request_gate
+from app.utils.request_gate import RequestGate
+from app.utils.responses import dumps
+from bson import ObjectId
+from pathlib import Path
+from typing import Optional
+import asyncio
+import logging
+import shutil
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+UPLOAD_DIR = Path("uploads")
+UPLOAD_DIR.mkdir(exist_ok=True)
+
+
+def _stage_event(stage: str, data) -> bytes:
+    """Encode one pipeline stage as a newline-delimited JSON line"""
+    return dumps({"stage": stage, "data": data}) + b"\n"
+
+
+async def _run_pipeline(
+    file_path: Path,
+    target_role: str,
+    weeks: int,
+    mode: str,
+    db: Database,
+    ai_service: AIService,
+    resume_parser: ResumeParser,
+    role_cache: RoleCache,
+    request_gate: RequestGate
+):
+    """Upload -> analyze -> roadmap, yielding each stage as it finishes
+
+    Intermediate results are passed along in memory instead of being
+    re-read from MongoDB, and everything is persisted at the end. The
+    analysis and roadmap go through the RequestGate under the same routes
+    and parameters as /api/analyze-skills and /api/generate-roadmap, so
+    their rate limits apply here too.
+    """
+    user_id = str(ObjectId())
+    role_key = role_cache.resolver.canonical_key(target_role)
+    role_text = " ".join(target_role.lower().split())
+
+    # Role requirements do not depend on the resume, so start them right away
+    # (usually a cache hit for roles seen before)
+    requirements_task = asyncio.create_task(role_cache.requirements(target_role))
+
+    try:
+        prepared = await asyncio.to_thread(resume_parser.prepare_pdf, str(file_path))
+        parsed_data = await resume_parser.parse_prepared(prepared)
+        yield _stage_event("resume", {**parsed_data, "user_id": user_id})
+
+        current_skills = parsed_data.get('skills', [])
+        # Cached by now unless the model failed, so the analysis is matched locally
+        await requirements_task
+        analysis = await request_gate.run(
+            "analyze-skills", user_id, {"target_role": role_key, "role_text": role_text},
+            lambda: role_cache.analyze(current_skills, target_role)
+        )
+        complete_analysis = ai_service.finalize_skill_analysis(analysis, current_skills, target_role)
+        yield _stage_event("skill_analysis", complete_analysis)
+
+        missing_skills = complete_analysis.get('missing_skills', [])
+        params = {"target_role": role_key, "role_text": role_text, "weeks": weeks, "mode": mode or ai_service.roadmap_mode}
+        roadmap_data = await request_gate.run(
+            "generate-roadmap", user_id, params,
+            lambda: ai_service.generate_roadmap(missing_skills, target_role, weeks, mode=mode)
+        )
+        complete_roadmap = {
+            **roadmap_data,
+            "user_id": user_id,
+            "target_role": target_role,
+            "total_weeks": weeks,
+            "job_readiness_score": complete_analysis.get('job_readiness_score', 0),
+            "skills_to_learn": missing_skills
+        }
+        yield _stage_event("roadmap", complete_roadmap)
+
+        roadmap_id = await db.save_pipeline_results(
+            user_id,
+            parsed_data,
+            complete_analysis,
+            complete_roadmap,
+            display_name=target_role,
+            role_key=role_key
+        )
+        logger.info(f"Pipeline complete for user {user_id}, roadmap {roadmap_id}")
+        yield _stage_event("saved", {"user_id": user_id, "roadmap_id": roadmap_id})
+
+    except Exception as e:
+        logger.error(f"Pipeline failed: {e}")
+        yield _stage_event("error", {"detail": str(e)})
+
+    finally:
+        if not requirements_task.done():
+            requirements_task.cancel()
+        try:
+            if file_path.exists():
+                file_path.unlink()
+        except Exception as cleanup_error:
+            logger.warning(f"Failed to clean up temporary file {file_path}: {cleanup_error}")
+
+
+@router.post("/pipeline")
+async def run_pipeline(
+    file: UploadFile = File(...),
+    target_role: str = Form(...),
+    weeks: int = Form(12),
+    mode: Optional[str] = Form(None),
+    db: Database = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service),
+    resume_parser: ResumeParser = Depends(get_resume_parser),
+    role_cache: RoleCache = Depends(get_role_cache),
+    request_gate: RequestGate = Depends(get_request_gate)
+):
+    """Upload a resume and get skill analysis and roadmap in one request
+
+    Streams newline-delimited JSON, one line per finished stage:
+    "resume", "skill_analysis", "roadmap" and finally "saved" (or "error").
+    mode selects how the roadmap is written (see /api/generate-roadmap).
+    """
+    if not file.filename.endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    if mode is not None and mode not in ROADMAP_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(ROADMAP_MODES)}")
+
+    logger.info(f"Running pipeline for {file.filename}, target: {target_role}")
+
+    file_path = UPLOAD_DIR / f"{ObjectId()}_{Path(file.filename).name}"
+    with file_path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+    return StreamingResponse(
+        _run_pipeline(file_path, target_role, weeks, mode, db, ai_service, resume_parser, role_cache, request_gate),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import PlainTextResponse
+import asyncio
+from app.utils.profiler import PROFILER, ProfilerBusy, collapsed
+from app.dependencies import require_admin
+
+router = APIRouter()
+
+
+@router.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10, gt=0),
+    mode: str = Query("sample", pattern="^(sample|requests)$"),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    include_idle: bool = False,
+    path_prefix: str = Query("/api/"),
+    max_requests: int = Query(20, ge=1, le=1000)
+):
+    """Profile the worker serving this request for a time window (admin only)
+
+    The response arrives when the window ends. Only one profile runs per
+    worker at a time; a second request gets 409.
+
+    Args:
+        seconds: Window length (at most PROFILER_MAX_SECONDS)
+        mode: sample (stack sampling of all threads) or requests (cProfile
+            of requests whose path starts with path_prefix, picked only
+            while no other request is in flight)
+        interval_ms: Sampling interval in sample mode
+        include_idle: Keep samples of waiting threads in sample mode
+        path_prefix: Requests to profile in requests mode
+        max_requests: Most requests to profile in requests mode
+
+    Returns:
+        Flamegraph collapsed stacks as text; X-Profile-* headers give the
+        mode, the unit of the counts and the number of samples or requests
+        (in requests mode also the requests skipped because others were in
+        flight and those whose profiling was capped)
+    """
+    if seconds > PROFILER.max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {PROFILER.max_seconds:g}")
+    try:
+        if mode == "sample":
+            result = await PROFILER.sample(seconds, interval_ms / 1000, include_idle)
+            count = result["samples"]
+        else:
+            result = await PROFILER.profile_requests(seconds, path_prefix, max_requests)
+            count = result["requests"]
+        body = await asyncio.to_thread(collapsed, result["stacks"])
+        headers = {
+            "X-Profile-Mode": result["mode"],
+            "X-Profile-Unit": result["unit"],
+            "X-Profile-Count": str(count),
+            "X-Profile-Seconds": str(result["seconds"])
+        }
+        if mode == "requests":
+            headers["X-Profile-Skipped"] = str(result["skipped"])
+            headers["X-Profile-Capped"] = str(result["capped"])
+        return PlainTextResponse(body, headers=headers)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from typing import List, Optional
+from app.utils.database import Database
+from app.dependencies import get_db
+
+router = APIRouter()
+
+
+class ProgressUpdate(BaseModel):
+    completed_weeks: List[int] = []
+    uncompleted_weeks: List[int] = []
+    current_week: Optional[int] = Field(None, ge=1)
+    hours_spent: float = Field(0, ge=0)
+
+
+@router.patch("/roadmaps/{roadmap_id}/progress")
+async def update_progress(
+    roadmap_id: str,
+    update: ProgressUpdate,
+    db: Database = Depends(get_db)
+):
+    """Mark weeks complete, advance the current week or log study hours
+
+    Only the touched fields are written; the roadmap itself is never
+    rewritten. current_week never moves backwards.
+
+    Args:
+        roadmap_id: Roadmap identifier
+        update: Progress changes to apply
+
+    Returns:
+        Progress after the update
+    """
+    if not ObjectId.is_valid(roadmap_id):
+        raise HTTPException(status_code=400, detail="Invalid roadmap id")
+    overlap = set(update.completed_weeks) & set(update.uncompleted_weeks)
+    if overlap:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Weeks cannot be both completed and uncompleted: {sorted(overlap)}"
+        )
+
+    try:
+        found = await db.update_roadmap_progress(
+            roadmap_id,
+            completed_weeks=update.completed_weeks,
+            uncompleted_weeks=update.uncompleted_weeks,
+            current_week=update.current_week,
+            hours_spent=update.hours_spent
+        )
+        if not found:
+            raise HTTPException(status_code=404, detail="Roadmap not found")
+
+        return await db.get_roadmap_progress(roadmap_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/roadmaps/{roadmap_id}/progress")
+async def get_progress(
+    roadmap_id: str,
+    db: Database = Depends(get_db)
+):
+    """Get progress for a roadmap
+
+    Args:
+        roadmap_id: Roadmap identifier
+
+    Returns:
+        current_week, total_weeks, completed_weeks and hours_spent
+    """
+    if not ObjectId.is_valid(roadmap_id):
+        raise HTTPException(status_code=400, detail="Invalid roadmap id")
+    try:
+        progress = await db.get_roadmap_progress(roadmap_id)
+        if not progress:
+            raise HTTPException(status_code=404, detail="Roadmap not found")
+        return progress
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,169 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Dict, List, Optional
+from app.utils.database import Database
+from app.dependencies import get_db, get_delta_responder
+from app.schemas import Roadmap
+from app.utils.deltas import DeltaResponder
+from app.utils.responses import FastJSONResponse
+from bson import ObjectId
+
+router = APIRouter()
+
+MAX_COMPARE = 10
+
+
+def _compare_skills(roadmaps: List[Dict]) -> Dict:
+    """Overlap of skills_to_learn across roadmaps (case-insensitive)"""
+    skill_sets = {}
+    spelling = {}
+    for roadmap in roadmaps:
+        skills = set()
+        for skill in roadmap.get("skills_to_learn") or []:
+            key = skill.strip().lower()
+            spelling.setdefault(key, skill.strip())
+            skills.add(key)
+        skill_sets[roadmap["_id"]] = skills
+
+    union = set().union(*skill_sets.values())
+    common = set.intersection(*skill_sets.values()) if skill_sets else set()
+    return {
+        "common": sorted(spelling[key] for key in common),
+        "unique": {
+            roadmap_id: sorted(spelling[key] for key in skills - set().union(*(s for rid, s in skill_sets.items() if rid != roadmap_id)))
+            for roadmap_id, skills in skill_sets.items()
+        },
+        "coverage_percentage": {
+            roadmap_id: round(len(skills) / len(union) * 100, 1) if union else 0
+            for roadmap_id, skills in skill_sets.items()
+        }
+    }
+
+
+@router.get("/roadmaps/compare")
+async def compare_roadmaps(
+    ids: List[str] = Query(..., description="Roadmap IDs to compare (repeat the parameter)"),
+    db: Database = Depends(get_db)
+):
+    """Compare roadmaps server-side
+
+    Computes skill coverage overlap, week-by-week topic differences and
+    estimated hours per roadmap. Only the compared fields are read: roadmap
+    metadata through a projection and weeks through an aggregation that
+    is consumed one week at a time.
+
+    Args:
+        ids: Roadmap identifiers (2 to 10)
+
+    Returns:
+        Per-roadmap totals, skill overlap and week-aligned topics
+    """
+    ids = list(dict.fromkeys(ids))
+    if not 2 <= len(ids) <= MAX_COMPARE:
+        raise HTTPException(status_code=400, detail=f"Provide between 2 and {MAX_COMPARE} distinct roadmap ids")
+    if not all(ObjectId.is_valid(roadmap_id) for roadmap_id in ids):
+        raise HTTPException(status_code=400, detail="Invalid roadmap id")
+
+    try:
+        roadmaps = await db.get_roadmaps_by_ids(
+            ids,
+            fields=["display_name", "target_role", "total_weeks", "week_count", "skills_to_learn", "created_at"]
+        )
+        found = {roadmap["_id"] for roadmap in roadmaps}
+        missing = [roadmap_id for roadmap_id in ids if roadmap_id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Roadmaps not found: {', '.join(missing)}")
+        # Keep the caller's order; the first roadmap is the baseline for deltas
+        roadmaps.sort(key=lambda roadmap: ids.index(roadmap["_id"]))
+
+        hours = {roadmap_id: 0 for roadmap_id in ids}
+        weeks = []
+        async for group in db.iter_week_summaries(ids, fields=["topic", "estimated_hours"]):
+            topics = {roadmap_id: None for roadmap_id in ids}
+            for entry in group["entries"]:
+                topics[entry["roadmap_id"]] = entry.get("topic")
+                estimated = entry.get("estimated_hours")
+                if isinstance(estimated, (int, float)):
+                    hours[entry["roadmap_id"]] += estimated
+            distinct = {(topic or "").strip().lower() for topic in topics.values()}
+            weeks.append({"week": group["week"], "topics": topics, "differs": len(distinct) > 1})
+
+        baseline = hours[ids[0]]
+        return FastJSONResponse({
+            "roadmaps": [
+                {
+                    "roadmap_id": roadmap["_id"],
+                    "display_name": roadmap.get("display_name"),
+                    "target_role": roadmap.get("target_role"),
+                    "total_weeks": roadmap.get("total_weeks") or roadmap.get("week_count"),
+                    "created_at": roadmap.get("created_at"),
+                    "total_estimated_hours": hours[roadmap["_id"]],
+                    "hours_delta": hours[roadmap["_id"]] - baseline
+                }
+                for roadmap in roadmaps
+            ],
+            "skills": _compare_skills(roadmaps),
+            "weeks": weeks,
+            "differing_weeks": sum(1 for week in weeks if week["differs"])
+        })
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/roadmaps/{roadmap_id}", response_model=Roadmap)
+async def get_roadmap(
+    roadmap_id: str,
+    start_week: Optional[int] = Query(None, ge=1),
+    end_week: Optional[int] = Query(None, ge=1),
+    since_version: Optional[str] = Query(None, description="Version the client already holds (from X-Version)"),
+    db: Database = Depends(get_db),
+    deltas: DeltaResponder = Depends(get_delta_responder)
+):
+    """Get a roadmap, optionally with only a window of its weeks
+
+    The response carries the roadmap version in X-Version. With
+    since_version the client gets 304 if it is still current, otherwise a
+    JSON Patch (application/json-patch+json) from that version when it is
+    smaller than the roadmap.
+
+    Args:
+        roadmap_id: Roadmap identifier
+        start_week: First week to include (defaults to week 1)
+        end_week: Last week to include (defaults to the last week)
+        since_version: Version the client already holds
+
+    Returns:
+        Roadmap metadata with weekly_plan limited to the requested weeks
+    """
+    if not ObjectId.is_valid(roadmap_id):
+        raise HTTPException(status_code=400, detail="Invalid roadmap id")
+    try:
+        weeks = None
+        meta = None
+        if since_version is not None or (start_week is not None and end_week is None):
+            # Metadata only: the version check and week count need no weeks
+            meta = await db.get_roadmap_by_id(roadmap_id, weeks=[])
+            if not meta:
+                raise HTTPException(status_code=404, detail="Roadmap not found")
+        view = f"{roadmap_id}:{start_week or ''}-{end_week or ''}"
+        if meta is not None and since_version == str(meta.get("version", 0)):
+            return deltas.not_modified("roadmap", view, since_version)
+
+        if start_week is not None or end_week is not None:
+            if end_week is None:
+                # Week count lives on the roadmap
+                end_week = meta.get("week_count") or meta.get("total_weeks") or 52
+            weeks = list(range(start_week or 1, end_week + 1))
+
+        roadmap = await db.get_roadmap_by_id(roadmap_id, weeks=weeks)
+        if not roadmap:
+            raise HTTPException(status_code=404, detail="Roadmap not found")
+
+        return await deltas.respond("roadmap", view, roadmap.get("version", 0), roadmap, since_version)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
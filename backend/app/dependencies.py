@@ -1,36 +1,224 @@
 from app.services.ai_service import AIService
+from app.services.pdf_text import shutdown_pool
 from app.services.resume_parser import ResumeParser
+from app.services.role_cache import RoleCache
+from app.services.role_resolver import RoleResolver
+from app.services.speculation import SkillAnalysisSpeculator
+from app.utils.change_feed import ChangeFeed
 from app.utils.database import Database
+from app.utils.deltas import DeltaResponder
+from app.utils.request_gate import RequestGate
+from app.utils.shared_state import ConcurrencyGovernor, create_shared_state
+from fastapi import Header, HTTPException
+import asyncio
+import hmac
 import logging
+import os
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Global instances (initialized lazily)
+# Global instances (initialized lazily, once per worker process)
+_owner_pid = None
+_shared_state = None
 _ai_service = None
 _db = None
 _resume_parser = None
+_speculator = None
+_request_gate = None
+_role_resolver = None
+_role_cache = None
+_delta_responder = None
+_change_feed = None
+
+# Readiness state reported by /ready
+_ready = False
+_warmup_error = None
+
+def _check_process():
+    """Drop instances inherited from a parent process
+
+    Clients (Mongo, HTTP pools, SQLite handles) must not be shared across
+    fork, so each worker builds its own on first use.
+    """
+    global _owner_pid
+    if _owner_pid != os.getpid():
+        if _owner_pid is not None:
+            logger.info("New worker process detected, rebuilding services")
+        reset_services()
+        _owner_pid = os.getpid()
+
+def reset_services():
+    """Forget all service instances (they are rebuilt lazily)"""
+    global _shared_state, _ai_service, _db, _resume_parser, _speculator, _request_gate, _role_resolver, _role_cache
+    global _delta_responder, _change_feed, _ready, _warmup_error
+    _shared_state = None
+    _ai_service = None
+    _db = None
+    _resume_parser = None
+    _speculator = None
+    _request_gate = None
+    _role_resolver = None
+    _role_cache = None
+    _delta_responder = None
+    _change_feed = None
+    _ready = False
+    _warmup_error = None
+
+def get_shared_state():
+    """Dependency for state shared by caches and limiters"""
+    global _shared_state
+    _check_process()
+    if _shared_state is None:
+        logger.info("Initializing shared state...")
+        _shared_state = create_shared_state()
+    return _shared_state
 
 def get_resume_parser():
     """Dependency for Resume Parser"""
     global _resume_parser
+    _check_process()
     if _resume_parser is None:
         logger.info("Initializing ResumeParser...")
-        _resume_parser = ResumeParser()
+        _resume_parser = ResumeParser(get_ai_service())
     return _resume_parser
 
 def get_ai_service():
     """Dependency for AI Service"""
     global _ai_service
+    _check_process()
     if _ai_service is None:
         logger.info("Initializing AIService...")
-        _ai_service = AIService()
+        limit = int(os.getenv("LLM_MAX_CONCURRENCY", 0))
+        governor = ConcurrencyGovernor(get_shared_state(), "llm", limit) if limit > 0 else None
+        _ai_service = AIService(governor=governor)
     return _ai_service
 
 def get_db():
     """Dependency for Database"""
     global _db
+    _check_process()
     if _db is None:
         logger.info("Initializing Database...")
         _db = Database()
     return _db
+
+def get_speculator():
+    """Dependency for speculative skill analysis"""
+    global _speculator
+    _check_process()
+    if _speculator is None:
+        logger.info("Initializing SkillAnalysisSpeculator...")
+        _speculator = SkillAnalysisSpeculator(get_role_cache(), get_shared_state())
+    return _speculator
+
+def get_request_gate():
+    """Dependency for request coalescing and rate limits"""
+    global _request_gate
+    _check_process()
+    if _request_gate is None:
+        logger.info("Initializing RequestGate...")
+        _request_gate = RequestGate(get_shared_state())
+    return _request_gate
+
+def get_role_resolver():
+    """Dependency for the canonical role catalog"""
+    global _role_resolver
+    _check_process()
+    if _role_resolver is None:
+        logger.info("Initializing RoleResolver...")
+        _role_resolver = RoleResolver()
+    return _role_resolver
+
+def get_role_cache():
+    """Dependency for role-keyed requirements and question pools"""
+    global _role_cache
+    _check_process()
+    if _role_cache is None:
+        logger.info("Initializing RoleCache...")
+        _role_cache = RoleCache(get_ai_service(), get_role_resolver(), get_shared_state())
+    return _role_cache
+
+def get_delta_responder():
+    """Dependency for versioned (patch / 304) responses"""
+    global _delta_responder
+    _check_process()
+    if _delta_responder is None:
+        _delta_responder = DeltaResponder(get_shared_state())
+    return _delta_responder
+
+def get_change_feed():
+    """Dependency for live per-user change events"""
+    global _change_feed
+    _check_process()
+    if _change_feed is None:
+        logger.info("Initializing ChangeFeed...")
+        _change_feed = ChangeFeed()
+    return _change_feed
+
+def require_admin(x_admin_token: str = Header(None)):
+    """Dependency guarding operational endpoints with the ADMIN_TOKEN header
+
+    Admin endpoints are disabled (403) while ADMIN_TOKEN is not set.
+    """
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+async def warm_up():
+    """Build all services and open connections before the first request
+
+    Run from the app lifespan so the first user does not pay for client
+    construction, the Mongo handshake or index creation. A failure (e.g.
+    MongoDB not reachable yet) is retried with exponential backoff, capped
+    at WARMUP_MAX_RETRY_SECONDS, until it succeeds; meanwhile /ready
+    reports warming_up with the last error.
+    """
+    global _ready, _warmup_error
+    max_delay = float(os.getenv("WARMUP_MAX_RETRY_SECONDS", 30))
+    delay = min(1.0, max_delay)
+    while True:
+        try:
+            get_ai_service()
+            get_resume_parser()
+            get_speculator()
+            get_request_gate()
+            get_role_cache()
+            db = get_db()
+            await db.ping()
+            await db.ensure_indexes()
+            await get_role_resolver().load(db)
+            await get_change_feed().start(db)
+            _ready = True
+            _warmup_error = None
+            logger.info("Warm-up complete, ready to serve")
+            return
+        except Exception as e:
+            _warmup_error = str(e)
+            logger.error(f"Warm-up failed, retrying in {delay:g}s: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+def readiness() -> dict:
+    """Current readiness state"""
+    if _ready:
+        return {"status": "ready"}
+    if _warmup_error:
+        return {"status": "warming_up", "detail": _warmup_error}
+    return {"status": "warming_up"}
+
+async def shutdown():
+    """Close connection pools and PDF extraction workers"""
+    global _ready
+    _ready = False
+    if _change_feed is not None:
+        await _change_feed.close()
+    if _ai_service is not None:
+        await _ai_service.close()
+    if _db is not None:
+        _db.close()
+    if _shared_state is not None:
+        _shared_state.close()
+    shutdown_pool()
@@ -1,21 +1,38 @@
-print("🚀 STARTING APP MODULE EXECUTION...")
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
-print("✅ Imports successful")
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import math
 import shutil
 import logging
 from pathlib import Path
 from app.services.resume_parser import ResumeParser
-from app.services.ai_service import AIService
+from app.services.ai_service import ROADMAP_MODES, AIService
+from app.services.role_cache import RoleCache
+from app.services.role_resolver import RoleResolver
+from app.services.speculation import SkillAnalysisSpeculator
+from app.utils.compression import CompressionMiddleware
 from app.utils.database import Database
+from app.utils.deltas import DeltaResponder, composite_version
+from app.utils.metrics import REGISTRY, MetricsMiddleware
+from app.utils.profiler import ProfilerMiddleware
+from app.utils.request_gate import RateLimitExceeded, RequestGate
+from app.utils.responses import FastJSONResponse, RawJSONResponse, dumps
+from app.schemas import Dashboard, Resume, Roadmap, SkillAnalysis
+from app.utils.tracing import TracingMiddleware
+from app import api_analytics  # Import role analytics routes
+from app import api_batch  # Import batch ingestion routes
 from app import api_chat  # Import chat routes
 from app import api_interview  # Import interview routes
+from app import api_live  # Import live update WebSocket
+from app import api_pipeline  # Import pipeline routes
+from app import api_profiling  # Import admin profiling routes
+from app import api_progress  # Import roadmap progress routes
+from app import api_roadmaps  # Import roadmap routes
 import os
 from dotenv import load_dotenv
-from bson import ObjectId
-from functools import lru_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,11 +41,29 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+from app.dependencies import (
+    get_db, get_ai_service, get_resume_parser, get_speculator, get_request_gate, get_role_cache, get_role_resolver,
+    get_delta_responder,
+    warm_up, readiness, shutdown
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm services up in the background so the port opens immediately"""
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    warmup_task.cancel()
+    await shutdown()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Career Navigator API",
     description="Intelligent career guidance with AI-powered skill analysis",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # CORS - Allow frontend to communicate with backend
@@ -40,16 +75,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from app.dependencies import get_db, get_ai_service, get_resume_parser
+# gzip/brotli for large JSON bodies (streamed responses pass through)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency histograms (exposed at /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Per-request trace spans (exported, or inline with ?debug_timing=1)
+app.add_middleware(TracingMiddleware)
+
+# cProfile for requests flagged by POST /api/admin/profile?mode=requests
+app.add_middleware(ProfilerMiddleware)
+
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    """429 with Retry-After instead of spending LLM capacity"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    )
 
-# Initialize services (optional warm-up during startup)
-# We can trigger them here if we want them fast-failed on startup
-# get_ai_service()
-# get_db()
 
 # Register routers
+app.include_router(api_analytics.router, prefix="/api", tags=["analytics"])
+app.include_router(api_batch.router, prefix="/api", tags=["batch"])
 app.include_router(api_chat.router, prefix="/api", tags=["chat"])
 app.include_router(api_interview.router, prefix="/api", tags=["interview"])
+app.include_router(api_live.router, prefix="/api", tags=["live"])
+app.include_router(api_pipeline.router, prefix="/api", tags=["pipeline"])
+app.include_router(api_profiling.router, prefix="/api", tags=["admin"])
+app.include_router(api_progress.router, prefix="/api", tags=["progress"])
+app.include_router(api_roadmaps.router, prefix="/api", tags=["roadmaps"])
 
 # Create uploads directory
 UPLOAD_DIR = Path("uploads")
@@ -66,15 +124,33 @@ async def root():
     }
 
 
-@app.post("/api/upload-resume")
+@app.get("/ready")
+async def ready():
+    """Readiness endpoint: 200 once services are warm, 503 before"""
+    state = readiness()
+    return JSONResponse(content=state, status_code=200 if state["status"] == "ready" else 503)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/api/upload-resume", response_model=Resume)
 async def upload_resume(
     file: UploadFile = File(...), 
+    target_role: Optional[str] = Form(None),
     db: Database = Depends(get_db),
-    resume_parser: ResumeParser = Depends(get_resume_parser)
+    resume_parser: ResumeParser = Depends(get_resume_parser),
+    speculator: SkillAnalysisSpeculator = Depends(get_speculator)
 ):
     """
     Upload and parse resume PDF
     
+    If speculative analysis is enabled, skill analysis for target_role (or a
+    role inferred from the resume) starts in the background.
+    
     Returns:
         - Parsed resume data with user_id
     """
@@ -108,6 +184,13 @@ async def upload_resume(
         
         logger.info(f"Resume parsed successfully. User ID: {user_id}")
         
+        # Speculatively start the skill analysis the user will ask for next
+        await speculator.speculate(
+            user_id,
+            parsed_data.get('skills', []),
+            target_role or speculator.infer_target_role(parsed_data)
+        )
+        
         # Clean up uploaded file
         try:
             if file_path.exists():
@@ -116,7 +199,7 @@ async def upload_resume(
         except Exception as cleanup_error:
             logger.warning(f"Failed to clean up temporary file {file_path}: {cleanup_error}")
         
-        return JSONResponse(content=jsonable_encoder(parsed_data, custom_encoder={ObjectId: str}))
+        return FastJSONResponse(parsed_data)
         
     except Exception as e:
         # Ensure cleanup even on error
@@ -129,158 +212,215 @@ async def upload_resume(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/analyze-skills")
+@app.post("/api/analyze-skills", response_model=SkillAnalysis)
 async def analyze_skills(
     user_id: str = Form(...), 
     target_role: str = Form(...),
     db: Database = Depends(get_db),
-    ai_service: AIService = Depends(get_ai_service)
+    ai_service: AIService = Depends(get_ai_service),
+    speculator: SkillAnalysisSpeculator = Depends(get_speculator),
+    request_gate: RequestGate = Depends(get_request_gate),
+    role_cache: RoleCache = Depends(get_role_cache),
+    resolver: RoleResolver = Depends(get_role_resolver)
 ):
     """
     Analyze skill gaps for target role
     
+    Duplicate requests (same user and role) share one analysis; new ones
+    are rate limited per user (429). Requirements of a role already
+    analyzed (under any equivalent spelling) are reused from the cache.
+    
     Returns:
         - Skill gap analysis with job readiness score
     """
-    try:
-        logger.info(f"Analyzing skills for user {user_id}, target: {target_role}")
-        
-        # Get user resume from database
-        resume = await db.get_resume(user_id)
-        
-        if not resume:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        current_skills = resume.get('skills', [])
-        
-        # Analyze gaps with AI
-        analysis = await ai_service.analyze_skill_gap(current_skills, target_role)
-        
-        # Calculate job readiness score
-        required_count = len(analysis['required_skills'])
-        matching_count = len(analysis['matching_skills'])
-        job_readiness = (matching_count / required_count * 100) if required_count > 0 else 0
-        
-        # Ensure trending_skills_comparison exists (use AI's detailed data if available)
-        if 'trending_skills_comparison' not in analysis or not isinstance(analysis['trending_skills_comparison'], dict):
-            # Fallback only if AI didn't provide the detailed comparison
-            logger.warning("AI didn't provide trending_skills_comparison, using fallback")
-            trending_comparison = {
-                skill: {"has_skill": skill in current_skills} 
-                for skill in analysis.get('trending_skills', [])
-            }
-            analysis['trending_skills_comparison'] = trending_comparison
-        else:
-            logger.info(f"Using AI-generated trending_skills_comparison with {len(analysis['trending_skills_comparison'])} skills")
-        
-        # Build complete analysis
-        complete_analysis = {
-            **analysis,
-            "job_readiness_score": round(job_readiness, 1),
-            "target_role": target_role
-        }
+    async def compute():
+        try:
+            logger.info(f"Analyzing skills for user {user_id}, target: {target_role}")
         
-        # Save analysis to database
-        await db.save_skill_analysis(user_id, complete_analysis)
+            # Get user resume from database
+            resume = await db.get_resume(user_id)
         
-        logger.info(f"Skill analysis complete. Readiness: {job_readiness}%")
-        logger.info(f"   Trending skills comparison keys: {list(complete_analysis.get('trending_skills_comparison', {}).keys())}")
+            if not resume:
+                raise HTTPException(status_code=404, detail="Resume not found")
         
-        return JSONResponse(content=jsonable_encoder(complete_analysis, custom_encoder={ObjectId: str}))
+            current_skills = resume.get('skills', [])
         
-    except Exception as e:
-        logger.error(f"Error analyzing skills: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            # Reuse a speculative analysis started at upload time, if any
+            analysis = await speculator.take(user_id, target_role)
+            if analysis is not None:
+                logger.info("Using speculative skill analysis")
+            else:
+                # Match against cached role requirements, or analyze gaps with AI
+                analysis = await role_cache.analyze(current_skills, target_role)
 
+            # Ensure trending_skills_comparison exists (use AI's detailed data if available)
+            if not isinstance(analysis.get('trending_skills_comparison'), dict):
+                logger.warning("AI didn't provide trending_skills_comparison, using fallback")
+            else:
+                logger.info(f"Using AI-generated trending_skills_comparison with {len(analysis['trending_skills_comparison'])} skills")
 
-@app.post("/api/generate-roadmap")
+            # Build complete analysis with job readiness score
+            complete_analysis = ai_service.finalize_skill_analysis(analysis, current_skills, target_role)
+
+            # Save analysis to database
+            await db.save_skill_analysis(user_id, complete_analysis, role_key=resolver.canonical_key(target_role))
+
+            logger.info(f"Skill analysis complete. Readiness: {complete_analysis['job_readiness_score']}%")
+            logger.info(f"   Trending skills comparison keys: {list(complete_analysis.get('trending_skills_comparison', {}).keys())}")
+        
+            # Serialized once; coalesced duplicates reuse the same body
+            return dumps(complete_analysis).decode("utf-8")
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error analyzing skills: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    # The role as written is part of the key: the result echoes it
+    params = {"target_role": resolver.canonical_key(target_role), "role_text": " ".join(target_role.lower().split())}
+    body = await request_gate.run("analyze-skills", user_id, params, compute)
+    return RawJSONResponse(body)
+
+
+@app.post("/api/generate-roadmap", response_model=Roadmap)
 async def generate_roadmap(
     user_id: str = Form(...), 
     target_role: str = Form(...), 
     weeks: int = Form(12),
+    mode: Optional[str] = Form(None),
     db: Database = Depends(get_db),
-    ai_service: AIService = Depends(get_ai_service)
+    ai_service: AIService = Depends(get_ai_service),
+    request_gate: RequestGate = Depends(get_request_gate),
+    resolver: RoleResolver = Depends(get_role_resolver)
 ):
     """
     Generate personalized learning roadmap
     
+    Duplicate requests (same user, role and weeks) share one roadmap; new
+    ones are rate limited per user (429). mode "library" composes the
+    roadmap from the curriculum library in milliseconds without the LLM,
+    "polish" also has the LLM rewrite its text (default: ROADMAP_MODE).
+    
     Returns:
         - Week-by-week learning plan with resources
     """
-    try:
-        logger.info(f"Generating {weeks}-week roadmap for {target_role}")
-        
-        # Get skill analysis
-        analysis = await db.get_skill_analysis(user_id)
-        
-        if not analysis:
-            raise HTTPException(
-                status_code=404, 
-                detail="Please complete skill analysis first"
+    async def compute():
+        try:
+            logger.info(f"Generating {weeks}-week roadmap for {target_role}")
+        
+            # Get skill analysis
+            analysis = await db.get_skill_analysis(user_id)
+        
+            if not analysis:
+                raise HTTPException(
+                    status_code=404, 
+                    detail="Please complete skill analysis first"
+                )
+        
+            missing_skills = analysis.get('missing_skills', [])
+            logger.info(f"Missing skills to focus on: {missing_skills[:3]}..." if len(missing_skills) > 3 else f"Missing skills: {missing_skills}")
+        
+            # Generate roadmap with AI
+            roadmap_data = await ai_service.generate_roadmap(
+                missing_skills, 
+                target_role, 
+                weeks,
+                mode=mode
             )
         
-        missing_skills = analysis.get('missing_skills', [])
-        logger.info(f"Missing skills to focus on: {missing_skills[:3]}..." if len(missing_skills) > 3 else f"Missing skills: {missing_skills}")
-        
-        # Generate roadmap with AI
-        roadmap_data = await ai_service.generate_roadmap(
-            missing_skills, 
-            target_role, 
-            weeks
-        )
-        
-        # Debug: Log the first few week numbers from AI response
-        if 'weekly_plan' in roadmap_data:
-            week_numbers = [week.get('week', '?') for week in roadmap_data['weekly_plan'][:5]]
-            logger.info(f"AI returned {len(roadmap_data['weekly_plan'])} weeks. First 5 week numbers: {week_numbers}")
-        else:
-            logger.warning("AI response missing 'weekly_plan' key!")
-        
-        # Add metadata
-        complete_roadmap = {
-            **roadmap_data,
-            "user_id": user_id,
-            "target_role": target_role,
-            "total_weeks": weeks,
-            "job_readiness_score": analysis.get('job_readiness_score', 0),
-            "skills_to_learn": missing_skills
-        }
-        
-        # Save roadmap to database (creates new roadmap each time)
-        roadmap_id = await db.save_roadmap(
-            user_id, 
-            complete_roadmap, 
-            display_name=target_role,  # Use target role as display name
-            is_active=True  # Make this the active roadmap
-        )
+            # Debug: Log the first few week numbers from AI response
+            if 'weekly_plan' in roadmap_data:
+                week_numbers = [week.get('week', '?') for week in roadmap_data['weekly_plan'][:5]]
+                logger.info(f"AI returned {len(roadmap_data['weekly_plan'])} weeks. First 5 week numbers: {week_numbers}")
+            else:
+                logger.warning("AI response missing 'weekly_plan' key!")
+        
+            # Add metadata
+            complete_roadmap = {
+                **roadmap_data,
+                "user_id": user_id,
+                "target_role": target_role,
+                "total_weeks": weeks,
+                "job_readiness_score": analysis.get('job_readiness_score', 0),
+                "skills_to_learn": missing_skills
+            }
         
-        logger.info(f"Roadmap saved to database for user {user_id}")
+            # Save roadmap to database (creates new roadmap each time)
+            roadmap_id = await db.save_roadmap(
+                user_id, 
+                complete_roadmap, 
+                display_name=target_role,  # Use target role as display name
+                is_active=True  # Make this the active roadmap
+            )
         
-        return JSONResponse(content=jsonable_encoder(complete_roadmap, custom_encoder={ObjectId: str}))
+            logger.info(f"Roadmap saved to database for user {user_id}")
         
-    except Exception as e:
-        logger.error(f"Error generating roadmap: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            return dumps(complete_roadmap).decode("utf-8")
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating roadmap: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if mode is not None and mode not in ROADMAP_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(ROADMAP_MODES)}")
+    params = {
+        "target_role": resolver.canonical_key(target_role),
+        "role_text": " ".join(target_role.lower().split()),
+        "weeks": weeks,
+        "mode": mode or ai_service.roadmap_mode
+    }
+    body = await request_gate.run("generate-roadmap", user_id, params, compute)
+    return RawJSONResponse(body)
+
 
+def _dashboard_version(analysis: Optional[dict], roadmap: Optional[dict]) -> str:
+    """Dashboard version: changes with the analysis or the active roadmap
 
-@app.get("/api/dashboard/{user_id}")
-async def get_dashboard(user_id: str, db: Database = Depends(get_db)):
+    Resumes are never modified once stored, so they are not part of it.
+    """
+    return composite_version(
+        analysis.get("created_at") if analysis else None,
+        str(roadmap["_id"]) if roadmap else None,
+        roadmap.get("version", 0) if roadmap else None
+    )
+
+
+@app.get("/api/dashboard/{user_id}", response_model=Dashboard)
+async def get_dashboard(
+    user_id: str,
+    since_version: Optional[str] = Query(None, description="Version the client already holds (from X-Version)"),
+    db: Database = Depends(get_db),
+    deltas: DeltaResponder = Depends(get_delta_responder)
+):
     """
     Get complete dashboard data for user
+
+    With since_version the response is 304 if nothing changed (checked
+    without loading the resume or any week), otherwise a JSON Patch from
+    that version when it is smaller than the dashboard.
     
     Returns:
         - Resume, skill analysis, and roadmap
     """
     try:
+        if since_version is not None:
+            analysis_meta = await db.get_skill_analysis(user_id, fields=["created_at"])
+            roadmap_meta = await db.get_roadmap(user_id, weeks=[])
+            if since_version == _dashboard_version(analysis_meta, roadmap_meta):
+                return deltas.not_modified("dashboard", user_id, since_version)
+
         resume = await db.get_resume(user_id)
         analysis = await db.get_skill_analysis(user_id)
         roadmap = await db.get_roadmap(user_id)
         
-        return JSONResponse(content=jsonable_encoder({
+        return await deltas.respond("dashboard", user_id, _dashboard_version(analysis, roadmap), {
             "resume": resume,
             "skill_analysis": analysis,
             "roadmap": roadmap
-        }, custom_encoder={ObjectId: str}))
+        }, since_version)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,109 @@
+"""Response models for the main routes
+
+They describe the payloads in the OpenAPI schema. Routes return
+FastJSONResponse directly, so FastAPI does not validate or re-encode
+through these models at request time; documents are serialized once.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class _Document(BaseModel):
+    """MongoDB document: `_id` as a string, unknown fields passed through"""
+    model_config = ConfigDict(extra="allow", populate_by_name=True)
+
+    id: Optional[str] = Field(None, alias="_id")
+
+
+class Education(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    degree: Optional[str] = None
+    institution: Optional[str] = None
+    year: Optional[Union[str, int]] = None
+
+
+class Experience(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: Optional[str] = None
+    company: Optional[str] = None
+    duration: Optional[str] = None
+    description: Optional[str] = None
+
+
+class Resume(_Document):
+    user_id: Optional[str] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = []
+    education: List[Education] = []
+    experience: List[Experience] = []
+    years_of_experience: Optional[float] = None
+    uploaded_at: Optional[datetime] = None
+
+
+class SkillAnalysis(_Document):
+    user_id: Optional[str] = None
+    target_role: Optional[str] = None
+    required_skills: List[str] = []
+    matching_skills: List[str] = []
+    missing_skills: List[str] = []
+    match_percentage: Optional[float] = None
+    job_readiness_score: Optional[float] = None
+    trending_skills: List[str] = []
+    trending_skills_comparison: Dict[str, Dict] = {}
+    created_at: Optional[datetime] = None
+
+
+class Resource(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: Optional[str] = None
+    url: Optional[str] = None
+    type: Optional[str] = None
+    platform: Optional[str] = None
+
+
+class MiniProject(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    difficulty: Optional[str] = None
+
+
+class WeekPlan(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    week: int
+    topic: Optional[str] = None
+    goal: Optional[str] = None
+    what_to_learn: Optional[str] = None
+    why_learn_this: Optional[str] = None
+    resources: List[Resource] = []
+    how_to_learn: Optional[str] = None
+    mini_project: Optional[MiniProject] = None
+    estimated_hours: Optional[float] = None
+    completed: Optional[bool] = None
+
+
+class Roadmap(_Document):
+    user_id: Optional[str] = None
+    target_role: Optional[str] = None
+    display_name: Optional[str] = None
+    total_weeks: Optional[int] = None
+    job_readiness_score: Optional[float] = None
+    skills_to_learn: List[str] = []
+    weekly_plan: List[WeekPlan] = []
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    version: Optional[int] = None
+
+
+class Dashboard(BaseModel):
+    resume: Optional[Resume] = None
+    skill_analysis: Optional[SkillAnalysis] = None
+    roadmap: Optional[Roadmap] = None
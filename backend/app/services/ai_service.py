@@ -1,12 +1,60 @@
-from openai import AsyncOpenAI
-import json
+from contextlib import asynccontextmanager
+import asyncio
 import os
-from typing import Dict, List
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from app.services.curriculum import RoadmapComposer, skill_key
+from app.services.llm_output import (
+    AnswerEvaluationOutput, InterviewQuestionOutput, LLMOutput, ResumeOutput, RoadmapWeekOutput,
+    RoadmapWeekTextOutput, RoleRequirementsOutput, SkillGapOutput, repair_json, validate_items, validate_output
+)
+from app.utils.metrics import (
+    LLM_FALLBACKS, LLM_OUTPUT_REPAIRS, LLM_QUEUE_SECONDS, LLM_REQUEST_SECONDS, LLM_RETRIES, LLM_TOKENS,
+    LLM_WASTED_TOKENS, ROADMAP_COMPOSITIONS
+)
+from app.utils.shared_state import ConcurrencyGovernor
+from app.utils.tracing import span
+
+RESUME_SCHEMA = {
+    "name": '"Full name"',
+    "email": '"Email address"',
+    "phone": '"Phone number"',
+    "skills": '["skill1", "skill2", ...]',
+    "education": '[\n        {"degree": "degree name", "institution": "school name", "year": "year"}\n    ]',
+    "experience": '[\n        {"title": "job title", "company": "company name", "duration": "time period", "description": "what they did"}\n    ]',
+    "years_of_experience": "number"
+}
+
+# llm: the model writes the roadmap; library: composed locally, no LLM;
+# polish: composed locally, the model only rewrites the text
+ROADMAP_MODES = ("llm", "library", "polish")
+POLISHED_FIELDS = ("topic", "goal", "what_to_learn", "why_learn_this", "how_to_learn")
+
+
+def _week_ranges(weeks: List[int]) -> str:
+    """Compact week list, e.g. [1, 2, 3, 7, 9, 10] -> 1-3, 7, 9-10"""
+    ranges, start = [], None
+    for index, week in enumerate(weeks):
+        if start is None:
+            start = week
+        if index + 1 == len(weeks) or weeks[index + 1] != week + 1:
+            ranges.append(f"{start}-{week}" if week != start else str(week))
+            start = None
+    return ", ".join(ranges)
+
+
+def _resume_schema_lines(known_fields: Dict, indent: str = "    ") -> str:
+    """JSON schema lines for the resume fields not already known"""
+    return ",\n".join(f'{indent}"{key}": {value}' for key, value in RESUME_SCHEMA.items() if key not in known_fields)
+
 
 class AIService:
     """AI service using Groq API (Llama 3.1)"""
     
-    def __init__(self):
+    def __init__(self, governor: ConcurrencyGovernor = None):
+        # Imported here so app startup does not pay for the OpenAI SDK
+        from openai import AsyncOpenAI
+
         # Fix for OpenAI SDK expecting OPENAI_API_KEY even when using custom base_url
         if not os.getenv("OPENAI_API_KEY"):
             os.environ["OPENAI_API_KEY"] = "dummy-key-not-used"
@@ -17,9 +65,234 @@ class AIService:
         )
         # Using Llama 3.1 8B which is lightning fast and free on Groq
         self.model = "llama-3.1-8b-instant"
+        # Optional cap on concurrent completions (per process or per host)
+        self.governor = governor
+        # Follow-up completions allowed for unusable or incomplete outputs
+        self.repair_attempts = int(os.getenv("LLM_REPAIR_ATTEMPTS", 1))
+        # Roadmaps from the curated curriculum library (fast mode and fallback)
+        self.composer = RoadmapComposer()
+        self.roadmap_mode = os.getenv("ROADMAP_MODE", "llm").lower()
+        if self.roadmap_mode not in ROADMAP_MODES:
+            raise ValueError(f"Unknown ROADMAP_MODE: {self.roadmap_mode}")
+
+    async def close(self):
+        """Close the HTTP connection pool"""
+        await self.groq_client.close()
+
+    @asynccontextmanager
+    async def _llm_slot(self, method: str, llm_span=None):
+        """Hold an LLM concurrency slot while a completion runs, if governed"""
+        if self.governor is None:
+            yield
+            return
+        async with self.governor.slot() as queue_wait:
+            LLM_QUEUE_SECONDS.observe(queue_wait, method)
+            if llm_span is not None:
+                llm_span.attributes["queue_wait_ms"] = round(queue_wait * 1000, 3)
+            yield
+
+    async def _complete(self, method: str, **kwargs):
+        """Run a chat completion, recording latency and token usage for method"""
+        with span(f"llm.{method}", model=kwargs.get("model")) as llm_span:
+            async with self._llm_slot(method, llm_span):
+                start = time.perf_counter()
+                try:
+                    response = await self.groq_client.chat.completions.create(**kwargs)
+                finally:
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, method)
+
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+                LLM_TOKENS.inc(method, "prompt", amount=prompt_tokens)
+                LLM_TOKENS.inc(method, "completion", amount=completion_tokens)
+                if llm_span is not None:
+                    llm_span.attributes["prompt_tokens"] = prompt_tokens
+                    llm_span.attributes["completion_tokens"] = completion_tokens
+        return response
+
+    @staticmethod
+    def _waste(method: str, tokens: float):
+        """Count completion tokens spent on output that was thrown away"""
+        if tokens >= 1:
+            LLM_WASTED_TOKENS.inc(method, amount=round(tokens))
+
+    async def _complete_json(self, method: str, messages: List[Dict], temperature: float) -> Tuple[Any, float, bool]:
+        """Run a JSON completion and parse it tolerantly
+
+        Returns:
+            (parsed value or None if unusable, completion tokens behind the
+            parsed part, whether the output was truncated)
+        """
+        response = await self._complete(
+            method,
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            response_format={"type": "json_object"}
+        )
+        content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        tokens = (getattr(usage, "completion_tokens", 0) or 0) if usage is not None else 0
+        try:
+            value, unused, truncated = repair_json(content)
+        except ValueError as e:
+            print(f"[AI Service] Unusable output from {method}: {e}")
+            self._waste(method, tokens)
+            return None, 0, False
+        if unused or truncated:
+            LLM_OUTPUT_REPAIRS.inc(method, "json")
+            wasted = tokens * unused / len(content)
+            self._waste(method, wasted)
+            tokens -= wasted
+        return value, tokens, truncated
+
+    async def _complete_validated(
+        self, method: str, messages: List[Dict], temperature: float, schema: Type[LLMOutput],
+        fallback: Dict, known: Iterable[str] = ()
+    ) -> Dict:
+        """Run a JSON object completion, keeping whatever fits the schema
+
+        Unusable JSON is requested again; REQUIRED fields that are missing
+        or invalid are requested on their own, and only what is still
+        missing after that is taken from fallback.
+
+        Args:
+            method: AIService method name (metrics label)
+            messages: Chat messages; the last one is the user prompt
+            temperature: Sampling temperature
+            schema: Expected output
+            fallback: Values for fields the model never provided
+            known: Fields the caller already has (not requested again)
+
+        Raises:
+            ValueError: No usable JSON after all attempts
+        """
+        for attempt in range(self.repair_attempts + 1):
+            if attempt:
+                LLM_RETRIES.inc(method, "invalid_json")
+            value, tokens, _ = await self._complete_json(method, messages, temperature)
+            if isinstance(value, dict):
+                break
+            self._waste(method, tokens)
+        else:
+            raise ValueError(f"No usable JSON object from {method}")
+
+        result, missing, dropped = validate_output(schema, value)
+        if dropped:
+            LLM_OUTPUT_REPAIRS.inc(method, "dropped")
+            self._waste(method, tokens * dropped / len(value))
+        missing = [field for field in missing if field not in known]
+
+        for _ in range(self.repair_attempts):
+            if not missing:
+                break
+            LLM_RETRIES.inc(method, "missing_fields")
+            follow_up = messages[:-1] + [{
+                "role": "user",
+                "content": f"{messages[-1]['content']}\n\nReturn a JSON object with ONLY these keys: {', '.join(missing)}"
+            }]
+            try:
+                value, tokens, _ = await self._complete_json(method, follow_up, temperature)
+            except Exception as e:
+                print(f"[AI Service] Follow-up for {method} failed: {e}")
+                break
+            provided, _, _ = validate_output(schema, value)
+            for field in missing:
+                if provided.get(field) not in (None, "", []):
+                    result[field] = provided[field]
+            missing = [field for field in missing if result.get(field) in (None, "", [])]
+
+        if missing:
+            LLM_OUTPUT_REPAIRS.inc(method, "filled")
+            result.update({field: fallback[field] for field in missing if field in fallback})
+        return result
+
+    async def _complete_items(
+        self, method: str, schema: Type[LLMOutput], key: str, wanted: List,
+        build_messages, id_key: Optional[str] = None
+    ) -> Tuple[List[Dict], Dict]:
+        """Collect list items (weeks, questions) over as few completions as possible
+
+        The first completion asks for everything; each follow-up asks only
+        for the items that are still missing or were invalid.
+
+        Args:
+            method: AIService method name (metrics label)
+            schema: Expected item
+            key: Key of the list in the returned object
+            wanted: Item ids needed (e.g. week numbers, or slot numbers
+                when items have no id)
+            build_messages: (missing ids, items so far) -> (messages, temperature)
+            id_key: Item field holding its id; items without it get the id
+                of their position among the requested ones. None fills
+                slots in order.
+
+        Returns:
+            (items in the order of wanted, extra top-level keys of the first
+            response); ids that never arrived are absent
+
+        Raises:
+            ValueError: The first completion was unusable and so were all
+                follow-ups
+        """
+        collected: Dict[Any, Dict] = {}
+        extras, reason = {}, "missing_items"
+        for attempt in range(self.repair_attempts + 1):
+            missing = [wanted_id for wanted_id in wanted if wanted_id not in collected]
+            if not missing:
+                break
+            if attempt:
+                LLM_RETRIES.inc(method, reason)
+            messages, temperature = build_messages(missing, [collected[i] for i in wanted if i in collected])
+            try:
+                value, tokens, truncated = await self._complete_json(method, messages, temperature)
+            except Exception:
+                if not collected:
+                    raise
+                break
+            items = value.get(key) if isinstance(value, dict) else value
+            if not isinstance(items, list):
+                self._waste(method, tokens)
+                reason = "invalid_json"
+                continue
+            if isinstance(value, dict) and not extras:
+                extras = {k: v for k, v in value.items() if k != key}
+            reason = "missing_items"
+
+            # The last item of a cut-off list is probably incomplete
+            usable = items[:-1] if truncated else items
+            if id_key is not None:
+                for position, item in enumerate(usable[:len(missing)]):
+                    if isinstance(item, dict) and item.get(id_key) is None:
+                        item[id_key] = missing[position]
+            valid, _ = validate_items(schema, usable)
+            accepted, slots = 0, iter(missing)
+            for item in valid:
+                wanted_id = item.get(id_key) if id_key is not None else next(slots, None)
+                if wanted_id in missing and wanted_id not in collected:
+                    collected[wanted_id] = item
+                    accepted += 1
+            if accepted < len(items):
+                LLM_OUTPUT_REPAIRS.inc(method, "dropped")
+                self._waste(method, tokens * (len(items) - accepted) / len(items))
+
+        if not collected:
+            raise ValueError(f"No usable {key} from {method}")
+        return [collected[wanted_id] for wanted_id in wanted if wanted_id in collected], extras
         
-    async def parse_resume(self, resume_text: str) -> Dict:
-        """Extract structured data from resume text"""
+    async def parse_resume(self, resume_text: str, known_fields: Dict = None) -> Dict:
+        """Extract structured data from resume text
+
+        Args:
+            resume_text: Resume text (ideally preprocessed)
+            known_fields: Fields already extracted locally (e.g. email,
+                phone); they are left out of the requested schema and
+                merged into the result
+        """
+        known_fields = known_fields or {}
+        schema_lines = _resume_schema_lines(known_fields)
         prompt = f"""Extract information from this resume and return as JSON:
 
 Resume Text:
@@ -27,48 +300,115 @@ Resume Text:
 
 Return JSON with these exact keys:
 {{
-    "name": "Full name",
-    "email": "Email address",
-    "phone": "Phone number",
-    "skills": ["skill1", "skill2", ...],
-    "education": [
-        {{"degree": "degree name", "institution": "school name", "year": "year"}}
-    ],
-    "experience": [
-        {{"title": "job title", "company": "company name", "duration": "time period", "description": "what they did"}}
-    ],
-    "years_of_experience": number
+{schema_lines}
 }}
 
 Extract ALL skills mentioned (technical and soft skills).
 """
         try:
-            response = await self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
+            result = await self._complete_validated(
+                "parse_resume",
+                [
                     {"role": "system", "content": "You are an expert resume parser. Return valid JSON only."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
+                0.1,
+                ResumeOutput,
+                fallback={"name": "", "skills": []},
+                known=known_fields
             )
-            return json.loads(response.choices[0].message.content)
+            return {**result, **known_fields}
             
         except Exception as e:
+            LLM_FALLBACKS.inc("parse_resume")
             print(f"Groq failed: {e}")
             # Ultimate fallback for resume parsing
-            return {
-                "name": f"Error: {str(e)}",
-                "email": "",
-                "phone": "",
-                "skills": [],
-                "education": [],
-                "experience": [],
-                "years_of_experience": 0
-            }
+            return self._get_fallback_resume(str(e), known_fields)
+
+    async def parse_resumes(self, resumes: List[Tuple[str, Dict]]) -> List[Dict]:
+        """Extract structured data from several resumes in one completion
 
-    async def analyze_skill_gap(self, current_skills: List[str], target_role: str) -> Dict:
-        """Analyze what skills are missing for target role"""
+        Used by batch ingestion: one prompt per batch saves the per-call
+        overhead (system prompt, instructions, round trip). If the model
+        returns too few resumes or some are unusable, only those are parsed
+        again on their own.
+
+        Args:
+            resumes: (resume_text, known_fields) pairs
+
+        Returns:
+            Parsed resumes in the same order
+        """
+        if len(resumes) == 1:
+            return [await self.parse_resume(*resumes[0])]
+
+        # Ask for every field that at least one resume is missing
+        shared_known = set.intersection(*(set(known or {}) for _, known in resumes))
+        schema_lines = _resume_schema_lines(shared_known, indent="        ")
+        documents = "\n\n".join(
+            f"### RESUME {index}\n{text}" for index, (text, _) in enumerate(resumes, 1)
+        )
+        prompt = f"""Extract information from each of these {len(resumes)} resumes and return as JSON:
+
+{documents}
+
+Return JSON with one object per resume, in the same order:
+{{
+    "resumes": [
+        {{
+{schema_lines}
+        }}
+    ]
+}}
+
+Extract ALL skills mentioned (technical and soft skills).
+"""
+        results: List[Optional[Dict]] = [None] * len(resumes)
+        try:
+            value, tokens, truncated = await self._complete_json(
+                "parse_resumes",
+                [
+                    {"role": "system", "content": "You are an expert resume parser. Return valid JSON only."},
+                    {"role": "user", "content": prompt}
+                ],
+                0.1
+            )
+            parsed = value.get("resumes") if isinstance(value, dict) else None
+            if isinstance(parsed, list) and len(parsed) <= len(resumes):
+                # Resumes come back in order; a cut-off last one is redone
+                for index, item in enumerate(parsed[:-1] if truncated else parsed):
+                    known = resumes[index][1] or {}
+                    provided, missing, _ = validate_output(ResumeOutput, item)
+                    if not [field for field in missing if field not in known]:
+                        results[index] = {**provided, **known}
+                redo = sum(1 for result in results[:len(parsed)] if result is None)
+                if redo:
+                    self._waste("parse_resumes", tokens * redo / len(parsed))
+            else:
+                print(f"Batch parse returned {len(parsed) if isinstance(parsed, list) else 'no'} resumes for {len(resumes)}")
+                self._waste("parse_resumes", tokens)
+        except Exception as e:
+            print(f"Groq batch parse failed: {e}")
+
+        redo = [index for index, result in enumerate(results) if result is None]
+        if len(redo) == len(resumes):
+            LLM_FALLBACKS.inc("parse_resumes")
+        elif redo:
+            LLM_RETRIES.inc("parse_resumes", "missing_items")
+        if redo:
+            reparsed = await asyncio.gather(*(self.parse_resume(*resumes[index]) for index in redo))
+            for index, result in zip(redo, reparsed):
+                results[index] = result
+        return results
+
+    async def analyze_skill_gap(self, current_skills: List[str], target_role: str, fallback: bool = True) -> Dict:
+        """Analyze what skills are missing for target role
+
+        Args:
+            fallback: Return generic content if the model fails; with False
+                the error is raised and fields the model never provided are
+                left out (for callers that cache the result)
+        """
         
         prompt = f"""Act as a Senior Career Coach and Tech Industry Analyst.
         
@@ -96,31 +436,162 @@ Provide a comprehensive, data-driven analysis in JSON format:
 Ensure "trending_skills_comparison" covers the detailed stats for the top trending skills.
 """
         try:
-            response = await self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
+            analysis = await self._complete_validated(
+                "analyze_skill_gap",
+                [
                     {"role": "system", "content": "You are a career counselor and tech industry expert. Provide detailed, data-backed insights. Return ONLY valid JSON."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+                0.3,
+                SkillGapOutput,
+                # Without fallback, missing fields stay missing so the caller can tell
+                fallback=self._get_fallback_skill_analysis(current_skills, target_role) if fallback else {}
             )
-            return json.loads(response.choices[0].message.content)
+            # Derived locally rather than requested again
+            if analysis.get("missing_skills") is None or analysis.get("matching_skills") is None:
+                matched = self.match_skills(current_skills, analysis)
+                for key in ("missing_skills", "matching_skills", "match_percentage"):
+                    if analysis.get(key) is None:
+                        analysis[key] = matched[key]
+            return analysis
         except Exception as e:
+            if not fallback:
+                raise
+            LLM_FALLBACKS.inc("analyze_skill_gap")
             print(f"Error in skill analysis: {e}")
             return self._get_fallback_skill_analysis(current_skills, target_role)
 
-    async def generate_roadmap(self, missing_skills: List[str], target_role: str, weeks: int = 12) -> Dict:
-        """Generate week-by-week learning roadmap"""
-        
-        print(f"[AI Service] Generating roadmap: {weeks} weeks for {target_role}")
-        
-        prompt = f"""Create a premium, detailed {weeks}-week learning masterclass for a {target_role}.
+    async def get_role_requirements(self, target_role: str, fallback: bool = True) -> Dict:
+        """Get the resume-independent skill requirements for a role
+
+        Unlike analyze_skill_gap this does not need the user's skills, so it
+        can run while the resume is still being parsed.
+
+        Args:
+            fallback: Return generic content if the model fails; with False
+                the error is raised and fields the model never provided are
+                left out (for callers that cache the result)
+        """
+        prompt = f"""Act as a Senior Career Coach and Tech Industry Analyst.
+
+Describe the skill requirements for this role:
+Target Role: {target_role}
+
+Provide a data-driven answer in JSON format:
+{{
+    "required_skills": ["list of top 12-15 most critical skills for {target_role}"],
+    "trending_skills": ["top 6-8 trending technologies in 2025-2026 for this role"],
+    "trending_skills_comparison": {{
+        "skill_name": {{
+            "demand": "High" | "Medium" | "Low",
+            "avg_salary": "e.g. $140k+",
+            "growth": "e.g. +22% YoY",
+            "reason": "Why is this trending?"
+        }}
+    }}
+}}
+
+Ensure "trending_skills_comparison" covers the detailed stats for the top trending skills.
+"""
+        try:
+            return await self._complete_validated(
+                "get_role_requirements",
+                [
+                    {"role": "system", "content": "You are a career counselor and tech industry expert. Provide detailed, data-backed insights. Return ONLY valid JSON."},
+                    {"role": "user", "content": prompt}
+                ],
+                0.3,
+                RoleRequirementsOutput,
+                fallback=self._get_fallback_skill_analysis([], target_role) if fallback else {}
+            )
+        except Exception as e:
+            if not fallback:
+                raise
+            LLM_FALLBACKS.inc("get_role_requirements")
+            print(f"Error getting role requirements: {e}")
+            generic = self._get_fallback_skill_analysis([], target_role)
+            return {
+                "required_skills": generic["required_skills"],
+                "trending_skills": generic["trending_skills"],
+                "trending_skills_comparison": generic["trending_skills_comparison"]
+            }
+
+    def match_skills(self, current_skills: List[str], requirements: Dict) -> Dict:
+        """Build a skill gap analysis locally from role requirements
+
+        Args:
+            current_skills: Skills extracted from the resume
+            requirements: Output of get_role_requirements
+
+        Returns:
+            Analysis with the same keys as analyze_skill_gap
+        """
+        # Compared by skill key, so "Node.js"/"NodeJS" and "JS"/"JavaScript" match
+        owned = {skill_key(skill) for skill in current_skills if skill}
+        required = requirements.get("required_skills", [])
+        matching = [skill for skill in required if skill_key(skill) in owned]
+        missing = [skill for skill in required if skill_key(skill) not in owned]
+        match_percentage = round(len(matching) / len(required) * 100) if required else 0
+
+        return {
+            **requirements,
+            "required_skills": required,
+            "missing_skills": missing,
+            "matching_skills": matching,
+            "match_percentage": match_percentage
+        }
+
+    def finalize_skill_analysis(self, analysis: Dict, current_skills: List[str], target_role: str) -> Dict:
+        """Add job readiness score and trending comparison to an analysis"""
+        required_count = len(analysis.get('required_skills', []))
+        matching_count = len(analysis.get('matching_skills', []))
+        job_readiness = (matching_count / required_count * 100) if required_count > 0 else 0
+
+        # Fallback only if AI didn't provide the detailed comparison
+        comparison = analysis.get('trending_skills_comparison')
+        if not isinstance(comparison, dict):
+            owned = {skill_key(skill) for skill in current_skills if skill}
+            comparison = {
+                skill: {"has_skill": skill_key(skill) in owned}
+                for skill in analysis.get('trending_skills', [])
+            }
+
+        # A new dict: the caller's analysis may be a cached result
+        return {
+            **analysis,
+            "trending_skills_comparison": comparison,
+            "job_readiness_score": round(job_readiness, 1),
+            "target_role": target_role
+        }
+
+    def _roadmap_prompt(
+        self, missing_skills: List[str], target_role: str, weeks: int,
+        week_numbers: List[int] = None, planned: List[Dict] = None
+    ) -> str:
+        """Roadmap prompt for all weeks, or only week_numbers of the plan
+
+        Args:
+            planned: Weeks already generated; their topics are listed so
+                the requested weeks do not repeat them
+        """
+        if week_numbers and len(week_numbers) < weeks:
+            scope = f"ONLY weeks {_week_ranges(week_numbers)} of the {weeks}-week plan"
+            numbering = f"Use exactly these week numbers: {_week_ranges(week_numbers)}."
+        else:
+            scope = f"EACH week (1 to {weeks})"
+            numbering = f"Week numbers MUST increment: 1, 2, 3, 4, etc. up to {weeks}."
+        covered = ""
+        if planned:
+            covered = "\nWeeks already planned (do not repeat these topics):\n" + "\n".join(
+                f"- Week {week['week']}: {week['topic']}" for week in planned
+            ) + "\n"
+
+        return f"""Create a premium, detailed {weeks}-week learning masterclass for a {target_role}.
         
 Target Role: {target_role}
 Skills to Focus On: {', '.join(missing_skills)}
-
-Return a JSON object with a "weekly_plan" list. For EACH week (1 to {weeks}), provide:
+{covered}
+Return a JSON object with a "weekly_plan" list. For {scope}, provide:
 {{
     "week": number,
     "topic": "High-Impact Topic Title",
@@ -146,22 +617,126 @@ Return a JSON object with a "weekly_plan" list. For EACH week (1 to {weeks}), pr
 
 CRITICAL INSTRUCTIONS:
 1. NO GENERIC CONTENT. Each week must be unique.
-2. Week numbers MUST increment: 1, 2, 3, 4, etc. up to {weeks}.
+2. {numbering}
 """
+
+    async def generate_roadmap(self, missing_skills: List[str], target_role: str, weeks: int = 12, mode: str = None) -> Dict:
+        """Generate week-by-week learning roadmap
+
+        Weeks that are missing, invalid or cut off in the response are
+        requested again on their own (e.g. weeks 9-12); any still missing
+        after LLM_REPAIR_ATTEMPTS follow-ups come from the curriculum library.
+
+        Args:
+            mode: llm, library or polish (defaults to ROADMAP_MODE)
+        """
+        mode = mode or self.roadmap_mode
+        if mode == "library":
+            ROADMAP_COMPOSITIONS.inc("library")
+            return self.composer.compose(missing_skills, target_role, weeks)
+        if mode == "polish":
+            ROADMAP_COMPOSITIONS.inc("polish")
+            return await self.polish_roadmap(self.composer.compose(missing_skills, target_role, weeks), target_role)
+        
+        print(f"[AI Service] Generating roadmap: {weeks} weeks for {target_role}")
+
+        def build_messages(week_numbers: List[int], planned: List[Dict]):
+            prompt = self._roadmap_prompt(missing_skills, target_role, weeks, week_numbers, planned)
+            return [
+                {"role": "system", "content": "You are a specialized technical curriculum designer. Return valid JSON only."},
+                {"role": "user", "content": prompt}
+            ], 0.4
+
         try:
-            response = await self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a specialized technical curriculum designer. Return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.4,
-                response_format={"type": "json_object"}
+            weekly_plan, extras = await self._complete_items(
+                "generate_roadmap", RoadmapWeekOutput, "weekly_plan", list(range(1, weeks + 1)),
+                build_messages, id_key="week"
             )
-            return json.loads(response.choices[0].message.content)
         except Exception as e:
+            LLM_FALLBACKS.inc("generate_roadmap")
             print(f"[AI Service] Groq failed: {e}")
-            return self._get_fallback_roadmap(target_role, weeks)
+            return self._get_fallback_roadmap(target_role, weeks, missing_skills)
+
+        if len(weekly_plan) < weeks:
+            LLM_OUTPUT_REPAIRS.inc("generate_roadmap", "filled")
+            ROADMAP_COMPOSITIONS.inc("fill")
+            generated = {week["week"]: week for week in weekly_plan}
+            fallback = self.composer.compose(missing_skills, target_role, weeks)["weekly_plan"]
+            weekly_plan = [generated.get(week["week"], week) for week in fallback]
+        return {**extras, "weekly_plan": weekly_plan}
+
+    async def polish_roadmap(self, roadmap: Dict, target_role: str) -> Dict:
+        """Have the model rewrite the text of a composed roadmap
+
+        Only the wording (topic, goal, what/why/how) is taken from the
+        model; week order, hours, resources and projects stay as composed,
+        so the model cannot invent links. Weeks it does not return keep
+        the composed text.
+        """
+        weekly_plan = roadmap["weekly_plan"]
+        by_week = {week["week"]: week for week in weekly_plan}
+
+        def build_messages(week_numbers: List[int], planned: List[Dict]):
+            outline = "\n".join(
+                f"- Week {number}: {by_week[number]['topic']} | goal: {by_week[number]['goal']} | "
+                f"covers: {by_week[number]['what_to_learn'].replace(chr(10), ' ')}"
+                for number in week_numbers
+            )
+            if len(week_numbers) < len(weekly_plan):
+                scope = f"ONLY weeks {_week_ranges(week_numbers)} of the plan"
+            else:
+                scope = "EACH week"
+            prompt = f"""Rewrite this {len(weekly_plan)}-week learning plan for a {target_role} so every week reads as specific, motivating guidance.
+Keep each week's subject and week number; do not add or remove weeks.
+
+{outline}
+
+Return a JSON object with a "weekly_plan" list. For {scope}, provide:
+{{
+    "week": number,
+    "topic": "Concise topic title",
+    "goal": "The specific outcome of this week",
+    "what_to_learn": "The concepts above as bullet points",
+    "why_learn_this": "Why this matters for a {target_role}",
+    "how_to_learn": "Actionable study tips"
+}}
+"""
+            return [
+                {"role": "system", "content": "You are a specialized technical curriculum editor. Return valid JSON only."},
+                {"role": "user", "content": prompt}
+            ], 0.3
+
+        try:
+            polished, _ = await self._complete_items(
+                "polish_roadmap", RoadmapWeekTextOutput, "weekly_plan", list(by_week),
+                build_messages, id_key="week"
+            )
+        except Exception as e:
+            LLM_FALLBACKS.inc("polish_roadmap")
+            print(f"[AI Service] Roadmap polish failed: {e}")
+            return roadmap
+
+        for item in polished:
+            week = by_week[item["week"]]
+            for field in POLISHED_FIELDS:
+                value = item.get(field)
+                if isinstance(value, list):
+                    value = "\n".join(f"- {line}" for line in value)
+                if value:
+                    week[field] = value
+        return roadmap
+
+    def _get_fallback_resume(self, error: str, known_fields: Dict) -> Dict:
+        return {
+            "name": f"Error: {error}",
+            "email": "",
+            "phone": "",
+            "skills": [],
+            "education": [],
+            "experience": [],
+            "years_of_experience": 0,
+            **known_fields
+        }
 
     def _get_fallback_skill_analysis(self, current_skills: List[str], target_role: str) -> Dict:
         """Provide high-quality analysis even if AI fails"""
@@ -177,33 +752,16 @@ CRITICAL INSTRUCTIONS:
             }
         }
 
-    def _get_fallback_roadmap(self, target_role: str, weeks: int) -> Dict:
-        """Provide a static but high-quality roadmap for common roles"""
-        weekly_plan = []
-        for i in range(1, weeks + 1):
-            weekly_plan.append({
-                "week": i,
-                "topic": f"Week {i}: Advanced {target_role} Fundamentals",
-                "goal": "Master core concepts",
-                "what_to_learn": "Deep dive into architecture patterns and best practices.",
-                "why_learn_this": "Foundational knowledge required for senior roles.",
-                "resources": [
-                    {"title": f"{target_role} Full Course", "url": "https://youtube.com", "type": "Video", "platform": "YouTube"}
-                ],
-                "how_to_learn": "30% Theory, 70% Practice.",
-                "mini_project": {
-                    "title": f"Build a {target_role} MVP",
-                    "description": "Create a prototype applying this week's concepts.",
-                    "difficulty": "Intermediate"
-                },
-                "estimated_hours": 10
-            })
-        return {"weekly_plan": weekly_plan}
+    def _get_fallback_roadmap(self, target_role: str, weeks: int, missing_skills: List[str] = ()) -> Dict:
+        """Roadmap composed from the curriculum library when the model fails"""
+        ROADMAP_COMPOSITIONS.inc("fallback")
+        return self.composer.compose(missing_skills, target_role, weeks)
 
     async def generate_response(self, prompt: str) -> str:
         '''Generate a chat response using AI'''
         try:
-            response = await self.groq_client.chat.completions.create(
+            response = await self._complete(
+                "generate_response",
                 model=self.model,
                 messages=[{'role': 'user', 'content': prompt}],
                 temperature=0.7,
@@ -211,18 +769,32 @@ CRITICAL INSTRUCTIONS:
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
+            LLM_FALLBACKS.inc("generate_response")
             return 'I am having trouble responding right now. Please try again later.'
 
     async def generate_interview_questions(
-        self, target_role: str, difficulty: str = "medium", count: int = 5
+        self, target_role: str, difficulty: str = "medium", count: int = 5, fallback: bool = True
     ) -> List[Dict]:
-        """Generate interview questions for a role"""
-        prompt = f"""Generate {count} interview questions for a {target_role} position at {difficulty} difficulty level.
+        """Generate interview questions for a role
+
+        Questions missing from or invalid in the response are requested
+        again (only that many); any still missing come from the fallback.
+
+        Args:
+            fallback: Return generic questions if the model fails; with
+                False the error is raised and missing questions are not
+                filled in (for callers that cache the result)
+        """
+        def build_messages(slots: List[int], asked: List[Dict]):
+            avoid = ""
+            if asked:
+                avoid = "\nDo not repeat these questions:\n" + "\n".join(f"- {q['question']}" for q in asked) + "\n"
+            prompt = f"""Generate {len(slots)} interview questions for a {target_role} position at {difficulty} difficulty level.
 
 Questions should be a mix of:
 - Technical (coding, system design)
 - Behavioral (teamwork, leadership)
-
+{avoid}
 Return a JSON object with a "questions" array. Each question should have:
 {{
     "question": "The interview question",
@@ -231,20 +803,26 @@ Return a JSON object with a "questions" array. Each question should have:
     "sample_answer_hints": "Brief hints or key points to address (optional)"
 }}
 """
+            return [
+                {"role": "system", "content": "You are a senior technical recruiter. Return valid JSON only."},
+                {"role": "user", "content": prompt}
+            ], 0.7
+
         try:
-            response = await self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a senior technical recruiter. Return valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
+            questions, _ = await self._complete_items(
+                "generate_interview_questions", InterviewQuestionOutput, "questions", list(range(count)),
+                build_messages
             )
-            result = json.loads(response.choices[0].message.content)
-            return result.get('questions', [])
         except Exception as e:
+            if not fallback:
+                raise
+            LLM_FALLBACKS.inc("generate_interview_questions")
             return self._get_fallback_questions(target_role, difficulty, count)
+
+        if len(questions) < count and fallback:
+            LLM_OUTPUT_REPAIRS.inc("generate_interview_questions", "filled")
+            questions += self._get_fallback_questions(target_role, difficulty, count - len(questions))
+        return questions
     
     async def evaluate_interview_answer(
         self, question: str, user_answer: str, category: str
@@ -272,24 +850,26 @@ Evaluate this answer and return a JSON object with:
     "improvements": ["improvement 1"]
 }}
 """
+        fallback = {
+            "score": 5,
+            "feedback": "Unable to evaluate at this time. Please try again.",
+            "strengths": ["Answer provided"],
+            "improvements": ["Try again for detailed feedback"]
+        }
         try:
-            response = await self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=[
+            return await self._complete_validated(
+                "evaluate_interview_answer",
+                [
                     {"role": "system", "content": "You are a fair technical interviewer. Return valid JSON only."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3,
-                response_format={"type": "json_object"}
+                0.3,
+                AnswerEvaluationOutput,
+                fallback=fallback
             )
-            return json.loads(response.choices[0].message.content)
         except Exception as e:
-            return {
-                "score": 5,
-                "feedback": "Unable to evaluate at this time. Please try again.",
-                "strengths": ["Answer provided"],
-                "improvements": ["Try again for detailed feedback"]
-            }
+            LLM_FALLBACKS.inc("evaluate_interview_answer")
+            return fallback
     
     def _get_fallback_questions(self, target_role: str, difficulty: str, count: int) -> List[Dict]:
         """Provide fallback questions if AI fails"""
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from app.services.resume_parser import ResumeParser
+from app.utils.database import Database
+from app.utils.metrics import BATCH_RESUMES
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _extraction_executor() -> ThreadPoolExecutor:
+    """Threads for batch PDF extraction, separate from asyncio.to_thread
+
+    Keeps a large batch from starving the interactive upload endpoints,
+    which share the default executor.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv("BATCH_EXTRACT_THREADS", 4)),
+            thread_name_prefix="batch-extract"
+        )
+    return _executor
+
+
+class ResumeBatchIngestor:
+    """Parses and stores many resumes, reporting each file as it finishes
+
+    Files go through three stages that overlap:
+        extraction  PDF text + preprocessing on a bounded thread pool
+        parsing     rule-based fast path; the rest is grouped into
+                    multi-resume LLM prompts (BATCH_LLM_SIZE per prompt,
+                    BATCH_LLM_CONCURRENCY prompts in flight)
+        storage     insert_many every BATCH_INSERT_SIZE resumes
+    """
+
+    def __init__(self, db: Database, resume_parser: ResumeParser):
+        self.db = db
+        self.resume_parser = resume_parser
+        self.llm_batch_size = int(os.getenv("BATCH_LLM_SIZE", 4))
+        self.llm_concurrency = int(os.getenv("BATCH_LLM_CONCURRENCY", 8))
+        self.insert_batch_size = int(os.getenv("BATCH_INSERT_SIZE", 50))
+        # Flush a partial LLM batch when no new resume arrived for this long
+        self.llm_batch_wait = float(os.getenv("BATCH_LLM_WAIT_SECONDS", 0.05))
+
+    def _prepare(self, path: Path) -> Tuple[Dict, Optional[str]]:
+        """Extraction and local parsing (blocking; runs on the batch pool)"""
+        prepared = self.resume_parser.prepare_pdf(str(path))
+        return self.resume_parser.plan_parse(prepared)
+
+    async def ingest(self, files: List[Tuple[str, Path]], batch_id: str):
+        """Process the files, yielding one status event per file and stage
+
+        Args:
+            files: (original filename, path on disk) pairs; paths are deleted
+            batch_id: Stored on each resume document
+
+        Yields:
+            {"file", "status": "parsed"|"saved"|"error", ...} and finally
+            {"status": "done", "summary": {...}}
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.create_task(self._run(files, batch_id, events))
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+    async def _run(self, files: List[Tuple[str, Path]], batch_id: str, events: asyncio.Queue):
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        executor = _extraction_executor()
+        llm_slots = asyncio.Semaphore(self.llm_concurrency)
+        summary = {"files": len(files), "saved": 0, "errors": 0, "local": 0, "llm": 0}
+        pending: List[Tuple[str, Dict, str]] = []  # (file, known fields, text for the LLM)
+        to_insert: List[Tuple[str, Dict]] = []
+        tasks = set()
+
+        def fail(name: str, error: Exception):
+            summary["errors"] += 1
+            BATCH_RESUMES.inc("error")
+            events.put_nowait({"file": name, "status": "error", "detail": str(error)})
+
+        async def flush():
+            if not to_insert:
+                return
+            batch = to_insert[:]
+            to_insert.clear()
+            try:
+                user_ids = await self.db.save_resumes([
+                    {**parsed, "batch_id": batch_id} for _, parsed in batch
+                ])
+            except Exception as e:
+                logger.error(f"Batch {batch_id}: insert failed: {e}")
+                for name, _ in batch:
+                    fail(name, e)
+                return
+            summary["saved"] += len(batch)
+            BATCH_RESUMES.inc("saved", amount=len(batch))
+            for (name, parsed), user_id in zip(batch, user_ids):
+                events.put_nowait({"file": name, "status": "saved", "user_id": user_id, "name": parsed.get("name")})
+
+        async def store(name: str, parsed: Dict):
+            events.put_nowait({"file": name, "status": "parsed"})
+            to_insert.append((name, parsed))
+            if len(to_insert) >= self.insert_batch_size:
+                await flush()
+
+        async def parse_batch(batch: List[Tuple[str, Dict, str]]):
+            async with llm_slots:
+                try:
+                    results = await self.resume_parser.ai_service.parse_resumes(
+                        [(text, known) for _, known, text in batch]
+                    )
+                except Exception as e:
+                    for name, _, _ in batch:
+                        fail(name, e)
+                    return
+            summary["llm"] += len(batch)
+            for (name, _, _), parsed in zip(batch, results):
+                await store(name, parsed)
+
+        def dispatch():
+            batch = pending[:]
+            pending.clear()
+            task = asyncio.create_task(parse_batch(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def extract(name: str, path: Path) -> Tuple[str, Optional[Tuple[Dict, Optional[str]]]]:
+            try:
+                return name, await loop.run_in_executor(executor, self._prepare, path)
+            except Exception as e:
+                fail(name, e)
+                return name, None
+            finally:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError as cleanup_error:
+                    logger.warning(f"Failed to clean up temporary file {path}: {cleanup_error}")
+
+        extractions = [asyncio.ensure_future(extract(name, path)) for name, path in files]
+        try:
+            remaining = set(extractions)
+            while remaining:
+                done, remaining = await asyncio.wait(
+                    remaining, timeout=self.llm_batch_wait if pending else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Extraction is the bottleneck; don't hold a partial batch
+                    dispatch()
+                    continue
+                for finished in done:
+                    name, plan = finished.result()
+                    if plan is None:
+                        continue
+                    known, text = plan
+                    if text is None:
+                        summary["local"] += 1
+                        await store(name, known)
+                        continue
+                    pending.append((name, known, text))
+                    if len(pending) >= self.llm_batch_size:
+                        dispatch()
+
+            if pending:
+                dispatch()
+            if tasks:
+                await asyncio.gather(*list(tasks))
+            await flush()
+
+            summary["seconds"] = round(time.perf_counter() - start, 3)
+            logger.info(f"Batch {batch_id}: {summary}")
+            events.put_nowait({"status": "done", "batch_id": batch_id, "summary": summary})
+        except Exception as e:
+            logger.error(f"Batch {batch_id} failed: {e}")
+            events.put_nowait({"status": "error", "batch_id": batch_id, "detail": str(e)})
+        finally:
+            for task in list(tasks) + extractions:
+                task.cancel()
+            events.put_nowait(None)
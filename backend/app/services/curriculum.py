@@ -0,0 +1,382 @@
+"""Roadmaps composed from the curated curriculum library
+
+RoadmapComposer turns a list of missing skills into a weekly_plan in about
+a millisecond, without the LLM:
+
+1. Each skill is looked up in the library (by name, alias or the longest
+   run of words naming a known skill: "AWS Lambda" -> AWS). Unknown skills
+   get a generic two-unit module with search links instead of made-up URLs.
+2. Modules are ordered so prerequisites come first (Docker before
+   Kubernetes); otherwise the order of missing_skills (priority) is kept.
+   Prerequisites the user does not miss are assumed known.
+3. Units are chosen within the hour budget (weeks x CURRICULUM_WEEKLY_HOURS):
+   the first unit of every missing skill, then the remaining core units,
+   then extension units. Short plans for long roadmaps are topped up with
+   related modules (Docker -> Kubernetes -> ...).
+4. The units are packed, in order, into at most `weeks` weeks so that the
+   busiest week has as few hours as possible. Weeks left over become
+   project sprints, interview preparation and a capstone.
+
+It is used for ROADMAP_MODE=library (no LLM), ROADMAP_MODE=polish (the LLM
+only rewrites the text) and as the fallback for weeks the LLM never
+delivered.
+"""
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote_plus
+
+from app.services.curriculum_library import MODULES, CurriculumModule, Unit
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+# "Next.js", "Next JS" and "Next-JS" are all "nextjs" before synonyms apply
+_JS_SUFFIX = re.compile(r"(?<=[a-z0-9])[\s.\-]*js\b")
+# Other spellings of the same skill, per word. Library aliases that name a
+# related tool (Flask for REST APIs) are not synonyms and stay out of this.
+_SKILL_SYNONYMS = {
+    "js": "javascript", "vanillajs": "javascript", "ts": "typescript", "node": "nodejs", "reactjs": "react", "vuejs": "vue",
+    "golang": "go", "k8s": "kubernetes", "postgres": "postgresql", "python3": "python",
+    "ml": "machine learning",
+}
+
+STUDY_PLANS = {
+    "Beginner": "Follow the first resource end to end and type every example yourself. "
+                "Spend the last third of the week on the exercise without looking at solutions.",
+    "Intermediate": "Skim the concepts first, then build: about 30% reading and 70% hands-on work. "
+                    "Look up anything unclear in the official documentation.",
+    "Advanced": "Read the design rationale in the official docs, then reproduce a realistic setup. "
+                "Break it on purpose and fix it to understand the failure modes.",
+}
+EXTENSIONS = [
+    "add automated tests and a CI pipeline",
+    "deploy it and add logging and monitoring",
+    "measure its performance and optimize the slowest part",
+    "write a README with a short design note and a demo",
+]
+
+
+def skill_key(skill: str) -> str:
+    """Canonical key of a skill name ("Node.js" -> "nodejs", "JS" -> "javascript", "CI/CD" -> "ci-cd")"""
+    text = _JS_SUFFIX.sub("js", (skill or "").lower().replace("&", " and "))
+    return "-".join(_SKILL_SYNONYMS.get(word, word) for word in _NON_WORD.sub(" ", text).split()).replace(" ", "-")
+
+
+def generic_module(skill: str) -> CurriculumModule:
+    """Module for a skill the library does not cover"""
+    query = quote_plus(skill)
+    return CurriculumModule(
+        skill=skill,
+        level="Intermediate",
+        why=f"{skill} is part of the requirements for this role and missing from your current profile.",
+        units=(
+            Unit(f"{skill} fundamentals", 5, f"Explain the core ideas of {skill} and use them in small exercises",
+                 ("Core concepts and terminology", "Setup and first exercises", "Common pitfalls")),
+            Unit(f"{skill} in practice", 5, f"Apply {skill} to a realistic task",
+                 ("Real-world use cases", "Best practices", "Reviewing examples from experienced practitioners")),
+        ),
+        project=(f"{skill} showcase", f"Build a small portfolio piece that applies {skill} to a realistic problem "
+                                      f"and write up what you learned."),
+        resources=(
+            (f"{skill} courses", f"https://www.coursera.org/search?query={query}", "Course", "Coursera"),
+            (f"{skill} tutorials", f"https://www.youtube.com/results?search_query={query}+tutorial", "Video", "YouTube"),
+        )
+    )
+
+
+class CurriculumLibrary:
+    """Modules indexed by canonical skill key and aliases"""
+
+    def __init__(self, modules: Iterable[CurriculumModule] = MODULES):
+        self.modules: Dict[str, CurriculumModule] = {skill_key(module.skill): module for module in modules}
+        self._index: Dict[str, str] = {}
+        for key, module in self.modules.items():
+            for name in (module.skill, *module.aliases):
+                self._index.setdefault(skill_key(name), key)
+
+    def find(self, skill: str) -> Optional[CurriculumModule]:
+        """Module teaching a skill, or None if the library has none"""
+        key = skill_key(skill)
+        for candidate in (key, key[:-1] if key.endswith("s") else None):
+            if candidate in self._index:
+                return self.modules[self._index[candidate]]
+        # Longest run of words naming a known skill ("AWS Lambda" -> AWS);
+        # very short keys ("go", "ml") only match on their own
+        words = key.split("-")
+        for size in range(len(words) - 1, 0, -1):
+            for start in range(len(words) - size + 1):
+                candidate = "-".join(words[start:start + size])
+                if len(candidate) >= 3 and candidate in self._index:
+                    return self.modules[self._index[candidate]]
+        return None
+
+
+def _pack(hours: List[float], groups: int) -> List[Tuple[int, int]]:
+    """Split hours, in order, into exactly `groups` contiguous ranges
+
+    The busiest range is made as light as possible (binary search on the
+    weekly capacity); ranges are then split further until there are
+    `groups` of them.
+
+    Returns:
+        (start, end) index ranges
+    """
+    def split(capacity: float) -> List[Tuple[int, int]]:
+        ranges, start, load = [], 0, 0.0
+        for index, value in enumerate(hours):
+            if index > start and load + value > capacity:
+                ranges.append((start, index))
+                start, load = index, 0.0
+            load += value
+        ranges.append((start, len(hours)))
+        return ranges
+
+    low, high = max(hours), sum(hours)
+    for _ in range(30):
+        middle = (low + high) / 2
+        if len(split(middle)) <= groups:
+            high = middle
+        else:
+            low = middle
+    ranges = split(high)
+
+    while len(ranges) < groups:
+        # Split the busiest range that has more than one unit
+        start, end = max((r for r in ranges if r[1] - r[0] > 1), key=lambda r: sum(hours[r[0]:r[1]]))
+        cut = min(range(start + 1, end), key=lambda i: max(sum(hours[start:i]), sum(hours[i:end])))
+        position = ranges.index((start, end))
+        ranges[position:position + 1] = [(start, cut), (cut, end)]
+    return ranges
+
+
+def _hours(value: float):
+    value = round(value, 1)
+    return int(value) if value == int(value) else value
+
+
+class RoadmapComposer:
+    """Builds weekly plans from the curriculum library"""
+
+    def __init__(self, library: CurriculumLibrary = None, weekly_hours: float = None):
+        self.library = library or CurriculumLibrary()
+        self.weekly_hours = weekly_hours if weekly_hours is not None else float(os.getenv("CURRICULUM_WEEKLY_HOURS", 10))
+
+    def modules_for(self, skills: Iterable[str]) -> List[CurriculumModule]:
+        """One module per distinct skill, in the given order"""
+        modules, seen = [], set()
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            module = self.library.find(skill) or generic_module(skill.strip())
+            key = skill_key(module.skill)
+            if key not in seen:
+                seen.add(key)
+                modules.append(module)
+        return modules
+
+    @staticmethod
+    def _order(modules: List[CurriculumModule]) -> List[CurriculumModule]:
+        """Prerequisites before the modules that need them, otherwise as given"""
+        by_key = {skill_key(module.skill): module for module in modules}
+        ordered, placed = [], set()
+
+        def place(module: CurriculumModule, visiting: set):
+            key = skill_key(module.skill)
+            if key in placed or key in visiting:
+                return
+            visiting.add(key)
+            for prerequisite in module.prerequisites:
+                required = by_key.get(skill_key(prerequisite))
+                if required is not None:
+                    place(required, visiting)
+            placed.add(key)
+            ordered.append(module)
+
+        for module in modules:
+            place(module, set())
+        return ordered
+
+    @staticmethod
+    def _select(modules: List[CurriculumModule], budget: float, required: int) -> Dict[str, int]:
+        """Number of units taken from each module
+
+        The first unit of the first `required` modules is always taken; the
+        rest only while the total stays within budget.
+        """
+        counts = {skill_key(module.skill): 0 for module in modules}
+        total = 0.0
+        tiers = (lambda module: 1, lambda module: module.core, lambda module: len(module.units))
+        for tier, limit in enumerate(tiers):
+            for position, module in enumerate(modules):
+                key = skill_key(module.skill)
+                while counts[key] < min(limit(module), len(module.units)):
+                    hours = module.units[counts[key]].hours
+                    if total + hours > budget and not (tier == 0 and position < required):
+                        break
+                    total += hours
+                    counts[key] += 1
+        return counts
+
+    def plan(self, missing_skills: Iterable[str], weeks: int) -> List[Tuple[CurriculumModule, int]]:
+        """Ordered (module, unit index) pairs for a roadmap of `weeks` weeks"""
+        modules = self._order(self.modules_for(missing_skills))
+        required = len(modules)
+        budget = weeks * self.weekly_hours
+        counts = self._select(modules, budget, required)
+
+        frontier = modules
+        while sum(counts.values()) < weeks and frontier:
+            # Room left: continue with what the planned skills lead to
+            present = {skill_key(module.skill) for module in modules}
+            related = [self.library.find(name) for module in frontier for name in module.related]
+            frontier = self._order(self.modules_for([
+                module.skill for module in related if module is not None and skill_key(module.skill) not in present
+            ]))
+            if frontier:
+                modules = modules + frontier
+                counts = self._select(modules, budget, required)
+
+        return [(module, index) for module in modules for index in range(counts[skill_key(module.skill)])]
+
+    def compose(self, missing_skills: Iterable[str], target_role: str, weeks: int) -> Dict:
+        """Roadmap ({"weekly_plan": [...]}) for the missing skills
+
+        Args:
+            missing_skills: Skills to learn, most important first
+            target_role: Role the roadmap prepares for
+            weeks: Number of weeks
+        """
+        units = self.plan(missing_skills, weeks)
+        last_unit = {}
+        for module, index in units:
+            last_unit[skill_key(module.skill)] = index
+
+        weekly_plan = []
+        if units:
+            hours = [module.units[index].hours for module, index in units]
+            for start, end in _pack(hours, min(weeks, len(units))):
+                weekly_plan.append(self._week(len(weekly_plan) + 1, units[start:end], last_unit))
+
+        modules = list({skill_key(module.skill): module for module, _ in units}.values())
+        remaining = weeks - len(weekly_plan)
+        for offset in range(remaining):
+            weekly_plan.append(self._practice_week(len(weekly_plan) + 1, offset, remaining, modules, target_role))
+        return {"weekly_plan": weekly_plan}
+
+    @staticmethod
+    def _week(number: int, group: List[Tuple[CurriculumModule, int]], last_unit: Dict[str, int]) -> Dict:
+        """Week covering consecutive units (usually one)"""
+        modules = list({skill_key(module.skill): module for module, _ in group}.values())
+        units = [module.units[index] for module, index in group]
+        resources, urls = [], set()
+        for module in modules:
+            for title, url, kind, platform in module.resources[:2]:
+                if url not in urls:
+                    urls.add(url)
+                    resources.append({"title": title, "url": url, "type": kind, "platform": platform})
+
+        finished = [module for module, index in group if last_unit[skill_key(module.skill)] == index]
+        if finished:
+            module = finished[-1]
+            mini_project = {"title": module.project[0], "description": module.project[1], "difficulty": module.level}
+        else:
+            module, unit = group[-1][0], units[-1]
+            mini_project = {
+                "title": f"{unit.title} exercise",
+                "description": f"{unit.goal} in a small, self-contained exercise and commit it to your portfolio repository.",
+                "difficulty": module.level
+            }
+
+        return {
+            "week": number,
+            "topic": " & ".join(unit.title for unit in units),
+            "goal": "; ".join(unit.goal for unit in units),
+            "what_to_learn": "\n".join(f"- {concept}" for unit in units for concept in unit.concepts),
+            "why_learn_this": " ".join(module.why for module in modules),
+            "resources": resources,
+            "how_to_learn": STUDY_PLANS.get(modules[0].level, STUDY_PLANS["Intermediate"]),
+            "mini_project": mini_project,
+            "estimated_hours": _hours(sum(unit.hours for unit in units)),
+            "skills": [module.skill for module in modules]
+        }
+
+    def _practice_week(self, number: int, offset: int, count: int, modules: List[CurriculumModule], target_role: str) -> Dict:
+        """Week after all units: project sprints, interview prep, capstone"""
+        if offset == count - 1:
+            skills = ", ".join(module.skill for module in modules[:5]) or "the skills from this roadmap"
+            return {
+                "week": number,
+                "topic": f"Capstone: {target_role} portfolio project",
+                "goal": f"Ship one project that demonstrates the {target_role} skills end to end",
+                "what_to_learn": "- Scoping a project to one week\n- Combining the skills you learned\n- Presenting your work",
+                "why_learn_this": "A finished, documented project is the strongest evidence of readiness in applications and interviews.",
+                "resources": [],
+                "how_to_learn": "Scope ruthlessly on day one, build every day and keep the last day for the README and a demo.",
+                "mini_project": {
+                    "title": f"{target_role} capstone",
+                    "description": f"Build and publish a project that uses {skills}, with tests, deployment and a write-up.",
+                    "difficulty": "Advanced"
+                },
+                "estimated_hours": _hours(self.weekly_hours),
+                "skills": [module.skill for module in modules]
+            }
+        if offset == count - 2:
+            query = quote_plus(f"{target_role} interview questions")
+            return {
+                "week": number,
+                "topic": f"{target_role} interview preparation",
+                "goal": "Explain your projects and answer technical questions with confidence",
+                "what_to_learn": "- Common technical questions for the role\n- Telling your project stories (STAR)\n- Mock interviews",
+                "why_learn_this": "Interviews test how clearly you explain what you know, not just what you know.",
+                "resources": [{"title": f"{target_role} interview questions",
+                               "url": f"https://www.youtube.com/results?search_query={query}",
+                               "type": "Video", "platform": "YouTube"}],
+                "how_to_learn": "Practice out loud: two mock interviews and one written answer per topic from this roadmap.",
+                "mini_project": {
+                    "title": "Interview story bank",
+                    "description": "Write five STAR stories from your projects and rehearse them until each takes two minutes.",
+                    "difficulty": "Intermediate"
+                },
+                "estimated_hours": _hours(self.weekly_hours),
+                "skills": []
+            }
+
+        extension = EXTENSIONS[offset % len(EXTENSIONS)]
+        if not modules:
+            return {
+                "week": number,
+                "topic": f"Project sprint: {target_role} portfolio",
+                "goal": f"Strengthen your portfolio for {target_role} roles",
+                "what_to_learn": f"- Picking a project a {target_role} would build\n- Working in small, shippable steps",
+                "why_learn_this": "Projects show employers what you can do beyond the skills on your resume.",
+                "resources": [],
+                "how_to_learn": "Plan the week's scope on day one and ship something every day.",
+                "mini_project": {
+                    "title": "Portfolio project",
+                    "description": f"Take your strongest project and {extension}.",
+                    "difficulty": "Intermediate"
+                },
+                "estimated_hours": _hours(self.weekly_hours),
+                "skills": []
+            }
+
+        module = modules[offset % len(modules)]
+        unit = module.units[-1]
+        return {
+            "week": number,
+            "topic": f"Project sprint: {module.skill}",
+            "goal": f"Deepen {module.skill} by extending a real project",
+            "what_to_learn": "\n".join(f"- {concept}" for concept in unit.concepts),
+            "why_learn_this": module.why,
+            "resources": [
+                {"title": title, "url": url, "type": kind, "platform": platform}
+                for title, url, kind, platform in module.resources[:2]
+            ],
+            "how_to_learn": STUDY_PLANS.get(module.level, STUDY_PLANS["Intermediate"]),
+            "mini_project": {
+                "title": f"{module.project[0]}: next iteration",
+                "description": f"Take the {module.project[0]} project and {extension}.",
+                "difficulty": module.level
+            },
+            "estimated_hours": _hours(self.weekly_hours),
+            "skills": [module.skill]
+        }
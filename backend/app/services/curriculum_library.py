@@ -0,0 +1,775 @@
+"""Curated skill modules for roadmaps composed without the LLM
+
+One CurriculumModule per canonical skill: ordered units (title, hours,
+goal, concepts), why the skill matters, a mini project, resources and the
+skills it builds on. The first `core` units are what a roadmap needs to
+cover; later units are added when the roadmap has room for them.
+
+Resources point at official documentation and long-lived free courses
+only, so composed roadmaps never link to made-up pages.
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+DOCS, COURSE, ARTICLE = "Documentation", "Course", "Article"
+
+
+@dataclass(frozen=True)
+class Unit:
+    title: str
+    hours: float
+    goal: str
+    concepts: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CurriculumModule:
+    skill: str
+    level: str
+    why: str
+    units: Tuple[Unit, ...]
+    project: Tuple[str, str]
+    resources: Tuple[Tuple[str, str, str, str], ...]
+    prerequisites: Tuple[str, ...] = ()
+    related: Tuple[str, ...] = ()
+    aliases: Tuple[str, ...] = ()
+    core: int = 2
+
+
+def _module(skill, level, why, units, project, resources, prerequisites=(), related=(), aliases=(), core=2):
+    return CurriculumModule(
+        skill=skill,
+        level=level,
+        why=why,
+        units=tuple(Unit(title, hours, goal, tuple(concepts)) for title, hours, goal, concepts in units),
+        project=project,
+        resources=tuple(resources),
+        prerequisites=tuple(prerequisites),
+        related=tuple(related),
+        aliases=tuple(aliases),
+        core=core
+    )
+
+
+MODULES = (
+    # Languages
+    _module(
+        "Python", "Beginner",
+        "Python is the default language for backend services, automation, data work and ML tooling.",
+        [
+            ("Python syntax and core data structures", 6, "Write small scripts with lists, dicts, sets and functions",
+             ["Variables, control flow and functions", "Lists, dicts, sets and comprehensions", "Modules and virtual environments"]),
+            ("Idiomatic Python", 6, "Structure code with classes, exceptions and the standard library",
+             ["Classes and dataclasses", "Exceptions and context managers", "Iterators and generators", "pathlib, json and logging"]),
+            ("Typing, packaging and async", 6, "Ship a typed, tested package",
+             ["Type hints and mypy", "pyproject.toml and dependency management", "asyncio basics"]),
+        ],
+        ("Command-line expense tracker", "Build a CLI that records expenses in a JSON file, summarizes them by category and has pytest tests."),
+        [
+            ("The Python Tutorial", "https://docs.python.org/3/tutorial/", DOCS, "Official Docs"),
+            ("Automate the Boring Stuff with Python", "https://automatetheboringstuff.com/", COURSE, "Online Book"),
+        ],
+        related=("Testing", "REST APIs"),
+        aliases=("python3", "python programming", "core python")
+    ),
+    _module(
+        "JavaScript", "Beginner",
+        "JavaScript runs every web frontend and, with Node.js, a large share of backends.",
+        [
+            ("JavaScript fundamentals", 6, "Write programs with functions, objects and arrays",
+             ["let/const, types and equality", "Functions, closures and scope", "Objects, arrays and destructuring"]),
+            ("Asynchronous JavaScript and the DOM", 6, "Fetch data and update a page without blocking",
+             ["Event loop, promises and async/await", "fetch and error handling", "DOM events and manipulation"]),
+            ("Modern tooling", 5, "Organize code into modules and bundle it",
+             ["ES modules", "npm and package.json", "Linting and formatting"]),
+        ],
+        ("Weather dashboard", "Build a page that fetches forecasts from a public API, caches them and handles loading and error states."),
+        [
+            ("JavaScript Guide", "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide", DOCS, "MDN"),
+            ("The Modern JavaScript Tutorial", "https://javascript.info/", COURSE, "javascript.info"),
+        ],
+        related=("TypeScript", "React", "Node.js"),
+        aliases=("js", "es6", "ecmascript", "vanilla javascript")
+    ),
+    _module(
+        "TypeScript", "Intermediate",
+        "TypeScript catches whole classes of bugs before runtime and is the norm for large JavaScript codebases.",
+        [
+            ("Types and interfaces", 5, "Type existing JavaScript code",
+             ["Primitive, union and literal types", "Interfaces and type aliases", "Narrowing and type guards"]),
+            ("Generics and strictness", 5, "Write reusable, strictly typed functions",
+             ["Generics", "Utility types (Partial, Pick, Record)", "strict mode and tsconfig"]),
+            ("Typing real projects", 4, "Type an API client end to end",
+             ["Declaration files", "Typing fetch responses", "Runtime validation with zod"]),
+        ],
+        ("Typed API client", "Write a typed client for a public REST API with validated responses and strict compiler settings."),
+        [("TypeScript Handbook", "https://www.typescriptlang.org/docs/handbook/intro.html", DOCS, "Official Docs")],
+        prerequisites=("JavaScript",),
+        aliases=("ts",)
+    ),
+    _module(
+        "Java", "Beginner",
+        "Java powers a large share of enterprise backends, Android and big data tooling.",
+        [
+            ("Java language basics", 6, "Write and run Java programs with classes and collections",
+             ["Classes, interfaces and records", "Collections and generics", "Exceptions"]),
+            ("Modern Java", 6, "Use streams, lambdas and concurrency utilities",
+             ["Lambdas and streams", "Optional", "ExecutorService and CompletableFuture"]),
+            ("Build tools and testing", 5, "Build, test and package a multi-module project",
+             ["Maven or Gradle builds", "JUnit 5 and Mockito", "Packaging runnable JARs"]),
+        ],
+        ("Library management service", "Build a Spring Boot service for books and loans with a REST API, JPA persistence and unit tests."),
+        [
+            ("Learn Java", "https://dev.java/learn/", DOCS, "Official Docs"),
+            ("Spring Boot Guides", "https://spring.io/guides", DOCS, "Official Docs"),
+        ],
+        related=("Spring Boot",),
+        aliases=("core java", "java 17", "j2ee")
+    ),
+    _module(
+        "Spring Boot", "Intermediate",
+        "Spring Boot is the most common framework for Java backend services.",
+        [
+            ("Spring Boot applications", 6, "Create a service with configuration and dependency injection",
+             ["Auto-configuration and starters", "Beans and dependency injection", "Profiles and configuration"]),
+            ("Data and REST", 6, "Serve and persist resources",
+             ["REST controllers and validation", "Spring Data JPA", "Error handling"]),
+            ("Production readiness", 5, "Make the service observable and secure",
+             ["Actuator and metrics", "Spring Security basics", "Integration tests"]),
+        ],
+        ("Order service", "Build an order API with validation, JPA persistence, Actuator health checks and integration tests."),
+        [("Spring Boot Guides", "https://spring.io/guides", DOCS, "Official Docs")],
+        prerequisites=("Java",),
+        aliases=("spring", "spring framework")
+    ),
+    _module(
+        "Go", "Intermediate",
+        "Go is the language of much cloud infrastructure and of fast, simple network services.",
+        [
+            ("Go basics", 6, "Write Go programs with structs, slices and maps",
+             ["Packages and modules", "Structs, methods and interfaces", "Error handling"]),
+            ("Concurrency in Go", 6, "Run work concurrently and safely",
+             ["Goroutines and channels", "select and context cancellation", "sync primitives"]),
+            ("Services in Go", 5, "Serve HTTP with the standard library",
+             ["net/http handlers", "JSON encoding", "Table-driven tests"]),
+        ],
+        ("Concurrent link checker", "Build a CLI that crawls a site with a worker pool, respects a timeout and reports broken links."),
+        [
+            ("A Tour of Go", "https://go.dev/tour/", COURSE, "Official Docs"),
+            ("Go by Example", "https://gobyexample.com/", ARTICLE, "gobyexample.com"),
+        ],
+        aliases=("golang",)
+    ),
+    _module(
+        "Rust", "Advanced",
+        "Rust gives memory safety without a garbage collector and is spreading into infrastructure and tooling.",
+        [
+            ("Ownership and borrowing", 7, "Write programs the borrow checker accepts",
+             ["Ownership, moves and borrowing", "Structs, enums and pattern matching", "Result and Option"]),
+            ("Traits and generics", 6, "Write reusable abstractions",
+             ["Traits and generics", "Lifetimes", "Iterators and closures"]),
+            ("Async and ecosystem", 6, "Build a small network service",
+             ["Cargo and crates", "async/await with tokio", "Error handling crates"]),
+        ],
+        ("Rust grep clone", "Build a command-line search tool with argument parsing, error handling and tests."),
+        [
+            ("The Rust Programming Language", "https://doc.rust-lang.org/book/", DOCS, "Official Docs"),
+            ("Rust by Example", "https://doc.rust-lang.org/rust-by-example/", DOCS, "Official Docs"),
+        ],
+        aliases=("rustlang",)
+    ),
+    # Data stores
+    _module(
+        "SQL", "Beginner",
+        "Almost every application and analysis reads from a relational database.",
+        [
+            ("Querying data", 5, "Answer questions about a dataset with SQL",
+             ["SELECT, WHERE and ORDER BY", "Joins", "GROUP BY and aggregates"]),
+            ("Modeling and changing data", 5, "Design tables and keep data consistent",
+             ["Normalization and keys", "INSERT, UPDATE and transactions", "Constraints"]),
+            ("Advanced SQL and performance", 6, "Write analytical queries that run fast",
+             ["Window functions and CTEs", "Indexes and EXPLAIN", "Query tuning"]),
+        ],
+        ("Sales analytics database", "Model a small store schema, load sample data and write reports with joins, CTEs and window functions."),
+        [
+            ("SQLBolt interactive lessons", "https://sqlbolt.com/", COURSE, "SQLBolt"),
+            ("PostgreSQL Tutorial", "https://www.postgresql.org/docs/current/tutorial.html", DOCS, "Official Docs"),
+        ],
+        related=("PostgreSQL",),
+        aliases=("mysql", "relational databases", "rdbms", "sql databases")
+    ),
+    _module(
+        "PostgreSQL", "Intermediate",
+        "PostgreSQL is the most widely used open-source database for production services.",
+        [
+            ("PostgreSQL in practice", 5, "Run and operate a PostgreSQL database",
+             ["psql and roles", "Data types and JSONB", "Backups and restores"]),
+            ("Performance", 6, "Find and fix slow queries",
+             ["Index types", "EXPLAIN ANALYZE", "Connection pooling"]),
+        ],
+        ("Query tuning lab", "Load a million-row dataset, profile slow queries and document the indexes that fix them."),
+        [("PostgreSQL Documentation", "https://www.postgresql.org/docs/current/", DOCS, "Official Docs")],
+        prerequisites=("SQL",),
+        aliases=("postgres",)
+    ),
+    _module(
+        "NoSQL", "Intermediate",
+        "Document, key-value and wide-column stores handle data shapes and scale relational databases struggle with.",
+        [
+            ("Document databases", 5, "Model and query data in MongoDB",
+             ["Documents and collections", "CRUD and aggregation pipelines", "Indexes"]),
+            ("Data modeling for NoSQL", 5, "Choose embedding or referencing for an access pattern",
+             ["Embedding vs referencing", "Access-pattern-driven design", "Consistency and transactions"]),
+            ("Other NoSQL families", 4, "Pick the right store for a workload",
+             ["Key-value stores", "Wide-column stores", "CAP trade-offs"]),
+        ],
+        ("Blog backend on MongoDB", "Store posts, comments and tags in MongoDB with indexes for the main queries and an aggregation for tag counts."),
+        [
+            ("MongoDB University", "https://learn.mongodb.com/", COURSE, "MongoDB"),
+            ("Data Modeling", "https://www.mongodb.com/docs/manual/data-modeling/", DOCS, "Official Docs"),
+        ],
+        aliases=("mongodb", "mongo", "nosql databases", "document databases", "dynamodb", "cassandra")
+    ),
+    _module(
+        "Redis", "Intermediate",
+        "Redis is the standard cache, rate limiter and lightweight queue in web backends.",
+        [
+            ("Redis data structures", 4, "Use strings, hashes, lists and sorted sets",
+             ["Core data types", "Expiry and eviction", "Atomic operations"]),
+            ("Caching patterns", 4, "Add a cache to a slow endpoint",
+             ["Cache-aside and write-through", "Invalidation", "Rate limiting with Redis"]),
+        ],
+        ("Cached API", "Put a Redis cache and a per-user rate limiter in front of a slow API and measure the latency change."),
+        [("Redis Documentation", "https://redis.io/docs/latest/", DOCS, "Official Docs")],
+        aliases=("caching", "memcached")
+    ),
+    # Engineering fundamentals
+    _module(
+        "Git", "Beginner",
+        "Every team collaborates through version control and pull requests.",
+        [
+            ("Git fundamentals", 4, "Track changes and recover from mistakes",
+             ["Commits, staging and history", "Branches and merging", "Undoing changes"]),
+            ("Collaborating with Git", 4, "Work through pull requests on a shared repository",
+             ["Remotes and pull requests", "Rebasing and resolving conflicts", "Branching strategies"]),
+        ],
+        ("Open-source contribution", "Fork a project, fix a small issue on a feature branch and open a pull request with a clean history."),
+        [
+            ("Pro Git", "https://git-scm.com/book/en/v2", DOCS, "Official Docs"),
+            ("Learn Git Branching", "https://learngitbranching.js.org/", COURSE, "Interactive"),
+        ],
+        aliases=("github", "gitlab", "version control")
+    ),
+    _module(
+        "Linux", "Beginner",
+        "Servers, containers and CI runners all run Linux; working in a shell is an everyday skill.",
+        [
+            ("Shell essentials", 5, "Navigate and manage a system from the terminal",
+             ["Files, permissions and users", "Pipes and redirection", "grep, find and text tools"]),
+            ("Processes and scripting", 5, "Automate tasks with shell scripts",
+             ["Processes and signals", "Bash scripting", "cron and systemd services"]),
+        ],
+        ("Server bootstrap script", "Write a script that sets up users, firewall rules and a systemd service on a fresh VM."),
+        [
+            ("The Missing Semester of Your CS Education", "https://missing.csail.mit.edu/", COURSE, "MIT"),
+            ("Linux Journey", "https://linuxjourney.com/", COURSE, "Linux Journey"),
+        ],
+        aliases=("bash", "shell scripting", "unix", "command line")
+    ),
+    _module(
+        "Data Structures and Algorithms", "Intermediate",
+        "Algorithmic problem solving is tested in most technical interviews and shapes everyday performance decisions.",
+        [
+            ("Core data structures", 6, "Pick the right structure for a problem",
+             ["Arrays, hash maps and sets", "Stacks, queues and heaps", "Big-O analysis"]),
+            ("Trees and graphs", 6, "Traverse and search trees and graphs",
+             ["Binary trees and BSTs", "BFS and DFS", "Shortest paths"]),
+            ("Problem-solving patterns", 6, "Solve medium interview problems in 30 minutes",
+             ["Two pointers and sliding window", "Binary search", "Dynamic programming"]),
+        ],
+        ("Interview problem set", "Solve 30 problems across the patterns, timing each one and writing down the pattern that cracked it."),
+        [
+            ("NeetCode Roadmap", "https://neetcode.io/roadmap", COURSE, "NeetCode"),
+            ("VisuAlgo", "https://visualgo.net/", ARTICLE, "VisuAlgo"),
+        ],
+        aliases=("dsa", "algorithms", "data structures", "problem solving")
+    ),
+    _module(
+        "Testing", "Intermediate",
+        "Automated tests let teams change code quickly without breaking it.",
+        [
+            ("Unit testing", 4, "Cover a module with fast unit tests",
+             ["Test structure and assertions", "Fixtures", "Mocking at boundaries"]),
+            ("Testing strategy", 4, "Balance unit, integration and end-to-end tests",
+             ["The test pyramid", "Integration tests with real dependencies", "Coverage and flaky tests"]),
+        ],
+        ("Test suite for a legacy module", "Add characterization tests to an untested module, then refactor it with the tests as a safety net."),
+        [
+            ("pytest: Get Started", "https://docs.pytest.org/en/stable/getting-started.html", DOCS, "Official Docs"),
+            ("The Practical Test Pyramid", "https://martinfowler.com/articles/practical-test-pyramid.html", ARTICLE, "martinfowler.com"),
+        ],
+        aliases=("unit testing", "test automation", "tdd", "pytest", "jest", "automated testing")
+    ),
+    # Web and APIs
+    _module(
+        "REST APIs", "Intermediate",
+        "HTTP APIs are how services, frontends and partners talk to each other.",
+        [
+            ("HTTP and REST design", 5, "Design resource-oriented endpoints",
+             ["HTTP methods and status codes", "Resource naming and versioning", "Pagination and filtering"]),
+            ("Building an API", 6, "Implement and document an API",
+             ["Request validation", "OpenAPI documentation", "Error responses"]),
+            ("API security and reliability", 5, "Protect and harden an API",
+             ["Authentication with tokens", "Rate limiting", "Idempotency keys"]),
+        ],
+        ("Task manager API", "Build a documented REST API with validation, pagination, token auth and tests using FastAPI or Express."),
+        [
+            ("HTTP overview", "https://developer.mozilla.org/en-US/docs/Web/HTTP/Overview", DOCS, "MDN"),
+            ("FastAPI Tutorial", "https://fastapi.tiangolo.com/tutorial/", DOCS, "Official Docs"),
+        ],
+        related=("GraphQL", "Microservices"),
+        aliases=("rest", "restful apis", "api design", "apis", "web apis", "fastapi", "flask", "django", "express")
+    ),
+    _module(
+        "GraphQL", "Intermediate",
+        "GraphQL lets clients fetch exactly the data a screen needs in one request.",
+        [
+            ("GraphQL schemas and queries", 4, "Query and mutate data through a schema",
+             ["Types and schema", "Queries, mutations and variables", "Resolvers"]),
+            ("GraphQL in production", 4, "Keep a GraphQL server fast and safe",
+             ["N+1 queries and dataloaders", "Pagination", "Query depth limits"]),
+        ],
+        ("GraphQL gateway", "Put a GraphQL layer over two REST services with dataloaders and cursor pagination."),
+        [("Learn GraphQL", "https://graphql.org/learn/", DOCS, "Official Docs")],
+        prerequisites=("REST APIs",)
+    ),
+    _module(
+        "HTML and CSS", "Beginner",
+        "Every web interface is built on semantic HTML and responsive CSS.",
+        [
+            ("Semantic HTML", 4, "Structure accessible pages",
+             ["Semantic elements", "Forms", "Accessibility basics"]),
+            ("CSS layout", 5, "Build responsive layouts",
+             ["Box model and selectors", "Flexbox and Grid", "Media queries"]),
+        ],
+        ("Responsive portfolio page", "Build an accessible personal page that works from phone to desktop without a CSS framework."),
+        [
+            ("Learn web development", "https://developer.mozilla.org/en-US/docs/Learn", COURSE, "MDN"),
+            ("Learn CSS", "https://web.dev/learn/css", COURSE, "web.dev"),
+        ],
+        aliases=("html", "css", "html5", "css3", "tailwind", "responsive design")
+    ),
+    _module(
+        "React", "Intermediate",
+        "React is the most used library for building interactive web frontends.",
+        [
+            ("Components and state", 6, "Build interactive UIs from components",
+             ["JSX and props", "useState and events", "Lists and conditional rendering"]),
+            ("Effects and data", 6, "Load and manage server data",
+             ["useEffect and data fetching", "Custom hooks", "Forms"]),
+            ("Application architecture", 5, "Structure a multi-page app",
+             ["Routing", "Context and state management", "Performance with memoization"]),
+        ],
+        ("Job board frontend", "Build a React app that lists, filters and bookmarks jobs from an API, with routing and loading states."),
+        [("React: Learn", "https://react.dev/learn", DOCS, "Official Docs")],
+        prerequisites=("JavaScript",),
+        related=("TypeScript",),
+        aliases=("reactjs", "react.js", "next.js", "nextjs", "redux")
+    ),
+    _module(
+        "Node.js", "Intermediate",
+        "Node.js runs JavaScript on the server and powers many APIs and tools.",
+        [
+            ("Node.js runtime", 5, "Write servers and scripts with Node.js",
+             ["Event loop and non-blocking I/O", "Modules and npm", "Streams and the file system"]),
+            ("APIs with Express", 6, "Serve a database-backed API",
+             ["Routing and middleware", "Validation and errors", "Database access"]),
+        ],
+        ("URL shortener", "Build an Express service that shortens URLs, stores them in a database and counts visits."),
+        [("Introduction to Node.js", "https://nodejs.org/en/learn/getting-started/introduction-to-nodejs", DOCS, "Official Docs")],
+        prerequisites=("JavaScript",),
+        aliases=("nodejs", "node", "express.js", "expressjs")
+    ),
+    # Cloud and operations
+    _module(
+        "Docker", "Intermediate",
+        "Containers are how most software is packaged, tested and deployed.",
+        [
+            ("Containers and images", 5, "Containerize an application",
+             ["Images, containers and layers", "Writing a Dockerfile", "Volumes and networking"]),
+            ("Multi-container apps", 5, "Run an app with its dependencies locally",
+             ["Docker Compose", "Environment configuration", "Health checks"]),
+            ("Production images", 4, "Build small, secure images",
+             ["Multi-stage builds", "Image scanning", "Registries and tagging"]),
+        ],
+        ("Containerized web app", "Containerize an API and its database with Compose, multi-stage builds and health checks."),
+        [("Docker Get Started", "https://docs.docker.com/get-started/", DOCS, "Official Docs")],
+        prerequisites=("Linux",),
+        related=("Kubernetes", "CI/CD"),
+        aliases=("containers", "containerization", "docker compose")
+    ),
+    _module(
+        "Kubernetes", "Advanced",
+        "Kubernetes is the standard platform for running containers at scale.",
+        [
+            ("Kubernetes core objects", 6, "Deploy an application to a cluster",
+             ["Pods, Deployments and Services", "ConfigMaps and Secrets", "kubectl workflows"]),
+            ("Operating workloads", 6, "Keep workloads healthy and scalable",
+             ["Probes and resource limits", "Horizontal Pod Autoscaler", "Ingress"]),
+            ("Packaging and delivery", 5, "Release to Kubernetes repeatably",
+             ["Helm charts", "Namespaces and RBAC", "GitOps basics"]),
+        ],
+        ("Deploy a service to Kubernetes", "Deploy an API with a database to a local cluster (kind or minikube) with probes, autoscaling and a Helm chart."),
+        [
+            ("Kubernetes Basics", "https://kubernetes.io/docs/tutorials/kubernetes-basics/", COURSE, "Official Docs"),
+            ("Kubernetes Concepts", "https://kubernetes.io/docs/concepts/", DOCS, "Official Docs"),
+        ],
+        prerequisites=("Docker",),
+        aliases=("k8s", "helm", "container orchestration", "eks", "gke", "aks", "openshift")
+    ),
+    _module(
+        "AWS", "Intermediate",
+        "AWS is the largest cloud provider; most companies run at least part of their stack on it.",
+        [
+            ("AWS foundations", 6, "Deploy a simple app with core AWS services",
+             ["IAM users, roles and policies", "EC2 and VPC basics", "S3"]),
+            ("Managed and serverless services", 6, "Build without managing servers",
+             ["Lambda and API Gateway", "RDS and DynamoDB", "SQS and SNS"]),
+            ("Operating on AWS", 5, "Monitor and control a deployment",
+             ["CloudWatch", "Cost management", "Well-Architected pillars"]),
+        ],
+        ("Serverless image service", "Build an upload API with API Gateway, Lambda and S3 that creates thumbnails, with least-privilege IAM."),
+        [
+            ("AWS Skill Builder", "https://skillbuilder.aws/", COURSE, "AWS"),
+            ("Getting Started with AWS", "https://aws.amazon.com/getting-started/", DOCS, "Official Docs"),
+        ],
+        related=("Terraform",),
+        aliases=("amazon web services", "aws cloud", "ec2", "s3", "lambda")
+    ),
+    _module(
+        "Azure", "Intermediate",
+        "Azure is the cloud of choice for many enterprises already on Microsoft tooling.",
+        [
+            ("Azure fundamentals", 6, "Deploy resources with the portal and CLI",
+             ["Subscriptions and resource groups", "Entra ID and RBAC", "Virtual machines and storage"]),
+            ("Azure application services", 6, "Host an app on managed services",
+             ["App Service and Functions", "Azure SQL and Cosmos DB", "Monitor and Application Insights"]),
+        ],
+        ("Web app on Azure", "Deploy an API to App Service with an Azure SQL database, managed identity and Application Insights."),
+        [("Azure training", "https://learn.microsoft.com/en-us/training/azure/", COURSE, "Microsoft Learn")],
+        aliases=("microsoft azure",)
+    ),
+    _module(
+        "GCP", "Intermediate",
+        "Google Cloud is strong in data, analytics and Kubernetes-based platforms.",
+        [
+            ("Google Cloud fundamentals", 6, "Deploy resources with the console and gcloud",
+             ["Projects and IAM", "Compute Engine and Cloud Storage", "VPC networking"]),
+            ("Managed services on GCP", 6, "Build on serverless and data services",
+             ["Cloud Run and Cloud Functions", "BigQuery", "Pub/Sub"]),
+        ],
+        ("Event pipeline on GCP", "Publish events to Pub/Sub, process them with Cloud Run and query the results in BigQuery."),
+        [("Google Cloud: Get started", "https://cloud.google.com/docs/get-started", DOCS, "Official Docs")],
+        aliases=("google cloud", "google cloud platform", "bigquery")
+    ),
+    _module(
+        "CI/CD", "Intermediate",
+        "Automated build, test and deploy pipelines let teams ship small changes safely and often.",
+        [
+            ("Continuous integration", 4, "Run tests and checks on every change",
+             ["Pipeline stages and triggers", "Caching and artifacts", "Branch protection"]),
+            ("Continuous delivery", 5, "Deploy automatically and roll back safely",
+             ["Environments and secrets", "Blue-green and canary releases", "Rollbacks"]),
+        ],
+        ("Pipeline for a service", "Set up a GitHub Actions workflow that tests, builds a container image and deploys to staging on merge."),
+        [
+            ("GitHub Actions documentation", "https://docs.github.com/en/actions", DOCS, "Official Docs"),
+            ("Continuous Integration", "https://martinfowler.com/articles/continuousIntegration.html", ARTICLE, "martinfowler.com"),
+        ],
+        prerequisites=("Git",),
+        aliases=("ci", "cd", "continuous integration", "continuous delivery", "github actions", "jenkins", "gitlab ci")
+    ),
+    _module(
+        "Terraform", "Intermediate",
+        "Infrastructure as code makes environments reproducible and reviewable.",
+        [
+            ("Terraform basics", 5, "Provision infrastructure from code",
+             ["Providers and resources", "Variables and outputs", "Plan and apply"]),
+            ("Terraform at team scale", 5, "Share and reuse infrastructure code",
+             ["Remote state and locking", "Modules", "Workspaces and environments"]),
+        ],
+        ("Infrastructure module", "Write a Terraform module for a network, database and service, used by staging and production."),
+        [("Terraform tutorials", "https://developer.hashicorp.com/terraform/tutorials", COURSE, "Official Docs")],
+        aliases=("infrastructure as code", "iac", "pulumi", "cloudformation")
+    ),
+    _module(
+        "Observability", "Intermediate",
+        "Metrics, logs and traces are how teams find out why production is slow or broken.",
+        [
+            ("Metrics and logs", 5, "Instrument a service",
+             ["Structured logging", "RED and USE metrics", "Prometheus and dashboards"]),
+            ("Tracing and alerting", 5, "Follow requests across services and alert on symptoms",
+             ["Distributed tracing with OpenTelemetry", "SLOs and error budgets", "Alert design"]),
+        ],
+        ("Observable service", "Add metrics, structured logs and traces to a service, build a dashboard and define an SLO alert."),
+        [
+            ("OpenTelemetry documentation", "https://opentelemetry.io/docs/", DOCS, "Official Docs"),
+            ("Site Reliability Engineering", "https://sre.google/sre-book/table-of-contents/", COURSE, "Google"),
+        ],
+        aliases=("monitoring", "logging", "prometheus", "grafana", "opentelemetry", "sre")
+    ),
+    _module(
+        "Networking", "Intermediate",
+        "Debugging distributed systems requires knowing how packets, DNS and TLS actually work.",
+        [
+            ("Network fundamentals", 5, "Explain what happens when a request is made",
+             ["TCP/IP and ports", "DNS", "HTTP and TLS"]),
+            ("Networks in the cloud", 5, "Design and troubleshoot a service network",
+             ["Subnets, routing and NAT", "Load balancers and proxies", "Troubleshooting with dig, curl and tcpdump"]),
+        ],
+        ("Network troubleshooting lab", "Set up a reverse proxy with TLS in front of two services and document a packet capture of a request."),
+        [("Cloudflare Learning Center", "https://www.cloudflare.com/learning/", ARTICLE, "Cloudflare")],
+        aliases=("computer networking", "tcp/ip", "dns", "network security")
+    ),
+    _module(
+        "Platform Engineering", "Advanced",
+        "Platform teams give developers self-service paths to build, deploy and run software.",
+        [
+            ("Internal developer platforms", 5, "Design a paved road for service teams",
+             ["Golden paths and templates", "Service catalogs", "Developer experience metrics"]),
+            ("Building the platform", 6, "Automate service creation end to end",
+             ["Scaffolding templates", "Self-service infrastructure", "Policy as code"]),
+        ],
+        ("Service template", "Build a template that creates a repository, CI pipeline and deployment for a new service in one step."),
+        [("Backstage documentation", "https://backstage.io/docs/overview/what-is-backstage", DOCS, "Official Docs")],
+        prerequisites=("Kubernetes", "CI/CD"),
+        aliases=("internal developer platform", "developer platform")
+    ),
+    # Architecture
+    _module(
+        "System Design", "Advanced",
+        "Designing systems that scale and fail gracefully is expected of mid-level and senior engineers.",
+        [
+            ("Scalability building blocks", 6, "Reason about load, latency and capacity",
+             ["Load balancing and horizontal scaling", "Caching layers", "Database replication and sharding"]),
+            ("Distributed system trade-offs", 6, "Choose consistency and availability trade-offs",
+             ["CAP and consistency models", "Message queues and async processing", "Idempotency and retries"]),
+            ("Design interviews", 6, "Present a design end to end in 45 minutes",
+             ["Requirements and estimates", "High-level design and bottlenecks", "Case studies: URL shortener, feed, chat"]),
+        ],
+        ("Design document", "Write a design document for a URL shortener or news feed with capacity estimates, data model and failure modes."),
+        [
+            ("The System Design Primer", "https://github.com/donnemartin/system-design-primer", COURSE, "GitHub"),
+            ("Designing Data-Intensive Applications", "https://dataintensive.net/", ARTICLE, "Book"),
+        ],
+        related=("Microservices",),
+        aliases=("distributed systems", "scalability", "software architecture", "high level design", "system architecture")
+    ),
+    _module(
+        "Microservices", "Advanced",
+        "Service-oriented architectures let teams deploy independently, at the cost of distributed complexity.",
+        [
+            ("Service boundaries", 5, "Split a domain into services",
+             ["Domain-driven design basics", "Service boundaries and data ownership", "Synchronous vs asynchronous communication"]),
+            ("Operating microservices", 5, "Keep a set of services reliable",
+             ["API gateways", "Sagas and eventual consistency", "Resilience: timeouts, retries, circuit breakers"]),
+        ],
+        ("Event-driven order system", "Split an order flow into services that communicate through events, with a saga for payment failures."),
+        [
+            ("Microservices patterns", "https://microservices.io/patterns/", ARTICLE, "microservices.io"),
+            ("Microservices", "https://martinfowler.com/articles/microservices.html", ARTICLE, "martinfowler.com"),
+        ],
+        prerequisites=("REST APIs",),
+        aliases=("microservice architecture", "event-driven architecture", "service oriented architecture")
+    ),
+    _module(
+        "Security", "Intermediate",
+        "Every engineer is expected to avoid the common vulnerabilities and handle secrets properly.",
+        [
+            ("Web application security", 5, "Find and fix the OWASP Top 10",
+             ["Injection and XSS", "Authentication and session flaws", "Access control"]),
+            ("Secure engineering practices", 5, "Build security into the delivery process",
+             ["Secrets management", "Dependency scanning", "Threat modeling"]),
+        ],
+        ("Security review", "Audit a small web app against the OWASP Top 10, fix what you find and add automated scanning to CI."),
+        [
+            ("OWASP Top 10", "https://owasp.org/www-project-top-ten/", DOCS, "OWASP"),
+            ("Web Security Academy", "https://portswigger.net/web-security", COURSE, "PortSwigger"),
+        ],
+        aliases=("cybersecurity", "application security", "appsec", "owasp", "web security", "oauth")
+    ),
+    # Data and ML
+    _module(
+        "Pandas", "Beginner",
+        "Pandas is the everyday tool for cleaning, transforming and exploring tabular data in Python.",
+        [
+            ("DataFrames", 5, "Load, inspect and clean a dataset",
+             ["Series and DataFrames", "Selecting and filtering", "Missing values and types"]),
+            ("Transformations", 5, "Reshape and summarize data",
+             ["groupby and aggregation", "merge and join", "Time series basics"]),
+        ],
+        ("Exploratory analysis", "Clean a messy public dataset and answer five questions with groupby, merges and time series."),
+        [("pandas: Getting started", "https://pandas.pydata.org/docs/getting_started/index.html", DOCS, "Official Docs")],
+        prerequisites=("Python",),
+        aliases=("pandas", "numpy", "data analysis", "data wrangling")
+    ),
+    _module(
+        "Statistics", "Intermediate",
+        "Statistics is how analysts and data scientists tell signal from noise.",
+        [
+            ("Descriptive statistics and probability", 5, "Summarize data and reason about uncertainty",
+             ["Distributions", "Mean, variance and percentiles", "Probability rules"]),
+            ("Inference and experiments", 6, "Run and read an A/B test",
+             ["Sampling and confidence intervals", "Hypothesis tests", "A/B testing pitfalls"]),
+        ],
+        ("A/B test analysis", "Analyze a public A/B test dataset, report effect size with confidence intervals and discuss pitfalls."),
+        [("Statistics and probability", "https://www.khanacademy.org/math/statistics-probability", COURSE, "Khan Academy")],
+        aliases=("probability", "statistical analysis", "a/b testing", "hypothesis testing")
+    ),
+    _module(
+        "Data Visualization", "Beginner",
+        "Clear charts and dashboards are how data work reaches decision makers.",
+        [
+            ("Charts that communicate", 4, "Choose the right chart for a question",
+             ["Chart types and when to use them", "Color and annotation", "Common misleading charts"]),
+            ("Dashboards", 5, "Build a dashboard for a business question",
+             ["Matplotlib and seaborn", "BI tools: Power BI or Tableau", "KPI design"]),
+        ],
+        ("KPI dashboard", "Build a dashboard for a sample business with five KPIs, filters and a written summary of insights."),
+        [
+            ("seaborn tutorial", "https://seaborn.pydata.org/tutorial.html", DOCS, "Official Docs"),
+            ("Power BI training", "https://learn.microsoft.com/en-us/training/powerplatform/power-bi", COURSE, "Microsoft Learn"),
+        ],
+        aliases=("tableau", "power bi", "powerbi", "matplotlib", "dashboards", "data storytelling")
+    ),
+    _module(
+        "Machine Learning", "Intermediate",
+        "Machine learning turns data into predictions and is behind most product personalization.",
+        [
+            ("Supervised learning", 6, "Train and evaluate a model",
+             ["Regression and classification", "Train/validation/test splits", "Metrics: accuracy, precision, recall, RMSE"]),
+            ("Model improvement", 6, "Improve a model systematically",
+             ["Feature engineering", "Cross-validation and tuning", "Tree ensembles"]),
+            ("Beyond the basics", 5, "Handle real-world ML problems",
+             ["Unsupervised learning", "Imbalanced data", "Interpretability"]),
+        ],
+        ("Churn prediction", "Build and evaluate a churn model with scikit-learn, compare three algorithms and explain the top features."),
+        [
+            ("Machine Learning Crash Course", "https://developers.google.com/machine-learning/crash-course", COURSE, "Google"),
+            ("scikit-learn tutorials", "https://scikit-learn.org/stable/tutorial/index.html", DOCS, "Official Docs"),
+        ],
+        prerequisites=("Python", "Statistics"),
+        related=("Deep Learning", "MLOps"),
+        aliases=("ml", "scikit-learn", "sklearn", "predictive modeling")
+    ),
+    _module(
+        "Deep Learning", "Advanced",
+        "Neural networks power vision, speech and language systems.",
+        [
+            ("Neural network fundamentals", 6, "Train a neural network from scratch",
+             ["Tensors and autograd", "Layers, activations and loss", "Training loops and optimizers"]),
+            ("Architectures", 6, "Apply CNNs and transformers",
+             ["Convolutional networks", "Transfer learning", "Transformers and attention"]),
+            ("Training at scale", 5, "Train efficiently and reliably",
+             ["GPUs and mixed precision", "Regularization", "Experiment tracking"]),
+        ],
+        ("Image classifier", "Fine-tune a pretrained model on a custom image dataset in PyTorch and report per-class results."),
+        [
+            ("PyTorch tutorials", "https://pytorch.org/tutorials/", DOCS, "Official Docs"),
+            ("Practical Deep Learning for Coders", "https://course.fast.ai/", COURSE, "fast.ai"),
+        ],
+        prerequisites=("Machine Learning",),
+        aliases=("neural networks", "pytorch", "tensorflow", "keras", "computer vision", "nlp")
+    ),
+    _module(
+        "MLOps", "Advanced",
+        "Models only create value when they are deployed, monitored and retrained reliably.",
+        [
+            ("Model lifecycle", 5, "Track and reproduce experiments",
+             ["Experiment tracking", "Model registry", "Data and model versioning"]),
+            ("Serving and monitoring", 6, "Deploy a model and watch it in production",
+             ["Model serving APIs", "Batch vs online inference", "Drift monitoring"]),
+        ],
+        ("Model deployment pipeline", "Train, register and serve a model behind an API with MLflow and add a drift report."),
+        [
+            ("Made With ML", "https://madewithml.com/", COURSE, "Made With ML"),
+            ("MLflow documentation", "https://mlflow.org/docs/latest/index.html", DOCS, "Official Docs"),
+        ],
+        prerequisites=("Machine Learning", "Docker"),
+        aliases=("ml ops", "ml engineering", "model deployment", "mlflow", "kubeflow")
+    ),
+    _module(
+        "GenAI", "Intermediate",
+        "LLM-based features are now expected in many products, and teams need engineers who can build them reliably.",
+        [
+            ("Working with LLMs", 5, "Call an LLM API and control its output",
+             ["Prompting techniques", "Structured output and validation", "Tokens, cost and latency"]),
+            ("Retrieval-augmented generation", 6, "Answer questions over your own documents",
+             ["Embeddings and vector search", "Chunking and retrieval", "Evaluation of answers"]),
+            ("LLM applications in production", 5, "Make an LLM feature reliable",
+             ["Tool calling and agents", "Guardrails", "Caching and fallbacks"]),
+        ],
+        ("Document Q&A assistant", "Build a RAG service over a set of PDFs with citations, an evaluation set and cost tracking."),
+        [
+            ("Hugging Face LLM Course", "https://huggingface.co/learn/llm-course", COURSE, "Hugging Face"),
+            ("Prompt Engineering Guide", "https://www.promptingguide.ai/", ARTICLE, "promptingguide.ai"),
+        ],
+        prerequisites=("Python",),
+        aliases=("generative ai", "llm", "llms", "large language models", "prompt engineering", "rag", "langchain")
+    ),
+    _module(
+        "Apache Spark", "Advanced",
+        "Spark is the standard engine for processing data that does not fit on one machine.",
+        [
+            ("Spark fundamentals", 6, "Process a large dataset with DataFrames",
+             ["Driver, executors and partitions", "DataFrame API and Spark SQL", "Lazy evaluation"]),
+            ("Spark performance", 5, "Make jobs fast and cheap",
+             ["Shuffles and joins", "Partitioning and skew", "Caching"]),
+        ],
+        ("Batch ETL job", "Write a PySpark job that cleans a large public dataset, joins it with a dimension table and writes partitioned Parquet."),
+        [("Spark Quick Start", "https://spark.apache.org/docs/latest/quick-start.html", DOCS, "Official Docs")],
+        prerequisites=("SQL", "Python"),
+        aliases=("spark", "pyspark", "databricks", "hadoop", "big data")
+    ),
+    _module(
+        "Airflow", "Intermediate",
+        "Data teams schedule and monitor their pipelines with workflow orchestrators.",
+        [
+            ("Orchestrating pipelines", 5, "Schedule a pipeline as a DAG",
+             ["DAGs, tasks and operators", "Scheduling and backfills", "Dependencies and retries"]),
+            ("Reliable pipelines", 4, "Make pipelines idempotent and observable",
+             ["Idempotent tasks", "Data quality checks", "Alerting on failures"]),
+        ],
+        ("Daily ELT pipeline", "Orchestrate an extract-load-transform pipeline with retries, backfills and data quality checks."),
+        [("Airflow tutorial", "https://airflow.apache.org/docs/apache-airflow/stable/tutorial/index.html", DOCS, "Official Docs")],
+        prerequisites=("Python", "SQL"),
+        aliases=("apache airflow", "etl", "elt", "data pipelines", "dbt", "workflow orchestration")
+    ),
+    _module(
+        "Kafka", "Advanced",
+        "Event streaming decouples services and powers real-time data pipelines.",
+        [
+            ("Kafka fundamentals", 5, "Produce and consume events",
+             ["Topics, partitions and offsets", "Producers and consumer groups", "Delivery guarantees"]),
+            ("Stream processing", 5, "Process events in real time",
+             ["Stream processing concepts", "Schema management", "Exactly-once processing"]),
+        ],
+        ("Real-time analytics", "Stream click events through Kafka, aggregate them per minute and expose the results through an API."),
+        [("Confluent Developer courses", "https://developer.confluent.io/courses/", COURSE, "Confluent")],
+        aliases=("apache kafka", "event streaming", "stream processing", "rabbitmq", "message queues")
+    ),
+    # Ways of working
+    _module(
+        "Agile", "Beginner",
+        "Most teams plan and deliver in short iterations; knowing the rituals makes you effective from week one.",
+        [
+            ("Agile delivery", 3, "Take part in sprint planning and retrospectives",
+             ["Scrum roles and events", "User stories and estimation", "Kanban flow"]),
+            ("Working in a product team", 3, "Turn requirements into shippable increments",
+             ["Breaking down work", "Definition of done", "Stakeholder communication"]),
+        ],
+        ("Sprint simulation", "Plan a two-week sprint for a small feature: write stories, estimate, track progress and run a retrospective."),
+        [("The Scrum Guide", "https://scrumguides.org/scrum-guide.html", DOCS, "Scrum.org")],
+        aliases=("scrum", "kanban", "agile methodologies", "jira")
+    ),
+)
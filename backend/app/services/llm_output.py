@@ -0,0 +1,234 @@
+"""Schemas and tolerant parsing for LLM JSON outputs
+
+A completion that is truncated (token limit, dropped connection), wrapped
+in a code fence or followed by chatter is still mostly usable. Instead of
+discarding it, repair_json() keeps the longest prefix that forms valid
+JSON, and validate_output() / validate_items() keep the fields and list
+items that match the schema. AIService then asks the model again for only
+what is missing (e.g. weeks 9-12 of a roadmap).
+
+Every schema field is optional so that one bad field never rejects the
+whole object; REQUIRED lists the fields worth a follow-up request.
+"""
+import json
+from typing import Annotated, Any, ClassVar, Dict, List, Optional, Tuple, Type, Union
+from pydantic import BaseModel, BeforeValidator, ConfigDict, ValidationError
+
+_DECODER = json.JSONDecoder()
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def _string_items(value: Any) -> Any:
+    """Keep the usable entries of a list of strings ("Python", 3 -> "3")"""
+    if not isinstance(value, list):
+        return value
+    return [str(item).strip() for item in value if isinstance(item, (str, int, float)) and str(item).strip()]
+
+
+StrList = Annotated[List[str], BeforeValidator(_string_items)]
+# Keeps integers as integers ("7" -> 7, 7.5 -> 7.5)
+Number = Union[int, float]
+
+
+class LLMOutput(BaseModel):
+    """Base for model outputs: extra keys pass through untouched"""
+    model_config = ConfigDict(extra="allow")
+
+    REQUIRED: ClassVar[Tuple[str, ...]] = ()
+
+
+class ResumeOutput(LLMOutput):
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("name", "skills")
+
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: Optional[StrList] = None
+    education: Optional[List[Dict]] = None
+    experience: Optional[List[Dict]] = None
+    years_of_experience: Optional[Number] = None
+
+
+class RoleRequirementsOutput(LLMOutput):
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("required_skills", "trending_skills")
+
+    required_skills: Optional[StrList] = None
+    trending_skills: Optional[StrList] = None
+    trending_skills_comparison: Optional[Dict[str, Dict]] = None
+
+
+class SkillGapOutput(RoleRequirementsOutput):
+    # missing/matching skills and match_percentage can be derived locally
+    missing_skills: Optional[StrList] = None
+    matching_skills: Optional[StrList] = None
+    match_percentage: Optional[Number] = None
+
+
+class RoadmapWeekOutput(LLMOutput):
+    # A week cut off before its mini project is requested again
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("week", "topic", "what_to_learn", "mini_project")
+
+    week: Optional[int] = None
+    topic: Optional[str] = None
+    goal: Optional[str] = None
+    what_to_learn: Optional[Union[str, List[str]]] = None
+    why_learn_this: Optional[str] = None
+    resources: Optional[List[Dict]] = None
+    how_to_learn: Optional[str] = None
+    mini_project: Optional[Dict] = None
+    estimated_hours: Optional[Number] = None
+
+
+class RoadmapWeekTextOutput(LLMOutput):
+    """Rewritten text of a composed week (structure stays the composer's)"""
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("week", "topic", "goal")
+
+    week: Optional[int] = None
+    topic: Optional[str] = None
+    goal: Optional[str] = None
+    what_to_learn: Optional[Union[str, List[str]]] = None
+    why_learn_this: Optional[str] = None
+    how_to_learn: Optional[str] = None
+
+
+class InterviewQuestionOutput(LLMOutput):
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("question",)
+
+    question: Optional[str] = None
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    sample_answer_hints: Optional[str] = None
+
+
+class AnswerEvaluationOutput(LLMOutput):
+    REQUIRED: ClassVar[Tuple[str, ...]] = ("score", "feedback")
+
+    score: Optional[Number] = None
+    feedback: Optional[str] = None
+    strengths: Optional[StrList] = None
+    improvements: Optional[StrList] = None
+
+
+def _close_truncated(text: str) -> Any:
+    """Parse the longest prefix of truncated JSON that can be closed
+
+    Cut points are the ends of complete values: before a separating comma,
+    after a closing bracket, or right after an opening bracket (yielding an
+    empty container). The latest cut point that parses wins, so a partly
+    written trailing item is dropped rather than guessed.
+    """
+    stack, cuts = [], []
+    in_string = escaped = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(_CLOSERS[char])
+            cuts.append((index + 1, "".join(reversed(stack))))
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                # The outermost value is complete
+                return json.loads(text[:index + 1])
+            cuts.append((index + 1, "".join(reversed(stack))))
+        elif char == "," and stack:
+            cuts.append((index, "".join(reversed(stack))))
+
+    for end, closers in reversed(cuts):
+        try:
+            return json.loads(text[:end] + closers)
+        except ValueError:
+            continue
+    raise ValueError("No recoverable JSON in model output")
+
+
+def repair_json(text: str) -> Tuple[Any, int, bool]:
+    """Parse model output that may be fenced, chatty or truncated
+
+    Args:
+        text: Raw completion content
+
+    Returns:
+        (parsed value, number of characters of text that were not used,
+        whether the value was cut short and had to be closed)
+
+    Raises:
+        ValueError: Nothing parseable was found
+    """
+    text = (text or "").strip()
+    try:
+        return json.loads(text), 0, False
+    except ValueError:
+        pass
+
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        raise ValueError("No JSON object in model output")
+    start = min(starts)
+    try:
+        # Complete value followed (or preceded) by other text
+        value, end = _DECODER.raw_decode(text, start)
+        return value, len(text) - (end - start), False
+    except ValueError:
+        pass
+
+    body = text[start:]
+    if body.rstrip().endswith("```"):
+        body = body.rstrip()[:-3]
+    value = _close_truncated(body)
+    used = len(json.dumps(value))
+    return value, max(0, len(text) - used), True
+
+
+def validate_output(model: Type[LLMOutput], value: Any) -> Tuple[Dict, List[str], int]:
+    """Validate a JSON object, dropping fields that do not fit the schema
+
+    Returns:
+        (fields the model provided, REQUIRED fields still missing,
+        number of invalid fields dropped)
+    """
+    if not isinstance(value, dict):
+        return {}, list(model.REQUIRED), 0
+    data, dropped = dict(value), 0
+    while True:
+        try:
+            result = model.model_validate(data)
+            break
+        except ValidationError as e:
+            invalid = {error["loc"][0] for error in e.errors() if error["loc"]}
+            invalid &= set(data)
+            if not invalid:
+                return {}, list(model.REQUIRED), len(data)
+            for field in invalid:
+                del data[field]
+            dropped += len(invalid)
+
+    provided = result.model_dump(exclude_unset=True)
+    missing = [field for field in model.REQUIRED if provided.get(field) in (None, "", [])]
+    return provided, missing, dropped
+
+
+def validate_items(model: Type[LLMOutput], items: Any) -> Tuple[List[Dict], int]:
+    """Keep the list items that validate and have every REQUIRED field
+
+    Returns:
+        (valid items in order, number of items dropped)
+    """
+    if not isinstance(items, list):
+        return [], 0
+    valid = []
+    for item in items:
+        provided, missing, _ = validate_output(model, item)
+        if not missing:
+            valid.append(provided)
+    return valid, len(items) - len(valid)
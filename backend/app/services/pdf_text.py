@@ -0,0 +1,255 @@
+"""PDF text extraction with page and character budgets
+
+Two engines:
+    layout  pdfplumber: groups characters into words and lines
+    text    pypdfium2 (installed with pdfplumber): PDFium's text layer,
+            no layout analysis, roughly an order of magnitude faster
+
+PDF_TEXT_ENGINE=auto uses the text engine when pypdfium2 is importable.
+
+Only the first PDF_MAX_PAGES pages are read, and reading stops as soon as
+PDF_MAX_CHARS characters have been collected, so a 60-page portfolio costs
+about as much as a resume. With PDF_EXTRACT_WORKERS > 1, documents of at
+least PDF_PARALLEL_MIN_PAGES pages are split into page ranges extracted in
+a process pool; ranges past the character budget are cancelled.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGES_PER_TASK = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# PDFium is not thread-safe: calls from request threads (asyncio.to_thread)
+# are serialized; pool workers are separate processes
+_pdfium_lock = threading.Lock()
+
+
+def pdfium_available() -> bool:
+    try:
+        import pypdfium2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def page_count(file_path: str, engine: str) -> int:
+    if engine == "text":
+        import pypdfium2 as pdfium
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+
+    import pdfplumber
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def iter_page_texts(file_path: str, start: int, stop: int, engine: str):
+    """Yield the text of pages [start, stop) ("" for pages without text)"""
+    if engine == "text":
+        import pypdfium2 as pdfium
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            count = len(pdf)
+        try:
+            for index in range(start, min(stop, count)):
+                # Released between pages, while the caller consumes the text
+                with _pdfium_lock:
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range().replace("\r\n", "\n")
+                    textpage.close()
+                    page.close()
+                yield text
+        finally:
+            with _pdfium_lock:
+                pdf.close()
+        return
+
+    import pdfplumber
+    with pdfplumber.open(file_path, pages=list(range(start + 1, stop + 1))) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+
+
+def _pdfium_rows(file_path: str, page_index: int) -> List[Dict]:
+    import ctypes
+    import pypdfium2 as pdfium
+    import pypdfium2.raw as pdfium_c
+
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            if page_index >= len(pdf):
+                return []
+            page = pdf[page_index]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            font_name = ctypes.create_string_buffer(128)
+            flags = ctypes.c_int()
+
+            rows, chars, sizes, bold = [], [], [], True
+            for index, char in enumerate(text + "\n"):
+                if char in "\r\n":
+                    line = "".join(chars).strip()
+                    if line:
+                        rows.append({"text": " ".join(line.split()), "size": max(sizes), "bold": bold})
+                    chars, sizes, bold = [], [], True
+                    continue
+                chars.append(char)
+                if char.isspace():
+                    continue
+                sizes.append(pdfium_c.FPDFText_GetFontSize(textpage, index))
+                if bold and pdfium_c.FPDFText_GetFontWeight(textpage, index) < 600:
+                    pdfium_c.FPDFText_GetFontInfo(textpage, index, font_name, len(font_name), ctypes.byref(flags))
+                    bold = b"bold" in font_name.value.lower()
+            textpage.close()
+            page.close()
+            return rows
+        finally:
+            pdf.close()
+
+
+def _pdfplumber_rows(file_path: str, page_index: int) -> List[Dict]:
+    import pdfplumber
+
+    with pdfplumber.open(file_path, pages=[page_index + 1]) as pdf:
+        if not pdf.pages:
+            return []
+        words = pdf.pages[0].extract_words(extra_attrs=["size", "fontname"])
+    lines = {}
+    for word in words:
+        lines.setdefault(round(word["top"]), []).append(word)
+    rows = []
+    for top in sorted(lines):
+        row = sorted(lines[top], key=lambda w: w["x0"])
+        rows.append({
+            "text": " ".join(w["text"] for w in row),
+            "size": max(w["size"] for w in row),
+            "bold": all("bold" in w["fontname"].lower() for w in row)
+        })
+    return rows
+
+
+def layout_rows(file_path: str, engine: str, page_index: int = 0) -> List[Dict]:
+    """Text lines of one page with their largest font size and boldness
+
+    Returns:
+        [{"text", "size", "bold"}] from top to bottom
+    """
+    if engine == "text":
+        return _pdfium_rows(file_path, page_index)
+    return _pdfplumber_rows(file_path, page_index)
+
+
+def extract_page_range(file_path: str, start: int, stop: int, engine: str) -> List[str]:
+    """Text of pages [start, stop); runs in pool workers"""
+    return list(iter_page_texts(file_path, start, stop, engine))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the server process has threads (event loop, to_thread)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the extraction worker processes (called on app shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+class PdfTextExtractor:
+    """Budgeted, optionally page-parallel PDF text extraction"""
+
+    def __init__(self, engine: str = None, max_pages: int = None, max_chars: int = None,
+                 workers: int = None, parallel_min_pages: int = None):
+        engine = (engine or os.getenv("PDF_TEXT_ENGINE", "auto")).lower()
+        if engine == "auto":
+            engine = "text" if pdfium_available() else "layout"
+        if engine not in ("text", "layout"):
+            raise ValueError(f"Unknown PDF_TEXT_ENGINE: {engine}")
+        self.engine = engine
+        self.max_pages = max_pages if max_pages is not None else int(os.getenv("PDF_MAX_PAGES", 10))
+        self.max_chars = max_chars if max_chars is not None else int(os.getenv("PDF_MAX_CHARS", 40000))
+        self.workers = workers if workers is not None else int(os.getenv("PDF_EXTRACT_WORKERS", 0))
+        self.parallel_min_pages = parallel_min_pages if parallel_min_pages is not None else \
+            int(os.getenv("PDF_PARALLEL_MIN_PAGES", 6))
+
+    def _page_texts(self, file_path: str, pages: int):
+        """Yield page texts in order, extracting ranges in parallel if enabled"""
+        starts = list(range(0, pages, PAGES_PER_TASK))
+        if self.workers <= 1 or pages < self.parallel_min_pages:
+            # Lazily, one page at a time, so the char budget stops the reading
+            yield from iter_page_texts(file_path, 0, pages, self.engine)
+            return
+
+        futures = []
+        try:
+            pool = _get_pool(self.workers)
+            futures = [
+                pool.submit(extract_page_range, file_path, start, start + PAGES_PER_TASK, self.engine)
+                for start in starts
+            ]
+            for start, future in zip(starts, futures):
+                try:
+                    texts = future.result()
+                except BrokenProcessPool:
+                    # A worker died; replace the pool and finish in this process
+                    logger.warning("PDF extraction pool broke, extracting in process")
+                    shutdown_pool()
+                    yield from iter_page_texts(file_path, start, pages, self.engine)
+                    return
+                yield from texts
+        finally:
+            # Early exit (or an error): drop ranges that have not started
+            for future in futures:
+                future.cancel()
+
+    def extract(self, file_path: str) -> Tuple[List[str], Optional[str]]:
+        """Extract page texts within the budgets
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            (text per page, truncation) - pages without text are skipped;
+            truncation is "pages", "chars" or None
+        """
+        total_pages = page_count(file_path, self.engine)
+        pages = min(total_pages, self.max_pages) if self.max_pages > 0 else total_pages
+        truncated = "pages" if pages < total_pages else None
+
+        texts, chars = [], 0
+        page_texts = self._page_texts(file_path, pages)
+        try:
+            for text in page_texts:
+                if not text:
+                    continue
+                if self.max_chars > 0 and chars + len(text) > self.max_chars:
+                    if chars < self.max_chars:
+                        texts.append(text[:self.max_chars - chars])
+                    truncated = "chars"
+                    break
+                texts.append(text)
+                chars += len(text)
+        finally:
+            page_texts.close()
+        return texts, truncated
@@ -0,0 +1,279 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.services.resume_preprocessor import PreparedResume
+
+# Fields of the parse_resume schema
+RESUME_FIELDS = ["name", "email", "phone", "skills", "education", "experience", "years_of_experience"]
+
+# Sections worth sending to the LLM when it has to fill a field
+FIELD_SECTIONS = {
+    "name": ["header"],
+    "email": ["header"],
+    "phone": ["header"],
+    "skills": ["skills", "summary", "experience", "projects"],
+    "education": ["education", "certifications"],
+    "experience": ["experience"],
+    "years_of_experience": ["summary", "experience"],
+}
+
+# Canonical skill -> aliases (compared lowercase)
+SKILL_DICTIONARY = {
+    "Python": ["python", "python3"], "Java": ["java"], "JavaScript": ["javascript", "js", "es6"],
+    "TypeScript": ["typescript", "ts"], "Go": ["go", "golang"], "Rust": ["rust"], "C": ["c"],
+    "C++": ["c++", "cpp"], "C#": ["c#", "csharp"], "Ruby": ["ruby"], "PHP": ["php"], "Kotlin": ["kotlin"],
+    "Swift": ["swift"], "Scala": ["scala"], "R": ["r"], "SQL": ["sql"], "Bash": ["bash", "shell scripting"],
+    "HTML": ["html", "html5"], "CSS": ["css", "css3"], "React": ["react", "react.js", "reactjs"],
+    "Next.js": ["next.js", "nextjs"], "Vue.js": ["vue", "vue.js", "vuejs"], "Angular": ["angular", "angularjs"],
+    "Node.js": ["node", "node.js", "nodejs"], "Express": ["express", "express.js"],
+    "Django": ["django"], "Flask": ["flask"], "FastAPI": ["fastapi"], "Spring Boot": ["spring", "spring boot"],
+    ".NET": [".net", "dotnet", "asp.net"], "Ruby on Rails": ["rails", "ruby on rails"],
+    "GraphQL": ["graphql"], "REST APIs": ["rest", "rest api", "rest apis", "restful apis"],
+    "gRPC": ["grpc"], "Microservices": ["microservices"], "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"], "MongoDB": ["mongodb", "mongo"], "Redis": ["redis"], "SQLite": ["sqlite"],
+    "Elasticsearch": ["elasticsearch", "elastic search"], "Cassandra": ["cassandra"],
+    "DynamoDB": ["dynamodb"], "Kafka": ["kafka", "apache kafka"], "RabbitMQ": ["rabbitmq"],
+    "Spark": ["spark", "apache spark", "pyspark"], "Hadoop": ["hadoop"], "Airflow": ["airflow", "apache airflow"],
+    "dbt": ["dbt"], "Snowflake": ["snowflake"], "BigQuery": ["bigquery"], "Pandas": ["pandas"],
+    "NumPy": ["numpy"], "scikit-learn": ["scikit-learn", "sklearn"], "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"], "Keras": ["keras"], "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"], "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"], "LLMs": ["llm", "llms", "large language models"],
+    "Data Analysis": ["data analysis", "data analytics"], "Statistics": ["statistics"],
+    "Tableau": ["tableau"], "Power BI": ["power bi", "powerbi"], "Excel": ["excel", "ms excel"],
+    "AWS": ["aws", "amazon web services"], "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"], "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"], "Terraform": ["terraform"], "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"], "GitHub Actions": ["github actions"], "CI/CD": ["ci/cd", "cicd", "ci cd"],
+    "Linux": ["linux", "unix"], "Git": ["git", "github", "gitlab"], "Nginx": ["nginx"],
+    "Prometheus": ["prometheus"], "Grafana": ["grafana"], "System Design": ["system design"],
+    "Agile": ["agile", "scrum", "kanban"], "Jira": ["jira"], "Figma": ["figma"],
+    "Unit Testing": ["unit testing", "pytest", "jest", "junit"], "Selenium": ["selenium"],
+    "Communication": ["communication"], "Leadership": ["leadership", "team leadership"],
+    "Problem Solving": ["problem solving", "problem-solving"], "Teamwork": ["teamwork", "collaboration"],
+    "Project Management": ["project management"],
+}
+_SKILL_ALIASES = {alias: skill for skill, aliases in SKILL_DICTIONARY.items() for alias in aliases}
+# Aliases scanned for in free text; one- and two-letter ones are too ambiguous there
+_SCAN_PATTERN = re.compile(
+    r"(?<![\w+#.])(" + "|".join(
+        re.escape(alias) for alias in sorted(_SKILL_ALIASES, key=len, reverse=True) if len(alias) > 2
+    ) + r")(?![\w+#])",
+    re.IGNORECASE
+)
+
+_YEAR = r"(?:19|20)\d{2}"
+_MONTH = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?"
+DATE_RANGE = re.compile(
+    rf"(?P<start>{_MONTH}{_YEAR})\s*(?:-|–|—|to)\s*(?P<end>{_MONTH}{_YEAR}|present|current|now|today)",
+    re.IGNORECASE
+)
+DEGREE = re.compile(
+    r"\b(B\.?\s?Sc|B\.?\s?S|B\.?\s?A|B\.?\s?Tech|B\.?\s?E|B\.?\s?Eng|Bachelor(?:'s)?|M\.?\s?Sc|M\.?\s?S|M\.?\s?A|"
+    r"M\.?\s?Tech|M\.?\s?Eng|Master(?:'s)?|MBA|Ph\.?\s?D|Doctorate|Associate(?:'s)? Degree|Diploma|High School)\b",
+    re.IGNORECASE
+)
+_INSTITUTION = re.compile(r"\b(university|college|institute|school|academy|polytechnic)\b", re.IGNORECASE)
+_YEARS_STATED = re.compile(r"(\d{1,2})\+?\s+years", re.IGNORECASE)
+_SEPARATORS = re.compile(r"\s+(?:-|–|—|\||@|at)\s+|,\s+")
+_BULLET = re.compile(r"^[\-•*·▪◦>]+\s*")
+_NOT_A_NAME = {"resume", "curriculum", "vitae", "cv", "profile", "contact"}
+
+
+class ExtractionResult:
+    """Field values found locally, each with a confidence in [0, 1]"""
+
+    def __init__(self):
+        self.values: Dict = {}
+        self.confidence: Dict[str, float] = {}
+
+    def set(self, field: str, value, confidence: float):
+        self.values[field] = value
+        self.confidence[field] = round(confidence, 2)
+
+    def confident(self, threshold: float) -> Dict:
+        """Fields at or above the threshold"""
+        return {
+            field: value for field, value in self.values.items()
+            if self.confidence.get(field, 0) >= threshold
+        }
+
+
+def _year(text: str) -> Optional[int]:
+    if text.lower() in ("present", "current", "now", "today"):
+        return datetime.now().year
+    match = re.search(_YEAR, text)
+    return int(match.group(0)) if match else None
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical spelling of a skill if it is in the dictionary"""
+    return _SKILL_ALIASES.get(skill.strip().lower(), skill.strip())
+
+
+class RuleBasedResumeExtractor:
+    """Fills the parse_resume schema without an LLM where the resume allows
+
+    Works on the sections found by ResumePreprocessor plus optional layout
+    hints from pdfplumber (font sizes and bold lines of the first page).
+    Every field gets a confidence; callers send only the fields below
+    their threshold to the model.
+    """
+
+    def extract(self, prepared: PreparedResume, layout: Dict = None) -> ExtractionResult:
+        result = ExtractionResult()
+        sections = prepared.sections
+        layout = layout or {}
+
+        for field in ("email", "phone"):
+            if prepared.contacts.get(field):
+                result.set(field, prepared.contacts[field], 0.95)
+
+        self._name(result, sections.get("header", ""), layout)
+        self._skills(result, sections)
+        self._education(result, sections)
+        self._experience(result, sections)
+        return result
+
+    @staticmethod
+    def _looks_like_name(line: str) -> bool:
+        words = line.split()
+        return (
+            2 <= len(words) <= 4
+            and all(re.fullmatch(r"[A-Z][A-Za-z'.\-]*", word) for word in words)
+            and not _NOT_A_NAME & {word.lower().strip(".") for word in words}
+        )
+
+    def _name(self, result: ExtractionResult, header: str, layout: Dict):
+        # Largest text on the first page is almost always the name
+        title = layout.get("title_line")
+        if title and self._looks_like_name(title):
+            result.set("name", title, 0.9)
+            return
+        for line in header.splitlines()[:3]:
+            # "Jane Doe | Senior Engineer" -> "Jane Doe"
+            candidate = _SEPARATORS.split(line)[0].strip()
+            if self._looks_like_name(candidate):
+                result.set("name", candidate, 0.75)
+                return
+
+    def _skills(self, result: ExtractionResult, sections: Dict[str, str]):
+        skills: List[str] = []
+        seen = set()
+
+        def add(skill: str):
+            skill = normalize_skill(skill)
+            if skill and skill.lower() not in seen and len(skill) <= 40:
+                seen.add(skill.lower())
+                skills.append(skill)
+
+        listed = 0
+        for line in sections.get("skills", "").splitlines():
+            # "Languages: Python, Go" -> "Python, Go"
+            if ":" in line:
+                line = line.split(":", 1)[1]
+            for item in re.split(r"[,|;•·/]|\s{2,}", _BULLET.sub("", line)):
+                if item.strip():
+                    add(item)
+                    listed += 1
+
+        # Dictionary matches in the rest of the resume
+        for section in ("summary", "experience", "projects"):
+            for match in _SCAN_PATTERN.finditer(sections.get(section, "")):
+                add(match.group(1))
+
+        if listed >= 3:
+            result.set("skills", skills, 0.9)
+        elif skills:
+            # No usable skills section: dictionary matches only, soft skills missed
+            result.set("skills", skills, 0.5)
+
+    def _education(self, result: ExtractionResult, sections: Dict[str, str]):
+        text = sections.get("education")
+        if text is None:
+            return
+        entries = []
+        complete = True
+        lines = text.splitlines()
+        for index, line in enumerate(lines):
+            degree_match = DEGREE.search(line)
+            if not degree_match:
+                continue
+            parts = [part.strip(" ()") for part in _SEPARATORS.split(line) if part.strip(" ()")]
+            degree = next((part for part in parts if DEGREE.search(part)), line)
+            institution = next((part for part in parts if _INSTITUTION.search(part)), None)
+            if institution is None and index + 1 < len(lines) and _INSTITUTION.search(lines[index + 1]):
+                institution = lines[index + 1]
+            year = re.findall(_YEAR, line)
+            entries.append({
+                "degree": re.sub(rf",?\s*{_YEAR}$", "", degree).strip(),
+                "institution": institution or "",
+                "year": year[-1] if year else ""
+            })
+            complete = complete and bool(institution and year)
+        if entries:
+            result.set("education", entries, 0.8 if complete else 0.5)
+
+    def _experience(self, result: ExtractionResult, sections: Dict[str, str]):
+        text = sections.get("experience")
+        if text is None:
+            if not DATE_RANGE.search("\n".join(sections.values())):
+                # Nothing that looks like a job anywhere: likely no experience
+                result.set("experience", [], 0.7)
+                years = _YEARS_STATED.search(sections.get("summary", ""))
+                result.set("years_of_experience", int(years.group(1)) if years else 0, 0.7)
+            return
+
+        entries: List[Dict] = []
+        intervals: List[Tuple[int, int]] = []
+        complete = True
+        previous = ""
+        for line in text.splitlines():
+            dates = DATE_RANGE.search(line)
+            if not dates:
+                if entries:
+                    description = entries[-1]["description"]
+                    addition = _BULLET.sub("", line)
+                    if len(description) < 300:
+                        entries[-1]["description"] = f"{description} {addition}".strip()
+                previous = line
+                continue
+
+            heading = (line[:dates.start()] + line[dates.end():]).strip(" ()|,-–—")
+            if not heading and previous:
+                heading = previous
+                if entries and entries[-1]["description"].endswith(previous):
+                    entries[-1]["description"] = entries[-1]["description"][:-len(previous)].strip()
+            parts = [part.strip(" ()") for part in _SEPARATORS.split(heading) if part.strip(" ()")]
+            title = parts[0] if parts else ""
+            company = parts[1] if len(parts) > 1 else ""
+            complete = complete and bool(title and company)
+            entries.append({
+                "title": title,
+                "company": company,
+                "duration": f"{dates.group('start')} - {dates.group('end')}",
+                "description": ""
+            })
+            start, end = _year(dates.group("start")), _year(dates.group("end"))
+            if start and end and end >= start:
+                intervals.append((start, end))
+            previous = ""
+
+        if not entries:
+            return
+        result.set("experience", entries, 0.8 if complete else 0.5)
+
+        # Union of employment periods, so overlapping jobs count once
+        total, current_end = 0, None
+        for start, end in sorted(intervals):
+            if current_end is None or start > current_end:
+                total += end - start
+                current_end = end
+            elif end > current_end:
+                total += end - current_end
+                current_end = end
+        stated = _YEARS_STATED.search(sections.get("summary", ""))
+        if stated:
+            result.set("years_of_experience", int(stated.group(1)), 0.8)
+        elif intervals:
+            result.set("years_of_experience", total, 0.75 if complete else 0.5)
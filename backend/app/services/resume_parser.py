@@ -1,49 +1,171 @@
-import pdfplumber
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import statistics
 from app.services.ai_service import AIService
+from app.services.pdf_text import PdfTextExtractor, layout_rows
+from app.services.resume_extractor import FIELD_SECTIONS, RESUME_FIELDS, RuleBasedResumeExtractor
+from app.services.resume_preprocessor import PreparedResume, ResumePreprocessor
+from app.utils.metrics import PDF_EXTRACTION_SECONDS, PDF_EXTRACTION_TRUNCATED, RESUME_PARSE_PATH
+from app.utils.tracing import span
 
 class ResumeParser:
     """Handles PDF resume uploads and parsing"""
-    
-    def __init__(self):
-        self.ai_service = AIService()
-    
-    def extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file
-        
+
+    def __init__(self, ai_service: AIService = None, preprocessor: ResumePreprocessor = None,
+                 pdf_extractor: PdfTextExtractor = None):
+        # Share the app's AIService (and its connection pool) when given
+        self.ai_service = ai_service or AIService()
+        self.pdf_extractor = pdf_extractor or PdfTextExtractor()
+        self.preprocess_enabled = os.getenv("RESUME_PREPROCESSING", "true").lower() in ("1", "true", "yes")
+        self.preprocessor = preprocessor or ResumePreprocessor()
+        # Rule-based extraction first; the LLM only fills low-confidence fields
+        self.fast_path_enabled = self.preprocess_enabled and \
+            os.getenv("RESUME_FAST_PATH", "true").lower() in ("1", "true", "yes")
+        self.fast_path_threshold = float(os.getenv("RESUME_FAST_PATH_THRESHOLD", 0.7))
+        self.extractor = RuleBasedResumeExtractor()
+
+    def extract_pdf(self, file_path: str, with_layout: bool = False) -> Tuple[List[str], Dict]:
+        """Extract text from each page of a PDF file
+
+        Pages and characters are capped by the PdfTextExtractor budgets
+        (PDF_MAX_PAGES, PDF_MAX_CHARS).
+
         Args:
             file_path: Path to the PDF file
-            
+            with_layout: Also collect font hints from the first page
+
         Returns:
-            Extracted text as string
+            (text per page, layout hints) - pages without text are skipped
         """
-        text = ""
+        layout = {}
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            with span("pdf.extract_text"), PDF_EXTRACTION_SECONDS.time():
+                pages, truncated = self.pdf_extractor.extract(file_path)
+                if with_layout:
+                    # Hints are optional; a font quirk must not fail the parse
+                    try:
+                        layout = self.extract_layout_hints(layout_rows(file_path, self.pdf_extractor.engine))
+                    except Exception as layout_error:
+                        print(f"Layout hints unavailable: {layout_error}")
         except Exception as e:
             print(f"Error reading PDF: {e}")
             raise
-        
-        return text
-    
+
+        if truncated:
+            PDF_EXTRACTION_TRUNCATED.inc(truncated)
+        return pages, layout
+
+    @staticmethod
+    def extract_layout_hints(rows: List[Dict]) -> Dict:
+        """Font-based hints from the first page's lines (see pdf_text.layout_rows)
+
+        Returns:
+            title_line: the line set in the largest font near the top
+            heading_lines: short lines that are bold or larger than body text
+        """
+        if not rows:
+            return {}
+
+        body_size = statistics.median(row["size"] for row in rows)
+        top_rows = rows[:5]
+        largest = max(top_rows, key=lambda row: row["size"])
+        return {
+            "title_line": largest["text"] if largest["size"] > body_size * 1.2 else None,
+            "heading_lines": [
+                row["text"] for row in rows[1:]
+                if len(row["text"].split()) <= 5 and (row["bold"] or row["size"] > body_size * 1.1)
+            ]
+        }
+
+    def extract_pages_from_pdf(self, file_path: str) -> List[str]:
+        """Extract text from each page of a PDF file
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            Extracted text per page (pages without text are skipped)
+        """
+        return self.extract_pdf(file_path)[0]
+
+    def extract_text_from_pdf(self, file_path: str) -> str:
+        """Extract text from PDF file
+
+        Args:
+            file_path: Path to the PDF file
+
+        Returns:
+            Extracted text as string
+        """
+        return "".join(page + "\n" for page in self.extract_pages_from_pdf(file_path))
+
+    def prepare_text(self, pages: List[str], layout: Dict = None) -> PreparedResume:
+        """Compact page text for the LLM (see ResumePreprocessor)
+
+        With RESUME_PREPROCESSING=false the raw text is passed through.
+        """
+        if not self.preprocess_enabled:
+            text = "".join(page + "\n" for page in pages)
+            return PreparedResume(text, {}, {}, len(text))
+        with span("resume.preprocess"):
+            return self.preprocessor.process(pages, layout)
+
+    def prepare_pdf(self, file_path: str) -> PreparedResume:
+        """Extract and preprocess a PDF (blocking; run in a thread from async code)"""
+        pages, layout = self.extract_pdf(file_path, with_layout=self.fast_path_enabled)
+        prepared = self.prepare_text(pages, layout)
+        if not prepared.text or len(prepared.text) < 50:
+            raise ValueError("Could not extract meaningful text from PDF")
+        return prepared
+
+    def plan_parse(self, prepared: PreparedResume) -> Tuple[Dict, Optional[str]]:
+        """Run the local extraction and decide what the LLM still needs
+
+        Returns:
+            (known fields, text to send to the LLM or None if nothing is missing)
+        """
+        if not self.fast_path_enabled:
+            RESUME_PARSE_PATH.inc("llm")
+            return prepared.contacts, prepared.text
+
+        with span("resume.rule_extract"):
+            extraction = self.extractor.extract(prepared, prepared.layout)
+        known = {**prepared.contacts, **extraction.confident(self.fast_path_threshold)}
+        missing = [field for field in RESUME_FIELDS if field not in known]
+        if not missing:
+            RESUME_PARSE_PATH.inc("local")
+            return {field: known[field] for field in RESUME_FIELDS}, None
+
+        RESUME_PARSE_PATH.inc("partial" if len(missing) < len(RESUME_FIELDS) else "llm")
+        sections = sorted({section for field in missing for section in FIELD_SECTIONS[field]})
+        return known, prepared.text_for(sections)
+
+    async def parse_prepared(self, prepared: PreparedResume) -> Dict:
+        """Structured extraction: local rules first, the AI for the rest
+
+        Fields the rule-based extractor fills with enough confidence are
+        kept; only the remaining fields (and the sections they come from)
+        are sent to the model. If every field is confident, no LLM call is
+        made.
+        """
+        known, text = self.plan_parse(prepared)
+        if text is None:
+            return known
+        return await self.ai_service.parse_resume(text, known_fields=known)
+
     async def parse_resume(self, file_path: str) -> Dict:
         """Complete resume parsing pipeline
-        
+
         1. Extract text from PDF
-        2. Send to AI for structured extraction
-        3. Return parsed data
+        2. Preprocess it to cut prompt tokens
+        3. Send to AI for structured extraction
+        4. Return parsed data
         """
-        # Step 1: Extract text
-        resume_text = self.extract_text_from_pdf(file_path)
-        
-        if not resume_text or len(resume_text) < 50:
-            raise ValueError("Could not extract meaningful text from PDF")
-        
-        # Step 2: Parse with AI
-        parsed_data = await self.ai_service.parse_resume(resume_text)
-        
+        # Steps 1-2: Extract and preprocess text (CPU-bound, off the event loop)
+        prepared = await asyncio.to_thread(self.prepare_pdf, file_path)
+
+        # Step 3: Parse with AI
+        parsed_data = await self.parse_prepared(prepared)
+
         return parsed_data
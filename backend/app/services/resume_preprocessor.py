@@ -0,0 +1,239 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Rough token estimate used for budgets: ~4 characters per token for
+# English text with the tokenizers of the hosted models
+CHARS_PER_TOKEN = 4
+
+# Canonical section -> heading spellings (compared lowercase, without a
+# trailing colon)
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "about me", "objective", "career objective"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "skills & tools", "skills and tools",
+               "technologies", "tech stack", "core competencies", "competencies", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "education": ["education", "academic background", "education & training", "qualifications",
+                  "academic qualifications"],
+    "projects": ["projects", "personal projects", "key projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "courses", "training"],
+    "other": ["awards", "achievements", "publications", "languages", "interests", "volunteering",
+              "volunteer experience", "activities", "references"],
+}
+_HEADING_LOOKUP = {spelling: section for section, spellings in SECTION_HEADINGS.items() for spelling in spellings}
+
+# Default token budget per section; "header" is the text above the first
+# heading (name, contact details, title)
+DEFAULT_SECTION_BUDGETS = {
+    "header": 120,
+    "summary": 200,
+    "skills": 300,
+    "experience": 1200,
+    "education": 250,
+    "projects": 400,
+    "certifications": 150,
+    "other": 200,
+}
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<![\w+])(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,3}(?!\w)")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d+(?:\s*(?:/|of)\s*\d+)?$", re.IGNORECASE)
+_SPACES = re.compile(r"[ \t ]+")
+_DIGITS = re.compile(r"\d+")
+
+
+class PreparedResume:
+    """Resume text after preprocessing"""
+
+    def __init__(self, text: str, sections: Dict[str, str], contacts: Dict[str, str], raw_chars: int):
+        self.text = text
+        self.sections = sections
+        self.contacts = contacts
+        self.raw_chars = raw_chars
+        # Font hints from the PDF (see ResumeParser.extract_layout_hints)
+        self.layout: Dict = {}
+
+    def text_for(self, sections: List[str]) -> str:
+        """Text of the given sections only (all text if none were detected)"""
+        parts = [
+            self.sections[name] if name == "header" else f"## {name.upper()}\n{self.sections[name]}"
+            for name in self.sections
+            if name in sections
+        ]
+        return "\n\n".join(parts) if parts else self.text
+
+    @property
+    def estimated_tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    @property
+    def raw_estimated_tokens(self) -> int:
+        return self.raw_chars // CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+# Keywords for headings that the PDF layout marks as headings (bold or
+# larger font) but that are not spelled like any entry above
+_HEADING_KEYWORDS = [
+    ("skill", "skills"), ("technolog", "skills"), ("proficienc", "skills"),
+    ("experience", "experience"), ("employment", "experience"), ("career", "experience"),
+    ("education", "education"), ("academic", "education"), ("degree", "education"),
+    ("project", "projects"), ("certif", "certifications"), ("summary", "summary"), ("profile", "summary"),
+]
+
+
+def section_for_heading(line: str, layout_headings: set = None) -> Optional[str]:
+    """Canonical section name if the line is a section heading
+
+    Args:
+        line: Text line
+        layout_headings: Lines styled as headings in the PDF (lowercase)
+    """
+    key = line.strip().rstrip(":").strip().lower()
+    if not key or len(key.split()) > 4:
+        return None
+    if key in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[key]
+    if layout_headings and key in layout_headings:
+        return next((section for word, section in _HEADING_KEYWORDS if word in key), "other")
+    return None
+
+
+def extract_contacts(text: str) -> Dict[str, str]:
+    """Find the first email address and phone number in the text"""
+    contacts = {}
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        contacts["email"] = email.group(0)
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Skip years and date ranges such as "2019 - 2024"
+        if 7 <= len(digits) <= 15 and not re.fullmatch(r"(19|20)\d{2}[\s.-]+(19|20)\d{2}", candidate):
+            contacts["phone"] = candidate
+            break
+    return contacts
+
+
+class ResumePreprocessor:
+    """Shrinks raw PDF text before it is sent to the LLM
+
+    - collapses whitespace and drops blank and repeated lines
+    - drops page furniture: lines repeated at the top or bottom of several
+      pages (headers, footers) and bare page numbers
+    - splits the text into sections by heading and caps each section at a
+      token budget
+    - optionally extracts email and phone with regular expressions
+    """
+
+    def __init__(self, section_budgets: Dict[str, int] = None, extract_contact_fields: bool = None):
+        self.section_budgets = {**DEFAULT_SECTION_BUDGETS, **(section_budgets or {})}
+        if extract_contact_fields is None:
+            extract_contact_fields = os.getenv("RESUME_REGEX_CONTACTS", "true").lower() in ("1", "true", "yes")
+        self.extract_contact_fields = extract_contact_fields
+
+    @staticmethod
+    def _clean_lines(page: str) -> List[str]:
+        lines = []
+        for line in page.splitlines():
+            line = _SPACES.sub(" ", line).strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    @staticmethod
+    def _furniture(pages: List[List[str]], edge: int = 3) -> set:
+        """Lines that repeat at the top or bottom of more than one page"""
+        if len(pages) < 2:
+            return set()
+        counts = Counter()
+        for lines in pages:
+            edges = {_DIGITS.sub("#", line.lower()) for line in lines[:edge] + lines[-edge:]}
+            counts.update(edges)
+        return {line for line, count in counts.items() if count >= 2}
+
+    def _split_sections(self, lines: List[str], layout_headings: set = None) -> Dict[str, List[str]]:
+        sections: Dict[str, List[str]] = {"header": []}
+        current = "header"
+        for line in lines:
+            section = section_for_heading(line, layout_headings)
+            if section:
+                current = section
+                sections.setdefault(current, [])
+                # Several headings share "other"; keep their names
+                if section == "other":
+                    sections[current].append(line)
+                continue
+            sections[current].append(line)
+        return sections
+
+    def _cap(self, section: str, lines: List[str]) -> List[str]:
+        budget = self.section_budgets.get(section, self.section_budgets["other"]) * CHARS_PER_TOKEN
+        kept, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > budget:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        return kept
+
+    def process(self, pages: List[str], layout: Dict = None) -> PreparedResume:
+        """Preprocess the text of each PDF page
+
+        Args:
+            pages: Extracted text per page
+            layout: Optional font hints (see ResumeParser.extract_layout_hints)
+
+        Returns:
+            PreparedResume with the compact text, sections and contacts
+        """
+        raw_chars = sum(len(page) for page in pages)
+        page_lines = [self._clean_lines(page) for page in pages]
+        furniture = self._furniture(page_lines)
+
+        lines, seen_furniture = [], set()
+        for page in page_lines:
+            for line in page:
+                if _PAGE_NUMBER.match(line):
+                    continue
+                key = _DIGITS.sub("#", line.lower())
+                if key in furniture:
+                    # Keep the first copy: headers often carry name and contact
+                    if key in seen_furniture:
+                        continue
+                    seen_furniture.add(key)
+                if lines and lines[-1] == line:
+                    continue
+                lines.append(line)
+
+        layout = layout or {}
+        layout_headings = {_SPACES.sub(" ", line).strip().rstrip(":").strip().lower() for line in layout.get("heading_lines", [])}
+        split = self._split_sections(lines, layout_headings)
+        contacts = {}
+        if self.extract_contact_fields:
+            # Contact details are almost always in the header
+            contacts = {**extract_contacts("\n".join(lines)), **extract_contacts("\n".join(split["header"]))}
+            for value in contacts.values():
+                split = {
+                    section: [line.replace(value, "").strip(" |,;-") if value in line else line for line in section_lines]
+                    for section, section_lines in split.items()
+                }
+                split = {section: [line for line in section_lines if line] for section, section_lines in split.items()}
+
+        sections = {}
+        parts = []
+        for section, section_lines in split.items():
+            kept = self._cap(section, section_lines)
+            if not kept:
+                continue
+            sections[section] = "\n".join(kept)
+            parts.append(sections[section] if section == "header" else f"## {section.upper()}\n{sections[section]}")
+
+        prepared = PreparedResume("\n\n".join(parts), sections, contacts, raw_chars)
+        prepared.layout = layout
+        return prepared
@@ -0,0 +1,167 @@
+"""Results keyed by canonical role, shared by every user
+
+Skill requirements and interview questions depend on the role, not on the
+user, so they are cached in the SharedState under the role's canonical
+key (see RoleResolver): "Back-end Developer" reuses what "Backend
+Engineer" produced. The model is asked about the canonical role rather
+than the first caller's spelling, so "Backend Dev" does not decide what
+every backend engineer needs. Content from AIService fallbacks, including
+generic values filled in for fields the model never provided, is never
+cached, and only roles the model answered for are learned by the resolver.
+
+    ROLE_CACHE_TTL          seconds a role's requirements and question
+                            pool are kept (0 disables the cache)
+    INTERVIEW_POOL_SIZE     questions generated per role and difficulty
+                            before sessions are drawn from the pool
+"""
+import logging
+import os
+import random
+from typing import Dict, List, Optional
+from app.services.ai_service import AIService
+from app.services.llm_output import RoleRequirementsOutput
+from app.services.role_resolver import RoleResolver
+from app.utils.metrics import LLM_FALLBACKS, ROLE_CACHE
+from app.utils.shared_state import SharedState
+
+logger = logging.getLogger(__name__)
+
+_REQUIREMENT_KEYS = ("required_skills", "trending_skills", "trending_skills_comparison")
+
+
+class RoleCache:
+    """Role requirements and interview question pools per canonical role"""
+
+    def __init__(self, ai_service: AIService, resolver: RoleResolver, state: SharedState,
+                 ttl: float = None, pool_size: int = None):
+        self.ai_service = ai_service
+        self.resolver = resolver
+        self.state = state
+        self.ttl = ttl if ttl is not None else float(os.getenv("ROLE_CACHE_TTL", 86400))
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("INTERVIEW_POOL_SIZE", 25))
+
+    def _key(self, kind: str, target_role: str, *parts: str) -> str:
+        return ":".join(["role", kind, self.resolver.canonical_key(target_role), *parts])
+
+    def _role_name(self, target_role: str) -> str:
+        """Canonical display name the model is asked about"""
+        return self.resolver.resolve(target_role).name
+
+    def _fill_missing(self, method: str, result: Dict, target_role: str) -> List[str]:
+        """Fill required role fields the model never provided with generic content
+
+        Returns:
+            The filled fields; if any, the result must not be cached
+        """
+        missing = [key for key in RoleRequirementsOutput.REQUIRED if not result.get(key)]
+        if missing:
+            LLM_FALLBACKS.inc(method)
+            generic = self.ai_service._get_fallback_skill_analysis([], target_role)
+            result.update({key: generic[key] for key in missing})
+        return missing
+
+    async def cached_requirements(self, target_role: str) -> Optional[Dict]:
+        """Requirements cached for the role, or None"""
+        if self.ttl <= 0:
+            return None
+        requirements = await self.state.get(self._key("requirements", target_role))
+        ROLE_CACHE.inc("requirements", "miss" if requirements is None else "hit")
+        return requirements
+
+    async def remember_requirements(self, target_role: str, analysis: Dict):
+        """Cache the role-dependent part of a skill analysis or requirements"""
+        if self.ttl <= 0 or not analysis.get("required_skills"):
+            return
+        requirements = {key: analysis[key] for key in _REQUIREMENT_KEYS if key in analysis}
+        await self.state.set(self._key("requirements", target_role), requirements, ttl=self.ttl)
+
+    async def requirements(self, target_role: str) -> Dict:
+        """Role requirements, from the cache or the model"""
+        cached = await self.cached_requirements(target_role)
+        if cached is not None:
+            return cached
+        try:
+            requirements = await self.ai_service.get_role_requirements(self._role_name(target_role), fallback=False)
+        except Exception as e:
+            LLM_FALLBACKS.inc("get_role_requirements")
+            logger.warning(f"Role requirements for {target_role} failed: {e}")
+            fallback = self.ai_service._get_fallback_skill_analysis([], target_role)
+            return {key: fallback[key] for key in _REQUIREMENT_KEYS}
+        if not self._fill_missing("get_role_requirements", requirements, target_role):
+            self.resolver.learn_role(target_role)
+            await self.remember_requirements(target_role, requirements)
+        return requirements
+
+    async def analyze(self, current_skills: List[str], target_role: str, fallback: bool = True) -> Dict:
+        """Skill gap analysis; matched locally when the role is cached
+
+        The first user asking for a role gets a full model analysis, whose
+        requirements are cached; later users of any equivalent spelling get
+        their skills matched against them without an LLM call.
+
+        Args:
+            fallback: Return generic content if the model fails or leaves
+                out required fields; with False the error is raised instead
+        """
+        cached = await self.cached_requirements(target_role)
+        if cached is not None:
+            return self.ai_service.match_skills(current_skills, cached)
+        try:
+            analysis = await self.ai_service.analyze_skill_gap(current_skills, self._role_name(target_role), fallback=False)
+        except Exception as e:
+            if not fallback:
+                raise
+            LLM_FALLBACKS.inc("analyze_skill_gap")
+            logger.warning(f"Skill analysis for {target_role} failed: {e}")
+            return self.ai_service._get_fallback_skill_analysis(current_skills, target_role)
+        missing = [key for key in RoleRequirementsOutput.REQUIRED if not analysis.get(key)]
+        if missing and not fallback:
+            raise ValueError(f"Skill analysis for {target_role} is missing {', '.join(missing)}")
+        filled = self._fill_missing("analyze_skill_gap", analysis, target_role)
+        if "required_skills" in filled:
+            # The gap was derived from no requirements at all
+            return self.ai_service.match_skills(current_skills, analysis)
+        if filled:
+            return analysis
+        self.resolver.learn_role(target_role)
+        await self.remember_requirements(target_role, analysis)
+        return analysis
+
+    async def interview_questions(self, target_role: str, difficulty: str, count: int) -> List[Dict]:
+        """Interview questions, drawn from the role's pool once it is full
+
+        Until the pool holds INTERVIEW_POOL_SIZE questions (or count, if
+        larger) each session generates new ones and adds them to it.
+        """
+        if self.ttl <= 0:
+            return await self.ai_service.generate_interview_questions(target_role, difficulty, count)
+        key = self._key("questions", target_role, difficulty.lower())
+        pool = await self.state.get(key) or []
+        if len(pool) >= max(count, self.pool_size):
+            ROLE_CACHE.inc("questions", "hit")
+            return random.sample(pool, count)
+
+        ROLE_CACHE.inc("questions", "miss")
+        try:
+            questions = await self.ai_service.generate_interview_questions(
+                self._role_name(target_role), difficulty, count, fallback=False
+            )
+        except Exception as e:
+            logger.warning(f"Interview questions for {target_role} failed: {e}")
+            questions = []
+        if questions:
+            self.resolver.learn_role(target_role)
+        seen = {question["question"].strip().lower() for question in pool}
+        added = [q for q in questions if q["question"].strip().lower() not in seen]
+        if added:
+            await self.state.set(key, pool + added, ttl=self.ttl)
+
+        if len(questions) < count:
+            # Top up from the pool, then from generic questions
+            asked = {question["question"] for question in questions}
+            extra = [question for question in pool if question["question"] not in asked]
+            questions += random.sample(extra, min(len(extra), count - len(questions)))
+        if len(questions) < count:
+            LLM_FALLBACKS.inc("generate_interview_questions")
+            questions += self.ai_service._get_fallback_questions(target_role, difficulty, count - len(questions))
+        return questions
@@ -0,0 +1,389 @@
+"""Maps free-text target roles to canonical roles
+
+"Backend Engineer", "Back-end Developer" and "Sr. Python Backend Dev" are
+the same role for everything keyed by role (cached requirements, question
+pools, request coalescing). Roles are compared with TF-IDF over word
+tokens and character trigrams; a lookup scores the query against every
+catalog entry at once with NumPy using a feature -> entries index, so it
+stays well under a millisecond with thousands of roles.
+
+A match needs a score of at least ROLE_MATCH_THRESHOLD and the same
+specific words (anything but generic titles like "Engineer"), allowing for
+typos: "Java Developer" is not "Java Backend Developer" and "Network
+Security Engineer" is not "Network Engineer", however similar they score.
+
+The catalog starts from SEED_ROLES plus the roles saved in MongoDB. A role
+that matches nothing is only learned (and saved, so other workers and
+restarts know it too) once the model has produced a real answer for it,
+so typos and one-off text are not kept.
+"""
+import asyncio
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.metrics import ROLE_RESOLUTIONS
+
+logger = logging.getLogger(__name__)
+
+SEED_ROLES: Dict[str, List[str]] = {
+    "Software Engineer": ["Software Developer", "SWE", "SDE", "Programmer", "Software Engineer Generalist"],
+    "Backend Engineer": ["Backend Developer", "Server Side Engineer", "API Developer", "Python Backend Developer",
+                         "Java Backend Developer", "Node.js Backend Developer", "Go Backend Engineer"],
+    "Frontend Engineer": ["Frontend Developer", "UI Developer", "React Developer", "Angular Developer",
+                          "Vue Developer", "JavaScript Developer", "Web Developer"],
+    "Full Stack Engineer": ["Full Stack Developer", "MERN Stack Developer", "MEAN Stack Developer",
+                            "Full Stack Web Developer"],
+    "Mobile Engineer": ["Mobile Developer", "Mobile App Developer"],
+    "iOS Engineer": ["iOS Developer", "Swift Developer"],
+    "Android Engineer": ["Android Developer", "Kotlin Developer"],
+    "DevOps Engineer": ["DevOps", "Build and Release Engineer", "CI/CD Engineer"],
+    "Site Reliability Engineer": ["SRE", "Reliability Engineer", "Production Engineer"],
+    "Platform Engineer": ["Infrastructure Engineer", "Platform Developer"],
+    "Cloud Engineer": ["Cloud Developer", "AWS Engineer", "Azure Engineer", "GCP Engineer"],
+    "Cloud Architect": ["Solutions Architect", "AWS Solutions Architect", "Cloud Solutions Architect"],
+    "Data Engineer": ["Big Data Engineer", "ETL Developer", "Data Pipeline Engineer", "Spark Developer"],
+    "Data Scientist": ["Data Science", "Applied Scientist", "Research Data Scientist"],
+    "Data Analyst": ["Business Intelligence Analyst", "BI Analyst", "Analytics Analyst", "SQL Analyst"],
+    "Analytics Engineer": ["dbt Developer", "Analytics Developer"],
+    "Machine Learning Engineer": ["ML Engineer", "MLE", "AI Engineer", "Deep Learning Engineer"],
+    "MLOps Engineer": ["ML Platform Engineer", "Machine Learning Operations Engineer"],
+    "Generative AI Engineer": ["GenAI Engineer", "LLM Engineer", "Prompt Engineer", "AI Application Developer"],
+    "Computer Vision Engineer": ["CV Engineer", "Image Processing Engineer"],
+    "NLP Engineer": ["Natural Language Processing Engineer", "NLP Scientist"],
+    "Research Scientist": ["AI Research Scientist", "ML Researcher"],
+    "Database Administrator": ["DBA", "Database Engineer", "Database Developer"],
+    "Security Engineer": ["Cybersecurity Engineer", "Information Security Engineer", "AppSec Engineer",
+                          "Application Security Engineer"],
+    "Security Analyst": ["Cybersecurity Analyst", "SOC Analyst", "Information Security Analyst"],
+    "Penetration Tester": ["Ethical Hacker", "Pentester", "Offensive Security Engineer"],
+    "Network Engineer": ["Network Administrator", "Network Architect"],
+    "Systems Administrator": ["Sysadmin", "System Administrator", "Linux Administrator"],
+    "Embedded Software Engineer": ["Embedded Developer", "Firmware Engineer", "Embedded Systems Engineer"],
+    "Game Developer": ["Game Programmer", "Unity Developer", "Unreal Developer", "Gameplay Engineer"],
+    "QA Engineer": ["Quality Assurance Engineer", "Test Engineer", "QA Analyst", "Software Tester"],
+    "Test Automation Engineer": ["SDET", "Automation Tester", "QA Automation Engineer"],
+    "Blockchain Developer": ["Smart Contract Developer", "Web3 Developer", "Solidity Developer"],
+    "Software Architect": ["Solution Architect", "Technical Architect", "Enterprise Architect"],
+    "Engineering Manager": ["Software Engineering Manager", "Development Manager", "Head of Engineering"],
+    "Technical Lead": ["Tech Lead", "Lead Developer", "Lead Engineer"],
+    "Product Manager": ["PM", "Technical Product Manager", "Product Owner"],
+    "Project Manager": ["Technical Project Manager", "IT Project Manager", "Scrum Master", "Program Manager"],
+    "UX Designer": ["UI/UX Designer", "Product Designer", "User Experience Designer", "UI Designer"],
+    "Business Analyst": ["IT Business Analyst", "Systems Analyst"],
+    "Technical Writer": ["Documentation Engineer", "API Technical Writer"],
+    "Developer Advocate": ["Developer Relations Engineer", "DevRel"],
+    "Salesforce Developer": ["Salesforce Engineer", "Salesforce Administrator"],
+    "SAP Consultant": ["SAP Developer", "SAP ABAP Developer"],
+    "IT Support Specialist": ["Help Desk Technician", "IT Support Engineer", "Desktop Support Technician"],
+}
+
+# Spelled-out forms, so "Dev", "Eng" and "ML" match their long forms
+_ABBREVIATIONS = {
+    "dev": "developer", "devs": "developer", "developers": "developer", "eng": "engineer", "engr": "engineer",
+    "engineers": "engineer", "swe": "software engineer", "sde": "software engineer", "ml": "machine learning",
+    "mgr": "manager", "admin": "administrator", "sysadmin": "systems administrator",
+    "qa": "quality assurance", "sre": "site reliability engineer", "js": "javascript", "k8s": "kubernetes",
+    "arch": "architect", "bi": "business intelligence",
+}
+# Seniority does not change which skills a role needs ("lead" does: Technical Lead)
+_SENIORITY = {
+    "senior", "sr", "junior", "jr", "principal", "staff", "intern", "internship", "entry", "level",
+    "mid", "associate", "trainee", "graduate", "i", "ii", "iii", "iv", "1", "2", "3", "the", "a", "an", "of",
+}
+_COMPOUNDS = [
+    (re.compile(r"\bfront[\s-]+end\b"), "frontend"),
+    (re.compile(r"\bback[\s-]+end\b"), "backend"),
+    (re.compile(r"\bfull[\s-]+stack\b"), "fullstack"),
+    (re.compile(r"\bdev[\s-]*ops\b"), "devops"),
+    (re.compile(r"\bml[\s-]*ops\b"), "mlops"),
+    (re.compile(r"\bnode[\s.-]*js\b"), "nodejs"),
+    (re.compile(r"\bcyber[\s-]+security\b"), "cybersecurity"),
+]
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+# Titles that name no specialization on their own: "Engineer" or "Staff
+# Developer" must not be resolved to (or learned as) a specific role
+_GENERIC_TITLES = {
+    "engineer", "developer", "architect", "manager", "analyst", "specialist", "consultant", "designer",
+    "administrator", "scientist",
+}
+
+# Character trigrams and whole words are weighted equally
+_WORD_WEIGHT = 1.0
+_NGRAM = 3
+# Best-scoring entries checked for the same specific words
+_CANDIDATES = 8
+
+
+def role_tokens(target_role: str) -> List[str]:
+    """Lowercased, spelled-out words of a role without seniority words"""
+    text = (target_role or "").lower()
+    for pattern, replacement in _COMPOUNDS:
+        text = pattern.sub(replacement, text)
+    words = []
+    for word in _NON_WORD.sub(" ", text).split():
+        for part in _ABBREVIATIONS.get(word, word).split():
+            if part not in _SENIORITY:
+                words.append(part)
+    return words
+
+
+def is_generic(tokens: List[str]) -> bool:
+    """Whether role tokens are only generic titles"""
+    return bool(tokens) and all(token in _GENERIC_TITLES for token in tokens)
+
+
+def _specific(tokens: List[str]) -> List[str]:
+    """Words of a role other than generic titles"""
+    return [token for token in tokens if token not in _GENERIC_TITLES]
+
+
+def _edits(a: str, b: str) -> int:
+    """Edit distance, counting a swap of adjacent letters as one edit"""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+def _same_word(a: str, b: str) -> bool:
+    """Equal, or a typo of each other (one edit; two for long words)"""
+    if a == b:
+        return True
+    shortest = min(len(a), len(b))
+    return shortest >= 5 and _edits(a, b) <= (2 if shortest >= 9 else 1)
+
+
+def _same_words(query: List[str], entry: List[str]) -> bool:
+    """Whether two roles name the same specific words (in any order)"""
+    return (all(any(_same_word(word, other) for other in entry) for word in query)
+            and all(any(_same_word(word, other) for other in query) for word in entry))
+
+
+def _features(tokens: List[str]) -> Dict[str, float]:
+    """Term frequencies of word and character trigram features"""
+    counts: Dict[str, float] = {}
+    for word in tokens:
+        counts["w:" + word] = counts.get("w:" + word, 0) + _WORD_WEIGHT
+        padded = f"#{word}#"
+        for start in range(max(1, len(padded) - _NGRAM + 1)):
+            gram = "c:" + padded[start:start + _NGRAM]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+@dataclass
+class RoleMatch:
+    key: str  # canonical role key, e.g. "backend-engineer"
+    name: str  # canonical display name
+    score: float  # cosine similarity of the closest catalog entry
+    outcome: str  # exact / matched / learned / unmatched
+
+
+class RoleResolver:
+    """Nearest-role lookup over a catalog that grows with traffic"""
+
+    def __init__(self, threshold: float = None, learn: bool = None, max_roles: int = None,
+                 seed: Dict[str, List[str]] = None):
+        self.threshold = threshold if threshold is not None else float(os.getenv("ROLE_MATCH_THRESHOLD", 0.7))
+        self.learn = learn if learn is not None else os.getenv("ROLE_LEARNING", "true").lower() in ("1", "true", "yes")
+        self.max_roles = max_roles if max_roles is not None else int(os.getenv("ROLE_CATALOG_MAX", 5000))
+        self.store = None  # Database that learned roles are saved to
+
+        self._names: Dict[str, str] = {}  # key -> display name
+        self._exact: Dict[str, str] = {}  # " ".join(tokens) -> key
+        self._entries: List[Tuple[str, Dict[str, float]]] = []  # (key, term frequencies) per name/alias
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = np.zeros(0, dtype=np.float32)
+        # CSC index: entries containing feature f are rows[ptr[f]:ptr[f + 1]]
+        self._ptr = np.zeros(1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self._entry_keys: List[str] = []
+        self._entry_words: List[List[str]] = []  # specific words per entry
+        # Entries added since the last rebuild: (key, term frequencies,
+        # vector weighted with the IDF of the last rebuild), scored directly
+        self._pending: List[Tuple[str, Dict[str, float], Dict[str, float]]] = []
+        self._save_tasks = set()
+
+        for name, aliases in (SEED_ROLES if seed is None else seed).items():
+            self.add_role(name, aliases, rebuild=False)
+        self._rebuild()
+
+    @staticmethod
+    def role_key(target_role: str) -> str:
+        """Key for a role as written (before matching)"""
+        tokens = role_tokens(target_role)
+        return "-".join(tokens) if tokens else " ".join((target_role or "").lower().split())
+
+    @property
+    def size(self) -> int:
+        return len(self._names)
+
+    def add_role(self, name: str, aliases: List[str] = (), key: str = None, rebuild: bool = True) -> str:
+        """Add a canonical role (or more aliases of an existing one)
+
+        Returns:
+            The role's key
+        """
+        key = key or self.role_key(name)
+        self._names.setdefault(key, name)
+        for text in [name, *aliases]:
+            tokens = role_tokens(text)
+            exact = " ".join(tokens)
+            if not tokens or exact in self._exact or is_generic(tokens):
+                continue
+            self._exact[exact] = key
+            counts = _features(tokens)
+            self._pending.append((key, counts, self._vector(counts)))
+        # Rebuilding re-weights every entry (tens of ms for thousands)
+        if rebuild and len(self._pending) > 32:
+            self._rebuild()
+        return key
+
+    def _rebuild(self):
+        """Recompute IDF weights and the feature index for all entries"""
+        self._entries.extend((key, counts) for key, counts, _ in self._pending)
+        self._pending = []
+        vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        for _, counts in self._entries:
+            for feature in counts:
+                index = vocabulary.setdefault(feature, len(vocabulary))
+                if index == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[index] += 1
+        total = len(self._entries)
+        idf = np.log((1 + total) / (1 + np.asarray(document_frequency, dtype=np.float64))) + 1
+
+        columns, rows, weights = [], [], []
+        for row, (_, counts) in enumerate(self._entries):
+            ids = np.fromiter((vocabulary[f] for f in counts), dtype=np.int64, count=len(counts))
+            values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * idf[ids]
+            columns.append(ids)
+            rows.append(np.full(len(ids), row, dtype=np.int32))
+            weights.append(values / np.linalg.norm(values))
+        columns = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+        order = np.argsort(columns, kind="stable")
+        self._rows = (np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32))[order]
+        self._weights = (np.concatenate(weights) if weights else np.zeros(0))[order].astype(np.float32)
+        self._ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(vocabulary)), out=self._ptr[1:])
+        self._vocabulary = vocabulary
+        self._idf = idf.astype(np.float32)
+        self._entry_keys = [key for key, _ in self._entries]
+        self._entry_words = [_specific([f[2:] for f in counts if f.startswith("w:")]) for _, counts in self._entries]
+
+    def _vector(self, counts: Dict[str, float]) -> Dict[str, float]:
+        """L2-normalized TF-IDF weights (unseen features get the highest IDF)"""
+        unseen = math.log(1 + len(self._entries)) + 1
+        weights = {
+            feature: count * (float(self._idf[self._vocabulary[feature]]) if feature in self._vocabulary else unseen)
+            for feature, count in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {feature: w / norm for feature, w in weights.items()}
+
+    def nearest(self, target_role: str) -> Tuple[Optional[str], float]:
+        """Closest canonical role key with the same specific words, and its cosine similarity"""
+        tokens = role_tokens(target_role)
+        if not tokens:
+            return None, 0.0
+        query = self._vector(_features(tokens))
+        words = _specific(tokens)
+
+        best_key, best_score = None, 0.0
+        known = [(self._vocabulary[f], weight) for f, weight in query.items() if f in self._vocabulary]
+        if known:
+            slices = [(self._ptr[index], self._ptr[index + 1], weight) for index, weight in known]
+            rows = np.concatenate([self._rows[start:end] for start, end, _ in slices])
+            weights = np.concatenate([self._weights[start:end] * weight for start, end, weight in slices])
+            scores = np.bincount(rows, weights=weights, minlength=len(self._entry_keys))
+            count = min(_CANDIDATES, len(scores))
+            top = np.argpartition(-scores, count - 1)[:count]
+            for row in top[np.argsort(-scores[top])]:
+                if scores[row] > 0 and _same_words(words, self._entry_words[row]):
+                    best_key, best_score = self._entry_keys[row], float(scores[row])
+                    break
+
+        for key, counts, entry in self._pending:
+            score = sum(weight * entry.get(feature, 0.0) for feature, weight in query.items())
+            if score > best_score and _same_words(words, _specific([f[2:] for f in counts if f.startswith("w:")])):
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def _match(self, target_role: str) -> RoleMatch:
+        tokens = role_tokens(target_role)
+        name = " ".join((target_role or "").split())
+        if is_generic(tokens):
+            # Too vague to share anything with a specific role
+            return RoleMatch(self.role_key(target_role), name, 0.0, "unmatched")
+        exact = " ".join(tokens)
+        if exact in self._exact:
+            key = self._exact[exact]
+            return RoleMatch(key, self._names[key], 1.0, "exact")
+
+        key, score = self.nearest(target_role)
+        if key is not None and score >= self.threshold:
+            # Remember the spelling so the next lookup is a dict hit
+            self._exact[exact] = key
+            return RoleMatch(key, self._names[key], score, "matched")
+        return RoleMatch(self.role_key(target_role), name, score, "unmatched")
+
+    def resolve(self, target_role: str) -> RoleMatch:
+        """Canonical role for free text (the text itself if nothing is close)"""
+        match = self._match(target_role)
+        ROLE_RESOLUTIONS.inc(match.outcome)
+        return match
+
+    def canonical_key(self, target_role: str) -> str:
+        return self.resolve(target_role).key
+
+    def learn_role(self, target_role: str) -> Optional[RoleMatch]:
+        """Add an unmatched role to the catalog once the model has answered for it
+
+        Call only with a model result that is not a fallback, so typos and
+        text the model could not make sense of are not kept.
+
+        Returns:
+            The learned role, or None if it matched a known role or was not learned
+        """
+        match = self._match(target_role)
+        tokens = role_tokens(target_role)
+        if (match.outcome != "unmatched" or not self.learn or not tokens or is_generic(tokens)
+                or len(tokens) > 8 or self.size >= self.max_roles):
+            return None
+        # Same key as the unmatched lookups, so entries cached under it stay valid
+        self.add_role(match.name, key=match.key)
+        ROLE_RESOLUTIONS.inc("learned")
+        logger.info(f"Learned new role '{match.name}' ({match.key}), closest match scored {match.score:.2f}")
+        self._save(match.key, match.name)
+        return RoleMatch(match.key, match.name, match.score, "learned")
+
+    def _save(self, key: str, name: str):
+        if self.store is None:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(self.store.save_role(key, name))
+        except RuntimeError:
+            return  # No event loop (e.g. a script); kept in memory only
+        self._save_tasks.add(task)
+        task.add_done_callback(self._save_tasks.discard)
+
+    async def load(self, store):
+        """Add roles learned earlier (by any worker) and save new ones to store"""
+        self.store = store
+        roles = await store.get_roles()
+        for role in roles:
+            self.add_role(role["name"], role.get("aliases") or [], key=role["_id"], rebuild=False)
+        self._rebuild()
+        logger.info(f"Role catalog: {self.size} roles ({len(roles)} learned)")
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+from app.services.role_cache import RoleCache
+from app.utils.metrics import SPECULATIVE_ANALYSES
+from app.utils.shared_state import MemoryState, SharedState
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_role(target_role: str) -> str:
+    """Normalize a free-text role so equivalent spellings compare equal"""
+    return " ".join(target_role.lower().split())
+
+
+class SkillAnalysisSpeculator:
+    """Speculatively runs skill analysis right after a resume upload
+
+    Users almost always call /api/analyze-skills after uploading, so the
+    analysis is started in the background and held provisionally until
+    that call arrives. Results are only reused for the same user and role.
+    The analysis goes through the RoleCache like the request's own would,
+    so a role analyzed before is matched locally; a failed or fallback
+    analysis is dropped and the request analyzes the skills itself.
+
+    Running analyses are tracked per process; finished results are kept in
+    the SharedState, so with a host-wide backend another worker can claim
+    them too.
+    """
+
+    def __init__(self, role_cache: RoleCache, state: SharedState = None):
+        self.role_cache = role_cache
+        self.state = state or MemoryState()
+        # Roles with the same canonical key are the same role
+        self.role_key: Callable[[str], str] = role_cache.resolver.canonical_key
+        self.enabled = os.getenv("SPECULATIVE_ANALYSIS", "false").lower() in ("1", "true", "yes")
+        # Budget: concurrently running speculations in this process and
+        # provisional results it keeps stored
+        self.max_in_flight = int(os.getenv("SPECULATIVE_MAX_IN_FLIGHT", 4))
+        self.max_entries = int(os.getenv("SPECULATIVE_MAX_ENTRIES", 256))
+        self.ttl_seconds = int(os.getenv("SPECULATIVE_TTL_SECONDS", 900))
+
+        self._running: Dict[str, Dict] = {}
+        # Users whose results this process stored, oldest first
+        self._stored: Dict[str, None] = {}
+        self.stats = {
+            "started": 0,
+            "skipped_budget": 0,
+            "hits": 0,
+            "misses": 0,
+            "wasted": 0
+        }
+
+    @staticmethod
+    def infer_target_role(parsed_resume: Dict) -> Optional[str]:
+        """Guess the target role from the most recent job title"""
+        for job in parsed_resume.get("experience") or []:
+            title = (job or {}).get("title")
+            if title and title.strip():
+                return title.strip()
+        return None
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"speculation:{user_id}"
+
+    def _count(self, outcome: str):
+        self.stats[outcome] += 1
+        SPECULATIVE_ANALYSES.inc(outcome)
+
+    async def _discard(self, user_id: str):
+        """Drop any running or stored speculation for the user as wasted"""
+        entry = self._running.pop(user_id, None)
+        if entry is not None:
+            entry["task"].cancel()
+        self._stored.pop(user_id, None)
+        stored = await self.state.pop(self._key(user_id))
+        if entry is not None or stored is not None:
+            self._count("wasted")
+
+    async def _run(self, user_id: str, current_skills: List[str], target_role: str) -> Optional[Dict]:
+        try:
+            analysis = await self.role_cache.analyze(current_skills, target_role, fallback=False)
+            await self.state.set(
+                self._key(user_id),
+                {"role": self.role_key(target_role), "analysis": analysis},
+                ttl=self.ttl_seconds
+            )
+            self._stored.pop(user_id, None)
+            self._stored[user_id] = None
+            while len(self._stored) > self.max_entries:
+                oldest = next(iter(self._stored))
+                del self._stored[oldest]
+                # Already claimed (possibly by another worker) if gone
+                if await self.state.pop(self._key(oldest)) is not None:
+                    self._count("wasted")
+            return analysis
+        except Exception as e:
+            logger.warning(f"Speculative skill analysis for user {user_id} failed: {e}")
+            return None
+        finally:
+            self._running.pop(user_id, None)
+
+    async def speculate(self, user_id: str, current_skills: List[str], target_role: Optional[str]) -> bool:
+        """Start a background skill analysis if enabled and within budget
+
+        Returns:
+            True if a speculative analysis was started
+        """
+        if not self.enabled or not target_role:
+            return False
+
+        if len(self._running) >= self.max_in_flight:
+            self._count("skipped_budget")
+            return False
+
+        await self._discard(user_id)
+        task = asyncio.create_task(self._run(user_id, current_skills, target_role))
+        self._running[user_id] = {"role": self.role_key(target_role), "task": task}
+        self._count("started")
+        logger.info(f"Speculative skill analysis started for user {user_id}, role: {target_role}")
+        return True
+
+    async def take(self, user_id: str, target_role: str) -> Optional[Dict]:
+        """Claim the provisional analysis for this user and role
+
+        Waits for it if it is still running here (without cancelling it if
+        the request is cancelled). Returns None when there is no usable
+        speculation; a failed one or one for a different role is wasted.
+        """
+        if not self.enabled:
+            return None
+
+        role = self.role_key(target_role)
+        self._stored.pop(user_id, None)
+        entry = self._running.get(user_id)
+        if entry is not None and entry["role"] == role:
+            analysis = await asyncio.shield(entry["task"])
+            if analysis is None:
+                self._count("wasted")
+                self._count("misses")
+                return None
+            await self.state.delete(self._key(user_id))
+            self._count("hits")
+            return analysis
+
+        stored = await self.state.pop(self._key(user_id))
+        if entry is None and stored is not None and stored["role"] == role:
+            self._count("hits")
+            return stored["analysis"]
+
+        # Whatever is left was speculated for a different role
+        if entry is not None:
+            self._running.pop(user_id, None)
+            entry["task"].cancel()
+        if entry is not None or stored is not None:
+            self._count("wasted")
+        self._count("misses")
+        return None
@@ -0,0 +1,276 @@
+"""Per-user change notifications for live dashboards
+
+Every worker keeps one feed. Connected clients subscribe by user_id and
+receive small events telling them what changed; they then refetch the
+view with since_version and get a JSON Patch (see deltas.py) instead of
+polling.
+
+    {"type": "change", "collection": "roadmaps", "operation": "update", "id": "<roadmap id>"}
+
+Changes come from one of two sources:
+    change_stream  one MongoDB change stream per worker over roadmaps,
+                   roadmap_progress, skill_analyses and interview_sessions,
+                   so writes made by any worker or process are seen.
+                   Needs a replica set (or Atlas).
+    local          the Database reports its own writes in-process. Only
+                   writes made by the same worker are seen.
+
+    CHANGE_FEED       auto (change stream, else local), change_streams, local or off
+    LIVE_QUEUE_SIZE   events buffered per connection before it is asked to resync
+
+Each connection has a bounded queue. A client that cannot keep up loses
+the buffered events and gets a single {"type": "resync"} instead, so a
+slow socket never holds memory or delays anyone else.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, Optional, Set
+from app.utils.metrics import CHANGE_EVENTS, CHANGE_EVENTS_DROPPED
+
+logger = logging.getLogger(__name__)
+
+FEED_MODES = ("auto", "change_streams", "local", "off")
+WATCHED_COLLECTIONS = ("roadmaps", "roadmap_progress", "skill_analyses", "interview_sessions")
+
+# Only what is needed to route an event (resume token _id is kept)
+_PIPELINE = [
+    {"$match": {
+        "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+        "operationType": {"$in": ["insert", "update", "replace"]}
+    }},
+    {"$project": {"operationType": 1, "ns": 1, "documentKey": 1, "fullDocument.user_id": 1}}
+]
+_MAX_RETRY_DELAY = 30
+# Server errors meaning the stream cannot resume from our token:
+# InvalidResumeToken, ChangeStreamFatalError (older servers), ChangeStreamHistoryLost
+_RESUME_LOST_CODES = {260, 280, 286}
+_RESUME_LOST_MESSAGES = ("resume token", "resume point", "history lost")
+
+
+def _resume_lost(error: Exception) -> bool:
+    """Whether an error means the resume token is unusable (not a transient failure)"""
+    if getattr(error, "code", None) in _RESUME_LOST_CODES:
+        return True
+    has_label = getattr(error, "has_error_label", None)
+    if has_label is not None and has_label("NonResumableChangeStreamError"):
+        message = str(error).lower()
+        return any(text in message for text in _RESUME_LOST_MESSAGES)
+    return False
+
+
+def change_event(collection: str, operation: str, doc_id: str) -> dict:
+    """Event sent to clients when one of their documents changed"""
+    return {"type": "change", "collection": collection, "operation": operation, "id": doc_id}
+
+
+class Subscription:
+    """Bounded event queue of one connection"""
+
+    __slots__ = ("user_id", "queue", "closed")
+
+    def __init__(self, user_id: str, size: int):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=size)
+        self.closed = False
+
+    def put(self, event: Optional[dict]) -> bool:
+        """Queue an event without waiting
+
+        Returns:
+            False if the queue was full; it then holds only a resync event
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            dropped = 0
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                dropped += 1
+            CHANGE_EVENTS_DROPPED.inc(amount=dropped + 1)
+            self.queue.put_nowait({"type": "resync"} if event is not None else None)
+            return False
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next event, or {"type": "ping"} if nothing arrives within timeout
+
+        Returns:
+            None once the subscription is closed
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None if self.closed else {"type": "ping"}
+
+    def close(self):
+        """Wake the reader up so it can stop"""
+        if not self.closed:
+            self.closed = True
+            self.put(None)
+
+
+class ChangeFeed:
+    """Fans per-user change events out to the connections of this worker"""
+
+    def __init__(self, mode: str = None, queue_size: int = None):
+        self.mode = (mode or os.getenv("CHANGE_FEED", "auto")).lower()
+        if self.mode not in FEED_MODES:
+            raise ValueError(f"Unknown CHANGE_FEED: {self.mode}")
+        self.queue_size = queue_size or int(os.getenv("LIVE_QUEUE_SIZE", 64))
+        # Set by start(): change_stream, local or off
+        self.source = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._task = None
+        self._start_lock = asyncio.Lock()
+        self._resume_token = None
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+        subs = self._subscribers.get(subscription.user_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id: str, event: dict) -> int:
+        """Queue an event for every connection of a user (never waits)
+
+        Returns:
+            Number of connections it was queued for
+        """
+        CHANGE_EVENTS.inc(self.source or "local", event.get("collection", ""))
+        subs = self._subscribers.get(user_id)
+        if not subs:
+            return 0
+        for subscription in subs:
+            subscription.put(event)
+        return len(subs)
+
+    def notify(self, user_id: str, collection: str, operation: str, doc_id: str):
+        """Database.change_hook used by the local source"""
+        self.publish(user_id, change_event(collection, operation, doc_id))
+
+    def resync_all(self):
+        """Ask every connection to refetch (events may have been missed)"""
+        for subs in self._subscribers.values():
+            for subscription in subs:
+                subscription.put({"type": "resync"})
+
+    async def start(self, db):
+        """Pick the source on first use and start watching (idempotent)
+
+        Args:
+            db: Database whose writes are followed
+        """
+        if self.source is not None:
+            return
+        async with self._start_lock:
+            if self.source is not None:
+                return
+            if self.mode == "off":
+                self.source = "off"
+                return
+            if self.mode in ("auto", "change_streams"):
+                try:
+                    stream = db.db.watch(_PIPELINE, full_document="updateLookup")
+                    # Opens the cursor; fails on a standalone server
+                    change = await stream.try_next()
+                except Exception as e:
+                    if self.mode == "change_streams":
+                        raise
+                    logger.info(f"Change streams unavailable, using local change feed: {e}")
+                else:
+                    self.source = "change_stream"
+                    if change is not None:
+                        self._dispatch(change)
+                    self._resume_token = stream.resume_token
+                    self._task = asyncio.create_task(self._watch(db, stream))
+                    logger.info("Following changes with a MongoDB change stream")
+                    return
+            db.change_hook = self.notify
+            self.source = "local"
+
+    async def _watch(self, db, stream):
+        """Dispatch change stream events, reopening the stream after errors
+
+        Reopening resumes after the last event seen. Only when the server
+        can no longer resume from it (the oplog moved past the token) is the
+        stream restarted from now and, once it is open, every connection
+        asked to resync; other failures keep the token and retry with backoff.
+        """
+        delay = 1
+        resync = False
+        while True:
+            try:
+                if stream is None:
+                    stream = db.db.watch(_PIPELINE, full_document="updateLookup", resume_after=self._resume_token)
+                    # Opens the cursor; may already return the first change
+                    change = await stream.try_next()
+                    if resync:
+                        self.resync_all()
+                        resync = False
+                    if change is not None:
+                        self._dispatch(change)
+                    self._resume_token = stream.resume_token
+                    delay = 1
+                async for change in stream:
+                    self._resume_token = stream.resume_token
+                    self._dispatch(change)
+                    delay = 1
+            except asyncio.CancelledError:
+                if stream is not None:
+                    await stream.close()
+                raise
+            except Exception as e:
+                if stream is not None:
+                    try:
+                        await stream.close()
+                    except Exception:
+                        pass
+                stream = None
+                if self._resume_token is not None and _resume_lost(e):
+                    logger.warning(f"Change stream cannot resume, restarting from now: {e}")
+                    self._resume_token = None
+                    resync = True
+                    continue
+                logger.warning(f"Change stream interrupted, reopening in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RETRY_DELAY)
+
+    def _dispatch(self, change: dict):
+        document = change.get("fullDocument") or {}
+        user_id = document.get("user_id")
+        if not user_id:
+            return
+        collection = change["ns"]["coll"]
+        doc_id = str(change["documentKey"]["_id"])
+        if collection == "roadmap_progress":
+            # Keyed by roadmap id; clients see it as a roadmap change
+            collection = "roadmaps"
+        elif collection == "skill_analyses":
+            # One analysis per user
+            doc_id = str(user_id)
+        self.publish(str(user_id), change_event(collection, change["operationType"], doc_id))
+
+    async def close(self):
+        """Stop watching and disconnect every subscriber"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        for subs in list(self._subscribers.values()):
+            for subscription in list(subs):
+                subscription.close()
@@ -0,0 +1,103 @@
+"""Response compression (brotli or gzip)
+
+Roadmap and dashboard JSON is repetitive and compresses 5-10x. Bodies of
+at least RESPONSE_COMPRESSION_MIN_BYTES are compressed with the best
+encoding the client accepts: brotli when the brotli package is installed,
+else gzip. Streamed responses (the NDJSON pipeline and batch endpoints)
+are passed through untouched so every line is still delivered as soon as
+it is written, and so are ?debug_timing=1 responses: TracingMiddleware
+runs inside this one and has to read the JSON body to add its timings.
+
+    RESPONSE_COMPRESSION            br,gzip (preference order) or off
+    RESPONSE_COMPRESSION_MIN_BYTES  smaller bodies are sent as is
+    GZIP_LEVEL / BROTLI_QUALITY     speed/ratio trade-off
+"""
+import gzip
+import os
+from starlette.datastructures import Headers, MutableHeaders
+from app.utils.metrics import RESPONSE_COMPRESSION_BYTES
+from app.utils.tracing import debug_timing_requested
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+_COMPRESSIBLE = ("application/json", "application/json-patch+json", "text/")
+
+
+def _accepted(header: str) -> set:
+    """Encodings accepted by the client (q=0 means refused)"""
+    accepted = set()
+    for part in header.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name)
+    return accepted
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete (non-streamed) response bodies"""
+
+    def __init__(self, app, encodings: str = None, minimum_size: int = None,
+                 gzip_level: int = None, brotli_quality: int = None):
+        self.app = app
+        encodings = (encodings or os.getenv("RESPONSE_COMPRESSION", "br,gzip")).lower()
+        self.encodings = [
+            name.strip() for name in encodings.split(",")
+            if name.strip() == "gzip" or (name.strip() == "br" and brotli is not None)
+        ]
+        self.minimum_size = minimum_size if minimum_size is not None else int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+        self.gzip_level = gzip_level if gzip_level is not None else int(os.getenv("GZIP_LEVEL", 6))
+        self.brotli_quality = brotli_quality if brotli_quality is not None else int(os.getenv("BROTLI_QUALITY", 5))
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings or debug_timing_requested(scope):
+            await self.app(scope, receive, send)
+            return
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        encoding = next((name for name in self.encodings if name in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_wrapper(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether to compress
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=held["headers"])
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not headers.get("content-type", "").startswith(_COMPRESSIBLE)
+            ):
+                await send(held)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            RESPONSE_COMPRESSION_BYTES.inc(encoding, "raw", amount=len(body))
+            RESPONSE_COMPRESSION_BYTES.inc(encoding, "sent", amount=len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(held)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
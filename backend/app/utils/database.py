@@ -1,20 +1,153 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
+import asyncio
+import logging
 import os
+import re
 from datetime import datetime
 from bson import ObjectId
 
-import certifi
+from app.utils.field_codec import FieldCodec, projection_fields, unpack, zstd_available
+from app.utils.metrics import DB_OPERATION_SECONDS, timed_methods
+from app.utils.tracing import traced_methods
 
+logger = logging.getLogger(__name__)
+
+# Readiness scores are counted in buckets of this many points (90 includes 100)
+READINESS_BUCKET = 10
+_ANALYTICS_FIELDS = {"role_key": 1, "target_role": 1, "job_readiness_score": 1, "missing_skills": 1}
+
+# Bulky LLM-written fields compressed at rest when FIELD_COMPRESSION is on
+WEEK_COMPRESSED_FIELDS = ("goal", "what_to_learn", "why_learn_this", "how_to_learn", "mini_project")
+CHAT_COMPRESSED_FIELDS = ("message",)
+SESSION_COMPRESSED_FIELDS = ("questions",)
+
+def _week_number(value, default: int) -> int:
+    """Week number as an int (LLM output may give "3" or 3.0); default if unusable"""
+    if isinstance(value, bool):
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return int(number) if number.is_integer() else default
+
+
+def _split_weekly_plan(roadmap_doc: dict):
+    """Move the weekly plan out of a roadmap document
+
+    Returns:
+        (week documents, {resource key: resource}) - week resources that
+        have a URL are replaced by {"ref": key}, others are kept inline
+    """
+    roadmap_id = str(roadmap_doc["_id"])
+    weekly_plan = roadmap_doc.pop("weekly_plan", None) or []
+    week_docs = []
+    resources = {}
+    for position, week in enumerate(weekly_plan):
+        items = []
+        for resource in week.get("resources") or []:
+            url = resource.get("url") if isinstance(resource, dict) else None
+            if url and url.strip():
+                key = url.strip().rstrip("/")
+                resources.setdefault(key, resource)
+                items.append({"ref": key})
+            else:
+                items.append({"inline": resource})
+        week_docs.append({
+            **week,
+            "week": _week_number(week.get("week"), position + 1),
+            "resources": items,
+            "roadmap_id": roadmap_id,
+            "position": position
+        })
+    roadmap_doc["storage"] = "normalized"
+    roadmap_doc["week_count"] = len(week_docs)
+    return week_docs, resources
+
+
+def _role_slug(target_role: str) -> str:
+    """Role key for analyses saved without a canonical one"""
+    return "-".join(re.findall(r"[a-z0-9+#]+", (target_role or "").lower()))
+
+
+def _field_name(name: str) -> str:
+    """Field name for a skill or category ("Node.js" -> "node_js"); paths cannot contain dots or $"""
+    return "_".join(re.findall(r"[a-z0-9+#]+", name.lower()))
+
+
+def _analytics_increments(analysis: dict, sign: int) -> tuple:
+    """What one skill analysis adds to (sign=1) or removes from (-1) its role's stats
+
+    Returns:
+        ({dotted field: increment}, {skill field: display name})
+    """
+    score = float(analysis.get("job_readiness_score") or 0)
+    bucket = min(int(score // READINESS_BUCKET) * READINESS_BUCKET, 100 - READINESS_BUCKET)
+    increments = {"count": sign, "readiness_sum": sign * score, f"readiness_histogram.{max(bucket, 0)}": sign}
+    names = {}
+    for skill in analysis.get("missing_skills") or []:
+        field = _field_name(skill) if isinstance(skill, str) else ""
+        if field and field not in names:
+            names[field] = skill
+            increments[f"missing_skills.{field}"] = sign
+    return increments, names
+
+
+def _apply_increments(stats: dict, increments: dict):
+    """Apply {dotted field: increment} to a nested dict, like $inc"""
+    for path, amount in increments.items():
+        *parents, field = path.split(".")
+        target = stats
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[field] = target.get(field, 0) + amount
+
+
+def _analytics_counts(stats: dict) -> tuple:
+    """Comparable form of role stats (zero counts dropped)"""
+    return (
+        stats.get("count", 0),
+        round(stats.get("readiness_sum", 0), 3),
+        {k: v for k, v in (stats.get("readiness_histogram") or {}).items() if v},
+        {k: v for k, v in (stats.get("missing_skills") or {}).items() if v}
+    )
+
+
+async def _next_or_none(cursor):
+    try:
+        return await cursor.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+@timed_methods(DB_OPERATION_SECONDS)
+@traced_methods("db")
 class Database:
     """Handles all database operations"""
     
-    def __init__(self):
+    def __init__(self, client=None):
+        if client is not None:
+            # Pre-built client (e.g. an in-memory stand-in for benchmarks)
+            self.client = client
+            self.db = self.client.career_navigator
+            self._configure()
+            return
+
+        # Imported here so app startup does not pay for the driver
+        from motor.motor_asyncio import AsyncIOMotorClient
+        import certifi
+
         # Connect to MongoDB
         mongodb_uri = os.getenv("MONGODB_URI")
         # Only use TLS settings for remote connections (like MongoDB Atlas)
         # Local connections typically don't use TLS and will fail the handshake if forced
         kwargs = {}
+        # Compress traffic to the server (negotiated; a server without
+        # support for a compressor simply does not use it)
+        compressors = os.getenv("MONGODB_COMPRESSORS", "auto").lower()
+        if compressors == "auto":
+            compressors = "zstd,zlib" if zstd_available() else "zlib"
+        if compressors not in ("", "none", "off"):
+            kwargs["compressors"] = compressors
         if "localhost" not in mongodb_uri and "127.0.0.1" not in mongodb_uri:
             kwargs["tlsCAFile"] = certifi.where()
             kwargs["tlsAllowInvalidCertificates"] = True
@@ -24,6 +157,63 @@ class Database:
             **kwargs
         )
         self.db = self.client.career_navigator
+        self._configure()
+
+    def _configure(self):
+        self.codec = FieldCodec()
+        # Scores kept per category/difficulty for rolling averages and trends
+        self.interview_stats_window = int(os.getenv("INTERVIEW_STATS_WINDOW", 10))
+        # "embedded": progress is stored on the roadmap document itself
+        # "collection": progress lives in the small roadmap_progress collection
+        self.progress_store = os.getenv("ROADMAP_PROGRESS_STORE", "embedded").lower()
+        if self.progress_store not in ("embedded", "collection"):
+            raise ValueError(f"Unknown ROADMAP_PROGRESS_STORE: {self.progress_store}")
+        # Called as hook(user_id, collection, operation, doc_id) after each
+        # user-visible write; set by the local change feed
+        self.change_hook = None
+        self._owners = {}
+
+    def _notify(self, user_id: str, collection: str, operation: str, doc_id: str):
+        """Report a write to the change hook (if any)"""
+        if self.change_hook is not None and user_id:
+            self.change_hook(str(user_id), collection, operation, str(doc_id))
+
+    async def _owner(self, collection: str, doc_id: str) -> str:
+        """user_id of a roadmap or interview session, looked up only while a change hook is set"""
+        if self.change_hook is None:
+            return None
+        key = (collection, doc_id)
+        user_id = self._owners.get(key)
+        if user_id is None:
+            doc = await self.db[collection].find_one({"_id": ObjectId(doc_id)}, {"user_id": 1})
+            if not doc:
+                return None
+            # Owners never change; the cache is simply dropped when large
+            if len(self._owners) >= 10000:
+                self._owners.clear()
+            user_id = self._owners[key] = doc.get("user_id")
+        return user_id
+
+    async def ping(self):
+        """Round-trip to the server (also establishes the connection pool)"""
+        await self.client.admin.command("ping")
+
+    async def ensure_indexes(self):
+        """Create the indexes used by the query paths (idempotent)"""
+        await asyncio.gather(
+            self.db.skill_analyses.create_index("user_id"),
+            self.db.resumes.create_index("batch_id", sparse=True),
+            self.db.roadmaps.create_index([("user_id", 1), ("is_active", 1)]),
+            self.db.roadmaps.create_index([("user_id", 1), ("created_at", -1)]),
+            self.db.roadmap_weeks.create_index([("roadmap_id", 1), ("position", 1)]),
+            self.db.roadmap_weeks.create_index([("roadmap_id", 1), ("week", 1)]),
+            self.db.chat_history.create_index([("user_id", 1), ("roadmap_id", 1), ("timestamp", 1)]),
+            self.db.interview_sessions.create_index([("user_id", 1), ("created_at", -1)])
+        )
+
+    def close(self):
+        """Close the MongoDB client"""
+        self.client.close()
         
     async def save_resume(self, resume_data: dict) -> str:
         """Save parsed resume to database
@@ -38,23 +228,59 @@ class Database:
         result = await self.db.resumes.insert_one(resume_data)
         return str(result.inserted_id)
     
+    async def save_resumes(self, resumes: list) -> list:
+        """Save many parsed resumes with one insert_many
+
+        Args:
+            resumes: Resume dictionaries
+
+        Returns:
+            user_ids in the same order
+        """
+        now = datetime.now()
+        for resume_data in resumes:
+            resume_data['uploaded_at'] = now
+        result = await self.db.resumes.insert_many(resumes)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
+    async def get_batch_resumes(self, batch_id: str) -> list:
+        """Resumes saved by one batch ingestion (id and name only)"""
+        cursor = self.db.resumes.find({"batch_id": batch_id}, {"name": 1})
+        return [{"user_id": str(doc["_id"]), "name": doc.get("name")} async for doc in cursor]
+    
     async def get_resume(self, user_id: str) -> dict:
         """Get resume by user ID"""
         return await self.db.resumes.find_one({"_id": ObjectId(user_id)})
     
-    async def save_skill_analysis(self, user_id: str, analysis: dict):
-        """Save skill gap analysis"""
+    async def save_skill_analysis(self, user_id: str, analysis: dict, role_key: str = None):
+        """Save skill gap analysis and update the role analytics
+
+        Args:
+            user_id: User identifier
+            analysis: Complete skill analysis
+            role_key: Canonical role key the analysis is counted under
+        """
         analysis['user_id'] = user_id
         analysis['created_at'] = datetime.now()
-        await self.db.skill_analyses.update_one(
+        analysis['role_key'] = role_key or _role_slug(analysis.get('target_role'))
+        # The replaced analysis is taken out of its role's stats
+        previous = await self.db.skill_analyses.find_one_and_update(
             {"user_id": user_id},
             {"$set": analysis},
+            projection=_ANALYTICS_FIELDS,
             upsert=True  # Create if doesn't exist, update if exists
         )
+        await self._update_role_analytics(previous, analysis)
+        self._notify(user_id, "skill_analyses", "update" if previous else "insert", user_id)
     
-    async def get_skill_analysis(self, user_id: str) -> dict:
-        """Get skill analysis for user"""
-        return await self.db.skill_analyses.find_one({"user_id": user_id})
+    async def get_skill_analysis(self, user_id: str, fields: list = None) -> dict:
+        """Get skill analysis for user
+
+        Args:
+            user_id: User identifier
+            fields: Fields to return (None for the whole analysis)
+        """
+        return await self.db.skill_analyses.find_one({"user_id": user_id}, fields)
     
     
     async def save_roadmap(self, user_id: str, roadmap: dict, display_name: str = None, is_active: bool = True):
@@ -72,45 +298,215 @@ class Database:
         # If this is marked as active, deactivate all other roadmaps for this user
         if is_active:
             await self.db.roadmaps.update_many(
-                {"user_id": user_id},
-                {"$set": {"is_active": False}}
+                {"user_id": user_id, "is_active": True},
+                {"$set": {"is_active": False}, "$inc": {"version": 1}}
             )
         
         roadmap_doc = {
             **roadmap,
+            "_id": ObjectId(),
             "user_id": user_id,
             "created_at": datetime.now(),
             "is_active": is_active,
-            "display_name": display_name or roadmap.get("target_role", "Unnamed Roadmap")
+            "display_name": display_name or roadmap.get("target_role", "Unnamed Roadmap"),
+            "version": 1
         }
         
-        result = await self.db.roadmaps.insert_one(roadmap_doc)
-        return str(result.inserted_id)
+        roadmap_id = await self._insert_roadmap(roadmap_doc)
+        self._notify(user_id, "roadmaps", "insert", roadmap_id)
+        return roadmap_id
     
-    async def get_roadmap(self, user_id: str) -> dict:
-        """Get active roadmap for user"""
-        return await self.db.roadmaps.find_one(
-            {"user_id": user_id, "is_active": True}
+    async def save_pipeline_results(
+        self, user_id: str, resume_data: dict, analysis: dict, roadmap: dict,
+        display_name: str = None, role_key: str = None
+    ) -> str:
+        """Persist resume, skill analysis and roadmap for a new user in one phase
+
+        The user_id is allocated by the caller, so the three writes do not
+        depend on each other and are issued concurrently.
+
+        Args:
+            user_id: Pre-allocated ObjectId string for the resume document
+            resume_data: Parsed resume
+            analysis: Complete skill analysis
+            roadmap: Complete roadmap
+            display_name: Optional friendly name for the roadmap
+            role_key: Canonical role key the analysis is counted under
+
+        Returns:
+            roadmap_id: ID of the saved roadmap
+        """
+        now = datetime.now()
+        resume_doc = {**resume_data, "_id": ObjectId(user_id), "uploaded_at": now}
+        analysis_doc = {
+            **analysis,
+            "user_id": user_id,
+            "created_at": now,
+            "role_key": role_key or _role_slug(analysis.get("target_role"))
+        }
+        # A brand new user has no other roadmaps to deactivate
+        roadmap_doc = {
+            **roadmap,
+            "_id": ObjectId(),
+            "user_id": user_id,
+            "created_at": now,
+            "is_active": True,
+            "display_name": display_name or roadmap.get("target_role", "Unnamed Roadmap"),
+            "version": 1
+        }
+
+        results = await asyncio.gather(
+            self.db.resumes.insert_one(resume_doc),
+            self.db.skill_analyses.update_one(
+                {"user_id": user_id},
+                {"$set": analysis_doc},
+                upsert=True
+            ),
+            self._insert_roadmap(roadmap_doc),
+            self._update_role_analytics(None, analysis_doc)
+        )
+        self._notify(user_id, "skill_analyses", "insert", user_id)
+        self._notify(user_id, "roadmaps", "insert", results[2])
+        return results[2]
+
+    async def _insert_roadmap(self, roadmap_doc: dict) -> str:
+        """Store a roadmap in normalized form
+
+        The weekly plan goes to roadmap_weeks (one document per week) and
+        resources with a URL go to resources, shared by every roadmap that
+        links the same URL. The roadmap document keeps only metadata and is
+        written last, so readers never see it before its weeks exist.
+        """
+        week_docs, resources = _split_weekly_plan(roadmap_doc)
+        week_docs = [self.codec.pack(week, WEEK_COMPRESSED_FIELDS) for week in week_docs]
+        await asyncio.gather(
+            self._upsert_resources(resources),
+            self.db.roadmap_weeks.insert_many(week_docs) if week_docs else asyncio.sleep(0)
+        )
+        await self.db.roadmaps.insert_one(roadmap_doc)
+        return str(roadmap_doc["_id"])
+
+    async def _upsert_resources(self, resources: dict):
+        """Insert resources that are not stored yet (keyed by URL)"""
+        if not resources:
+            return
+        from pymongo.errors import BulkWriteError
+
+        now = datetime.now()
+        try:
+            await self.db.resources.insert_many(
+                [{**resource, "_id": key, "created_at": now} for key, resource in resources.items()],
+                ordered=False
+            )
+        except BulkWriteError as e:
+            # Duplicate keys are resources stored by an earlier roadmap
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+
+    async def _load_weeks(self, roadmaps: list, weeks: list = None, week_fields: list = None):
+        """Attach weekly_plan to roadmaps, loading only what is asked for
+
+        Args:
+            roadmaps: Roadmap documents (modified in place)
+            weeks: Week numbers to load; None loads all, [] loads none
+            week_fields: Fields of each week to load; None loads all
+        """
+        if weeks == []:
+            return
+
+        normalized = []
+        for roadmap in roadmaps:
+            if "weekly_plan" in roadmap:
+                # Document written before weeks were normalized
+                if weeks is not None:
+                    roadmap["weekly_plan"] = [w for w in roadmap["weekly_plan"] if w.get("week") in weeks]
+            elif roadmap.get("storage") == "normalized":
+                roadmap["weekly_plan"] = []
+                normalized.append(roadmap)
+        if not normalized:
+            return
+
+        by_id = {str(roadmap["_id"]): roadmap for roadmap in normalized}
+        query = {"roadmap_id": {"$in": list(by_id)}}
+        if weeks is not None:
+            query["week"] = {"$in": list(weeks)}
+        projection = {"_id": 0}
+        if week_fields is not None:
+            fields = projection_fields(["roadmap_id", "position", *week_fields], WEEK_COMPRESSED_FIELDS)
+            projection.update({field: 1 for field in fields})
+
+        cursor = self.db.roadmap_weeks.find(query, projection).sort([("roadmap_id", 1), ("position", 1)])
+        week_docs = await cursor.to_list(length=None)
+        if week_fields is None or "resources" in week_fields:
+            await self._resolve_resources(week_docs)
+
+        for week in week_docs:
+            unpack(week, week_fields)
+            roadmap = by_id[week.pop("roadmap_id")]
+            week.pop("position", None)
+            roadmap["weekly_plan"].append(week)
+
+    async def _resolve_resources(self, week_docs: list):
+        """Replace resource references in week documents with the resources"""
+        keys = {
+            item["ref"]
+            for week in week_docs
+            for item in week.get("resources") or []
+            if "ref" in item
+        }
+        found = {}
+        if keys:
+            cursor = self.db.resources.find({"_id": {"$in": list(keys)}}, {"created_at": 0})
+            for resource in await cursor.to_list(length=None):
+                found[resource.pop("_id")] = resource
+        for week in week_docs:
+            week["resources"] = [
+                found.get(item["ref"], {"url": item["ref"]}) if "ref" in item else item.get("inline")
+                for item in week.get("resources") or []
+            ]
+
+    async def get_roadmap(self, user_id: str, weeks: list = None) -> dict:
+        """Get active roadmap for user
+
+        Args:
+            user_id: User identifier
+            weeks: Week numbers to include; None for all, [] for metadata only
+        """
+        roadmap = await self.db.roadmaps.find_one(
+            {"user_id": user_id, "is_active": True},
+            {"weekly_plan": 0} if weeks == [] else None
         )
+        if roadmap:
+            await self._load_weeks([roadmap], weeks)
+        return await self._with_progress(roadmap)
     
     async def get_user_roadmaps(self, user_id: str) -> list:
-        """Get all roadmaps for a user"""
-        cursor = self.db.roadmaps.find({"user_id": user_id}).sort("created_at", -1)
+        """Get all roadmaps for a user (metadata only, without weekly plans)"""
+        cursor = self.db.roadmaps.find({"user_id": user_id}, {"weekly_plan": 0}).sort("created_at", -1)
         roadmaps = await cursor.to_list(length=100)
         # Convert ObjectId to string for JSON serialization
         for rm in roadmaps:
             rm['_id'] = str(rm['_id'])
         return roadmaps
     
-    async def get_roadmap_by_id(self, roadmap_id: str) -> dict:
-        """Get specific roadmap by ID"""
-        roadmap = await self.db.roadmaps.find_one({"_id": ObjectId(roadmap_id)})
+    async def get_roadmap_by_id(self, roadmap_id: str, weeks: list = None) -> dict:
+        """Get specific roadmap by ID
+
+        Args:
+            roadmap_id: Roadmap identifier
+            weeks: Week numbers to include; None for all, [] for metadata only
+        """
+        roadmap = await self.db.roadmaps.find_one(
+            {"_id": ObjectId(roadmap_id)},
+            {"weekly_plan": 0} if weeks == [] else None
+        )
         if roadmap:
             roadmap['_id'] = str(roadmap['_id'])
-        return roadmap
+            await self._load_weeks([roadmap], weeks)
+        return await self._with_progress(roadmap)
     
     async def update_roadmap(self, roadmap_id: str, updates: dict):
-        """Update roadmap properties
+        """Update roadmap properties (and bump its version)
         
         Args:
             roadmap_id: Roadmap identifier
@@ -118,39 +514,251 @@ class Database:
         """
         # Handle is_active flag - deactivate others if setting this one as active
         if updates.get("is_active") == True:
-            roadmap = await self.get_roadmap_by_id(roadmap_id)
+            # Only the owner is needed, not the whole plan
+            roadmap = await self.db.roadmaps.find_one({"_id": ObjectId(roadmap_id)}, {"user_id": 1})
             if roadmap:
                 await self.db.roadmaps.update_many(
-                    {"user_id": roadmap["user_id"], "_id": {"$ne": ObjectId(roadmap_id)}},
-                    {"$set": {"is_active": False}}
+                    {"user_id": roadmap["user_id"], "_id": {"$ne": ObjectId(roadmap_id)}, "is_active": True},
+                    {"$set": {"is_active": False}, "$inc": {"version": 1}}
                 )
         
-        await self.db.roadmaps.update_one(
+        result = await self.db.roadmaps.update_one(
             {"_id": ObjectId(roadmap_id)},
-            {"$set": updates}
+            {"$set": updates, "$inc": {"version": 1}}
         )
+        if result.matched_count:
+            self._notify(await self._owner("roadmaps", roadmap_id), "roadmaps", "update", roadmap_id)
     
+    async def update_roadmap_progress(
+        self,
+        roadmap_id: str,
+        completed_weeks: list = None,
+        uncompleted_weeks: list = None,
+        current_week: int = None,
+        hours_spent: float = 0
+    ) -> bool:
+        """Record learning progress with a single targeted update
+
+        Only the touched week documents are flagged, current_week only
+        moves forward ($max) and hours are added atomically ($inc), so
+        concurrent updates do not overwrite each other.
+
+        Args:
+            roadmap_id: Roadmap identifier
+            completed_weeks: Week numbers to mark completed
+            uncompleted_weeks: Week numbers to mark not completed
+            current_week: Week the user has reached
+            hours_spent: Study hours to add
+
+        Returns:
+            False if the roadmap does not exist
+        """
+        completed_weeks = completed_weeks or []
+        uncompleted_weeks = uncompleted_weeks or []
+        now = datetime.now()
+
+        if self.progress_store == "collection":
+            update = {
+                "$set": {"updated_at": now},
+                "$inc": {"hours_spent": hours_spent, "updates": 1},
+                "$setOnInsert": {"roadmap_id": roadmap_id}
+            }
+            if completed_weeks:
+                update["$addToSet"] = {"completed_weeks": {"$each": completed_weeks}}
+            if current_week is not None:
+                update["$max"] = {"current_week": current_week}
+            if uncompleted_weeks:
+                # $pull and $addToSet on the same field in one update conflict;
+                # the lists are disjoint, so the order of the two writes is irrelevant
+                await self.db.roadmap_progress.update_one(
+                    {"_id": roadmap_id},
+                    {"$pull": {"completed_weeks": {"$in": uncompleted_weeks}}}
+                )
+            result = await self.db.roadmap_progress.update_one({"_id": roadmap_id}, update, upsert=True)
+            if result.upserted_id is not None:
+                # First progress write for this roadmap: make sure it exists
+                roadmap = await self.db.roadmaps.find_one({"_id": ObjectId(roadmap_id)}, {"user_id": 1})
+                if not roadmap:
+                    await self.db.roadmap_progress.delete_one({"_id": roadmap_id})
+                    return False
+                await self.db.roadmap_progress.update_one({"_id": roadmap_id}, {"$set": {"user_id": roadmap["user_id"]}})
+            self._notify(await self._owner("roadmaps", roadmap_id), "roadmaps", "update", roadmap_id)
+            return True
+
+        roadmap = await self.db.roadmaps.find_one({"_id": ObjectId(roadmap_id)}, {"storage": 1})
+        if not roadmap:
+            return False
+        update = {"$set": {"progress_updated_at": now}, "$inc": {"hours_spent": hours_spent, "version": 1}}
+        if current_week is not None:
+            update["$max"] = {"current_week": current_week}
+        array_filters = None
+
+        if roadmap.get("storage") == "normalized":
+            # Week flags first (they can be rewritten safely), so a failed
+            # write never leaves the version and hours bumped without them
+            await asyncio.gather(*(
+                self.db.roadmap_weeks.update_many(
+                    {"roadmap_id": roadmap_id, "week": {"$in": weeks}},
+                    {"$set": {"completed": completed}}
+                )
+                for weeks, completed in ((completed_weeks, True), (uncompleted_weeks, False)) if weeks
+            ))
+        elif completed_weeks or uncompleted_weeks:
+            # Roadmaps stored before weeks were normalized embed weekly_plan:
+            # flags and counters change in the same (atomic) update
+            array_filters = []
+            if completed_weeks:
+                update["$set"]["weekly_plan.$[done].completed"] = True
+                array_filters.append({"done.week": {"$in": completed_weeks}})
+            if uncompleted_weeks:
+                update["$set"]["weekly_plan.$[undone].completed"] = False
+                array_filters.append({"undone.week": {"$in": uncompleted_weeks}})
+
+        result = await self.db.roadmaps.update_one({"_id": ObjectId(roadmap_id)}, update, array_filters=array_filters)
+        if result.matched_count == 0:
+            return False
+        self._notify(await self._owner("roadmaps", roadmap_id), "roadmaps", "update", roadmap_id)
+        return True
+
+    async def get_roadmap_progress(self, roadmap_id: str) -> dict:
+        """Get progress for a roadmap without loading the full plan
+
+        Returns:
+            Dictionary with current_week, completed_weeks, hours_spent and
+            total_weeks, or None if the roadmap does not exist
+        """
+        roadmap = await self.db.roadmaps.find_one(
+            {"_id": ObjectId(roadmap_id)},
+            {"current_week": 1, "total_weeks": 1, "hours_spent": 1, "storage": 1, "weekly_plan.week": 1, "weekly_plan.completed": 1}
+        )
+        if not roadmap:
+            return None
+        await self._load_weeks([roadmap], week_fields=["week", "completed"])
+
+        progress = {
+            "roadmap_id": roadmap_id,
+            "current_week": roadmap.get("current_week", 1),
+            "total_weeks": roadmap.get("total_weeks", len(roadmap.get("weekly_plan", []))),
+            "completed_weeks": sorted(w["week"] for w in roadmap.get("weekly_plan", []) if w.get("completed") and "week" in w),
+            "hours_spent": roadmap.get("hours_spent", 0)
+        }
+        if self.progress_store == "collection":
+            stored = await self.db.roadmap_progress.find_one({"_id": roadmap_id})
+            if stored:
+                progress["current_week"] = max(progress["current_week"], stored.get("current_week", 1))
+                progress["completed_weeks"] = sorted(stored.get("completed_weeks", []))
+                progress["hours_spent"] = stored.get("hours_spent", 0)
+        return progress
+
+    async def _with_progress(self, roadmap: dict) -> dict:
+        """Overlay progress from roadmap_progress onto a roadmap document
+
+        Progress writes count as roadmap versions: the version returned is
+        the roadmap's own plus the number of progress updates.
+        """
+        if not roadmap or self.progress_store != "collection":
+            return roadmap
+        stored = await self.db.roadmap_progress.find_one({"_id": str(roadmap["_id"])})
+        if stored:
+            roadmap["version"] = roadmap.get("version", 0) + stored.get("updates", 0)
+            completed = set(stored.get("completed_weeks", []))
+            roadmap["current_week"] = max(roadmap.get("current_week", 1), stored.get("current_week", 1))
+            roadmap["hours_spent"] = stored.get("hours_spent", 0)
+            for week in roadmap.get("weekly_plan", []):
+                week["completed"] = week.get("week") in completed
+        return roadmap
+
     async def delete_roadmap(self, roadmap_id: str):
-        """Delete a roadmap"""
-        await self.db.roadmaps.delete_one({"_id": ObjectId(roadmap_id)})
+        """Delete a roadmap with its weeks and progress (shared resources stay)"""
+        user_id = await self._owner("roadmaps", roadmap_id)
+        await asyncio.gather(
+            self.db.roadmaps.delete_one({"_id": ObjectId(roadmap_id)}),
+            self.db.roadmap_weeks.delete_many({"roadmap_id": roadmap_id}),
+            self.db.roadmap_progress.delete_one({"_id": roadmap_id})
+        )
+        self._notify(user_id, "roadmaps", "delete", roadmap_id)
     
-    async def get_roadmaps_by_ids(self, roadmap_ids: list) -> list:
+    async def get_roadmaps_by_ids(self, roadmap_ids: list, fields: list = None, week_fields: list = None) -> list:
         """Batch fetch roadmaps for comparison
         
         Args:
             roadmap_ids: List of roadmap IDs
+            fields: Roadmap fields to load; None loads all. Weeks are only
+                loaded when "weekly_plan" is among them.
+            week_fields: Fields of each week to load; None loads all
             
         Returns:
             List of roadmap documents
         """
         object_ids = [ObjectId(rid) for rid in roadmap_ids]
-        cursor = self.db.roadmaps.find({"_id": {"$in": object_ids}})
+        projection = None
+        if fields is not None:
+            projection = {field: 1 for field in [*fields, "storage"]}
+            if "weekly_plan" in fields and week_fields is not None:
+                del projection["weekly_plan"]
+                projection.update({f"weekly_plan.{field}": 1 for field in week_fields})
+        cursor = self.db.roadmaps.find({"_id": {"$in": object_ids}}, projection)
         roadmaps = await cursor.to_list(length=len(roadmap_ids))
+        if fields is None or "weekly_plan" in fields:
+            await self._load_weeks(roadmaps, week_fields=week_fields)
         # Convert ObjectId to string
         for rm in roadmaps:
             rm['_id'] = str(rm['_id'])
         return roadmaps
 
+
+    async def iter_week_summaries(self, roadmap_ids: list, fields: list = None):
+        """Stream weeks of several roadmaps grouped by week number
+
+        Runs as an aggregation so only the requested week fields leave the
+        server, one week group at a time.
+
+        Args:
+            roadmap_ids: List of roadmap IDs
+            fields: Week fields to include (default: topic, estimated_hours)
+
+        Yields:
+            {"week": n, "entries": [{"roadmap_id": ..., <fields>}, ...]}
+            in ascending week order
+        """
+        fields = fields or ["topic", "estimated_hours"]
+        entry = {
+            "roadmap_id": "$roadmap_id",
+            **{field: f"${field}" for field in projection_fields(fields, WEEK_COMPRESSED_FIELDS)}
+        }
+        group = [
+            {"$group": {"_id": "$week", "entries": {"$push": entry}}},
+            {"$sort": {"_id": 1}}
+        ]
+        # Both streams must be ordered by numeric week for the merge below
+        normalized = self.db.roadmap_weeks.aggregate([
+            {"$match": {"roadmap_id": {"$in": list(roadmap_ids)}, "week": {"$type": "number"}}},
+            *group
+        ])
+        # Roadmaps stored before weeks were normalized embed weekly_plan
+        legacy = self.db.roadmaps.aggregate([
+            {"$match": {"_id": {"$in": [ObjectId(rid) for rid in roadmap_ids]}, "storage": {"$ne": "normalized"}}},
+            {"$unwind": "$weekly_plan"},
+            {"$project": {
+                "roadmap_id": {"$toString": "$_id"},
+                "week": "$weekly_plan.week",
+                **{field: f"$weekly_plan.{field}" for field in fields}
+            }},
+            {"$match": {"week": {"$type": "number"}}},
+            *group
+        ])
+
+        # Merge the two week-ordered streams
+        streams = [normalized, legacy]
+        heads = [await _next_or_none(stream) for stream in streams]
+        while any(heads):
+            week = min(head["_id"] for head in heads if head)
+            entries = []
+            for index, head in enumerate(heads):
+                if head and head["_id"] == week:
+                    entries.extend(unpack(item, fields) for item in head["entries"])
+                    heads[index] = await _next_or_none(streams[index])
+            yield {"week": week, "entries": entries}
     
     # Chat History Methods
     async def save_chat_message(self, user_id: str, roadmap_id: str, role: str, message: str):
@@ -169,7 +777,7 @@ class Database:
             "message": message,
             "timestamp": datetime.now()
         }
-        await self.db.chat_history.insert_one(chat_message)
+        await self.db.chat_history.insert_one(self.codec.pack(chat_message, CHAT_COMPRESSED_FIELDS))
     
     async def get_chat_history(self, user_id: str, roadmap_id: str = None, limit: int = 50):
         """Get chat history for a user
@@ -192,6 +800,7 @@ class Database:
         # Convert ObjectId to string
         for msg in messages:
             msg['_id'] = str(msg['_id'])
+            unpack(msg)
         
         return messages
     
@@ -226,7 +835,10 @@ class Database:
             "created_at": datetime.now()
         }
         
-        result = await self.db.interview_sessions.insert_one(session_doc)
+        result = await self.db.interview_sessions.insert_one(
+            self.codec.pack(session_doc, SESSION_COMPRESSED_FIELDS)
+        )
+        self._notify(user_id, "interview_sessions", "insert", result.inserted_id)
         return str(result.inserted_id)
     
     async def get_interview_sessions(self, user_id: str, limit: int = 10) -> list:
@@ -248,6 +860,7 @@ class Database:
         # Convert ObjectId to string
         for session in sessions:
             session['_id'] = str(session['_id'])
+            unpack(session)
         
         return sessions
     
@@ -266,6 +879,221 @@ class Database:
         
         if session:
             session['_id'] = str(session['_id'])
+            unpack(session)
         
         return session
 
+    async def complete_interview_session(self, session_id: str, questions: list, overall_score: float) -> bool:
+        """Store evaluated answers; the first completion updates the user's stats
+
+        Re-submitting a completed session updates it but is not counted again.
+
+        Args:
+            session_id: Session identifier
+            questions: Questions with answers, scores and feedback
+            overall_score: Session score (0-100)
+
+        Returns:
+            True if the session was found
+        """
+        update = self.codec.pack_update(
+            {"questions": questions, "overall_score": overall_score, "status": "completed"},
+            SESSION_COMPRESSED_FIELDS
+        )
+        session = await self.db.interview_sessions.find_one_and_update(
+            {"_id": ObjectId(session_id), "status": {"$ne": "completed"}},
+            {**update, "$set": {**update["$set"], "completed_at": datetime.now()}},
+            projection={"user_id": 1, "difficulty": 1, "target_role": 1}
+        )
+        if session is None:
+            result = await self.db.interview_sessions.update_one({"_id": ObjectId(session_id)}, update)
+            if result.matched_count == 0:
+                return False
+            self._notify(await self._owner("interview_sessions", session_id), "interview_sessions", "update", session_id)
+            return True
+        await self._update_interview_stats(session, session_id, questions, overall_score)
+        self._notify(session.get("user_id"), "interview_sessions", "update", session_id)
+        return True
+
+    async def _update_interview_stats(self, session: dict, session_id: str, questions: list, overall_score: float):
+        """Fold one completed session into the user's interview_stats document
+
+        Everything is applied in one update. The streak depends on the
+        previous practice day, so the update is conditional on it and
+        retried if another session of the same user got in first.
+        """
+        from pymongo.errors import DuplicateKeyError
+
+        now = datetime.now()
+        today = now.date().isoformat()
+        window = self.interview_stats_window
+        increments = {"sessions": 1, "score_sum": overall_score}
+        pushes = {"recent_scores": {"$each": [overall_score], "$slice": -window}}
+        names = {}
+
+        difficulty = _field_name(session.get("difficulty") or "") or "unknown"
+        increments.update({f"difficulties.{difficulty}.count": 1, f"difficulties.{difficulty}.score_sum": overall_score})
+        pushes[f"difficulties.{difficulty}.recent"] = {"$each": [overall_score], "$slice": -window}
+
+        # Question scores are 0-10; categories are kept on the 0-100 session scale
+        category_scores = {}
+        for question in questions:
+            if question.get("score") is None:
+                continue
+            category = question.get("category") or "general"
+            field = _field_name(category) or "general"
+            names[f"categories.{field}.name"] = category
+            category_scores.setdefault(field, []).append(float(question["score"]) * 10)
+        for field, scores in category_scores.items():
+            increments[f"categories.{field}.count"] = len(scores)
+            increments[f"categories.{field}.score_sum"] = sum(scores)
+            pushes[f"categories.{field}.recent"] = {"$each": scores, "$slice": -window}
+
+        latest = {
+            "session_id": session_id,
+            "score": overall_score,
+            "target_role": session.get("target_role"),
+            "difficulty": session.get("difficulty"),
+            "completed_at": now
+        }
+        user_id = session["user_id"]
+        for _ in range(5):
+            stats = await self.db.interview_stats.find_one({"_id": user_id}, {"streak": 1})
+            streak = (stats or {}).get("streak") or {}
+            last_day = streak.get("last_day")
+            if last_day == today:
+                current = streak.get("current", 1)
+            elif last_day and (now.date() - datetime.fromisoformat(last_day).date()).days == 1:
+                current = streak.get("current", 0) + 1
+            else:
+                current = 1
+            update = {
+                "$inc": increments,
+                "$push": pushes,
+                "$max": {"best_score": overall_score},
+                "$set": {
+                    **names,
+                    "latest": latest,
+                    "streak": {"current": current, "longest": max(current, streak.get("longest", 0)), "last_day": today},
+                    "updated_at": now
+                }
+            }
+            try:
+                result = await self.db.interview_stats.update_one(
+                    {"_id": user_id, "streak.last_day": last_day}, update, upsert=stats is None
+                )
+            except DuplicateKeyError:
+                continue  # Another session created the document first
+            if result.matched_count or result.upserted_id is not None:
+                return
+        logger.warning(f"Interview stats for user {user_id} not updated: too many concurrent sessions")
+
+    async def get_interview_stats(self, user_id: str) -> dict:
+        """Interview statistics of a user (one document, sessions are not read)"""
+        return await self.db.interview_stats.find_one({"_id": user_id})
+
+
+    # Role Catalog Methods
+    async def get_roles(self) -> list:
+        """Roles learned from traffic ({_id: key, name, aliases})"""
+        cursor = self.db.role_catalog.find({}, {"name": 1, "aliases": 1})
+        return await cursor.to_list(length=None)
+
+    async def save_role(self, key: str, name: str, aliases: list = None):
+        """Add a learned role (idempotent: workers may learn the same role)
+
+        Args:
+            key: Canonical role key
+            name: Display name (the first spelling seen)
+            aliases: Other spellings of the role
+        """
+        await self.db.role_catalog.update_one(
+            {"_id": key},
+            {
+                "$setOnInsert": {"name": name, "created_at": datetime.now()},
+                "$addToSet": {"aliases": {"$each": aliases or []}}
+            },
+            upsert=True
+        )
+
+    # Role Analytics Methods
+    async def _update_role_analytics(self, previous: dict, current: dict):
+        """Move one user's analysis between role stats (role_analytics collection)
+
+        Not transactional with the analysis write: a failure is logged and
+        rebuild_role_analytics() puts the stats right.
+        """
+        changes, names = {}, {}
+        for analysis, sign in ((previous, -1), (current, 1)):
+            if not analysis or not analysis.get("target_role"):
+                continue
+            key = analysis.get("role_key") or _role_slug(analysis["target_role"])
+            increments, skill_names = _analytics_increments(analysis, sign)
+            role_changes = changes.setdefault(key, {})
+            for field, amount in increments.items():
+                role_changes[field] = role_changes.get(field, 0) + amount
+            if sign > 0:
+                names[key] = (analysis["target_role"], skill_names)
+
+        now = datetime.now()
+        updates = []
+        for key, increments in changes.items():
+            increments = {field: amount for field, amount in increments.items() if amount}
+            if not increments:
+                continue  # Re-analysis with the same outcome
+            update = {"$inc": increments, "$set": {"updated_at": now}}
+            if key in names:
+                role_name, skill_names = names[key]
+                update["$set"]["name"] = role_name
+                update["$set"].update({f"skill_names.{field}": name for field, name in skill_names.items()})
+            updates.append(self.db.role_analytics.update_one({"_id": key}, update, upsert=True))
+        try:
+            await asyncio.gather(*updates)
+        except Exception as e:
+            logger.warning(f"Role analytics update failed: {e}")
+
+    async def get_role_analytics(self, role_key: str) -> dict:
+        """Stats of one role: a single document read, no aggregation"""
+        return await self.db.role_analytics.find_one({"_id": role_key})
+
+    async def rebuild_role_analytics(self, role_key=None) -> dict:
+        """Recompute role_analytics from skill_analyses
+
+        Analyses written while the rebuild runs may be missed; run it when
+        writes are quiet or run it again.
+
+        Args:
+            role_key: Maps a target role to its key, for analyses saved
+                without one (defaults to a slug of the role)
+
+        Returns:
+            {"analyses", "roles", "drifted": keys whose stored stats differed}
+        """
+        role_key = role_key or _role_slug
+        stats = {}
+        analyses = 0
+        async for analysis in self.db.skill_analyses.find({}, _ANALYTICS_FIELDS):
+            if not analysis.get("target_role"):
+                continue
+            analyses += 1
+            key = analysis.get("role_key") or role_key(analysis["target_role"])
+            role_stats = stats.setdefault(key, {"_id": key})
+            increments, skill_names = _analytics_increments(analysis, 1)
+            _apply_increments(role_stats, increments)
+            role_stats["name"] = analysis["target_role"]
+            role_stats.setdefault("skill_names", {}).update(skill_names)
+
+        stored = {doc["_id"]: doc async for doc in self.db.role_analytics.find({})}
+        drifted = sorted(
+            key for key in set(stats) | set(stored)
+            if _analytics_counts(stats.get(key, {})) != _analytics_counts(stored.get(key, {}))
+        )
+        now = datetime.now()
+        await asyncio.gather(*(
+            self.db.role_analytics.replace_one({"_id": key}, {**stats[key], "updated_at": now}, upsert=True)
+            for key in drifted if key in stats
+        ))
+        stale = [key for key in stored if key not in stats]
+        if stale:
+            await self.db.role_analytics.delete_many({"_id": {"$in": stale}})
+        return {"analyses": analyses, "roles": len(stats), "drifted": drifted}
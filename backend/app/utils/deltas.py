@@ -0,0 +1,128 @@
+"""Versioned JSON responses with JSON Patch deltas
+
+Roadmap views are fetched again and again while usually only a few fields
+(current_week, a completed flag) change. A client that holds version N of
+a document sends since_version=N and gets back only the changes, as an
+RFC 6902 JSON Patch (application/json-patch+json). Responses carry the
+current version in X-Version (and ETag); since_version equal to it gets
+304 Not Modified.
+
+The bodies of the last DELTA_SNAPSHOT_VERSIONS versions of each view are
+kept in one SharedState key for DELTA_SNAPSHOT_TTL seconds, so later
+requests can be diffed against them while storage per view stays bounded.
+When the client's version is no longer kept (or the patch would not be
+smaller) the full document is sent as usual.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+from fastapi import Response
+from app.utils.metrics import DELTA_RESPONSES
+from app.utils.responses import RawJSONResponse, dumps
+from app.utils.shared_state import SharedState
+
+PATCH_MEDIA_TYPE = "application/json-patch+json"
+
+
+def _token(key) -> str:
+    """JSON Pointer reference token (RFC 6901)"""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """RFC 6902 operations turning old into new (JSON-compatible values)
+
+    Objects are diffed key by key and lists item by item, with items added
+    or removed at the end; anything else that differs is replaced.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": f"{path}/{_token(key)}"} for key in old if key not in new]
+        for key, value in new.items():
+            if key in old:
+                ops.extend(json_patch(old[key], value, f"{path}/{_token(key)}"))
+            else:
+                ops.append({"op": "add", "path": f"{path}/{_token(key)}", "value": value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        ops = []
+        for index in range(common):
+            ops.extend(json_patch(old[index], new[index], f"{path}/{index}"))
+        # Remove from the end so earlier indexes stay valid
+        ops.extend({"op": "remove", "path": f"{path}/{index}"} for index in range(len(old) - 1, common - 1, -1))
+        ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[common:])
+        return ops
+    # 1 == 1.0 == True in Python, but not in JSON
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def composite_version(*parts: Any) -> str:
+    """Version of a view assembled from several documents
+
+    Args:
+        parts: Whatever identifies the current state of each document
+               (ids, versions, timestamps)
+    """
+    return hashlib.blake2s(dumps(list(parts)), digest_size=8).hexdigest()
+
+
+class DeltaResponder:
+    """Builds full, patch or 304 responses for versioned documents"""
+
+    def __init__(self, state: SharedState, ttl: float = None, versions: int = None):
+        self.state = state
+        self.ttl = ttl if ttl is not None else float(os.getenv("DELTA_SNAPSHOT_TTL", 3600))
+        self.versions = max(1, versions if versions is not None else int(os.getenv("DELTA_SNAPSHOT_VERSIONS", 3)))
+
+    @staticmethod
+    def headers(kind: str, doc_id: str, version) -> Dict[str, str]:
+        return {"X-Version": str(version), "ETag": f'"{kind}-{doc_id}-{version}"'}
+
+    def not_modified(self, kind: str, doc_id: str, version) -> Response:
+        DELTA_RESPONSES.inc(kind, "not_modified")
+        return Response(status_code=304, headers=self.headers(kind, doc_id, version))
+
+    async def respond(self, kind: str, doc_id: str, version, content: Any, since_version: Optional[str] = None) -> Response:
+        """Response for version `version` of a document
+
+        Args:
+            kind: Document kind (e.g. "roadmap"), part of the snapshot key
+            doc_id: Document identifier (including any view parameters)
+            version: Current version of the document
+            content: Current document
+            since_version: Version the client already holds, if any
+        """
+        version = str(version)
+        headers = self.headers(kind, doc_id, version)
+        if since_version == version:
+            return self.not_modified(kind, doc_id, version)
+
+        body = dumps(content)
+        if self.ttl <= 0:
+            DELTA_RESPONSES.inc(kind, "full")
+            return RawJSONResponse(body, headers=headers)
+
+        # [[version, body], ...], newest last
+        key = f"snapshot:{kind}:{doc_id}"
+        snapshots = await self.state.get(key) or []
+        kept = dict(snapshots)
+        if version not in kept:
+            snapshots = snapshots[-(self.versions - 1):] if self.versions > 1 else []
+            await self.state.set(key, snapshots + [[version, body.decode("utf-8")]], ttl=self.ttl)
+
+        if since_version:
+            base = kept.get(since_version)
+            if base is not None:
+                patch = dumps(json_patch(json.loads(base), json.loads(body)))
+                if len(patch) < len(body):
+                    DELTA_RESPONSES.inc(kind, "patch")
+                    return RawJSONResponse(
+                        patch,
+                        headers={**headers, "X-Base-Version": since_version},
+                        media_type=PATCH_MEDIA_TYPE
+                    )
+        DELTA_RESPONSES.inc(kind, "full")
+        return RawJSONResponse(body, headers=headers)
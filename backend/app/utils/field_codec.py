@@ -0,0 +1,140 @@
+"""Transparent compression of large fields stored in MongoDB
+
+LLM output (week descriptions, chat replies, interview answers and
+feedback) is verbose text. Database packs the fields it designates for a
+collection into one compressed value before writing and unpacks them
+after reading, so callers only ever see plain documents. Packing the
+fields of a document together compresses ~3x where compressing each
+few-hundred-byte field on its own gains little.
+
+Unpacking is lazy: reads that do not ask for any packed field (e.g.
+week_fields=["week", "topic"]) do not project the packed value at all,
+so nothing is fetched or decompressed for them.
+
+A packed document carries
+    {"_z": {"v": 1, "alg": "zstd" | "zlib", "data": Binary(JSON)}}
+instead of the fields, where "v" is the format version. Documents written
+without compression keep plain fields, so compression can be switched on
+and off at any time.
+
+    FIELD_COMPRESSION            off (default), zlib or zstd
+    FIELD_COMPRESSION_MIN_BYTES  documents whose fields are smaller are
+                                 stored as is
+"""
+import json
+import logging
+import os
+import zlib
+from typing import Iterable, List, Optional
+from bson import Binary
+from app.utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+PACKED_FIELD = "_z"
+ALGORITHMS = ("zlib", "zstd")
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _compress(algorithm: str, data: bytes) -> bytes:
+    if algorithm == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(algorithm: str, data: bytes) -> bytes:
+    if algorithm == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("Fields compressed with zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if algorithm == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown field compression: {algorithm}")
+
+
+def unpack(doc: Optional[dict], fields: Iterable[str] = None) -> Optional[dict]:
+    """Restore packed fields into a document (in place)
+
+    Args:
+        doc: Document as read from MongoDB
+        fields: Packed fields to restore; None restores all of them
+    """
+    if not doc or PACKED_FIELD not in doc:
+        return doc
+    packed = doc.pop(PACKED_FIELD)
+    if packed.get("v", 0) > FORMAT_VERSION:
+        raise ValueError(f"Field compression format {packed['v']} is newer than supported ({FORMAT_VERSION})")
+    values = json.loads(_decompress(packed["alg"], bytes(packed["data"])))
+    wanted = None if fields is None else set(fields)
+    for field, value in values.items():
+        if wanted is None or field in wanted:
+            doc[field] = value
+    return doc
+
+
+def projection_fields(fields: Iterable[str], packed_fields: Iterable[str]) -> List[str]:
+    """Fields to project for a read, with the packed value if it is needed"""
+    fields = list(fields)
+    if set(fields) & set(packed_fields):
+        fields.append(PACKED_FIELD)
+    return fields
+
+
+class FieldCodec:
+    """Packs designated fields of documents before they are written"""
+
+    def __init__(self, algorithm: str = None, min_bytes: int = None):
+        algorithm = (algorithm or os.getenv("FIELD_COMPRESSION", "off")).lower()
+        if algorithm not in ("off", *ALGORITHMS):
+            raise ValueError(f"Unknown FIELD_COMPRESSION: {algorithm}")
+        if algorithm == "zstd" and not zstd_available():
+            logger.warning("FIELD_COMPRESSION=zstd but zstandard is not installed, using zlib")
+            algorithm = "zlib"
+        self.algorithm = None if algorithm == "off" else algorithm
+        self.min_bytes = min_bytes if min_bytes is not None else int(os.getenv("FIELD_COMPRESSION_MIN_BYTES", 256))
+
+    @property
+    def enabled(self) -> bool:
+        return self.algorithm is not None
+
+    def pack(self, doc: dict, fields: Iterable[str]) -> dict:
+        """Copy of a document with the listed fields packed, if worth it"""
+        if not self.enabled:
+            return doc
+        values = {field: doc[field] for field in fields if doc.get(field) is not None}
+        if not values:
+            return doc
+        data = dumps(values)
+        if len(data) < self.min_bytes:
+            return doc
+        compressed = _compress(self.algorithm, data)
+        if len(compressed) >= len(data):
+            return doc
+        packed = {key: value for key, value in doc.items() if key not in values}
+        packed[PACKED_FIELD] = {"v": FORMAT_VERSION, "alg": self.algorithm, "data": Binary(compressed)}
+        return packed
+
+    def pack_update(self, values: dict, fields: Iterable[str]) -> dict:
+        """Update document setting values, packed or plain
+
+        All packed fields of a collection must be written together: the
+        other representation is removed so reads never mix the two.
+        """
+        fields = list(fields)
+        packed = self.pack(values, fields)
+        if PACKED_FIELD in packed:
+            unset = [field for field in fields if field not in packed]
+        else:
+            unset = [PACKED_FIELD]
+        return {"$set": packed, "$unset": {field: "" for field in unset}}
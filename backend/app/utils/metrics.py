@@ -0,0 +1,347 @@
+"""In-process metrics with Prometheus text exposition
+
+Recording is a dict lookup plus a few additions under a lock, so it is
+cheap enough to stay on the hot path. Everything is rendered on demand
+by the /metrics endpoint.
+"""
+from bisect import bisect_left
+from functools import wraps
+import inspect
+import threading
+import time
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value per label set that can go up and down"""
+
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram:
+    """Cumulative bucketed distribution per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labels) -> "_Timer":
+        """Context manager observing the elapsed time of its block"""
+        return _Timer(self, labels)
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        lines = []
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Tuple):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "llm_request_duration_seconds",
+    "LLM completion latency by AIService method",
+    ["method"],
+    buckets=LLM_BUCKETS
+))
+LLM_QUEUE_SECONDS = REGISTRY.register(Histogram(
+    "llm_queue_wait_seconds",
+    "Time AIService calls waited for an LLM concurrency slot",
+    ["method"]
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total",
+    "LLM tokens used by AIService method and kind (prompt/completion)",
+    ["method", "kind"]
+))
+LLM_FALLBACKS = REGISTRY.register(Counter(
+    "llm_fallbacks_total",
+    "AIService calls that returned a fallback instead of a model response",
+    ["method"]
+))
+LLM_RETRIES = REGISTRY.register(Counter(
+    "llm_retries_total",
+    "Follow-up completions for unusable or incomplete outputs by method and reason "
+    "(invalid_json/missing_fields/missing_items)",
+    ["method", "reason"]
+))
+LLM_OUTPUT_REPAIRS = REGISTRY.register(Counter(
+    "llm_output_repairs_total",
+    "LLM outputs kept in part by method and kind (json/dropped/filled)",
+    ["method", "kind"]
+))
+LLM_WASTED_TOKENS = REGISTRY.register(Counter(
+    "llm_wasted_tokens_total",
+    "Completion tokens spent on output that was discarded, by AIService method",
+    ["method"]
+))
+DB_OPERATION_SECONDS = REGISTRY.register(Histogram(
+    "db_operation_duration_seconds",
+    "MongoDB latency by Database method",
+    ["method"]
+))
+PDF_EXTRACTION_SECONDS = REGISTRY.register(Histogram(
+    "pdf_extraction_duration_seconds",
+    "PDF text extraction time per document"
+))
+PDF_EXTRACTION_TRUNCATED = REGISTRY.register(Counter(
+    "pdf_extraction_truncated_total",
+    "PDF extractions cut short by the page or character budget",
+    ["budget"]
+))
+RESUME_PARSE_PATH = REGISTRY.register(Counter(
+    "resume_parse_path_total",
+    "Resume parses by path: local (no LLM), partial (LLM for some fields) or llm",
+    ["path"]
+))
+BATCH_RESUMES = REGISTRY.register(Counter(
+    "batch_resumes_total",
+    "Resumes processed by batch ingestion by outcome (saved/error)",
+    ["outcome"]
+))
+RATE_LIMITED = REGISTRY.register(Counter(
+    "rate_limited_requests_total",
+    "Requests rejected with 429 by the per-user rate limit",
+    ["route"]
+))
+REQUESTS_COALESCED = REGISTRY.register(Counter(
+    "coalesced_requests_total",
+    "Duplicate requests served from another request's result (in_flight/recent/worker)",
+    ["route", "source"]
+))
+ROLE_RESOLUTIONS = REGISTRY.register(Counter(
+    "role_resolutions_total",
+    "Target roles resolved to a canonical role by outcome (exact/matched/learned/unmatched)",
+    ["outcome"]
+))
+ROLE_CACHE = REGISTRY.register(Counter(
+    "role_cache_requests_total",
+    "Role-keyed cache lookups by kind (requirements/questions) and outcome (hit/miss)",
+    ["kind", "outcome"]
+))
+ROADMAP_COMPOSITIONS = REGISTRY.register(Counter(
+    "roadmap_compositions_total",
+    "Roadmaps built from the curriculum library by mode (library/polish/fallback/fill)",
+    ["mode"]
+))
+RESPONSE_COMPRESSION_BYTES = REGISTRY.register(Counter(
+    "response_compression_bytes_total",
+    "Response body bytes before (raw) and after (sent) compression by encoding",
+    ["encoding", "kind"]
+))
+DELTA_RESPONSES = REGISTRY.register(Counter(
+    "delta_responses_total",
+    "Versioned responses by document kind and type (full/patch/not_modified)",
+    ["kind", "type"]
+))
+LIVE_CONNECTIONS = REGISTRY.register(Gauge(
+    "live_connections",
+    "Open dashboard WebSocket connections"
+))
+CHANGE_EVENTS = REGISTRY.register(Counter(
+    "change_events_total",
+    "Change events seen by source (change_stream/local) and collection",
+    ["source", "collection"]
+))
+CHANGE_EVENTS_DROPPED = REGISTRY.register(Counter(
+    "change_events_dropped_total",
+    "Changes dropped for connections whose send queue was full (they get a resync event)"
+))
+PROFILER_RUNS = REGISTRY.register(Counter(
+    "profiler_runs_total",
+    "Completed on-demand profiling windows by mode (sample/requests)",
+    ["mode"]
+))
+SPECULATIVE_ANALYSES = REGISTRY.register(Counter(
+    "speculative_analysis_total",
+    "Speculative skill analyses by outcome (started/hits/misses/wasted/skipped_budget)",
+    ["outcome"]
+))
+
+
+def timed_methods(histogram: Histogram):
+    """Class decorator recording the latency of every public coroutine method
+
+    The method name is used as the only label value.
+    """
+    def decorate(cls):
+        for name, func in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(func):
+                continue
+            setattr(cls, name, _timed_coroutine(func, histogram, name))
+        return cls
+    return decorate
+
+
+def _timed_coroutine(func, histogram: Histogram, label: str):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start, label)
+    return wrapper
+
+
+def route_template(scope) -> str:
+    """Route path template matched for an ASGI scope, including router prefix"""
+    # Newer FastAPI versions resolve included routers lazily and keep the
+    # prefixed path on the effective route context instead of the route
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    path = getattr(effective, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template
+
+    The route template (e.g. /api/dashboard/{user_id}) is used instead of
+    the raw path so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope.get("method", ""),
+                route_template(scope),
+                status[0]
+            )
@@ -0,0 +1,328 @@
+"""On-demand CPU profiling of one worker
+
+Started for a time window from the admin endpoint, one run at a time per
+worker, in one of two modes:
+    sample    a background thread records the stack of every thread
+              (sys._current_frames) once per interval. Requests run
+              unchanged; the process pays a few tens of microseconds per
+              sample (well under 1% at the default 10 ms interval).
+    requests  requests whose path starts with a prefix run under cProfile,
+              one at a time and up to a maximum count. cProfile follows the
+              event loop thread, so other requests interleaved on the loop
+              would be slowed (and included) too: a request is only picked
+              while no other request is in flight, and profiling stops after
+              PROFILER_REQUEST_MAX_MS even if it is still running. Thread pool
+              work is not included.
+
+Both produce flamegraph collapsed stacks, one "frame;frame;frame count"
+line per stack, for flamegraph.pl, speedscope or inferno. Counts are
+samples in sample mode and microseconds in requests mode.
+
+    PROFILER_MAX_SECONDS    longest window that can be requested
+    PROFILER_REQUEST_MAX_MS longest time one request is profiled in requests mode
+"""
+import asyncio
+import contextvars
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.utils.metrics import PROFILER_RUNS
+
+# (file name, function) of leaf frames that mean a thread is waiting
+_IDLE_LEAVES = {
+    ("selectors.py", "select"), ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"), ("thread.py", "_worker")
+}
+_MAX_DEPTH = 128
+# Set while a request counted in Profiler.active runs, so a window opened
+# from a request does not count that request as another one in flight
+_counted = contextvars.ContextVar("profiler_counted", default=False)
+
+
+class ProfilerBusy(Exception):
+    """A profile is already running in this worker"""
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    """File name relative to the sys.path entry it was imported from"""
+    for entry in sorted((p for p in sys.path if p), key=len, reverse=True):
+        prefix = entry.rstrip(os.sep) + os.sep
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _code_frame(code) -> str:
+    return f"{_short_path(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}".replace(";", ",")
+
+
+def _pstats_frame(func: tuple) -> str:
+    filename, _, name = func
+    if filename == "~":
+        # Built-in, e.g. "<method 'encode' of 'str' objects>"
+        return name.replace(";", ",")
+    return f"{_short_path(filename)}:{name}".replace(";", ",")
+
+
+def collapsed(stacks: Dict[str, int]) -> str:
+    """Collapsed stack text, heaviest stacks first"""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, int]:
+    """Turn cProfile caller/callee totals into collapsed stacks (microseconds)
+
+    cProfile keeps one edge per caller/callee pair rather than whole
+    stacks, so time is split down the call graph in proportion to each
+    edge's share of the callee's cumulative time.
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+    stacks = Counter()
+
+    def walk(func: tuple, path: tuple, on_path: frozenset, seconds: float):
+        _, _, own, cumulative, _ = entries[func]
+        if cumulative <= 0:
+            return
+        share = min(1.0, seconds / cumulative)
+        path = path + (_pstats_frame(func),)
+        own_us = int(own * share * 1e6)
+        if own_us:
+            stacks[";".join(path)] += own_us
+        if len(path) >= _MAX_DEPTH:
+            return
+        on_path = on_path | {func}
+        for callee, edge_seconds in callees.get(func, {}).items():
+            if callee not in on_path and edge_seconds * share >= 1e-6:
+                walk(callee, path, on_path, edge_seconds * share)
+
+    for func, (_, _, _, cumulative, callers) in entries.items():
+        if not callers and "_lsprof.Profiler" not in func[2]:
+            walk(func, (), frozenset(), cumulative)
+    return dict(stacks)
+
+
+class _RequestWindow:
+    """Requests to profile while a requests-mode run is open"""
+
+    def __init__(self, path_prefix: str, max_requests: int, own_requests: int = 0):
+        self.path_prefix = path_prefix
+        self.max_requests = max_requests
+        # Requests in flight that belong to the window (the admin request)
+        self.own_requests = own_requests
+        self.started = 0
+        self.skipped = 0
+        self.capped = 0
+        self.in_flight = False
+        self.profiles: List[cProfile.Profile] = []
+
+    def claim(self, path: str, running: int) -> bool:
+        """Whether this request is profiled
+
+        One at a time, up to max_requests, and only while no other request
+        is in flight (running counts every request, this one included).
+        """
+        if self.in_flight or self.started >= self.max_requests or not path.startswith(self.path_prefix):
+            return False
+        if running - 1 - self.own_requests > 0:
+            self.skipped += 1
+            return False
+        self.in_flight = True
+        self.started += 1
+        return True
+
+
+class Profiler:
+    """Runs one profiling window at a time in this worker"""
+
+    def __init__(self, max_seconds: float = None):
+        self.max_seconds = max_seconds or float(os.getenv("PROFILER_MAX_SECONDS", 120))
+        self.request_max_seconds = float(os.getenv("PROFILER_REQUEST_MAX_MS", 250)) / 1000
+        self.mode: Optional[str] = None
+        self.request_window: Optional[_RequestWindow] = None
+        # HTTP requests in flight in this worker (kept by ProfilerMiddleware)
+        self.active = 0
+
+    def _acquire(self, mode: str):
+        # No await between the check and the set, so this is atomic on the loop
+        if self.mode is not None:
+            raise ProfilerBusy(f"A {self.mode} profile is already running in this worker")
+        self.mode = mode
+
+    async def sample(self, seconds: float, interval: float = 0.01, include_idle: bool = False) -> dict:
+        """Sample the stacks of all threads for a time window
+
+        Args:
+            seconds: Window length
+            interval: Seconds between samples
+            include_idle: Keep samples of threads that are only waiting
+
+        Returns:
+            Dictionary with the collapsed stacks and the number of samples
+        """
+        self._acquire("sample")
+        stop = threading.Event()
+        raw = Counter()
+        ticks = [0]
+
+        def run():
+            me = threading.get_ident()
+            names = {}
+            while not stop.wait(interval):
+                ticks[0] += 1
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    codes = []
+                    while frame is not None:
+                        codes.append(frame.f_code)
+                        frame = frame.f_back
+                    name = names.get(ident)
+                    if name is None:
+                        names.update((t.ident, t.name) for t in threading.enumerate())
+                        name = names.get(ident, str(ident))
+                    raw[(name, tuple(codes))] += 1
+
+        thread = threading.Thread(target=run, name="profiler-sampler", daemon=True)
+        start = time.perf_counter()
+        try:
+            thread.start()
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(thread.join)
+            self.mode = None
+        PROFILER_RUNS.inc("sample")
+
+        def collapse() -> Dict[str, int]:
+            stacks = Counter()
+            for (thread_name, codes), count in raw.items():
+                leaf = codes[0]
+                if not include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                    continue
+                frames = [thread_name] + [_code_frame(code) for code in reversed(codes[:_MAX_DEPTH])]
+                stacks[";".join(frames)] += count
+            return dict(stacks)
+
+        stacks = await asyncio.to_thread(collapse)
+        return {
+            "mode": "sample",
+            "seconds": round(time.perf_counter() - start, 3),
+            "samples": ticks[0],
+            "unit": "samples",
+            "stacks": stacks
+        }
+
+    async def profile_requests(self, seconds: float, path_prefix: str = "/api/", max_requests: int = 20) -> dict:
+        """Run matching requests under cProfile for a time window
+
+        Args:
+            seconds: Window length (ends early once max_requests finished)
+            path_prefix: Only requests whose path starts with it are profiled
+            max_requests: Most requests to profile
+
+        Returns:
+            Dictionary with the collapsed stacks, the number of requests
+            profiled, skipped (others in flight) and capped (profiling
+            stopped at PROFILER_REQUEST_MAX_MS)
+        """
+        self._acquire("requests")
+        window = _RequestWindow(path_prefix, max_requests, 1 if _counted.get() else 0)
+        start = time.perf_counter()
+        self.request_window = window
+        try:
+            deadline = start + seconds
+            while time.perf_counter() < deadline and len(window.profiles) < max_requests:
+                await asyncio.sleep(min(0.1, max(0.0, deadline - time.perf_counter())))
+        finally:
+            self.request_window = None
+            self.mode = None
+        PROFILER_RUNS.inc("requests")
+        # A request still running when the window closed is left out
+        profiles = list(window.profiles)
+
+        def collapse() -> Dict[str, int]:
+            if not profiles:
+                return {}
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            return collapse_pstats(stats)
+
+        stacks = await asyncio.to_thread(collapse)
+        return {
+            "mode": "requests",
+            "seconds": round(time.perf_counter() - start, 3),
+            "requests": len(profiles),
+            "skipped": window.skipped,
+            "capped": window.capped,
+            "unit": "microseconds",
+            "stacks": stacks
+        }
+
+
+# One per worker process, like the metrics registry
+PROFILER = Profiler()
+
+
+class ProfilerMiddleware:
+    """ASGI middleware running flagged requests under cProfile
+
+    Counts HTTP requests in flight; outside a requests-mode window that and
+    an attribute check is all it does.
+    """
+
+    def __init__(self, app, profiler: Profiler = None):
+        self.app = app
+        self.profiler = profiler or PROFILER
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profiler = self.profiler
+        profiler.active += 1
+        token = _counted.set(True)
+        try:
+            window = profiler.request_window
+            if window is None or not window.claim(scope["path"], profiler.active):
+                await self.app(scope, receive, send)
+            else:
+                await self._profiled(window, scope, receive, send)
+        finally:
+            _counted.reset(token)
+            profiler.active -= 1
+
+    async def _profiled(self, window: _RequestWindow, scope, receive, send):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is active
+            window.in_flight = False
+            await self.app(scope, receive, send)
+            return
+
+        def cap():
+            # Requests arriving meanwhile share the loop; stop slowing them
+            profile.disable()
+            window.capped += 1
+
+        timer = asyncio.get_running_loop().call_later(self.profiler.request_max_seconds, cap)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            timer.cancel()
+            profile.disable()
+            window.in_flight = False
+            window.profiles.append(profile)
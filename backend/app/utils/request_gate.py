@@ -0,0 +1,153 @@
+"""Request coalescing and per-user rate limits for the AI endpoints
+
+Identical requests (same user, route and normalized parameters) share one
+computation: duplicates that arrive while it runs await the same result,
+and duplicates that arrive within COALESCE_RESULT_TTL seconds after it
+finished get the stored result. Through a host-wide SharedState this also
+works across worker processes.
+
+Requests that would start a new computation first take a token from a
+per-user, per-route bucket. There are no limits unless RATE_LIMITS is
+set, e.g.
+
+    RATE_LIMITS="default=20/5,generate-roadmap=6/2"
+
+meaning 20 requests per minute with bursts of 5 for every route, and 6
+per minute with bursts of 2 for generate-roadmap. 0 disables a limit.
+Buckets idle for SHARED_STATE_BUCKET_IDLE_SECONDS are dropped.
+Duplicates served from a running or recent result consume no tokens.
+
+A failed computation is not shared: its error goes to the request that
+started it, and requests that joined it start (or join) a new one.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from app.utils.metrics import RATE_LIMITED, REQUESTS_COALESCED
+from app.utils.shared_state import SharedState
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a user's bucket for a route is empty"""
+
+    def __init__(self, route: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {route}, retry in {math.ceil(retry_after)}s")
+        self.route = route
+        self.retry_after = retry_after
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse "route=per_minute/burst,..." into {route: (per_minute, burst)}"""
+    limits = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        route, _, quota = item.partition("=")
+        per_minute, _, burst = quota.partition("/")
+        per_minute = float(per_minute)
+        limits[route.strip()] = (per_minute, float(burst) if burst else max(1.0, per_minute))
+    return limits
+
+
+class RequestGate:
+    """Coalesces duplicate requests and rate limits new ones"""
+
+    def __init__(self, state: SharedState, limits: Dict[str, Tuple[float, float]] = None,
+                 result_ttl: float = None, lease_seconds: float = None):
+        self.state = state
+        self.limits = {"default": (0.0, 0.0), **parse_rate_limits(os.getenv("RATE_LIMITS", "")), **(limits or {})}
+        self.result_ttl = result_ttl if result_ttl is not None else float(os.getenv("COALESCE_RESULT_TTL", 5))
+        # Longest a computation may hold the key before others stop waiting
+        self.lease_seconds = lease_seconds if lease_seconds is not None else \
+            float(os.getenv("COALESCE_LEASE_SECONDS", 180))
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def key(route: str, user_id: str, params: Dict) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        return f"{route}:{user_id}:{digest}"
+
+    async def check_rate(self, route: str, user_id: str):
+        """Take one token from the user's bucket or raise RateLimitExceeded"""
+        per_minute, burst = self.limits.get(route, self.limits["default"])
+        if per_minute <= 0:
+            return
+        allowed, retry_after = await self.state.take_tokens(f"ratelimit:{route}:{user_id}", per_minute / 60, burst)
+        if not allowed:
+            RATE_LIMITED.inc(route)
+            raise RateLimitExceeded(route, retry_after)
+
+    async def run(self, route: str, user_id: str, params: Dict, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return compute()'s result, sharing it with identical requests
+
+        Args:
+            route: Route name (also selects the rate limit)
+            user_id: Requesting user
+            params: Normalized request parameters
+            compute: Produces a JSON-serializable result
+
+        Raises:
+            RateLimitExceeded: the request would start a new computation
+                and the user's bucket is empty
+        """
+        key = self.key(route, user_id, params)
+        for attempt in range(2):
+            running = self._inflight.get(key)
+            if running is None:
+                break
+            REQUESTS_COALESCED.inc(route, "in_flight")
+            try:
+                return await asyncio.shield(running)
+            except Exception:
+                if attempt:
+                    raise
+                # The computation we joined failed; its error belongs to the
+                # request that started it, so join or start a new one once
+
+        recent = await self.state.get(f"coalesce:result:{key}")
+        if recent is not None:
+            REQUESTS_COALESCED.inc(route, "recent")
+            return recent
+
+        await self.check_rate(route, user_id)
+
+        task = asyncio.ensure_future(self._lead(route, key, compute))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _lead(self, route: str, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Compute under a host-wide lease, or wait for the worker holding it"""
+        slot, result_key = f"coalesce:{key}", f"coalesce:result:{key}"
+        deadline = time.monotonic() + self.lease_seconds
+        delay = 0.02
+        while True:
+            token = await self.state.acquire_slot(slot, 1, self.lease_seconds)
+            if token is not None:
+                break
+            # Another worker is computing it
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            result = await self.state.get(result_key)
+            if result is not None:
+                REQUESTS_COALESCED.inc(route, "worker")
+                return result
+            if time.monotonic() > deadline:
+                return await compute()
+
+        try:
+            # The previous holder may have finished between our checks
+            result = await self.state.get(result_key)
+            if result is not None:
+                REQUESTS_COALESCED.inc(route, "worker")
+                return result
+            result = await compute()
+            if self.result_ttl > 0:
+                await self.state.set(result_key, result, ttl=self.result_ttl)
+            return result
+        finally:
+            await self.state.release_slot(slot, token)
@@ -0,0 +1,62 @@
+"""JSON serialization at the edge
+
+Documents from MongoDB (ObjectId, datetime) are written straight to bytes
+in one pass with orjson, instead of jsonable_encoder building a converted
+copy of the whole document and json.dumps walking it again. Falls back to
+the standard library when orjson is not installed.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+import json
+from typing import Any
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    """Types neither serializer handles natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        # orjson serializes these itself; only the stdlib path gets here
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(content: Any) -> bytes:
+        """Serialize to JSON bytes (ObjectId as str, datetime as ISO 8601)"""
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+else:
+    def dumps(content: Any) -> bytes:
+        """Serialize to JSON bytes (ObjectId as str, datetime as ISO 8601)"""
+        return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that accepts raw MongoDB documents
+
+    Return it directly from a route to skip FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(JSONResponse):
+    """Response for a body that is already serialized (bytes or str)"""
+
+    def render(self, content: Any) -> bytes:
+        return content.encode("utf-8") if isinstance(content, str) else content
@@ -0,0 +1,356 @@
+"""State shared by caches, rate limiters and the LLM concurrency governor
+
+Two backends with the same async interface:
+
+    MemoryState  - per-process dictionaries (default, single worker)
+    SQLiteState  - a local SQLite file in WAL mode, shared by every worker
+                   process on the host (uvicorn --workers / gunicorn)
+
+Select with SHARED_STATE_BACKEND=memory|sqlite and SHARED_STATE_PATH.
+Values must be JSON-serializable.
+
+Expired keys are also removed without being read: every
+SHARED_STATE_SWEEP_SECONDS a write sweeps out expired keys and slot
+leases, and token buckets idle for SHARED_STATE_BUCKET_IDLE_SECONDS
+(refilled by then at any realistic rate, so dropping them changes nothing).
+"""
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+
+def _sweep_settings() -> Tuple[float, float]:
+    return (
+        float(os.getenv("SHARED_STATE_SWEEP_SECONDS", 60)),
+        float(os.getenv("SHARED_STATE_BUCKET_IDLE_SECONDS", 3600))
+    )
+
+
+class SharedState(ABC):
+    """Interface implemented by the state backends"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Value of a key, or None if it is missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, expiring after ttl seconds if given"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a key if present"""
+
+    @abstractmethod
+    async def pop(self, key: str) -> Any:
+        """Atomically get and delete a key"""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add to a counter and return the new value
+
+        ttl applies when the counter is created; later increments keep its expiry.
+        """
+
+    @abstractmethod
+    async def take_tokens(self, key: str, rate: float, capacity: float, cost: float = 1) -> Tuple[bool, float]:
+        """Token bucket: take `cost` tokens refilling at `rate` per second
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+
+    @abstractmethod
+    async def acquire_slot(self, name: str, limit: int, lease_seconds: float) -> Optional[str]:
+        """Take one of `limit` slots; returns a token or None when all are in use
+
+        Leases expire after lease_seconds so a crashed worker cannot hold a
+        slot forever.
+        """
+
+    @abstractmethod
+    async def release_slot(self, name: str, token: str):
+        """Give back a slot taken with acquire_slot"""
+
+    def close(self):
+        pass
+
+
+class MemoryState(SharedState):
+    """Per-process backend; all calls run on the event loop"""
+
+    def __init__(self):
+        self._values = {}  # key -> (value, expires)
+        self._buckets = {}  # key -> (tokens, updated)
+        self._slots = {}  # name -> {token: expires}
+        self.sweep_interval, self.bucket_idle = _sweep_settings()
+        self._next_sweep = time.time() + self.sweep_interval
+
+    def _maybe_sweep(self, now: float):
+        """Drop expired keys, leases and idle buckets (amortized over writes)"""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        self._values = {k: item for k, item in self._values.items() if item[1] is None or item[1] >= now}
+        idle = now - self.bucket_idle
+        self._buckets = {k: bucket for k, bucket in self._buckets.items() if bucket[1] >= idle}
+        for name in list(self._slots):
+            slots = {token: expires for token, expires in self._slots[name].items() if expires > now}
+            if slots:
+                self._slots[name] = slots
+            else:
+                del self._slots[name]
+
+    def _live(self, key: str):
+        item = self._values.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] < time.time():
+            del self._values[key]
+            return None
+        return item
+
+    async def get(self, key: str) -> Any:
+        item = self._live(key)
+        return item[0] if item else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        self._maybe_sweep(now)
+        self._values[key] = (value, now + ttl if ttl else None)
+
+    async def delete(self, key: str):
+        self._values.pop(key, None)
+
+    async def pop(self, key: str) -> Any:
+        item = self._live(key)
+        self._values.pop(key, None)
+        return item[0] if item else None
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        self._maybe_sweep(now)
+        item = self._live(key)
+        value = (item[0] if item else 0) + amount
+        expires = item[1] if item else (now + ttl if ttl else None)
+        self._values[key] = (value, expires)
+        return value
+
+    async def take_tokens(self, key: str, rate: float, capacity: float, cost: float = 1) -> Tuple[bool, float]:
+        now = time.time()
+        self._maybe_sweep(now)
+        tokens, updated = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens >= cost:
+            self._buckets[key] = (tokens - cost, now)
+            return True, 0.0
+        self._buckets[key] = (tokens, now)
+        return False, (cost - tokens) / rate if rate > 0 else float("inf")
+
+    async def acquire_slot(self, name: str, limit: int, lease_seconds: float) -> Optional[str]:
+        now = time.time()
+        slots = {token: expires for token, expires in self._slots.get(name, {}).items() if expires > now}
+        self._slots[name] = slots
+        if len(slots) >= limit:
+            return None
+        token = secrets.token_hex(8)
+        slots[token] = now + lease_seconds
+        return token
+
+    async def release_slot(self, name: str, token: str):
+        slots = self._slots.get(name, {})
+        slots.pop(token, None)
+        if not slots:
+            self._slots.pop(name, None)
+
+
+class SQLiteState(SharedState):
+    """Host-wide backend on a local SQLite file
+
+    Every read-modify-write runs in a BEGIN IMMEDIATE transaction, so the
+    operations stay atomic across worker processes. Calls run in a thread
+    to keep the event loop free while SQLite waits on its file lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL);
+            CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL);
+            CREATE TABLE IF NOT EXISTS slots (token TEXT PRIMARY KEY, name TEXT NOT NULL, expires REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS slots_name ON slots (name, expires);
+            CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires);
+            CREATE INDEX IF NOT EXISTS buckets_updated ON buckets (updated);
+        """)
+        self.sweep_interval, self.bucket_idle = _sweep_settings()
+        # Each worker sweeps on its own schedule; the deletes are idempotent
+        self._next_sweep = time.time() + self.sweep_interval
+
+    def _transaction(self, fn):
+        with self._lock:
+            now = time.time()
+            if now >= self._next_sweep:
+                self._next_sweep = now + self.sweep_interval
+                self._execute(self._sweep, now)
+            return self._execute(fn, now)
+
+    def _execute(self, fn, now: float):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(self._conn, now)
+            self._conn.execute("COMMIT")
+            return result
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _sweep(self, conn, now: float):
+        """Drop expired keys, leases and idle buckets"""
+        conn.execute("DELETE FROM kv WHERE expires < ?", (now,))
+        conn.execute("DELETE FROM buckets WHERE updated < ?", (now - self.bucket_idle,))
+        conn.execute("DELETE FROM slots WHERE expires <= ?", (now,))
+
+    async def _run(self, fn):
+        return await asyncio.to_thread(self._transaction, fn)
+
+    @staticmethod
+    def _read(conn, key: str, now: float):
+        row = conn.execute("SELECT value, expires FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] < now:
+            conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            return None
+        return row
+
+    async def get(self, key: str) -> Any:
+        def op(conn, now):
+            row = self._read(conn, key, now)
+            return json.loads(row[0]) if row else None
+        return await self._run(op)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        def op(conn, now):
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl if ttl else None)
+            )
+        await self._run(op)
+
+    async def delete(self, key: str):
+        await self._run(lambda conn, now: conn.execute("DELETE FROM kv WHERE key = ?", (key,)))
+
+    async def pop(self, key: str) -> Any:
+        def op(conn, now):
+            row = self._read(conn, key, now)
+            conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+            return json.loads(row[0]) if row else None
+        return await self._run(op)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        def op(conn, now):
+            row = self._read(conn, key, now)
+            value = (json.loads(row[0]) if row else 0) + amount
+            expires = row[1] if row else (now + ttl if ttl else None)
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires)
+            )
+            return value
+        return await self._run(op)
+
+    async def take_tokens(self, key: str, rate: float, capacity: float, cost: float = 1) -> Tuple[bool, float]:
+        def op(conn, now):
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                (key, tokens, now)
+            )
+            if allowed:
+                return True, 0.0
+            return False, (cost - tokens) / rate if rate > 0 else float("inf")
+        return await self._run(op)
+
+    async def acquire_slot(self, name: str, limit: int, lease_seconds: float) -> Optional[str]:
+        def op(conn, now):
+            conn.execute("DELETE FROM slots WHERE name = ? AND expires <= ?", (name, now))
+            in_use = conn.execute("SELECT COUNT(*) FROM slots WHERE name = ?", (name,)).fetchone()[0]
+            if in_use >= limit:
+                return None
+            token = secrets.token_hex(8)
+            conn.execute(
+                "INSERT INTO slots (token, name, expires) VALUES (?, ?, ?)",
+                (token, name, now + lease_seconds)
+            )
+            return token
+        return await self._run(op)
+
+    async def release_slot(self, name: str, token: str):
+        await self._run(lambda conn, now: conn.execute("DELETE FROM slots WHERE token = ?", (token,)))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ConcurrencyGovernor:
+    """Caps concurrent operations (e.g. LLM calls) through a SharedState
+
+    With MemoryState the cap is per process; with SQLiteState it is shared
+    by all workers on the host.
+    """
+
+    def __init__(self, state: SharedState, name: str, limit: int, lease_seconds: float = 180):
+        self.state = state
+        self.name = name
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot and hold it for the duration of the block
+
+        Yields the seconds spent waiting.
+        """
+        if self.limit <= 0:
+            yield 0.0
+            return
+
+        start = time.perf_counter()
+        delay = 0.01
+        token = await self.state.acquire_slot(self.name, self.limit, self.lease_seconds)
+        while token is None:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            token = await self.state.acquire_slot(self.name, self.limit, self.lease_seconds)
+
+        try:
+            yield time.perf_counter() - start
+        finally:
+            await self.state.release_slot(self.name, token)
+
+
+def create_shared_state() -> SharedState:
+    """Build the backend selected by SHARED_STATE_BACKEND"""
+    backend = os.getenv("SHARED_STATE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return MemoryState()
+    if backend == "sqlite":
+        return SQLiteState(os.getenv("SHARED_STATE_PATH", "career_navigator_state.db"))
+    raise ValueError(f"Unknown SHARED_STATE_BACKEND: {backend}")
@@ -0,0 +1,340 @@
+"""Lightweight in-process request tracing
+
+A trace is started per request by TracingMiddleware and propagated through
+a context variable, so nested spans (Database calls, AIService calls, PDF
+extraction) attach to the right request even across asyncio.gather.
+
+Spans are only recorded when a trace is active: that is when an exporter is
+configured or the request asked for ?debug_timing=1. Otherwise span() is a
+no-op.
+
+Configuration:
+    TRACE_EXPORT_PATH: write finished spans as JSON lines to this file
+    OTEL_EXPORTER_OTLP_ENDPOINT: send finished traces as OTLP/HTTP JSON
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+import inspect
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from app.utils.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "end", "attributes", "children", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.attributes = attributes or {}
+        self.children: List["Span"] = []
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.time()
+        return round((end - self.start) * 1000, 3)
+
+    def to_record(self) -> Dict:
+        """Flat representation used by the JSON lines exporter"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+    def to_tree(self, origin: Optional[float] = None) -> Dict:
+        """Nested representation returned for ?debug_timing=1"""
+        origin = self.start if origin is None else origin
+        node = {
+            "name": self.name,
+            "start_offset_ms": round((self.start - origin) * 1000, 3),
+            "duration_ms": self.duration_ms,
+        }
+        if self.attributes:
+            node["attributes"] = self.attributes
+        if self.error:
+            node["error"] = self.error
+        if self.children:
+            node["children"] = [child.to_tree(origin) for child in sorted(self.children, key=lambda s: s.start)]
+        return node
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace id of the active request, if any"""
+    active = _current_span.get()
+    return active.trace_id if active else None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Record a child span of the active span; no-op outside a trace"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(name, parent.trace_id, parent.span_id, attributes)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = repr(e)
+        raise
+    finally:
+        child.end = time.time()
+        _current_span.reset(token)
+
+
+def traced_methods(prefix: str):
+    """Class decorator wrapping every public coroutine method in a span"""
+    def decorate(cls):
+        for name, func in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(func):
+                continue
+            setattr(cls, name, _traced_coroutine(func, f"{prefix}.{name}"))
+        return cls
+    return decorate
+
+
+def _traced_coroutine(func, span_name: str):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _current_span.get() is None:
+            return await func(*args, **kwargs)
+        with span(span_name):
+            return await func(*args, **kwargs)
+    return wrapper
+
+
+class _JsonLinesExporter:
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, root: Span):
+        with open(self.path, "a", encoding="utf-8") as fh:
+            for item in root.walk():
+                fh.write(json.dumps(item.to_record(), default=str) + "\n")
+
+
+class _OtlpExporter:
+    """Minimal OTLP/HTTP JSON exporter (no opentelemetry dependency)"""
+
+    def __init__(self, endpoint: str, service_name: str):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+
+    @staticmethod
+    def _attributes(values: Dict) -> List[Dict]:
+        return [{"key": key, "value": {"stringValue": str(value)}} for key, value in values.items()]
+
+    def export(self, root: Span):
+        spans = []
+        for item in root.walk():
+            otlp_span = {
+                "traceId": item.trace_id,
+                "spanId": item.span_id,
+                "name": item.name,
+                "kind": 1,
+                "startTimeUnixNano": str(int(item.start * 1e9)),
+                "endTimeUnixNano": str(int((item.end or item.start) * 1e9)),
+                "attributes": self._attributes(item.attributes),
+                "status": {"code": 2, "message": item.error} if item.error else {"code": 1}
+            }
+            if item.parent_id:
+                otlp_span["parentSpanId"] = item.parent_id
+            spans.append(otlp_span)
+
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+                "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": spans}]
+            }]
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        urllib.request.urlopen(request, timeout=5).close()
+
+
+class TraceExporter:
+    """Exports finished traces from a background thread, off the request path"""
+
+    def __init__(self):
+        # Configured on first use so variables loaded from .env are seen
+        self._exporters = None
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=1000)
+        self._thread = None
+
+    def _configure(self):
+        self._exporters = []
+        if os.getenv("TRACE_EXPORT_PATH"):
+            self._exporters.append(_JsonLinesExporter(os.getenv("TRACE_EXPORT_PATH")))
+        if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            self._exporters.append(_OtlpExporter(
+                os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"),
+                os.getenv("OTEL_SERVICE_NAME", "ai-career-navigator-backend")
+            ))
+
+    @property
+    def enabled(self) -> bool:
+        if self._exporters is None:
+            self._configure()
+        return bool(self._exporters)
+
+    def submit(self, root: Span):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(root)
+        except queue.Full:
+            logger.warning("Trace export queue full, dropping trace")
+
+    def _run(self):
+        while True:
+            root = self._queue.get()
+            for exporter in self._exporters:
+                try:
+                    exporter.export(root)
+                except Exception as e:
+                    logger.warning(f"Trace export failed: {e}")
+
+
+EXPORTER = TraceExporter()
+
+
+def _incoming_trace_id(scope) -> Optional[str]:
+    """Reuse the trace id from a W3C traceparent header if present"""
+    for key, value in scope.get("headers", []):
+        if key == b"traceparent":
+            parts = value.decode("latin-1").split("-")
+            if len(parts) == 4 and len(parts[1]) == 32:
+                return parts[1]
+    return None
+
+
+def debug_timing_requested(scope) -> bool:
+    """Whether the request asked for ?debug_timing=1"""
+    return b"debug_timing" in scope.get("query_string", b"") and \
+        parse_qs(scope["query_string"].decode("latin-1")).get("debug_timing", ["0"])[0] in ("1", "true")
+
+
+class TracingMiddleware:
+    """ASGI middleware opening the root span for each HTTP request
+
+    With ?debug_timing=1 the span tree is returned inline: added under
+    "_debug_timing" for JSON object responses, otherwise in the
+    X-Debug-Timing header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        debug = debug_timing_requested(scope)
+        if not debug and not EXPORTER.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(
+            f"{scope.get('method', '')} {scope.get('path', '')}",
+            _incoming_trace_id(scope) or secrets.token_hex(16),
+            attributes={"http.method": scope.get("method", ""), "http.path": scope.get("path", "")}
+        )
+        token = _current_span.set(root)
+        response_start = None
+        body_parts = []
+
+        async def send_wrapper(message):
+            nonlocal response_start
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                if not debug:
+                    await send(message)
+                    return
+                response_start = message
+                return
+            if debug and message["type"] == "http.response.body":
+                body_parts.append(message.get("body", b""))
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.error = repr(e)
+            raise
+        finally:
+            root.end = time.time()
+            _current_span.reset(token)
+            template = route_template(scope)
+            if template != "unmatched":
+                root.name = f"{scope.get('method', '')} {template}"
+                root.attributes["http.route"] = template
+            EXPORTER.submit(root)
+
+        if debug and response_start is not None:
+            await self._send_with_timing(send, response_start, b"".join(body_parts), root)
+
+    @staticmethod
+    async def _send_with_timing(send, start_message, body: bytes, root: Span):
+        tree = root.to_tree()
+        headers = [(k, v) for k, v in start_message.get("headers", []) if k.lower() != b"content-length"]
+        content_type = dict(headers).get(b"content-type", b"")
+
+        payload = None
+        if content_type.startswith(b"application/json"):
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                payload = None
+
+        if isinstance(payload, dict):
+            payload["_debug_timing"] = tree
+            body = json.dumps(payload).encode("utf-8")
+        else:
+            headers.append((b"x-debug-timing", json.dumps(tree).encode("utf-8")))
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
@@ -0,0 +1,105 @@
+"""Throughput of batch resume ingestion (POST /api/resumes/batch)
+
+Uploads a zip of synthetic resumes to the in-process app (in-memory Mongo,
+stubbed LLM) and reads the NDJSON status stream. Runs three modes:
+    fast_path    rule-based extraction, the LLM only for low-confidence fields
+    llm_batch_1  every resume through the LLM, one resume per prompt
+    llm_batch_N  every resume through the LLM, N resumes per prompt
+
+Usage (from backend/):
+    python -m benchmarks.batch_ingest --files 300 --llm-latency lognormal:0.8,0.4 \\
+        --output batch_ingest.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import time
+import zipfile
+from typing import Dict
+
+import httpx
+
+from benchmarks.resume_tokens import synthetic_resume
+from benchmarks.run import build_app
+from benchmarks.stubs import make_resume_pdf
+
+
+def build_zip(count: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for index in range(count):
+            archive.writestr(f"resumes/resume_{index:04d}.pdf", make_resume_pdf(pages=synthetic_resume(rng, index)))
+    return buffer.getvalue()
+
+
+async def run_mode(client: httpx.AsyncClient, payload: bytes, llm_calls) -> Dict:
+    calls_before = llm_calls()
+    statuses = {"saved": 0, "error": 0}
+    summary = {}
+    start = time.perf_counter()
+    response = await client.post("/api/resumes/batch", files=[("files", ("resumes.zip", payload, "application/zip"))])
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    for line in response.text.splitlines():
+        event = json.loads(line)
+        if event.get("status") in statuses:
+            statuses[event["status"]] += 1
+        if event.get("status") == "done":
+            summary = event["summary"]
+    return {
+        "seconds": round(elapsed, 3),
+        "resumes_per_minute": round(statuses["saved"] / elapsed * 60, 1),
+        "saved": statuses["saved"],
+        "errors": statuses["error"],
+        "llm_calls": llm_calls() - calls_before,
+        "local": summary.get("local"),
+    }
+
+
+async def main_async(args) -> Dict:
+    app, _ = build_app(args)
+    from app import dependencies
+    resume_parser = app.dependency_overrides[dependencies.get_resume_parser]()
+    completions = resume_parser.ai_service.groq_client.chat.completions
+    payload = build_zip(args.files, args.seed)
+
+    modes = [("fast_path", True, args.batch_size), ("llm_batch_1", False, 1),
+             (f"llm_batch_{args.batch_size}", False, args.batch_size)]
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=None) as client:
+        for name, fast_path, batch_size in modes:
+            resume_parser.fast_path_enabled = fast_path
+            os.environ["BATCH_LLM_SIZE"] = str(batch_size)
+            results[name] = await run_mode(client, payload, lambda: completions.calls)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch resume ingestion throughput")
+    parser.add_argument("--files", type=int, default=300, help="resumes in the uploaded zip")
+    parser.add_argument("--batch-size", type=int, default=4, help="resumes per LLM prompt")
+    parser.add_argument("--llm-latency", default="lognormal:0.8,0.4", help="stub LLM latency (see benchmarks.run)")
+    parser.add_argument("--mongo", default="memory", help='"memory" or a MongoDB URI')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    result = {
+        "files": args.files,
+        "llm_latency": args.llm_latency,
+        "batch_extract_threads": int(os.getenv("BATCH_EXTRACT_THREADS", 4)),
+        "modes": asyncio.run(main_async(args)),
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""The backend app wired to the stubbed LLM, for serving with multiple workers
+
+Each worker process imports this module and builds its own clients.
+Configured from the environment:
+    BENCH_MONGO          MongoDB URI (required for more than one worker,
+                         since the in-memory stand-in is per process)
+    BENCH_LLM_LATENCY    stub LLM latency spec (default lognormal:0.5,0.4)
+    BENCH_SEED           RNG seed (default 42)
+
+Usage (from backend/):
+    BENCH_MONGO=mongodb://localhost:27017 SHARED_STATE_BACKEND=sqlite \\
+        uvicorn benchmarks.bench_app:app --workers 4
+"""
+import os
+from types import SimpleNamespace
+
+from benchmarks.run import build_app
+
+app, _ = build_app(SimpleNamespace(
+    mongo=os.getenv("BENCH_MONGO", "memory"),
+    llm_latency=os.getenv("BENCH_LLM_LATENCY", "lognormal:0.5,0.4"),
+    # Distinct per worker so stub latencies are not identical across processes
+    seed=int(os.getenv("BENCH_SEED", 42)) + os.getpid()
+))
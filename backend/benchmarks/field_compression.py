@@ -0,0 +1,165 @@
+"""Storage size and read latency of compressed roadmap weeks
+
+Stores synthetic 52-week roadmaps with FIELD_COMPRESSION off, zlib and
+zstd, then reports per mode:
+    week_bytes      BSON size of all roadmap_weeks documents
+                    (and the collection's storageSize on a real server)
+    write_ms        mean time to store one roadmap
+    read_full_ms    mean get_roadmap_by_id with every week field
+    read_topics_ms  mean get_roadmaps_by_ids with week_fields=[week, topic],
+                    which never decompresses the bulky fields
+
+Week text is generated prose of the length LLM answers usually have (a
+few sentences per field), so compression ratios are close to real ones.
+
+Usage (from backend/):
+    python -m benchmarks.field_compression --roadmaps 50 --output field_compression.json
+    python -m benchmarks.field_compression --mongo mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from bson import BSON, ObjectId
+
+SUBJECTS = ["partitioning", "idempotent writes", "backfills", "stream processing", "data contracts",
+            "query planning", "indexing strategies", "caching layers", "observability", "schema evolution",
+            "batch scheduling", "cost controls", "access policies", "unit testing", "incident reviews"]
+VERBS = ["understand", "practice", "compare", "design", "implement", "measure", "document", "refactor"]
+CLAUSES = ["so that failures can be retried safely", "while keeping latency predictable",
+           "using the official documentation and one worked example", "before moving on to production concerns",
+           "and write down the trade-offs you notice", "because interviewers ask about it often",
+           "with a focus on what breaks at scale", "so the next weeks can build on it"]
+
+
+def _prose(rng: random.Random, sentences: int) -> str:
+    return " ".join(
+        f"{rng.choice(VERBS).capitalize()} {rng.choice(SUBJECTS)} and {rng.choice(SUBJECTS)} {rng.choice(CLAUSES)}."
+        for _ in range(sentences)
+    )
+
+
+def roadmap(weeks: int, rng: random.Random) -> Dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "target_role": "Data Engineer",
+        "total_weeks": weeks,
+        "is_active": True,
+        "created_at": datetime.now(),
+        "weekly_plan": [
+            {
+                "week": week,
+                "topic": f"Week {week}: {rng.choice(SUBJECTS).title()}",
+                "goal": _prose(rng, 2),
+                "what_to_learn": _prose(rng, 6),
+                "why_learn_this": _prose(rng, 3),
+                "resources": [
+                    {"title": f"Resource {week}.{n}", "url": f"https://example.com/{week}/{n}",
+                     "type": "Article", "platform": "Medium"}
+                    for n in range(3)
+                ],
+                "how_to_learn": _prose(rng, 4),
+                "mini_project": {"title": f"Project {week}", "description": _prose(rng, 4), "difficulty": "Intermediate"},
+                "estimated_hours": 8
+            }
+            for week in range(1, weeks + 1)
+        ]
+    }
+
+
+def _ms(samples: List[float]) -> float:
+    return round(statistics.mean(samples) * 1000, 3)
+
+
+async def run_mode(client, mode: str, plans: List[Dict], reads: int) -> Dict:
+    from app.utils.database import Database
+    from app.utils.field_codec import FieldCodec
+
+    db = Database(client=client)
+    db.db = client.career_navigator_bench
+    db.codec = FieldCodec("off" if mode == "off" else mode)
+    await asyncio.gather(db.db.roadmaps.drop(), db.db.roadmap_weeks.drop(), db.db.resources.drop())
+
+    writes = []
+    for plan in plans:
+        start = time.perf_counter()
+        await db._insert_roadmap(copy.deepcopy(plan))
+        writes.append(time.perf_counter() - start)
+
+    week_bytes = 0
+    async for week in db.db.roadmap_weeks.find({}):
+        week_bytes += len(BSON.encode(week))
+    result = {"week_bytes": week_bytes}
+    try:
+        stats = await db.db.command("collStats", "roadmap_weeks")
+        result["storage_size"] = stats.get("storageSize")
+    except Exception:
+        pass  # In-memory stand-in has no storage engine
+
+    ids = [str(plan["_id"]) for plan in plans]
+    full, topics = [], []
+    for index in range(reads):
+        roadmap_id = ids[index % len(ids)]
+        start = time.perf_counter()
+        await db.get_roadmap_by_id(roadmap_id)
+        full.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await db.get_roadmaps_by_ids([roadmap_id], fields=["weekly_plan"], week_fields=["week", "topic"])
+        topics.append(time.perf_counter() - start)
+
+    # Round trip check: compression must not change what callers read
+    stored = await db.get_roadmap_by_id(ids[0])
+    assert [w["what_to_learn"] for w in stored["weekly_plan"]] == [w["what_to_learn"] for w in plans[0]["weekly_plan"]]
+
+    await asyncio.gather(db.db.roadmaps.drop(), db.db.roadmap_weeks.drop(), db.db.resources.drop())
+    return {**result, "write_ms": _ms(writes), "read_full_ms": _ms(full), "read_topics_ms": _ms(topics)}
+
+
+async def main_async(args) -> Dict:
+    from app.utils.field_codec import zstd_available
+
+    if args.mongo == "memory":
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongo)
+
+    rng = random.Random(args.seed)
+    plans = [roadmap(args.weeks, rng) for _ in range(args.roadmaps)]
+    modes = ["off", "zlib"] + (["zstd"] if zstd_available() else [])
+    results = {"roadmaps": args.roadmaps, "weeks": args.weeks, "mongo": args.mongo, "modes": {}}
+    for mode in modes:
+        results["modes"][mode] = await run_mode(client, mode, plans, args.reads)
+    baseline = results["modes"]["off"]["week_bytes"]
+    for row in results["modes"].values():
+        row["ratio"] = round(baseline / row["week_bytes"], 2)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roadmap week storage size and read latency per compression mode")
+    parser.add_argument("--roadmaps", type=int, default=50)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--mongo", default="memory", help='"memory" (mongomock) or a MongoDB URI')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(main_async(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
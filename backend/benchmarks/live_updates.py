@@ -0,0 +1,106 @@
+"""Live update fan-out: publish cost and delivery latency per worker
+
+Subscribes many connections (several per user) to one ChangeFeed, each
+drained by a consumer task like the WebSocket sender loop, and publishes
+change events for random users. A share of the consumers is stalled
+(like a socket blocked by a client that stopped reading) until every
+event has been published. Reports:
+    publish_us        mean/p99 microseconds to publish one event
+    delivery_ms       mean/p99 publish-to-consumer latency (other consumers)
+    resyncs           stalled consumers that found a resync instead of the events
+    max_queue         largest queue seen (bounded by LIVE_QUEUE_SIZE)
+
+Usage (from backend/):
+    python -m benchmarks.live_updates --connections 2000 --events 50000 --output live_updates.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Dict
+
+
+async def run(args) -> Dict:
+    from app.utils.change_feed import ChangeFeed, change_event
+
+    feed = ChangeFeed(mode="local", queue_size=args.queue_size)
+    rng = random.Random(args.seed)
+    users = [f"user{i}" for i in range(max(1, args.connections // args.per_user))]
+    latencies, resyncs, max_queue = [], [0], [0]
+    published = asyncio.Event()
+
+    async def consume(subscription, stalled: bool):
+        if stalled:
+            await published.wait()
+        while True:
+            event = await subscription.get(3600)
+            if event is None:
+                return
+            max_queue[0] = max(max_queue[0], subscription.queue.qsize() + 1)
+            if event["type"] == "resync":
+                resyncs[0] += 1
+            elif not stalled:
+                latencies.append((time.perf_counter() - event["sent"]) * 1000)
+
+    subscriptions = [feed.subscribe(users[i % len(users)]) for i in range(args.connections)]
+    consumers = [
+        asyncio.create_task(consume(sub, rng.random() < args.stalled_share))
+        for sub in subscriptions
+    ]
+
+    publish = []
+    for i in range(args.events):
+        event = change_event("roadmaps", "update", str(i))
+        event["sent"] = time.perf_counter()
+        start = time.perf_counter()
+        feed.publish(rng.choice(users), event)
+        publish.append((time.perf_counter() - start) * 1e6)
+        if i % args.batch == 0:
+            # Let consumers run, as the event loop would between writes
+            await asyncio.sleep(0)
+    published.set()
+    await asyncio.sleep(0.05)
+    for sub in subscriptions:
+        feed.unsubscribe(sub)
+    await asyncio.gather(*consumers)
+
+    publish.sort()
+    latencies.sort()
+    return {
+        "connections": args.connections,
+        "users": len(users),
+        "events": args.events,
+        "publish_us": {"mean": round(statistics.mean(publish), 2), "p99": round(publish[int(len(publish) * 0.99)], 2)},
+        "delivery_ms": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p99": round(latencies[int(len(latencies) * 0.99)], 3)
+        } if latencies else None,
+        "resyncs": resyncs[0],
+        "max_queue": max_queue[0],
+        "queue_size": args.queue_size
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live update fan-out cost and latency")
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=4, help="connections per user (tabs/devices)")
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=10, help="events published between event loop yields")
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--stalled-share", type=float, default=0.05, help="share of consumers that stop reading")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
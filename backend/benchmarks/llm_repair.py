@@ -0,0 +1,131 @@
+"""How much model output survives truncated completions
+
+Runs generate_roadmap (12 weeks) and analyze_skill_gap against the stub
+LLM with a share of answers cut off part-way, two ways:
+    discard   json.loads on the completion, fallback content on any error
+              (the previous AIService behavior)
+    repair    the current AIService: tolerant parsing, schema validation
+              and follow-up requests for only the missing weeks/fields
+
+Reports, per method, the share of content that came from the model rather
+than the fallback, whole-response fallbacks, LLM calls, completion tokens
+and the completion tokens wasted on discarded output.
+
+Usage (from backend/):
+    python -m benchmarks.llm_repair --truncate 0.1,0.3 --runs 200 --output llm_repair.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+from typing import Dict
+
+from benchmarks.stubs import LatencyDistribution, StubLLMClient
+
+SKILLS = ["Python", "SQL", "Git"]
+ROLE = "Data Engineer"
+WEEKS = 12
+
+
+def _completion_tokens() -> float:
+    from app.utils.metrics import LLM_TOKENS
+    return sum(LLM_TOKENS.value(method, "completion") for method in ("generate_roadmap", "analyze_skill_gap"))
+
+
+def _wasted_tokens() -> float:
+    from app.utils.metrics import LLM_WASTED_TOKENS
+    return sum(LLM_WASTED_TOKENS.value(method) for method in ("generate_roadmap", "analyze_skill_gap"))
+
+
+async def run_discard(ai, runs: int) -> Dict:
+    """Previous behavior: one completion, all or nothing"""
+    client = ai.groq_client.chat.completions
+    model_weeks = roadmap_fallbacks = analysis_fallbacks = 0
+    tokens = wasted = 0
+    for _ in range(runs):
+        for kind in ("roadmap", "analysis"):
+            prompt = ai._roadmap_prompt(SKILLS, ROLE, WEEKS) if kind == "roadmap" else f"Target Role: {ROLE}"
+            response = await client.create(
+                messages=[{"role": "user", "content": prompt}], response_format={"type": "json_object"}
+            )
+            tokens += response.usage.completion_tokens
+            try:
+                result = json.loads(response.choices[0].message.content)
+            except ValueError:
+                wasted += response.usage.completion_tokens
+                if kind == "roadmap":
+                    roadmap_fallbacks += 1
+                else:
+                    analysis_fallbacks += 1
+                continue
+            if kind == "roadmap":
+                model_weeks += len(result["weekly_plan"])
+    return {
+        "model_weeks_pct": round(model_weeks / (runs * WEEKS) * 100, 1),
+        "roadmap_fallbacks": roadmap_fallbacks,
+        "analysis_fallbacks": analysis_fallbacks,
+        "llm_calls": client.calls,
+        "completion_tokens": tokens,
+        "wasted_tokens": wasted
+    }
+
+
+async def run_repair(ai, runs: int) -> Dict:
+    from app.utils.metrics import LLM_FALLBACKS
+    client = ai.groq_client.chat.completions
+    tokens_before, wasted_before = _completion_tokens(), _wasted_tokens()
+    fallbacks_before = (LLM_FALLBACKS.value("generate_roadmap"), LLM_FALLBACKS.value("analyze_skill_gap"))
+    model_weeks = 0
+    for _ in range(runs):
+        roadmap = await ai.generate_roadmap(SKILLS, ROLE, WEEKS)
+        model_weeks += sum(1 for week in roadmap["weekly_plan"] if week["topic"].startswith("Topic"))
+        await ai.analyze_skill_gap(SKILLS, ROLE)
+    return {
+        "model_weeks_pct": round(model_weeks / (runs * WEEKS) * 100, 1),
+        "roadmap_fallbacks": int(LLM_FALLBACKS.value("generate_roadmap") - fallbacks_before[0]),
+        "analysis_fallbacks": int(LLM_FALLBACKS.value("analyze_skill_gap") - fallbacks_before[1]),
+        "llm_calls": client.calls,
+        "completion_tokens": int(_completion_tokens() - tokens_before),
+        "wasted_tokens": int(_wasted_tokens() - wasted_before)
+    }
+
+
+async def main_async(args) -> Dict:
+    from app.services.ai_service import AIService
+    import builtins
+
+    results = {"runs": args.runs, "weeks": WEEKS, "truncate": {}}
+    quiet_print = builtins.print
+    builtins.print = lambda *a, **k: None  # AIService logs every failure
+    try:
+        for rate in [float(r) for r in args.truncate.split(",")]:
+            ai = AIService()
+            row = {}
+            for mode, runner in (("discard", run_discard), ("repair", run_repair)):
+                ai.groq_client = StubLLMClient(LatencyDistribution("zero", random.Random(args.seed)), truncate_rate=rate)
+                row[mode] = await runner(ai, args.runs)
+            results["truncate"][str(rate)] = row
+    finally:
+        builtins.print = quiet_print
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model output kept under truncated completions")
+    parser.add_argument("--truncate", default="0,0.1,0.3", help="comma-separated shares of truncated answers")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+    output = json.dumps(asyncio.run(main_async(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
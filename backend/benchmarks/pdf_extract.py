@@ -0,0 +1,86 @@
+"""PDF text extraction time by engine, budget and worker count
+
+Extracts a resume-sized PDF and a long portfolio-sized PDF with:
+    layout_full     pdfplumber, every page (the previous behavior)
+    layout_budget   pdfplumber with the page/char budgets
+    layout_parallel pdfplumber with the budgets and a process pool
+    text_budget     pypdfium2 text layer with the budgets
+
+Usage (from backend/):
+    python -m benchmarks.pdf_extract --pages 60 --output pdf_extract.json
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from app.services.pdf_text import PdfTextExtractor, shutdown_pool
+from benchmarks.resume_tokens import synthetic_resume
+from benchmarks.stubs import make_resume_pdf
+
+
+def build_pdf(path: Path, pages: int, seed: int) -> Path:
+    rng = random.Random(seed)
+    lines = []
+    index = 0
+    while len(lines) < pages:
+        lines += synthetic_resume(rng, index)
+        index += 1
+    path.write_bytes(make_resume_pdf(pages=lines[:pages]))
+    return path
+
+
+def time_extractor(extractor: PdfTextExtractor, path: Path, repeat: int) -> Dict:
+    extractor.extract(str(path))  # warm-up (imports, pool start)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages, truncated = extractor.extract(str(path))
+        samples.append(time.perf_counter() - start)
+    return {
+        "ms_median": round(statistics.median(samples) * 1000, 2),
+        "pages_returned": len(pages),
+        "chars": sum(len(page) for page in pages),
+        "truncated": truncated,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF extraction time by engine, budget and worker count")
+    parser.add_argument("--pages", type=int, default=60, help="pages in the long document")
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--max-chars", type=int, default=40000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    modes = {
+        "layout_full": PdfTextExtractor("layout", max_pages=0, max_chars=0, workers=0),
+        "layout_budget": PdfTextExtractor("layout", args.max_pages, args.max_chars, workers=0),
+        "layout_parallel": PdfTextExtractor("layout", args.max_pages, args.max_chars, args.workers, parallel_min_pages=2),
+        "text_budget": PdfTextExtractor("text", args.max_pages, args.max_chars, workers=0),
+    }
+    result = {"max_pages": args.max_pages, "max_chars": args.max_chars, "workers": args.workers, "documents": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, pages in (("resume", 2), ("portfolio", args.pages)):
+            path = build_pdf(Path(tmp) / f"{name}.pdf", pages, args.seed)
+            result["documents"][f"{name}_{pages}p"] = {
+                mode: time_extractor(extractor, path, args.repeat) for mode, extractor in modes.items()
+            }
+    shutdown_pool()
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Request latency with and without the sampling profiler running
+
+Serves GET /api/roadmaps/{id} for a synthetic roadmap through the app
+(in-process ASGI, mongomock) from several concurrent clients, first
+without profiling and then while POST /api/admin/profile samples the
+worker at each interval, then with mode=requests (cProfile per request).
+requests mode is also run with a single client against its own baseline,
+since it only picks requests while no other request is in flight.
+Reports per run:
+    requests     completed in the window
+    latency_ms   mean/p50/p99
+    samples      stack samples taken (sample runs)
+    profiled     requests run under cProfile (requests runs)
+    skipped      requests not profiled because others were in flight
+    capped       profiled requests cut off at PROFILER_REQUEST_MAX_MS
+    stacks       distinct collapsed stacks returned
+
+Usage (from backend/):
+    python -m benchmarks.profiler_overhead --seconds 5 --intervals 10 1 --output profiler_overhead.json
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from benchmarks.field_compression import roadmap
+
+
+def _summary(latencies: List[float]) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 3),
+            "p50": round(latencies[len(latencies) // 2] * 1000, 3),
+            "p99": round(latencies[int(len(latencies) * 0.99)] * 1000, 3)
+        }
+    }
+
+
+async def run(args) -> Dict:
+    os.environ["ADMIN_TOKEN"] = "benchmark"
+    import httpx
+    from mongomock_motor import AsyncMongoMockClient
+    from app import dependencies
+    from app.main import app
+    from app.utils.database import Database
+    from app.utils.deltas import DeltaResponder
+    from app.utils.shared_state import MemoryState
+
+    db = Database(client=AsyncMongoMockClient())
+    db.progress_store = "collection"
+    deltas = DeltaResponder(MemoryState())
+    app.dependency_overrides[dependencies.get_db] = lambda: db
+    app.dependency_overrides[dependencies.get_delta_responder] = lambda: deltas
+
+    plan = roadmap(args.weeks, random.Random(args.seed))
+    plan.pop("_id")
+    roadmap_id = await db.save_roadmap(plan["user_id"], copy.deepcopy(plan))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def load(seconds: float, concurrency: int) -> List[float]:
+            latencies = []
+            deadline = time.perf_counter() + seconds
+
+            async def worker():
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(f"/api/roadmaps/{roadmap_id}")
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return latencies
+
+        async def profiled(params: Dict, concurrency: int):
+            profile = asyncio.create_task(client.post(
+                "/api/admin/profile",
+                params={"seconds": args.seconds, **params},
+                headers={"X-Admin-Token": "benchmark"}
+            ))
+            latencies = await load(args.seconds, concurrency)
+            response = await profile
+            response.raise_for_status()
+            row = _summary(latencies)
+            row["stacks"] = len(response.text.splitlines())
+            return row, response.headers
+
+        results = {"weeks": args.weeks, "concurrency": args.concurrency, "runs": {}}
+        results["runs"]["baseline"] = _summary(await load(args.seconds, args.concurrency))
+        for interval in args.intervals:
+            row, headers = await profiled({"interval_ms": interval}, args.concurrency)
+            row["samples"] = int(headers["x-profile-count"])
+            results["runs"][f"sample_{interval:g}ms"] = row
+        results["runs"]["baseline_1_client"] = _summary(await load(args.seconds, 1))
+        for name, concurrency in (("requests", args.concurrency), ("requests_1_client", 1)):
+            row, headers = await profiled({"mode": "requests", "max_requests": args.max_requests}, concurrency)
+            row["profiled"] = int(headers["x-profile-count"])
+            row["skipped"] = int(headers["x-profile-skipped"])
+            row["capped"] = int(headers["x-profile-capped"])
+            results["runs"][name] = row
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request latency with the sampling profiler on and off")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--intervals", type=float, nargs="+", default=[10, 1], help="sampling intervals in ms")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-requests", type=int, default=1000, help="max_requests for the requests-mode runs")
+    parser.add_argument("--weeks", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
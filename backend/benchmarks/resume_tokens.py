@@ -0,0 +1,159 @@
+"""Prompt tokens and parse latency for resume parsing
+
+Parses every PDF in a corpus three ways:
+    raw           the raw pdfplumber text (RESUME_PREPROCESSING=false)
+    preprocessed  ResumePreprocessor output, every field from the LLM
+    fast_path     rule-based extraction, the LLM only for low-confidence
+                  fields (RESUME_FAST_PATH=true)
+The LLM is the benchmark stub, so prompt_tokens is the size of what would
+be sent (~4 characters per token) and latency is local work plus the stub
+delay. Use a realistic --llm-latency to see the tail latency effect of
+skipped LLM calls.
+
+Without --corpus a synthetic corpus of multi-page resumes with headers,
+footers, page numbers and irregular whitespace is generated.
+
+Usage (from backend/):
+    python -m benchmarks.resume_tokens --output resume_tokens.json
+    python -m benchmarks.resume_tokens --corpus ~/resumes --llm-latency zero
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.run import percentile
+from benchmarks.stubs import LatencyDistribution, StubLLMClient, make_resume_pdf
+
+SKILLS = ["Python", "Go", "Java", "SQL", "PostgreSQL", "Docker", "Kubernetes", "AWS", "Terraform", "React",
+          "TypeScript", "Kafka", "Redis", "GraphQL", "Linux", "CI/CD", "Spark", "Airflow", "Git", "REST APIs"]
+TITLES = ["Backend Engineer", "Data Engineer", "Software Engineer", "Platform Engineer", "Frontend Developer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+FIRST_NAMES = ["Avery", "Jordan", "Priya", "Mateo", "Chen", "Amara", "Lukas", "Sofia", "Kenji", "Fatima"]
+LAST_NAMES = ["Okafor", "Silva", "Nguyen", "Schmidt", "Patel", "Kowalski", "Haddad", "Larsen", "Moreau", "Tanaka"]
+
+
+def synthetic_resume(rng: random.Random, index: int) -> List[List[str]]:
+    """Lines per page for one synthetic resume"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    body = [
+        f"{name}      {rng.choice(TITLES)}",
+        f"{name.split()[0].lower()}{index}@example.com  |  +1 555 {rng.randrange(1000, 9999)}  |  linkedin.com/in/c{index}",
+        "PROFESSIONAL SUMMARY",
+        "Engineer   with   " + str(rng.randint(2, 15)) + " years of experience building   reliable systems.",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 14))),
+        "EXPERIENCE",
+    ]
+    for _ in range(rng.randint(2, 5)):
+        start = rng.randint(2008, 2020)
+        body.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(3, 6)):
+            body.append("  - Designed and shipped   " + " and ".join(rng.sample(SKILLS, 2)) + " services for   customers")
+    body += ["EDUCATION", f"B.Sc. Computer Science - State University, {rng.randint(2000, 2016)}", "PROJECTS"]
+    body += [f"Project {p}: built a {rng.choice(SKILLS)} tool used by {rng.randint(10, 500)} people" for p in range(rng.randint(1, 4))]
+
+    per_page = 24
+    chunks = [body[i:i + per_page] for i in range(0, len(body), per_page)]
+    return [
+        [f"{name} - Curriculum Vitae", "Confidential"] + chunk + [f"Page {number} of {len(chunks)}"]
+        for number, chunk in enumerate(chunks, 1)
+    ]
+
+
+def build_corpus(directory: Path, count: int, seed: int) -> List[Path]:
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        path = directory / f"resume_{index:03d}.pdf"
+        path.write_bytes(make_resume_pdf(pages=synthetic_resume(rng, index)))
+        paths.append(path)
+    return paths
+
+
+def summarize(tokens: List[int], latencies: List[float]) -> Dict:
+    latencies = sorted(latencies)
+    return {
+        "llm_calls": sum(1 for count in tokens if count),
+        "prompt_tokens_mean": round(statistics.mean(tokens), 1),
+        "prompt_tokens_total": sum(tokens),
+        "parse_ms_p50": round(percentile(latencies, 50) * 1000, 2),
+        "parse_ms_p95": round(percentile(latencies, 95) * 1000, 2),
+    }
+
+
+async def measure(paths: List[Path], preprocess: bool, fast_path: bool, llm_latency: str, seed: int) -> Dict:
+    os.environ["RESUME_PREPROCESSING"] = "true" if preprocess else "false"
+    os.environ["RESUME_FAST_PATH"] = "true" if fast_path else "false"
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    from app.services.ai_service import AIService
+    from app.services.resume_parser import ResumeParser
+
+    ai_service = AIService()
+    ai_service.groq_client = StubLLMClient(LatencyDistribution(llm_latency, random.Random(seed)))
+    parser = ResumeParser(ai_service)
+
+    tokens, latencies = [], []
+    for path in paths:
+        original_create = ai_service.groq_client.chat.completions.create
+        usage = {}
+
+        async def create(**kwargs):
+            response = await original_create(**kwargs)
+            usage["prompt_tokens"] = response.usage.prompt_tokens
+            return response
+
+        ai_service.groq_client.chat.completions.create = create
+        start = time.perf_counter()
+        await parser.parse_resume(str(path))
+        latencies.append(time.perf_counter() - start)
+        tokens.append(usage.get("prompt_tokens", 0))
+        ai_service.groq_client.chat.completions.create = original_create
+    return summarize(tokens, latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume parsing prompt tokens: raw, preprocessed and fast path")
+    parser.add_argument("--corpus", help="directory of PDF resumes (default: generated corpus)")
+    parser.add_argument("--count", type=int, default=40, help="size of the generated corpus")
+    parser.add_argument("--llm-latency", default="zero", help="stub LLM latency (see benchmarks.run)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.corpus:
+            paths = sorted(Path(args.corpus).expanduser().glob("*.pdf"))
+        else:
+            paths = build_corpus(Path(tmp), args.count, args.seed)
+        if not paths:
+            raise SystemExit("No PDFs found")
+
+        raw = asyncio.run(measure(paths, False, False, args.llm_latency, args.seed))
+        prepared = asyncio.run(measure(paths, True, False, args.llm_latency, args.seed))
+        fast_path = asyncio.run(measure(paths, True, True, args.llm_latency, args.seed))
+
+    reduction = lambda mode: round((1 - mode["prompt_tokens_total"] / raw["prompt_tokens_total"]) * 100, 1)
+    result = {
+        "corpus": args.corpus or f"synthetic:{args.count}",
+        "documents": len(paths),
+        "raw": raw,
+        "preprocessed": prepared,
+        "fast_path": fast_path,
+        "token_reduction_pct": {"preprocessed": reduction(prepared), "fast_path": reduction(fast_path)}
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
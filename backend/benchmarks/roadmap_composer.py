@@ -0,0 +1,82 @@
+"""Roadmaps composed from the curriculum library: speed and shape
+
+Composes roadmaps for random sets of missing skills (spelled the way
+skill analyses return them, plus some the library does not know) and
+reports per roadmap length:
+    compose_ms       mean/p99 milliseconds per roadmap
+    distinct_topics  share of weeks with a topic no other week has
+    hours            mean and max estimated hours per week
+and overall the share of skills matched to a curated module.
+
+Usage (from backend/):
+    python -m benchmarks.roadmap_composer --roadmaps 500 --output roadmap_composer.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Dict
+
+SKILLS = [
+    "Python", "AWS", "Docker", "Kubernetes", "System Design", "CI/CD", "SQL", "NoSQL", "Git", "REST APIs",
+    "GenAI", "MLOps", "Rust", "Platform Engineering", "React.js", "Node.js", "TypeScript", "k8s", "Terraform",
+    "Machine Learning", "PyTorch", "Apache Kafka", "Spark", "Airflow", "Data Structures & Algorithms",
+    "Unit Testing", "Microservices", "GraphQL", "Linux", "Prometheus", "AWS Lambda", "Power BI", "Statistics",
+    "Go", "Java", "Spring Boot", "Redis", "PostgreSQL", "OWASP", "Agile",
+]
+UNKNOWN = ["Figma", "Salesforce Apex", "SAP ABAP", "Unity", "Solidity", "COBOL", "Elixir", "Snowflake"]
+
+
+def run(args) -> Dict:
+    from app.services.curriculum import RoadmapComposer
+
+    composer = RoadmapComposer()
+    rng = random.Random(args.seed)
+    pool = SKILLS + UNKNOWN
+    matched = sum(composer.library.find(skill) is not None for skill in SKILLS)
+    results = {
+        "roadmaps": args.roadmaps,
+        "library_modules": len(composer.library.modules),
+        "known_skill_match_pct": round(matched / len(SKILLS) * 100, 1),
+        "by_weeks": {}
+    }
+    for weeks in args.weeks:
+        timings, distinct, hours, peak = [], [], [], []
+        for _ in range(args.roadmaps):
+            skills = rng.sample(pool, rng.randint(2, 8))
+            start = time.perf_counter()
+            plan = composer.compose(skills, "Backend Engineer", weeks)["weekly_plan"]
+            timings.append((time.perf_counter() - start) * 1000)
+            assert [week["week"] for week in plan] == list(range(1, weeks + 1))
+            topics = [week["topic"] for week in plan]
+            distinct.append(sum(topics.count(topic) == 1 for topic in topics) / weeks)
+            week_hours = [week["estimated_hours"] for week in plan]
+            hours.append(statistics.mean(week_hours))
+            peak.append(max(week_hours))
+        timings.sort()
+        results["by_weeks"][str(weeks)] = {
+            "compose_ms": {"mean": round(statistics.mean(timings), 3), "p99": round(timings[int(len(timings) * 0.99)], 3)},
+            "distinct_topics_pct": round(statistics.mean(distinct) * 100, 1),
+            "hours": {"mean": round(statistics.mean(hours), 1), "max": max(peak)}
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Curriculum library roadmap composition speed and shape")
+    parser.add_argument("--roadmaps", type=int, default=500)
+    parser.add_argument("--weeks", type=int, nargs="+", default=[4, 12, 26, 52])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Bytes on the wire for roadmap views: full, compressed and delta
+
+Stores a synthetic 52-week roadmap, then fetches GET /api/roadmaps/{id}
+through the app (in-process ASGI, mongomock) after typical progress
+updates and reports per update:
+    full_bytes   uncompressed JSON body
+    gzip_bytes   body with Accept-Encoding: gzip
+    br_bytes     body with Accept-Encoding: br (if brotli is installed)
+    patch_bytes  JSON Patch from the previous version (since_version)
+    patch_br_bytes  the patch as sent with Accept-Encoding: br (or gzip)
+plus the status of a repeated fetch with the current version (304).
+
+Usage (from backend/):
+    python -m benchmarks.roadmap_responses --weeks 52 --output roadmap_responses.json
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+from typing import Dict
+
+from benchmarks.field_compression import roadmap
+
+UPDATES = [
+    ("complete week 1", {"completed_weeks": [1], "current_week": 2, "hours_spent": 6}),
+    ("complete week 2", {"completed_weeks": [2], "current_week": 3, "hours_spent": 8}),
+    ("log hours", {"hours_spent": 2}),
+    ("undo week 2", {"uncompleted_weeks": [2]}),
+]
+
+
+async def run(args) -> Dict:
+    import httpx
+    from mongomock_motor import AsyncMongoMockClient
+    from app import dependencies
+    from app.main import app
+    from app.utils.compression import brotli
+    from app.utils.database import Database
+    from app.utils.deltas import DeltaResponder
+    from app.utils.shared_state import MemoryState
+
+    db = Database(client=AsyncMongoMockClient())
+    # mongomock has no array filters, which the embedded store's update uses
+    db.progress_store = "collection"
+    deltas = DeltaResponder(MemoryState())
+    app.dependency_overrides[dependencies.get_db] = lambda: db
+    app.dependency_overrides[dependencies.get_delta_responder] = lambda: deltas
+
+    plan = roadmap(args.weeks, random.Random(args.seed))
+    plan.pop("_id")
+    roadmap_id = await db.save_roadmap(plan["user_id"], copy.deepcopy(plan))
+    url = f"/api/roadmaps/{roadmap_id}"
+    encoding = "br" if brotli is not None else "gzip"
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def size(encoding: str, **params) -> int:
+            response = await client.get(url, params=params, headers={"Accept-Encoding": encoding})
+            response.raise_for_status()
+            return len(response.content) if encoding == "identity" else int(response.headers["content-length"])
+
+        first = await client.get(url, headers={"Accept-Encoding": "identity"})
+        version = first.headers["x-version"]
+        rows = []
+        for name, update in UPDATES:
+            await db.update_roadmap_progress(roadmap_id, **update)
+            row = {"update": name, "full_bytes": await size("identity"), "gzip_bytes": await size("gzip")}
+            if brotli is not None:
+                row["br_bytes"] = await size("br")
+            patch = await client.get(url, params={"since_version": version}, headers={"Accept-Encoding": "identity"})
+            assert patch.headers["content-type"].startswith("application/json-patch+json"), patch.headers
+            row["patch_bytes"] = len(patch.content)
+            row["patch_ops"] = len(patch.json())
+            row[f"patch_{encoding}_bytes"] = await size(encoding, since_version=version)
+            version = patch.headers["x-version"]
+            rows.append(row)
+
+        unchanged = await client.get(url, params={"since_version": version})
+    return {"weeks": args.weeks, "updates": rows, "unchanged_status": unchanged.status_code}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roadmap response sizes: full, gzip, brotli and JSON Patch")
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Canonical role resolution: lookup cost and cache reuse
+
+Builds a RoleResolver with the seed roles plus --roles synthetic learned
+roles, then reports:
+    lookup      mean/p50/p99 microseconds per nearest-role lookup
+    accuracy    share of hand-written variant spellings resolved to the
+                expected canonical role
+    reuse       distinct cache keys (one model analysis each) for a stream
+                of variant spellings, keyed by normalize_role (exact text,
+                the previous behavior) and by the canonical role key
+
+Usage (from backend/):
+    python -m benchmarks.role_resolver --roles 3000 --output role_resolver.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Dict
+
+VARIANTS = {
+    "backend-engineer": ["Back-end Developer", "Sr. Backend Dev", "Python Backend Engineer", "backend engineer",
+                         "Node JS developer", "Senior Back End Engineer"],
+    "frontend-engineer": ["Front-end Developer", "React.js Developer", "Jr Frontend Dev", "frontend engineer"],
+    "fullstack-engineer": ["Fullstack Developer", "Full-Stack Engineer", "MERN developer"],
+    "data-scientist": ["Data Scientist II", "Senior Data Scientist", "data science engineer"],
+    "machine-learning-engineer": ["ML Engineer", "Machine-Learning Engineer", "Sr. ML Eng"],
+    "devops-engineer": ["Dev Ops Engineer", "Devops Eng", "Lead DevOps Engineer"],
+    "data-engineer": ["Data Engineer", "Big Data Engineer", "ETL Data Engineer"],
+}
+
+GENERIC = ["Engineer", "Developer", "Staff Engineer", "Principal Engineer", "Senior Developer"]
+
+WORDS = ["quantum", "marine", "textile", "audio", "payroll", "forest", "retail", "robotics", "clinical",
+         "supply", "brand", "legal", "solar", "gaming", "carbon", "drone", "wine", "museum", "rail", "sports"]
+TITLES = ["Analyst", "Specialist", "Coordinator", "Consultant", "Technician", "Planner", "Strategist", "Officer"]
+
+
+def build(roles: int, seed: int):
+    from app.services.role_resolver import RoleResolver
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    resolver = RoleResolver(learn=True, max_roles=roles + 1000)
+    names = set()
+    while len(names) < roles:
+        names.add(f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {rng.choice(TITLES)} {len(names)}")
+    for name in names:
+        resolver.add_role(name, rebuild=False)
+    resolver._rebuild()
+    return resolver, (time.perf_counter() - start) * 1000, sorted(names)
+
+
+def run(args) -> Dict:
+    from app.services.speculation import normalize_role
+    resolver, build_ms, learned = build(args.roles, args.seed)
+    rng = random.Random(args.seed)
+
+    queries = [variant for variants in VARIANTS.values() for variant in variants] + rng.sample(learned, 50)
+    timings = []
+    for _ in range(args.lookups // len(queries) + 1):
+        for query in queries:
+            start = time.perf_counter()
+            resolver.nearest(query)
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+
+    # Bare titles name no specialization and must not share a specific role's cache
+    for title in GENERIC:
+        match = resolver.resolve(title)
+        assert match.outcome == "unmatched", f"{title!r} resolved to {match.key}"
+    assert resolver.canonical_key("Lead Engineer") == "technical-lead"
+
+    correct = {key: sum(resolver.canonical_key(variant) == key for variant in variants)
+               for key, variants in VARIANTS.items()}
+    total = sum(len(variants) for variants in VARIANTS.values())
+
+    stream = [rng.choice(variants) for variants in VARIANTS.values() for _ in range(args.requests // len(VARIANTS))]
+    return {
+        "catalog_roles": resolver.size,
+        "build_ms": round(build_ms, 1),
+        "lookup_us": {
+            "mean": round(statistics.mean(timings), 1),
+            "p50": round(timings[len(timings) // 2], 1),
+            "p99": round(timings[int(len(timings) * 0.99)], 1)
+        },
+        "accuracy_pct": round(sum(correct.values()) / total * 100, 1),
+        "misses": {key: [v for v in VARIANTS[key] if resolver.canonical_key(v) != key]
+                   for key, hits in correct.items() if hits < len(VARIANTS[key])},
+        "reuse": {
+            "requests": len(stream),
+            "keys_normalize_role": len({normalize_role(role) for role in stream}),
+            "keys_canonical": len({resolver.canonical_key(role) for role in stream})
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Role resolution lookup time and cache reuse")
+    parser.add_argument("--roles", type=int, default=3000, help="synthetic learned roles on top of the seed roles")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=700, help="variant spellings in the reuse stream")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Offline load test for the backend API
+
+Boots the FastAPI app in-process against an in-memory Mongo stand-in (or a
+real local Mongo) and a stubbed LLM with configurable latency, drives a
+weighted mix of realistic traffic and writes per-route throughput and
+latency percentiles to JSON.
+
+Usage (from backend/):
+    python -m benchmarks.run --requests 500 --concurrency 32 \\
+        --llm-latency lognormal:0.8,0.4 --output bench.json
+    python -m benchmarks.run --baseline bench.json   # compare against a previous run
+    python -m benchmarks.run --url http://localhost:8000  # drive a running server
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.stubs import LatencyDistribution, StubLLMClient, make_resume_pdf
+
+DEFAULT_MIX = "upload=1,analyze=2,roadmap=1,dashboard=4,chat=4,interview=1"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Collects latency samples per route"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, label: str, request):
+        start = time.perf_counter()
+        try:
+            response = await request
+            ok = response.status_code < 400
+        except Exception:
+            response, ok = None, False
+        self.samples[label].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[label] += 1
+        return response if ok else None
+
+    def report(self, duration: float) -> Dict:
+        routes = {}
+        for label, values in sorted(self.samples.items()):
+            values = sorted(values)
+            routes[label] = {
+                "count": len(values),
+                "errors": self.errors.get(label, 0),
+                "throughput_rps": round(len(values) / duration, 2) if duration else 0,
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2)
+            }
+        total = sum(route["count"] for route in routes.values())
+        return {
+            "summary": {
+                "requests": total,
+                "errors": sum(route["errors"] for route in routes.values()),
+                "duration_s": round(duration, 3),
+                "throughput_rps": round(total / duration, 2) if duration else 0
+            },
+            "routes": routes
+        }
+
+
+# Operations -----------------------------------------------------------------
+
+RESUME_PDF = make_resume_pdf()
+ROLES = ["Backend Engineer", "Data Scientist", "DevOps Engineer", "Frontend Developer", "ML Engineer"]
+
+
+async def op_upload(client: httpx.AsyncClient, recorder: Recorder, users: List[Dict], rng: random.Random):
+    response = await recorder.call("POST /api/upload-resume", client.post(
+        "/api/upload-resume",
+        files={"file": (f"resume_{rng.randrange(10**9)}.pdf", RESUME_PDF, "application/pdf")}
+    ))
+    if response is not None:
+        return {"user_id": response.json()["user_id"], "role": rng.choice(ROLES)}
+    return None
+
+
+async def op_analyze(client, recorder, users, rng, user=None):
+    user = user or rng.choice(users)
+    return await recorder.call("POST /api/analyze-skills", client.post(
+        "/api/analyze-skills",
+        data={"user_id": user["user_id"], "target_role": user["role"]}
+    ))
+
+
+async def op_roadmap(client, recorder, users, rng, user=None):
+    user = user or rng.choice(users)
+    return await recorder.call("POST /api/generate-roadmap", client.post(
+        "/api/generate-roadmap",
+        data={"user_id": user["user_id"], "target_role": user["role"], "weeks": rng.choice([8, 12, 24])}
+    ))
+
+
+async def op_dashboard(client, recorder, users, rng):
+    user = rng.choice(users)
+    return await recorder.call("GET /api/dashboard/{user_id}", client.get(f"/api/dashboard/{user['user_id']}"))
+
+
+async def op_chat(client, recorder, users, rng):
+    user = rng.choice(users)
+    return await recorder.call("POST /api/chat/{user_id}", client.post(
+        f"/api/chat/{user['user_id']}",
+        json={"message": "What should I focus on this week?", "roadmap_id": user.get("roadmap_id")}
+    ))
+
+
+async def op_interview(client, recorder, users, rng):
+    user = rng.choice(users)
+    response = await recorder.call("POST /api/interview/generate/{user_id}", client.post(
+        f"/api/interview/generate/{user['user_id']}",
+        json={"target_role": user["role"], "difficulty": "medium", "question_count": 5}
+    ))
+    if response is None:
+        return None
+    session = response.json()
+    answers = [
+        {"question": q["question"], "answer": "I would start by clarifying requirements and measuring.", "category": q.get("category", "technical")}
+        for q in session["questions"]
+    ]
+    return await recorder.call("POST /api/interview/submit/{session_id}", client.post(
+        f"/api/interview/submit/{session['session_id']}",
+        json={"answers": answers}
+    ))
+
+
+OPERATIONS = {
+    "upload": op_upload,
+    "analyze": op_analyze,
+    "roadmap": op_roadmap,
+    "dashboard": op_dashboard,
+    "chat": op_chat,
+    "interview": op_interview,
+}
+
+
+# Harness ---------------------------------------------------------------------
+
+def build_app(args):
+    """Import the app and swap in the Mongo stand-in and stubbed LLM"""
+    os.environ.setdefault("MONGODB_URI", args.mongo if args.mongo != "memory" else "mongodb://localhost:27017")
+    os.environ.setdefault("GROQ_API_KEY", "benchmark")
+    # Few virtual users issue many requests; measure capacity, not quotas
+    os.environ.setdefault("RATE_LIMITS", "default=0")
+
+    from app.main import app
+    from app import dependencies
+    from app.services.ai_service import AIService
+    from app.services.resume_parser import ResumeParser
+    from app.services.role_cache import RoleCache
+    from app.services.role_resolver import RoleResolver
+    from app.services.speculation import SkillAnalysisSpeculator
+    from app.utils.database import Database
+    from app.utils.request_gate import RequestGate
+    from app.utils.shared_state import ConcurrencyGovernor
+
+    if args.mongo == "memory":
+        from mongomock_motor import AsyncMongoMockClient
+        client = AsyncMongoMockClient()
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(args.mongo)
+    db = Database(client=client)
+    # Keep benchmark data away from the application database
+    db.db = client.career_navigator_bench
+
+    # Same shared state and LLM cap as production, configured from the env
+    state = dependencies.get_shared_state()
+    limit = int(os.getenv("LLM_MAX_CONCURRENCY", 0))
+    ai_service = AIService(governor=ConcurrencyGovernor(state, "llm", limit) if limit > 0 else None)
+    ai_service.groq_client = StubLLMClient(LatencyDistribution(args.llm_latency, random.Random(args.seed)))
+    resume_parser = ResumeParser(ai_service)
+    resolver = RoleResolver()
+    role_cache = RoleCache(ai_service, resolver, state)
+    speculator = SkillAnalysisSpeculator(role_cache, state)
+    request_gate = RequestGate(state)
+
+    app.dependency_overrides[dependencies.get_db] = lambda: db
+    app.dependency_overrides[dependencies.get_ai_service] = lambda: ai_service
+    app.dependency_overrides[dependencies.get_resume_parser] = lambda: resume_parser
+    app.dependency_overrides[dependencies.get_speculator] = lambda: speculator
+    app.dependency_overrides[dependencies.get_request_gate] = lambda: request_gate
+    app.dependency_overrides[dependencies.get_role_resolver] = lambda: resolver
+    app.dependency_overrides[dependencies.get_role_cache] = lambda: role_cache
+    return app, db
+
+
+async def seed_users(client, recorder: Recorder, count: int, rng: random.Random) -> List[Dict]:
+    """Create users that have a resume, skill analysis and roadmap"""
+    users: List[Dict] = []
+
+    async def seed_one():
+        user = await op_upload(client, recorder, users, rng)
+        if user:
+            await op_analyze(client, recorder, users, rng, user=user)
+            await op_roadmap(client, recorder, users, rng, user=user)
+            # Chat uses the active roadmap as context
+            dashboard = (await client.get(f"/api/dashboard/{user['user_id']}")).json()
+            user["roadmap_id"] = (dashboard.get("roadmap") or {}).get("_id")
+            users.append(user)
+
+    await asyncio.gather(*(seed_one() for _ in range(count)))
+    return users
+
+
+async def drive(client, recorder: Recorder, users: List[Dict], mix: Dict[str, float], total: int, concurrency: int, seed: int):
+    """Closed-loop load: `concurrency` workers run `total` operations"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    remaining = [total]
+
+    async def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            name = rng.choices(names, weights)[0]
+            await OPERATIONS[name](client, recorder, users, rng)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args) -> Dict:
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+
+    if args.url:
+        # External server (e.g. benchmarks.workers); it owns Mongo and the stub LLM
+        client_options = {"base_url": args.url, "limits": httpx.Limits(max_connections=args.concurrency * 2)}
+    else:
+        app, _ = build_app(args)
+        client_options = {"transport": httpx.ASGITransport(app=app), "base_url": "http://benchmark"}
+
+    async with httpx.AsyncClient(timeout=None, **client_options) as client:
+        seed_recorder = Recorder()
+        users = await seed_users(client, seed_recorder, args.users, rng)
+        if not users:
+            raise RuntimeError("Seeding failed: no users could be created")
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        await drive(client, recorder, users, mix, args.requests, args.concurrency, args.seed)
+        duration = time.perf_counter() - start
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "target": args.url or "in-process",
+            "mongo": "memory" if args.mongo == "memory" else "mongodb",
+            "llm_latency": args.llm_latency,
+            "mix": mix,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "seed": args.seed
+        },
+        **recorder.report(duration)
+    }
+
+
+def compare(current: Dict, baseline: Dict) -> str:
+    """Human-readable per-route comparison against a previous result file"""
+    lines = [f"{'route':45} {'metric':>8} {'baseline':>10} {'current':>10} {'delta':>8}"]
+    for route, stats in current["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            before, after = base[metric], stats[metric]
+            delta = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            lines.append(f"{route:45} {metric:>8} {before:>10} {after:>10} {delta:>8}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the AI Career Navigator API")
+    parser.add_argument("--requests", type=int, default=300, help="operations in the measured phase")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--users", type=int, default=20, help="users seeded before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted operation mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--llm-latency", default="lognormal:0.5,0.4", help="stub LLM latency: zero | fixed:S | uniform:A,B | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--mongo", default="memory", help='"memory" for an in-memory stand-in, or a MongoDB URI')
+    parser.add_argument("--url", help="drive a running server at this base URL instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            print(compare(result, json.load(fh)), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
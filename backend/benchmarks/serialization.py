@@ -0,0 +1,132 @@
+"""CPU cost of serializing large responses
+
+Compares, per payload:
+    encoder   jsonable_encoder(..., custom_encoder={ObjectId: str}) then
+              JSONResponse rendering (the previous route code)
+    edge      FastJSONResponse (orjson, native ObjectId/datetime), once
+
+Payloads are a 52-week roadmap and a dashboard (resume, skill analysis and
+that roadmap) shaped like the documents the routes return.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --weeks 52 --output serialization.json
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.utils.responses import FastJSONResponse, orjson
+
+
+def roadmap_doc(weeks: int) -> Dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "target_role": "Data Engineer",
+        "display_name": "Data Engineer",
+        "total_weeks": weeks,
+        "job_readiness_score": 62,
+        "skills_to_learn": ["Kubernetes", "AWS", "System Design", "CI/CD", "Spark", "Airflow"],
+        "is_active": True,
+        "created_at": datetime.now(),
+        "weekly_plan": [
+            {
+                "week": week,
+                "topic": f"Topic {week}: distributed data processing",
+                "goal": "Ship a small pipeline that ingests, transforms and serves data",
+                "what_to_learn": "Partitioning, idempotent writes, backfills and monitoring",
+                "why_learn_this": "Every data platform team relies on these fundamentals",
+                "resources": [
+                    {"title": f"Resource {week}.{n}", "url": f"https://example.com/{week}/{n}",
+                     "type": "Article", "platform": "Medium"}
+                    for n in range(4)
+                ],
+                "how_to_learn": "Read, then rebuild the example from scratch and extend it",
+                "mini_project": {"title": f"Project {week}", "description": "Build and deploy it", "difficulty": "Intermediate"},
+                "estimated_hours": 8,
+                "completed": week % 3 == 0
+            }
+            for week in range(1, weeks + 1)
+        ]
+    }
+
+
+def dashboard_doc(weeks: int) -> Dict:
+    return {
+        "resume": {
+            "_id": ObjectId(), "name": "Avery Okafor", "email": "avery@example.com", "phone": "+1 555 0100",
+            "skills": ["Python", "SQL", "Docker", "Git", "REST APIs", "Linux", "Pandas", "Communication"],
+            "education": [{"degree": "B.Sc. Computer Science", "institution": "State University", "year": "2016"}],
+            "experience": [
+                {"title": "Backend Engineer", "company": f"Company {n}", "duration": "2018 - 2021",
+                 "description": "Designed and operated services handling millions of requests per day"}
+                for n in range(4)
+            ],
+            "years_of_experience": 7, "uploaded_at": datetime.now()
+        },
+        "skill_analysis": {
+            "_id": ObjectId(), "user_id": str(ObjectId()), "target_role": "Data Engineer",
+            "required_skills": ["Python", "SQL", "Spark", "Airflow", "Kubernetes", "AWS"],
+            "matching_skills": ["Python", "SQL"], "missing_skills": ["Spark", "Airflow", "Kubernetes", "AWS"],
+            "match_percentage": 33, "job_readiness_score": 40, "trending_skills": ["dbt", "Iceberg"],
+            "trending_skills_comparison": {
+                skill: {"demand": "High", "avg_salary": "$150k+", "growth": "+20%", "reason": "Adoption"}
+                for skill in ("dbt", "Iceberg")
+            },
+            "created_at": datetime.now()
+        },
+        "roadmap": roadmap_doc(weeks)
+    }
+
+
+def encoder_path(payload: Dict) -> bytes:
+    return JSONResponse(content=jsonable_encoder(payload, custom_encoder={ObjectId: str})).body
+
+
+def edge_path(payload: Dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def time_path(fn: Callable[[Dict], bytes], payload: Dict, repeat: int) -> float:
+    fn(payload)
+    start = time.process_time()
+    for _ in range(repeat):
+        fn(payload)
+    return (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization CPU per request")
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    result = {"weeks": args.weeks, "orjson": orjson is not None, "payloads": {}}
+    for name, payload in (("roadmap", roadmap_doc(args.weeks)), ("dashboard", dashboard_doc(args.weeks))):
+        # Same document either way
+        assert json.loads(encoder_path(payload)) == json.loads(edge_path(payload))
+        encoder = time_path(encoder_path, payload, args.repeat)
+        edge = time_path(edge_path, payload, args.repeat)
+        result["payloads"][name] = {
+            "bytes": len(edge_path(payload)),
+            "encoder_cpu_ms": round(encoder * 1000, 3),
+            "edge_cpu_ms": round(edge * 1000, 3),
+            "speedup": round(encoder / edge, 1) if edge else None
+        }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
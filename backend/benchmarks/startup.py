@@ -0,0 +1,91 @@
+"""Cold-start measurement: import time, warm-up time and first-request latency
+
+Each sample runs in a fresh interpreter so module caches do not carry over.
+MongoDB is replaced by the in-memory stand-in and no LLM call is made, so
+the numbers isolate what the process itself spends before and during its
+first real request.
+
+Usage (from backend/):
+    python -m benchmarks.startup --samples 5 --output startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+PROBE = r'''
+import asyncio, json, os, time
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import motor.motor_asyncio
+from mongomock_motor import AsyncMongoMockClient
+motor.motor_asyncio.AsyncIOMotorClient = lambda *args, **kwargs: AsyncMongoMockClient()
+
+start = time.perf_counter()
+from app.main import app
+import_s = time.perf_counter() - start
+
+import httpx
+
+async def probe():
+    result = {"import_s": import_s}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            start = time.perf_counter()
+            if any(getattr(route, "path", None) == "/ready" for route in app.routes):
+                while (await client.get("/ready")).status_code != 200:
+                    await asyncio.sleep(0.005)
+            result["warmup_s"] = time.perf_counter() - start
+
+            # Short chat input is answered without an LLM call but still
+            # resolves the Database and AIService dependencies
+            for key in ("first_request_s", "second_request_s"):
+                start = time.perf_counter()
+                response = await client.post("/api/chat/000000000000000000000000", json={"message": "?"})
+                result[key] = time.perf_counter() - start
+                assert response.status_code == 200, response.text
+    return result
+
+print("STARTUP_RESULT " + json.dumps(asyncio.run(probe())))
+'''
+
+
+def sample() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout
+    for line in output.splitlines():
+        if line.startswith("STARTUP_RESULT "):
+            return json.loads(line[len("STARTUP_RESULT "):])
+    raise RuntimeError(f"No result in probe output:\n{output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold-start latency")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    samples = [sample() for _ in range(args.samples)]
+    result = {
+        "samples": args.samples,
+        "median_ms": {
+            key[:-len("_s")]: round(statistics.median(s[key] for s in samples) * 1000, 2)
+            for key in samples[0]
+        }
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Stand-ins used by the benchmark harness
+
+StubLLMClient mimics the parts of AsyncOpenAI that AIService uses and
+answers with canned JSON after a sampled latency, so benchmark numbers
+reflect the backend's own concurrency behavior rather than a provider.
+With truncate_rate > 0 that share of JSON answers is cut off part-way,
+like a completion that hit its token limit.
+"""
+import asyncio
+import itertools
+import json
+import random
+import re
+from types import SimpleNamespace
+from typing import Dict, List
+
+# Interview questions differ between calls, like sampled completions
+_QUESTION_IDS = itertools.count(1)
+
+
+class LatencyDistribution:
+    """Samples simulated LLM latency in seconds
+
+    Spec formats:
+        fixed:0.5
+        uniform:0.2,1.5
+        lognormal:0.8,0.5      (median seconds, sigma)
+        zero
+    """
+
+    def __init__(self, spec: str, rng: random.Random):
+        self.spec = spec
+        self.rng = rng
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(a) for a in args.split(",") if a]
+        if kind not in ("fixed", "uniform", "lognormal", "zero"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "zero":
+            return 0.0
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.args[0], self.args[1])
+        median, sigma = self.args
+        return self.rng.lognormvariate(0, sigma) * median
+
+
+def _week_numbers(spec: str) -> List[int]:
+    """Week numbers from a range list, e.g. 9-12, 14"""
+    weeks = []
+    for part in spec.split(","):
+        first, _, last = part.strip().partition("-")
+        weeks.extend(range(int(first), int(last or first) + 1))
+    return weeks
+
+
+def _respond(prompt: str) -> Dict:
+    """Canned JSON answer for each AIService prompt"""
+    keys = re.search(r"ONLY these keys: ([\w, ]+)", prompt)
+    if keys:
+        answer = _respond(prompt[:keys.start()])
+        return {key: answer.get(key) for key in keys.group(1).split(", ")}
+    if "Extract information from each of these" in prompt:
+        count = int(re.search(r"each of these (\d+) resumes", prompt).group(1))
+        return {"resumes": [_respond("Extract information from this resume") for _ in range(count)]}
+    if "Extract information from this resume" in prompt:
+        return {
+            "name": "Bench User",
+            "email": "bench@example.com",
+            "phone": "+1 555 0100",
+            "skills": ["Python", "SQL", "Git", "Docker", "REST APIs", "Communication"],
+            "education": [{"degree": "B.Sc. Computer Science", "institution": "State University", "year": "2019"}],
+            "experience": [{"title": "Backend Developer", "company": "Acme", "duration": "2019-2024", "description": "Built APIs"}],
+            "years_of_experience": 5
+        }
+    if "weekly_plan" in prompt:
+        match = re.search(r"(\d+)-week", prompt)
+        only = re.search(r"ONLY weeks ([\d, -]+) of", prompt)
+        weeks = _week_numbers(only.group(1)) if only else range(1, (int(match.group(1)) if match else 12) + 1)
+        return {"weekly_plan": [
+            {
+                "week": week,
+                "topic": f"Topic {week}",
+                "goal": "Ship a feature",
+                "what_to_learn": "Concepts and tooling",
+                "why_learn_this": "Industry relevance",
+                "resources": [
+                    {"title": f"Resource {week}", "url": f"https://example.com/{week % 5}", "type": "Article", "platform": "Medium"}
+                ],
+                "how_to_learn": "Practice daily",
+                "mini_project": {"title": f"Project {week}", "description": "Build it", "difficulty": "Intermediate"},
+                "estimated_hours": 8
+            }
+            for week in weeks
+        ]}
+    if "interview questions" in prompt:
+        match = re.search(r"Generate (\d+) interview", prompt)
+        count = int(match.group(1)) if match else 5
+        return {"questions": [
+            {"question": f"Question {next(_QUESTION_IDS)}?", "category": "technical", "difficulty": "medium", "sample_answer_hints": "Be specific"}
+            for _ in range(count)
+        ]}
+    if "CANDIDATE'S ANSWER" in prompt:
+        return {"score": 7, "feedback": "Solid answer.", "strengths": ["Clear"], "improvements": ["Add metrics"]}
+    return {
+        "required_skills": ["Python", "SQL", "Docker", "Kubernetes", "AWS", "System Design", "CI/CD", "Git"],
+        "missing_skills": ["Kubernetes", "AWS", "System Design", "CI/CD"],
+        "matching_skills": ["Python", "SQL", "Docker", "Git"],
+        "match_percentage": 50,
+        "trending_skills": ["GenAI", "Rust"],
+        "trending_skills_comparison": {
+            "GenAI": {"demand": "High", "avg_salary": "$160k+", "growth": "+40%", "reason": "Adoption"},
+            "Rust": {"demand": "Medium", "avg_salary": "$150k+", "growth": "+15%", "reason": "Safety"}
+        }
+    }
+
+
+class _StubCompletions:
+    def __init__(self, latency: LatencyDistribution, truncate_rate: float = 0.0):
+        self.latency = latency
+        self.truncate_rate = truncate_rate
+        self.calls = 0
+        self.truncated = 0
+
+    async def create(self, model: str = None, messages: List[Dict] = None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency.sample())
+        prompt = messages[-1]["content"]
+        if kwargs.get("response_format"):
+            content = json.dumps(_respond(prompt))
+            if self.truncate_rate and self.latency.rng.random() < self.truncate_rate:
+                self.truncated += 1
+                content = content[:int(len(content) * self.latency.rng.uniform(0.3, 0.95))]
+        else:
+            content = "Focus on one skill at a time and build a small project with it."
+        prompt_tokens = len(" ".join(m["content"] for m in messages)) // 4
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=len(content) // 4,
+                total_tokens=prompt_tokens + len(content) // 4
+            )
+        )
+
+
+class StubLLMClient:
+    """Drop-in for AIService.groq_client"""
+
+    def __init__(self, latency: LatencyDistribution, truncate_rate: float = 0.0):
+        self.chat = SimpleNamespace(completions=_StubCompletions(latency, truncate_rate))
+
+
+def make_resume_pdf(lines: List[str] = None, pages: List[List[str]] = None) -> bytes:
+    """Build a small text PDF without extra dependencies
+
+    Args:
+        lines: Lines of a single-page resume
+        pages: Lines per page, for multi-page documents
+    """
+    pages = pages or [lines or [
+        "Bench User",
+        "bench@example.com | +1 555 0100",
+        "SKILLS",
+        "Python, SQL, Git, Docker, REST APIs, Communication",
+        "EXPERIENCE",
+        "Backend Developer - Acme (2019-2024)",
+        "Built and operated REST APIs serving millions of requests",
+        "EDUCATION",
+        "B.Sc. Computer Science - State University, 2019",
+    ]]
+    # Objects: 1 catalog, 2 pages, 3 font, then (page, content) per page
+    kids = " ".join(f"{4 + 2 * index} 0 R" for index in range(len(pages)))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, page_lines in enumerate(pages):
+        escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in page_lines]
+        content = "BT /F1 11 Tf 72 740 Td 14 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {5 + 2 * index} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode("latin-1")
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode("latin-1")
+    return pdf
@@ -0,0 +1,95 @@
+"""Throughput scaling across worker counts
+
+For each worker count, starts `uvicorn benchmarks.bench_app:app --workers N`
+with the SQLite shared-state backend, waits for /ready, drives the same
+load as benchmarks.run against it over HTTP and records the summary.
+
+A real MongoDB is required: with the in-memory stand-in every worker would
+see a different database.
+
+Usage (from backend/):
+    python -m benchmarks.workers --mongo mongodb://localhost:27017 \\
+        --workers 1,2,4,8 --requests 1000 --concurrency 64 --output workers.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.run import DEFAULT_MIX, run
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{url}/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} not ready after {timeout}s")
+
+
+def measure(workers: int, args) -> dict:
+    url = f"http://127.0.0.1:{args.port}"
+    state_dir = tempfile.mkdtemp(prefix="bench-state-")
+    env = {
+        **os.environ,
+        "BENCH_MONGO": args.mongo,
+        "BENCH_LLM_LATENCY": args.llm_latency,
+        "BENCH_SEED": str(args.seed),
+        "SHARED_STATE_BACKEND": "sqlite",
+        "SHARED_STATE_PATH": os.path.join(state_dir, "state.db"),
+        "GROQ_API_KEY": "benchmark",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.bench_app:app",
+         "--port", str(args.port), "--workers", str(workers), "--log-level", "warning"],
+        env=env
+    )
+    try:
+        wait_ready(url, process)
+        result = asyncio.run(run(argparse.Namespace(**{**vars(args), "url": url})))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {"workers": workers, **result["summary"], "routes": result["routes"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure throughput for several worker counts")
+    parser.add_argument("--mongo", required=True, help="MongoDB URI shared by all workers")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--llm-latency", default="lognormal:0.5,0.4")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    results = []
+    for count in (int(n) for n in args.workers.split(",")):
+        results.append(measure(count, args))
+        print(f"workers={count} throughput={results[-1]['throughput_rps']} rps errors={results[-1]['errors']}", file=sys.stderr)
+
+    output = json.dumps({"cpus": os.cpu_count(), "llm_latency": args.llm_latency, "mix": args.mix, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
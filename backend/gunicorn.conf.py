@@ -0,0 +1,18 @@
+# Multi-worker deployment with gunicorn managing uvicorn workers:
+#   pip install gunicorn uvicorn-worker
+#   gunicorn app.main:app -c gunicorn.conf.py
+# Set SHARED_STATE_BACKEND=sqlite so caches, rate limits and the LLM
+# concurrency cap are coordinated across workers.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Each worker must build its own Mongo/HTTP clients after fork. The app is
+# imported per worker, and app.dependencies also rebuilds services when it
+# detects a new process id, so preloading would still be safe.
+preload_app = False
+timeout = 120
+graceful_timeout = 30
+
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app import dependencies
+from app.main import app
+from app.services.ai_service import AIService
+from app.services.curriculum import RoadmapComposer
+from app.utils.database import Database
+
+REQUIREMENTS = {
+    "required_skills": ["Python", "SQL", "Docker", "AWS"],
+    "trending_skills": ["Rust", "GenAI"],
+    "trending_skills_comparison": {"Rust": {"demand": "High"}, "GenAI": {"demand": "High"}},
+}
+
+ROADMAP = {
+    "target_role": "Data Engineer",
+    "total_weeks": 3,
+    "weekly_plan": [{"week": week, "topic": f"Topic {week}", "resources": []} for week in (1, 2, 3)],
+}
+
+
+async def save_roadmap(db, user_id: str = "u1") -> str:
+    """Save a copy of ROADMAP for the user and return its id"""
+    roadmap = dict(ROADMAP, weekly_plan=[dict(week) for week in ROADMAP["weekly_plan"]])
+    return str(await db.save_roadmap(user_id, roadmap))
+
+
+class FakeAI(AIService):
+    """AIService whose model calls return REQUIREMENTS (or fail) without a network
+
+    Records the role each model call was made for in calls. Roadmaps come
+    from the curriculum library.
+    """
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.composer = RoadmapComposer()
+        self.roadmap_mode = "library"
+        self.fail = fail
+        self.delay = delay
+        self.calls: List[str] = []
+
+    async def _model(self, target_role: str, fallback: bool):
+        self.calls.append(target_role)
+        await asyncio.sleep(self.delay)
+        if self.fail and not fallback:
+            raise RuntimeError("model unavailable")
+        return not self.fail
+
+    async def analyze_skill_gap(self, current_skills: List[str], target_role: str, fallback: bool = True) -> Dict:
+        if not await self._model(target_role, fallback):
+            return self._get_fallback_skill_analysis(current_skills, target_role)
+        return self.match_skills(current_skills, dict(REQUIREMENTS))
+
+    async def get_role_requirements(self, target_role: str, fallback: bool = True) -> Dict:
+        if not await self._model(target_role, fallback):
+            return {key: value for key, value in self._get_fallback_skill_analysis([], target_role).items()
+                    if key in REQUIREMENTS}
+        return dict(REQUIREMENTS)
+
+
+@pytest.fixture
+def fake_ai():
+    return FakeAI()
+
+
+@pytest.fixture
+def db():
+    return Database(client=AsyncMongoMockClient())
+
+
+@pytest.fixture
+def api(db):
+    """The app using the db fixture; call it for an httpx client (inside the event loop)"""
+    app.dependency_overrides[dependencies.get_db] = lambda: db
+    yield lambda: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    app.dependency_overrides.clear()
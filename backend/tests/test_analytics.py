@@ -0,0 +1,90 @@
+import asyncio
+import random
+
+from bson import ObjectId
+
+from app import dependencies
+from app.main import app
+from app.services.role_resolver import RoleResolver
+from app.utils.database import _analytics_counts
+
+ROLES = ["Backend Developer", "Sr. Backend Engineer", "Data Scientist", "Java Developer"]
+SKILLS = ["Docker", "AWS", "Kubernetes", "Node.js", "SQL", "System Design"]
+
+
+def _analysis(rng, role):
+    return {
+        "target_role": role,
+        "job_readiness_score": rng.choice([0, 12.5, 40, 55.5, 99, 100]),
+        "missing_skills": rng.sample(SKILLS, rng.randint(0, 4)),
+        "matching_skills": [],
+        "required_skills": SKILLS,
+    }
+
+
+async def _stored(db):
+    return {doc["_id"]: _analytics_counts(doc) async for doc in db.db.role_analytics.find({})
+            if _analytics_counts(doc)[0]}
+
+
+def test_incremental_stats_match_a_rebuild(db):
+    async def scenario():
+        rng, resolver = random.Random(7), RoleResolver()
+        users = [f"u{i}" for i in range(12)]
+        # New analyses, re-analyses for the same and for another role, and pipeline saves
+        for step in range(80):
+            role = rng.choice(ROLES)
+            if step % 10 == 9:
+                await db.save_pipeline_results(str(ObjectId()), {"name": "Ada"}, _analysis(rng, role),
+                                               {"weekly_plan": []}, role_key=resolver.canonical_key(role))
+            else:
+                await db.save_skill_analysis(rng.choice(users), _analysis(rng, role),
+                                             role_key=resolver.canonical_key(role))
+        incremental = await _stored(db)
+
+        result = await db.rebuild_role_analytics(resolver.canonical_key)
+        assert result["drifted"] == []
+        assert result["analyses"] == await db.db.skill_analyses.count_documents({})
+        assert await _stored(db) == incremental
+        # Equivalent spellings were counted under one role
+        assert "backend-engineer" in incremental and "java-developer" in incremental
+        assert result["roles"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_rebuild_corrects_drifted_and_stale_stats(db):
+    async def scenario():
+        rng = random.Random(3)
+        for user in ("u1", "u2", "u3"):
+            await db.save_skill_analysis(user, _analysis(rng, "Data Scientist"), role_key="data-scientist")
+        expected = await _stored(db)
+        await db.db.role_analytics.update_one({"_id": "data-scientist"}, {"$inc": {"count": 5}})
+        await db.db.role_analytics.insert_one({"_id": "ghost-role", "count": 2})
+
+        result = await db.rebuild_role_analytics()
+        assert result["drifted"] == ["data-scientist", "ghost-role"]
+        assert await _stored(db) == expected
+        assert (await db.rebuild_role_analytics())["drifted"] == []
+
+    asyncio.run(scenario())
+
+
+def test_role_analytics_endpoint(db, api):
+    resolver = RoleResolver()
+    app.dependency_overrides[dependencies.get_role_resolver] = lambda: resolver
+
+    async def scenario():
+        for user, score, missing in (("u1", 40, ["Docker", "AWS"]), ("u2", 80, ["Docker"])):
+            analysis = {"target_role": "Backend Developer", "job_readiness_score": score, "missing_skills": missing}
+            await db.save_skill_analysis(user, analysis, role_key=resolver.canonical_key("Backend Developer"))
+        async with api() as client:
+            response = await client.get("/api/analytics/roles/Back-end Engineer", params={"top": 1})
+            assert (await client.get("/api/analytics/roles/Data Scientist")).status_code == 404
+        body = response.json()
+        assert body["role_key"] == "backend-engineer"
+        assert body["analyses"] == 2 and body["average_readiness"] == 60.0
+        assert body["top_missing_skills"] == [{"skill": "Docker", "count": 2, "share": 100.0}]
+        assert sum(bucket["count"] for bucket in body["readiness_distribution"]) == 2
+
+    asyncio.run(scenario())
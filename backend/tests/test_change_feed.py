@@ -0,0 +1,101 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app import dependencies
+from app.main import app
+from app.utils.change_feed import ChangeFeed, change_event
+from app.utils.metrics import CHANGE_EVENTS_DROPPED
+from conftest import save_roadmap
+
+
+def _events(n, start=0):
+    return [change_event("roadmaps", "update", f"r{i}") for i in range(start, start + n)]
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_queue_is_bounded_and_overflow_becomes_one_resync():
+    async def scenario():
+        feed = ChangeFeed(mode="local", queue_size=3)
+        slow, fast = feed.subscribe("u1"), feed.subscribe("u1")
+        other = feed.subscribe("u2")
+        dropped = CHANGE_EVENTS_DROPPED.value()
+
+        received = []
+        for event in _events(3):
+            assert feed.publish("u1", event) == 2
+            received += _drain(fast)
+        assert slow.queue.qsize() == 3
+
+        assert feed.publish("u1", _events(1, 3)[0]) == 2
+        assert _drain(slow) == [{"type": "resync"}]
+        # The slow connection does not hold anyone else back
+        received += _drain(fast)
+        assert received == _events(4)
+        assert other.queue.empty()
+
+        # After the resync, events are delivered again
+        feed.publish("u1", _events(1, 4)[0])
+        assert await slow.get(0.1) == _events(1, 4)[0]
+        # Three buffered events and the one that did not fit
+        assert CHANGE_EVENTS_DROPPED.value() == dropped + 4
+
+    asyncio.run(scenario())
+
+
+def test_get_pings_when_idle_and_stops_when_closed():
+    async def scenario():
+        feed = ChangeFeed(mode="local", queue_size=1)
+        subscription = feed.subscribe("u1")
+        assert await subscription.get(0.01) == {"type": "ping"}
+        # Closing always gets through, even with a full queue
+        feed.publish("u1", _events(1)[0])
+        feed.unsubscribe(subscription)
+        assert feed.connections == 0
+        assert await subscription.get(0.01) is None
+        assert feed.publish("u1", _events(1)[0]) == 0
+
+    asyncio.run(scenario())
+
+
+def test_local_feed_follows_database_writes(db):
+    async def scenario():
+        feed = ChangeFeed(mode="auto", queue_size=8)
+        await feed.start(db)
+        assert feed.source == "local"  # no change streams without a replica set
+        subscription = feed.subscribe("u1")
+        roadmap_id = await save_roadmap(db)
+        await db.update_roadmap_progress(roadmap_id, completed_weeks=[1])
+        assert _drain(subscription) == [change_event("roadmaps", "insert", roadmap_id),
+                                        change_event("roadmaps", "update", roadmap_id)]
+        await feed.close()
+
+    asyncio.run(scenario())
+
+
+def test_websocket_resyncs_a_slow_client(db):
+    feed = ChangeFeed(mode="local", queue_size=2)
+    app.dependency_overrides[dependencies.get_change_feed] = lambda: feed
+    app.dependency_overrides[dependencies.get_db] = lambda: db
+    try:
+        with TestClient(app).websocket_connect("/api/ws/dashboard/u1") as websocket:
+            assert websocket.receive_json() == {"type": "subscribed", "source": "local"}
+
+            def burst():
+                # Published within one event loop step, faster than the socket drains
+                for event in _events(5):
+                    feed.publish("u1", event)
+
+            websocket.portal.call(burst)
+            assert websocket.receive_json() == {"type": "resync"}
+            websocket.portal.call(feed.publish, "u1", _events(1, 5)[0])
+            assert websocket.receive_json() == _events(1, 5)[0]
+        assert feed.connections == 0
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,59 @@
+import asyncio
+import gzip
+import json
+
+import httpx
+
+from app.utils.compression import CompressionMiddleware
+from conftest import ROADMAP
+
+BODY = json.dumps({"items": [{"week": week, "topic": "Distributed systems"} for week in range(100)]}).encode()
+
+
+async def json_app(scope, receive, send):
+    body = BODY if scope["path"] == "/large" else b'{"small": true}'
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def _get(app, path, encoding, params=None):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, params=params, headers={"Accept-Encoding": encoding})
+    return asyncio.run(scenario())
+
+
+def test_large_json_is_compressed_with_the_preferred_accepted_encoding():
+    app = CompressionMiddleware(json_app, encodings="br,gzip", minimum_size=1024)
+    response = _get(app, "/large", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == json.loads(BODY)
+
+    response = _get(app, "/large", "gzip, br;q=0")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(gzip.compress(BODY, compresslevel=6, mtime=0))
+
+    assert "content-encoding" not in _get(app, "/small", "br").headers
+    assert "content-encoding" not in _get(app, "/large", "identity").headers
+
+
+def test_debug_timing_responses_keep_their_timings(db, api):
+    async def scenario():
+        roadmap = dict(ROADMAP, total_weeks=30, weekly_plan=[
+            {"week": week, "topic": f"Topic {week}", "description": "Practice " * 20, "resources": []}
+            for week in range(1, 31)
+        ])
+        roadmap_id = str(await db.save_roadmap("u1", roadmap))
+        async with api() as client:
+            plain = await client.get(f"/api/roadmaps/{roadmap_id}", headers={"Accept-Encoding": "br"})
+            assert plain.headers["content-encoding"] == "br"
+            timed = await client.get(f"/api/roadmaps/{roadmap_id}", params={"debug_timing": "1"},
+                                     headers={"Accept-Encoding": "br"})
+        assert "content-encoding" not in timed.headers
+        body = timed.json()
+        assert body["_debug_timing"]["name"] == "GET /api/roadmaps/{roadmap_id}"
+        assert len(body["weekly_plan"]) == 30
+
+    asyncio.run(scenario())
@@ -0,0 +1,96 @@
+import itertools
+import random
+
+import pytest
+
+from app.services.curriculum import CurriculumLibrary, _pack, skill_key
+
+
+def _loads(hours, ranges):
+    return [sum(hours[start:end]) for start, end in ranges]
+
+
+def _best_max_load(hours, groups):
+    """Smallest possible busiest range, by trying every split"""
+    best = float("inf")
+    for cuts in itertools.combinations(range(1, len(hours)), groups - 1):
+        bounds = (0, *cuts, len(hours))
+        best = min(best, max(sum(hours[a:b]) for a, b in zip(bounds, bounds[1:])))
+    return best
+
+
+def _check_ranges(hours, groups, ranges):
+    assert len(ranges) == groups
+    # Contiguous, in order, non-empty and covering every unit once
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(hours)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    assert all(end > start for start, end in ranges)
+
+
+@pytest.mark.parametrize("hours, groups", [
+    ([5], 1),
+    ([3, 3, 3, 3], 4),
+    ([3, 3, 3, 3], 2),
+    ([10, 1, 1, 1, 1], 2),
+    ([1, 1, 1, 1, 10], 3),
+    ([2, 8, 2, 8, 2, 8], 3),
+    ([4.5, 0.5, 6, 2, 2, 2, 7], 4),
+])
+def test_pack_bounds(hours, groups):
+    ranges = _pack(hours, groups)
+    _check_ranges(hours, groups, ranges)
+    busiest = max(_loads(hours, ranges))
+    assert max(hours) <= busiest
+    assert busiest <= _best_max_load(hours, groups) + 1e-6
+
+
+def test_pack_random_inputs_are_optimal():
+    rng = random.Random(3)
+    for _ in range(200):
+        hours = [rng.choice([0.5, 1, 2, 3, 5, 8]) for _ in range(rng.randint(1, 9))]
+        groups = rng.randint(1, len(hours))
+        ranges = _pack(hours, groups)
+        _check_ranges(hours, groups, ranges)
+        assert max(_loads(hours, ranges)) <= _best_max_load(hours, groups) + 1e-6
+
+
+def test_pack_lower_bound_of_average_load():
+    hours = [1.0] * 12
+    ranges = _pack(hours, 5)
+    _check_ranges(hours, 5, ranges)
+    assert max(_loads(hours, ranges)) == 3
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Node.js", "NodeJS"),
+    ("Node", "node.js"),
+    ("JS", "JavaScript"),
+    ("TS", "TypeScript"),
+    ("Golang", "Go"),
+    ("K8s", "Kubernetes"),
+    ("Postgres", "PostgreSQL"),
+    ("React.js", "React"),
+    ("Next.js", "Next JS"),
+    ("NextJS", "next-js"),
+    ("Vue.js", "Vue JS"),
+    ("Node JS", "Node.js"),
+    ("Vanilla JS", "JavaScript"),
+    ("ML", "Machine Learning"),
+    (" CI/CD ", "ci cd"),
+])
+def test_skill_key_spellings(a, b):
+    assert skill_key(a) == skill_key(b)
+
+
+@pytest.mark.parametrize("a, b", [("Java", "JavaScript"), ("C++", "C#"), ("Flask", "REST APIs"), ("JSON", "JS")])
+def test_skill_key_keeps_different_skills_apart(a, b):
+    assert skill_key(a) != skill_key(b)
+
+
+def test_library_finds_modules_by_any_spelling():
+    library = CurriculumLibrary()
+    for spelling in ("Node.js", "NodeJS", "Node JS", "node"):
+        assert library.find(spelling).skill == "Node.js"
+    assert library.find("JS").skill == "JavaScript"
+    assert library.find("Golang").skill == "Go"
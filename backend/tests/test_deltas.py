@@ -0,0 +1,152 @@
+import asyncio
+import copy
+import json
+import random
+
+import pytest
+
+from app.utils.deltas import PATCH_MEDIA_TYPE, DeltaResponder, json_patch
+from app.utils.shared_state import MemoryState
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def apply_patch(document, ops):
+    """Minimal RFC 6902 add/remove/replace, enough for json_patch output"""
+    document = copy.deepcopy(document)
+    for op in ops:
+        if op["path"] == "":
+            assert op["op"] == "replace"
+            document = copy.deepcopy(op["value"])
+            continue
+        *parents, last = [_unescape(token) for token in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            if op["op"] == "add":
+                target.insert(len(target) if last == "-" else int(last), copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del target[int(last)]
+            else:
+                target[int(last)] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op["value"])
+    return document
+
+
+ROADMAP = {
+    "target_role": "Data Engineer",
+    "current_week": 2,
+    "weekly_plan": [
+        {"week": 1, "topic": "SQL", "completed": True, "resources": [{"url": "https://a"}]},
+        {"week": 2, "topic": "Spark", "completed": False, "resources": []},
+        {"week": 3, "topic": "Airflow", "completed": False, "resources": []}
+    ],
+    "a/b~c": {"escaped": 1}
+}
+
+
+@pytest.mark.parametrize("change", [
+    lambda d: d.update(current_week=3),
+    lambda d: d["weekly_plan"][1].update(completed=True),
+    lambda d: d["weekly_plan"].append({"week": 4, "topic": "dbt"}),
+    lambda d: d["weekly_plan"].pop(),
+    lambda d: d["weekly_plan"].clear(),
+    lambda d: d.pop("target_role"),
+    lambda d: d.update(notes=None),
+    lambda d: d["a/b~c"].update(escaped=2),
+    lambda d: d["weekly_plan"][0]["resources"].insert(0, {"url": "https://b"}),
+    lambda d: d.update(weekly_plan={"not": "a list"}),
+])
+def test_patch_round_trip(change):
+    new = copy.deepcopy(ROADMAP)
+    change(new)
+    ops = json_patch(ROADMAP, new)
+    assert apply_patch(ROADMAP, ops) == new
+    # Operations are plain JSON
+    json.dumps(ops)
+
+
+def test_identical_documents_give_empty_patch():
+    assert json_patch(ROADMAP, copy.deepcopy(ROADMAP)) == []
+
+
+@pytest.mark.parametrize("old, new", [(1, 1.0), (1, True), (0, False), ("1", 1)])
+def test_values_equal_in_python_but_not_in_json_are_replaced(old, new):
+    assert json_patch({"v": old}, {"v": new}) == [{"op": "replace", "path": "/v", "value": new}]
+
+
+def test_whole_document_replaced_when_types_differ():
+    assert apply_patch({"a": 1}, json_patch({"a": 1}, [1, 2])) == [1, 2]
+
+
+def test_random_documents_round_trip():
+    rng = random.Random(7)
+
+    def value(depth):
+        kind = rng.randrange(6 if depth < 3 else 3)
+        if kind == 0:
+            return rng.randrange(5)
+        if kind == 1:
+            return rng.choice(["x", "y", "a/b", "~"])
+        if kind == 2:
+            return rng.choice([None, True, 1.5])
+        if kind == 3:
+            return [value(depth + 1) for _ in range(rng.randrange(4))]
+        return {rng.choice("abc/~"): value(depth + 1) for _ in range(rng.randrange(4))}
+
+    for _ in range(500):
+        old, new = value(0), value(0)
+        assert apply_patch(old, json_patch(old, new)) == new
+
+
+def _version(document, week):
+    document = copy.deepcopy(document)
+    document["current_week"] = week
+    return document
+
+
+def test_responder_sends_304_patch_or_full_document():
+    async def scenario():
+        responder = DeltaResponder(MemoryState(), ttl=60, versions=3)
+        first = await responder.respond("roadmap", "r1", 1, ROADMAP)
+        assert first.status_code == 200 and first.headers["x-version"] == "1"
+
+        unchanged = await responder.respond("roadmap", "r1", 1, ROADMAP, since_version="1")
+        assert unchanged.status_code == 304
+
+        updated = _version(ROADMAP, 3)
+        patch = await responder.respond("roadmap", "r1", 2, updated, since_version="1")
+        assert patch.media_type == PATCH_MEDIA_TYPE
+        assert patch.headers["x-base-version"] == "1"
+        assert apply_patch(ROADMAP, json.loads(patch.body)) == updated
+
+        unknown = await responder.respond("roadmap", "r1", 2, updated, since_version="missing")
+        assert unknown.media_type != PATCH_MEDIA_TYPE
+        assert json.loads(unknown.body) == updated
+
+    asyncio.run(scenario())
+
+
+def test_responder_keeps_last_versions_in_one_key():
+    async def scenario():
+        state = MemoryState()
+        responder = DeltaResponder(state, ttl=60, versions=3)
+        for version in range(1, 8):
+            await responder.respond("roadmap", "r1", version, _version(ROADMAP, version))
+
+        assert [key for key in state._values if key.startswith("snapshot:")] == ["snapshot:roadmap:r1"]
+        assert [version for version, _ in await state.get("snapshot:roadmap:r1")] == ["5", "6", "7"]
+
+        current = _version(ROADMAP, 8)
+        old = await responder.respond("roadmap", "r1", 8, current, since_version="4")
+        assert old.media_type != PATCH_MEDIA_TYPE
+        recent = await responder.respond("roadmap", "r1", 8, current, since_version="6")
+        assert recent.media_type == PATCH_MEDIA_TYPE
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+import asyncio
+import zlib
+
+import pytest
+from bson import Binary
+
+from app.utils.field_codec import FORMAT_VERSION, PACKED_FIELD, FieldCodec, projection_fields, unpack
+from app.utils.responses import dumps
+from app.utils.database import WEEK_COMPRESSED_FIELDS
+
+FIELDS = ("goal", "how_to_learn")
+DOC = {
+    "week": 3,
+    "topic": "Caching",
+    "goal": "Understand cache invalidation and eviction policies in depth. " * 10,
+    "how_to_learn": ["Read the Redis docs on eviction", "Build a write-through cache"] * 5,
+}
+
+
+def _week(week: int) -> dict:
+    return {
+        "week": week,
+        "topic": f"Topic {week}",
+        "resources": [],
+        **{field: f"Week {week}: study, practice and review the material carefully. " * 8 for field in WEEK_COMPRESSED_FIELDS},
+    }
+
+
+@pytest.mark.parametrize("algorithm", ["zlib", "zstd"])
+def test_round_trip(algorithm):
+    codec = FieldCodec(algorithm, min_bytes=64)
+    packed = codec.pack(dict(DOC), FIELDS)
+    assert set(packed) == {"week", "topic", PACKED_FIELD}
+    assert packed[PACKED_FIELD]["alg"] == algorithm and packed[PACKED_FIELD]["v"] == FORMAT_VERSION
+    assert isinstance(packed[PACKED_FIELD]["data"], Binary)
+    assert unpack(dict(packed)) == DOC
+
+    # Only the asked-for fields are restored
+    assert unpack(dict(packed), ["goal"]) == {"week": 3, "topic": "Caching", "goal": DOC["goal"]}
+
+
+def test_off_and_small_documents_stay_plain():
+    assert FieldCodec("off").pack(DOC, FIELDS) is DOC
+    assert FieldCodec("zlib", min_bytes=10_000).pack(DOC, FIELDS) is DOC
+    # Plain documents (written with compression off) read back unchanged
+    assert unpack(dict(DOC)) == DOC
+    assert unpack(None) is None
+
+
+def test_pack_update_removes_the_other_representation():
+    update = FieldCodec("zlib", min_bytes=64).pack_update({"goal": DOC["goal"], "how_to_learn": DOC["how_to_learn"]},
+                                                          FIELDS)
+    assert set(update["$set"]) == {PACKED_FIELD}
+    assert update["$unset"] == {"goal": "", "how_to_learn": ""}
+    update = FieldCodec("off").pack_update({"goal": "short"}, FIELDS)
+    assert update == {"$set": {"goal": "short"}, "$unset": {PACKED_FIELD: ""}}
+
+
+def test_projection_and_unsupported_formats():
+    assert projection_fields(["week", "topic"], FIELDS) == ["week", "topic"]
+    assert projection_fields(["week", "goal"], FIELDS) == ["week", "goal", PACKED_FIELD]
+    data = Binary(zlib.compress(dumps({"goal": "x"})))
+    with pytest.raises(ValueError):
+        unpack({PACKED_FIELD: {"v": FORMAT_VERSION + 1, "alg": "zlib", "data": data}})
+    with pytest.raises(ValueError):
+        unpack({PACKED_FIELD: {"v": FORMAT_VERSION, "alg": "lz4", "data": data}})
+    with pytest.raises(ValueError):
+        FieldCodec("lz4")
+
+
+@pytest.mark.parametrize("algorithm", ["zlib", "zstd"])
+def test_database_reads_legacy_and_packed_weeks(db, algorithm):
+    async def scenario():
+        weeks = [_week(1), _week(2)]
+        legacy_id = str(await db.save_roadmap("u1", {"target_role": "Data Engineer", "weekly_plan": [dict(w) for w in weeks]}))
+        db.codec = FieldCodec(algorithm)
+        packed_id = str(await db.save_roadmap("u1", {"target_role": "Data Engineer", "weekly_plan": [dict(w) for w in weeks]}))
+
+        stored = {doc["roadmap_id"]: doc async for doc in db.db.roadmap_weeks.find({"week": 1})}
+        assert PACKED_FIELD not in stored[legacy_id] and stored[legacy_id]["goal"] == weeks[0]["goal"]
+        assert PACKED_FIELD in stored[packed_id] and "goal" not in stored[packed_id]
+
+        for roadmap_id in (legacy_id, packed_id):
+            roadmap = await db.get_roadmap_by_id(roadmap_id)
+            assert [{k: w[k] for k in weeks[0]} for w in roadmap["weekly_plan"]] == weeks
+            assert not any(PACKED_FIELD in w for w in roadmap["weekly_plan"])
+
+        # Reads of unpacked fields only, and of one packed field
+        compared = await db.get_roadmaps_by_ids([legacy_id, packed_id], fields=["weekly_plan"], week_fields=["week", "topic"])
+        assert [[set(w) for w in r["weekly_plan"]] for r in compared] == [[{"week", "topic"}] * 2] * 2
+        compared = await db.get_roadmaps_by_ids([legacy_id, packed_id], fields=["weekly_plan"], week_fields=["week", "goal"])
+        assert [[w["goal"] for w in r["weekly_plan"]] for r in compared] == [[w["goal"] for w in weeks]] * 2
+
+    asyncio.run(scenario())
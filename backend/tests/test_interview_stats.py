@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from datetime import datetime
+
+import pytest
+
+from app.utils import database
+
+SESSION = {"user_id": "u1", "difficulty": "Medium", "target_role": "Backend Engineer"}
+QUESTIONS = [{"category": "System Design", "score": 7}, {"category": "Python", "score": 9}, {"category": "Python"}]
+
+
+@pytest.fixture
+def today(monkeypatch):
+    """Sets the day database.datetime.now() returns"""
+    day = [datetime(2026, 3, 10, 12, 0)]
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return day[0]
+
+    monkeypatch.setattr(database, "datetime", Clock)
+    return lambda year, month, date: day.__setitem__(0, datetime(year, month, date, 12, 0))
+
+
+def _stats(db, score, session_id="s"):
+    return db._update_interview_stats(SESSION, session_id, QUESTIONS, score)
+
+
+def test_stats_and_streak_across_days(db, today):
+    async def scenario():
+        for day, score in ((10, 60), (10, 80), (11, 70), (12, 90), (14, 50)):
+            today(2026, 3, day)
+            await _stats(db, score)
+        stats = await db.get_interview_stats("u1")
+        assert stats["sessions"] == 5 and stats["score_sum"] == 350
+        assert stats["best_score"] == 90
+        assert stats["streak"] == {"current": 1, "longest": 3, "last_day": "2026-03-14"}
+        assert stats["difficulties"]["medium"]["count"] == 5
+        assert stats["categories"]["python"] == {"name": "Python", "count": 5, "score_sum": 450.0, "recent": [90.0] * 5}
+
+    asyncio.run(scenario())
+
+
+def _race(monkeypatch, db, other_session):
+    """Lets another session of the user update the stats right after the next read"""
+    collection = type(db.db.interview_stats)
+    find_one = collection.find_one
+    raced = []
+
+    async def racing_find_one(self, *args, **kwargs):
+        result = await find_one(self, *args, **kwargs)
+        if not raced:
+            raced.append(True)
+            await other_session()
+        return result
+
+    monkeypatch.setattr(collection, "find_one", racing_find_one)
+
+
+def test_first_sessions_racing_to_create_the_document(db, today, monkeypatch):
+    async def scenario():
+        _race(monkeypatch, db, lambda: _stats(db, 40, "other"))
+        await _stats(db, 80)
+        stats = await db.get_interview_stats("u1")
+        assert stats["sessions"] == 2 and stats["score_sum"] == 120
+        assert stats["recent_scores"] == [40, 80]
+        assert stats["streak"] == {"current": 1, "longest": 1, "last_day": "2026-03-10"}
+
+    asyncio.run(scenario())
+
+
+def test_streak_is_extended_once_when_sessions_race(db, today, monkeypatch):
+    async def scenario():
+        await _stats(db, 50)
+        today(2026, 3, 11)
+        _race(monkeypatch, db, lambda: _stats(db, 60, "other"))
+        await _stats(db, 70)
+        stats = await db.get_interview_stats("u1")
+        assert stats["sessions"] == 3
+        # Both sessions of the 11th count as one day, read after the other one's write
+        assert stats["streak"] == {"current": 2, "longest": 2, "last_day": "2026-03-11"}
+        assert stats["latest"]["session_id"] == "s"
+
+    asyncio.run(scenario())
+
+
+def test_gives_up_after_repeated_conflicts(db, today, monkeypatch, caplog):
+    async def scenario():
+        await _stats(db, 50)
+        today(2026, 3, 11)
+        collection = type(db.db.interview_stats)
+        find_one = collection.find_one
+
+        async def stale_find_one(self, *args, **kwargs):
+            # Every read sees a day that no longer matches
+            result = await find_one(self, *args, **kwargs)
+            return {**result, "streak": {"last_day": "2026-03-01", "current": 9}}
+
+        monkeypatch.setattr(collection, "find_one", stale_find_one)
+        with caplog.at_level(logging.WARNING, logger=database.__name__):
+            await _stats(db, 70)
+        monkeypatch.undo()
+        assert "too many concurrent sessions" in caplog.text
+        assert (await db.get_interview_stats("u1"))["sessions"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from app.services.llm_output import _close_truncated, repair_json
+
+ROADMAP = {"weeks": [{"week": 1, "topic": "Python"}, {"week": 2, "topic": "SQL"}], "title": "Data"}
+
+
+def test_plain_json_is_parsed_as_is():
+    assert repair_json(json.dumps(ROADMAP)) == (ROADMAP, 0, False)
+
+
+@pytest.mark.parametrize("text", [
+    f"```json\n{json.dumps(ROADMAP)}\n```",
+    f"```\n{json.dumps(ROADMAP, indent=2)}\n```",
+])
+def test_fenced_output(text):
+    value, unused, truncated = repair_json(text)
+    assert value == ROADMAP
+    assert unused > 0
+    assert not truncated
+
+
+def test_chatty_output():
+    text = f"Sure! Here is your roadmap:\n{json.dumps(ROADMAP)}\nLet me know if you need changes."
+    value, unused, truncated = repair_json(text)
+    assert value == ROADMAP
+    assert unused == len(text) - len(json.dumps(ROADMAP))
+    assert not truncated
+
+
+def test_top_level_list():
+    assert repair_json('Questions: [{"question": "Why?"}] Good luck')[0] == [{"question": "Why?"}]
+
+
+def test_truncated_output_keeps_complete_values():
+    text = json.dumps(ROADMAP)
+    cut = text[:text.index('"SQL"') + 3]
+    value, unused, truncated = repair_json(f"```json\n{cut}")
+    assert truncated
+    assert unused > 0
+    # The half-written topic is dropped, not guessed; the week keeps its complete fields
+    assert value == {"weeks": [{"week": 1, "topic": "Python"}, {"week": 2}]}
+
+
+def test_truncated_fenced_output_with_closing_fence():
+    value, _, truncated = repair_json('```json\n{"a": [1, 2, {"b": 3}, {"c": 4\n```')
+    assert truncated
+    # The fence is not taken for JSON; "4" may be cut short, so only the brace is kept
+    assert value == {"a": [1, 2, {"b": 3}, {}]}
+
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        repair_json("I cannot help with that.")
+
+
+@pytest.mark.parametrize("text, expected", [
+    # The last number may itself be cut short ("2" of "25")
+    ('{"a": 1, "b": [1, 2', {"a": 1, "b": [1]}),
+    ('{"a": 1, "b": "unfinished str', {"a": 1}),
+    ('{"a": {"b": {"c": [', {"a": {"b": {"c": []}}}),
+    # Cut right after an opening bracket yields an empty container
+    ('[{"x": 1}, {"x": 2}, {"x"', [{"x": 1}, {"x": 2}, {}]),
+    ('{"a', {}),
+    ('{"quote": "say \\"hi\\", {ok}", "next": [', {"quote": 'say "hi", {ok}', "next": []}),
+    ('{"a": 1} trailing', {"a": 1}),
+])
+def test_close_truncated(text, expected):
+    assert _close_truncated(text) == expected
+
+
+def test_close_truncated_without_recoverable_prefix():
+    with pytest.raises(ValueError):
+        _close_truncated('"just a string')
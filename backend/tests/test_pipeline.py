@@ -0,0 +1,117 @@
+import asyncio
+import json
+
+import pytest
+
+from app import dependencies
+from app.main import app
+from app.services.role_cache import RoleCache
+from app.services.role_resolver import RoleResolver
+from app.utils.request_gate import RequestGate
+from app.utils.shared_state import MemoryState
+from conftest import FakeAI
+
+RESUME = {"name": "Ada", "email": "ada@example.com", "skills": ["Python", "SQL"], "experience": []}
+
+
+class FakeParser:
+    """prepare_pdf/parse_prepared of ResumeParser without a PDF"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    def prepare_pdf(self, file_path):
+        if self.fail:
+            raise ValueError("Could not extract meaningful text from PDF")
+        return file_path
+
+    async def parse_prepared(self, prepared):
+        return dict(RESUME)
+
+
+def _provide(value):
+    # A lambda with a default argument would become a (copied) query parameter
+    return lambda: value
+
+
+@pytest.fixture
+def pipeline(api, monkeypatch, tmp_path):
+    """Posts a resume to /api/pipeline and returns the streamed events"""
+    monkeypatch.setattr("app.api_pipeline.UPLOAD_DIR", tmp_path)
+    ai = FakeAI()
+    role_cache = RoleCache(ai, RoleResolver(learn=True), MemoryState(), ttl=60)
+    app.dependency_overrides.update({
+        dependencies.get_ai_service: _provide(ai),
+        dependencies.get_resume_parser: _provide(FakeParser()),
+        dependencies.get_role_cache: _provide(role_cache),
+        dependencies.get_request_gate: _provide(RequestGate(MemoryState())),
+    })
+
+    async def post(target_role="Back-end Developer", weeks=4):
+        async with api() as client:
+            response = await client.post(
+                "/api/pipeline",
+                files={"file": ("resume.pdf", b"%PDF-1.4 resume", "application/pdf")},
+                data={"target_role": target_role, "weeks": str(weeks), "mode": "library"}
+            )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    post.ai = ai
+    return post
+
+
+def test_pipeline_streams_each_stage_and_saves_the_results(db, pipeline, tmp_path):
+    async def scenario():
+        events = await pipeline()
+        assert [event["stage"] for event in events] == ["resume", "skill_analysis", "roadmap", "saved"]
+        resume, analysis, roadmap, saved = (event["data"] for event in events)
+
+        user_id = resume["user_id"]
+        assert saved["user_id"] == user_id and roadmap["user_id"] == user_id
+        assert analysis["matching_skills"] == ["Python", "SQL"]
+        assert analysis["missing_skills"] == ["Docker", "AWS"]
+        assert roadmap["skills_to_learn"] == ["Docker", "AWS"]
+        assert len(roadmap["weekly_plan"]) == 4
+        # Requirements were fetched once for the canonical role; the
+        # analysis was matched against them through the role cache
+        assert pipeline.ai.calls == ["Backend Engineer"]
+
+        stored_resume = await db.get_resume(user_id)
+        assert stored_resume["skills"] == ["Python", "SQL"]
+        stored_analysis = await db.get_skill_analysis(user_id)
+        assert stored_analysis["missing_skills"] == ["Docker", "AWS"]
+        stored_roadmap = await db.get_roadmap_by_id(saved["roadmap_id"])
+        assert stored_roadmap["user_id"] == user_id
+        assert [week["week"] for week in stored_roadmap["weekly_plan"]] == [1, 2, 3, 4]
+        assert not list(tmp_path.iterdir())  # upload removed
+
+        # A second user of the same role needs no model call
+        events = await pipeline("Backend Engineer")
+        assert events[-1]["stage"] == "saved"
+        assert pipeline.ai.calls == ["Backend Engineer"]
+
+    asyncio.run(scenario())
+
+
+def test_pipeline_reports_errors_as_the_last_event(db, pipeline):
+    async def scenario():
+        app.dependency_overrides[dependencies.get_resume_parser] = lambda: FakeParser(fail=True)
+        events = await pipeline()
+        assert events == [{"stage": "error", "data": {"detail": "Could not extract meaningful text from PDF"}}]
+        assert await db.db.resumes.count_documents({}) == 0
+
+    asyncio.run(scenario())
+
+
+def test_pipeline_goes_through_the_request_gate(db, pipeline):
+    async def scenario():
+        gate = RequestGate(MemoryState(), limits={"generate-roadmap": (1, 0)})
+        app.dependency_overrides[dependencies.get_request_gate] = lambda: gate
+        events = await pipeline()
+        assert [event["stage"] for event in events] == ["resume", "skill_analysis", "error"]
+        assert "Rate limit exceeded for generate-roadmap" in events[-1]["data"]["detail"]
+        assert await db.db.roadmaps.count_documents({}) == 0
+
+    asyncio.run(scenario())
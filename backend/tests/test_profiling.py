@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.utils.profiler import Profiler, ProfilerMiddleware
+
+
+def _burn(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def before_cap():
+    _burn(0.005)
+
+
+def after_cap():
+    _burn(0.005)
+
+
+async def slow_app(scope, receive, send):
+    before_cap()
+    await asyncio.sleep(0.05)  # the cap fires while the request waits
+    after_cap()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.mark.parametrize("token, headers, status", [
+    (None, {"X-Admin-Token": "secret"}, 403),
+    ("secret", {}, 401),
+    ("secret", {"X-Admin-Token": "wrong"}, 401),
+])
+def test_profile_endpoint_requires_the_admin_token(api, monkeypatch, token, headers, status):
+    if token is None:
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    else:
+        monkeypatch.setenv("ADMIN_TOKEN", token)
+
+    async def scenario():
+        async with api() as client:
+            response = await client.post("/api/admin/profile", params={"seconds": 0.01}, headers=headers)
+        assert response.status_code == status
+
+    asyncio.run(scenario())
+
+
+def test_profile_endpoint_with_the_admin_token(api, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+
+    async def scenario():
+        headers = {"X-Admin-Token": "secret"}
+        async with api() as client:
+            response = await client.post("/api/admin/profile", params={"seconds": 100000}, headers=headers)
+            assert response.status_code == 400
+            response = await client.post("/api/admin/profile", params={"seconds": 0.05, "interval_ms": 5}, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["x-profile-mode"] == "sample"
+        assert int(response.headers["x-profile-count"]) > 0
+
+    asyncio.run(scenario())
+
+
+def test_request_max_ms_comes_from_the_environment(monkeypatch):
+    monkeypatch.setenv("PROFILER_REQUEST_MAX_MS", "40")
+    assert Profiler().request_max_seconds == 0.04
+
+
+def test_request_profiling_stops_at_the_cap(monkeypatch):
+    monkeypatch.setenv("PROFILER_REQUEST_MAX_MS", "20")
+    profiler = Profiler()
+    app = ProfilerMiddleware(slow_app, profiler)
+
+    async def scenario():
+        window = asyncio.create_task(profiler.profile_requests(2, "/api/", max_requests=1))
+        await asyncio.sleep(0)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/api/slow")).status_code == 200
+        return await window
+
+    result = asyncio.run(scenario())
+    assert result["requests"] == 1 and result["capped"] == 1
+    frames = "".join(result["stacks"])
+    assert "before_cap" in frames
+    assert "after_cap" not in frames
+    assert result["seconds"] < 1  # ended once max_requests were profiled
+
+
+def test_only_requests_alone_on_the_loop_are_profiled():
+    profiler = Profiler()
+    app = ProfilerMiddleware(slow_app, profiler)
+
+    async def scenario():
+        window = asyncio.create_task(profiler.profile_requests(0.3, "/api/", max_requests=5))
+        await asyncio.sleep(0)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            # /api/a arrives while /other (not profiled) is in flight
+            await asyncio.gather(client.get("/other"), client.get("/api/a"))
+            await client.get("/api/b")
+        return await window
+
+    result = asyncio.run(scenario())
+    assert result["requests"] == 1 and result["skipped"] == 1
+    assert profiler.active == 0 and profiler.mode is None
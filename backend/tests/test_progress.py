@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from conftest import save_roadmap
+
+
+@pytest.mark.parametrize("store", ["embedded", "collection"])
+def test_progress_updates_weeks_counters_and_version(db, api, store):
+    db.progress_store = store
+
+    async def scenario():
+        roadmap_id = await save_roadmap(db)
+        async with api() as client:
+            response = await client.patch(f"/api/roadmaps/{roadmap_id}/progress",
+                                          json={"completed_weeks": [1, 2], "current_week": 3, "hours_spent": 4})
+            assert response.status_code == 200, response.text
+            assert response.json() == {"roadmap_id": roadmap_id, "current_week": 3, "total_weeks": 3,
+                                       "completed_weeks": [1, 2], "hours_spent": 4}
+
+            response = await client.patch(f"/api/roadmaps/{roadmap_id}/progress",
+                                          json={"uncompleted_weeks": [2], "current_week": 2, "hours_spent": 1.5})
+            progress = response.json()
+            assert progress["completed_weeks"] == [1]
+            assert progress["current_week"] == 3  # never moves backwards
+            assert progress["hours_spent"] == 5.5
+
+            assert (await client.get(f"/api/roadmaps/{roadmap_id}/progress")).json() == progress
+        roadmap = await db.get_roadmap_by_id(roadmap_id)
+        assert roadmap["version"] == 3
+        assert [week.get("completed", False) for week in roadmap["weekly_plan"]] == [True, False, False]
+
+    asyncio.run(scenario())
+
+
+def test_progress_errors(db, api):
+    async def scenario():
+        roadmap_id = await save_roadmap(db)
+        async with api() as client:
+            response = await client.patch("/api/roadmaps/notanid/progress", json={"completed_weeks": [1]})
+            assert response.status_code == 400
+            response = await client.patch(f"/api/roadmaps/{ObjectId()}/progress", json={"completed_weeks": [1]})
+            assert response.status_code == 404
+            response = await client.patch(f"/api/roadmaps/{roadmap_id}/progress",
+                                          json={"completed_weeks": [1], "uncompleted_weeks": [1]})
+            assert response.status_code == 400
+            assert (await client.get(f"/api/roadmaps/{ObjectId()}/progress")).status_code == 404
+
+    asyncio.run(scenario())
+
+
+def test_failed_week_write_leaves_the_roadmap_unchanged(db, api, monkeypatch):
+    async def scenario():
+        roadmap_id = await save_roadmap(db)
+
+        async def failing(*args, **kwargs):
+            raise RuntimeError("write failed")
+
+        monkeypatch.setattr(type(db.db.roadmap_weeks), "update_many", failing)
+        async with api() as client:
+            response = await client.patch(f"/api/roadmaps/{roadmap_id}/progress",
+                                          json={"completed_weeks": [1], "current_week": 2, "hours_spent": 3})
+        assert response.status_code == 500
+        monkeypatch.undo()
+        roadmap = await db.db.roadmaps.find_one({"_id": ObjectId(roadmap_id)})
+        assert roadmap["version"] == 1
+        assert "hours_spent" not in roadmap and "current_week" not in roadmap
+
+    asyncio.run(scenario())
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from app.utils import shared_state
+from app.utils.request_gate import RateLimitExceeded, RequestGate, parse_rate_limits
+from app.utils.shared_state import MemoryState
+
+
+class Computation:
+    """compute() callable that counts calls and can be made to wait or fail"""
+
+    def __init__(self, result="done", fail_first: int = 0):
+        self.calls = 0
+        self.result = result
+        self.fail_first = fail_first
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        if call <= self.fail_first:
+            raise RuntimeError(f"call {call} failed")
+        return f"{self.result} {call}"
+
+
+def _gate(**kwargs):
+    return RequestGate(MemoryState(), **{"result_ttl": 5, **kwargs})
+
+
+def test_concurrent_identical_requests_share_one_computation():
+    async def scenario():
+        gate, compute = _gate(), Computation()
+        requests = [asyncio.create_task(gate.run("analyze-skills", "u1", {"role": "data"}, compute)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        compute.release.set()
+        assert await asyncio.gather(*requests) == ["done 1"] * 5
+        assert compute.calls == 1
+        # Shortly after, duplicates get the stored result
+        assert await gate.run("analyze-skills", "u1", {"role": "data"}, compute) == "done 1"
+        assert compute.calls == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("other", [
+    ("analyze-skills", "u1", {"role": "web"}),
+    ("analyze-skills", "u2", {"role": "data"}),
+    ("generate-roadmap", "u1", {"role": "data"}),
+])
+def test_different_requests_do_not_coalesce(other):
+    async def scenario():
+        gate, compute = _gate(), Computation()
+        compute.release.set()
+        first = await gate.run("analyze-skills", "u1", {"role": "data"}, compute)
+        second = await gate.run(*other, compute)
+        assert (first, second) == ("done 1", "done 2")
+
+    asyncio.run(scenario())
+
+
+def test_failing_leader_does_not_poison_waiters():
+    async def scenario():
+        gate, compute = _gate(), Computation(fail_first=1)
+        leader = asyncio.create_task(gate.run("analyze-skills", "u1", {}, compute))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(gate.run("analyze-skills", "u1", {}, compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        compute.release.set()
+
+        with pytest.raises(RuntimeError):
+            await leader
+        # The waiters share one new computation instead of the error
+        assert await asyncio.gather(*waiters) == ["done 2"] * 3
+        assert compute.calls == 2
+        # The failure was not stored as a result
+        assert await gate.state.get(f"coalesce:result:{gate.key('analyze-skills', 'u1', {})}") == "done 2"
+
+    asyncio.run(scenario())
+
+
+def test_failure_is_not_cached_for_later_requests():
+    async def scenario():
+        gate, compute = _gate(), Computation(fail_first=1)
+        compute.release.set()
+        with pytest.raises(RuntimeError):
+            await gate.run("analyze-skills", "u1", {}, compute)
+        assert await gate.run("analyze-skills", "u1", {}, compute) == "done 2"
+
+    asyncio.run(scenario())
+
+
+def test_no_rate_limit_by_default(monkeypatch):
+    monkeypatch.delenv("RATE_LIMITS", raising=False)
+
+    async def scenario():
+        gate = _gate(result_ttl=0)
+        for _ in range(50):
+            await gate.check_rate("generate-roadmap", "u1")
+
+    asyncio.run(scenario())
+
+
+def test_bucket_refuses_when_empty_and_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(shared_state.time, "time", lambda: now[0])
+
+    async def scenario():
+        # 6 per minute (one every 10 s), bursts of 2
+        gate = _gate(limits=parse_rate_limits("generate-roadmap=6/2"))
+        await gate.check_rate("generate-roadmap", "u1")
+        await gate.check_rate("generate-roadmap", "u1")
+        with pytest.raises(RateLimitExceeded) as refused:
+            await gate.check_rate("generate-roadmap", "u1")
+        assert refused.value.retry_after == pytest.approx(10)
+        # Other users and routes have their own buckets
+        await gate.check_rate("generate-roadmap", "u2")
+        await gate.check_rate("analyze-skills", "u1")
+
+        now[0] += 5
+        with pytest.raises(RateLimitExceeded) as refused:
+            await gate.check_rate("generate-roadmap", "u1")
+        assert refused.value.retry_after == pytest.approx(5)
+        now[0] += 5
+        await gate.check_rate("generate-roadmap", "u1")
+        # Refill is capped at the burst size
+        now[0] += 3600
+        await gate.check_rate("generate-roadmap", "u1")
+        await gate.check_rate("generate-roadmap", "u1")
+        with pytest.raises(RateLimitExceeded):
+            await gate.check_rate("generate-roadmap", "u1")
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_only_applies_to_new_computations(monkeypatch):
+    monkeypatch.setattr(shared_state.time, "time", lambda: 1000.0)
+
+    async def scenario():
+        gate, compute = _gate(limits=parse_rate_limits("default=1/1")), Computation()
+        compute.release.set()
+        assert await gate.run("analyze-skills", "u1", {}, compute) == "done 1"
+        # Served from the recent result: no token needed
+        assert await gate.run("analyze-skills", "u1", {}, compute) == "done 1"
+        with pytest.raises(RateLimitExceeded):
+            await gate.run("analyze-skills", "u1", {"other": 1}, compute)
+
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+import asyncio
+
+from bson import ObjectId
+
+from conftest import save_roadmap
+
+
+def test_get_roadmap_validates_the_id(db, api):
+    async def scenario():
+        roadmap_id = await save_roadmap(db)
+        async with api() as client:
+            response = await client.get("/api/roadmaps/notanid")
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Invalid roadmap id"
+            assert (await client.get("/api/roadmaps/notanid", params={"since_version": "1"})).status_code == 400
+            assert (await client.get(f"/api/roadmaps/{ObjectId()}")).status_code == 404
+
+            response = await client.get(f"/api/roadmaps/{roadmap_id}", params={"start_week": 2})
+            assert response.status_code == 200
+            assert [week["week"] for week in response.json()["weekly_plan"]] == [2, 3]
+
+            response = await client.get("/api/roadmaps/compare", params={"ids": [roadmap_id, "notanid"]})
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Invalid roadmap id"
+
+    asyncio.run(scenario())
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.services.role_cache import RoleCache
+from app.services.role_resolver import RoleResolver
+from app.utils.shared_state import MemoryState
+from conftest import FakeAI
+
+
+class RoleStore:
+    """save_role/get_roles of Database, in memory"""
+
+    def __init__(self, roles=()):
+        self.roles = list(roles)
+
+    async def save_role(self, key, name):
+        self.roles.append({"_id": key, "name": name})
+
+    async def get_roles(self):
+        return list(self.roles)
+
+
+@pytest.fixture
+def resolver():
+    return RoleResolver(threshold=0.7, learn=True, max_roles=5000)
+
+
+@pytest.mark.parametrize("role, key", [
+    ("Back-end Developer", "backend-engineer"),
+    ("Sr. Python Backend Dev", "backend-engineer"),
+    ("Senior Back End Engineer", "backend-engineer"),
+    ("Front End Engineer II", "frontend-engineer"),
+    ("data science engineer", "data-scientist"),
+    ("Machine Lerning Engineer", "machine-learning-engineer"),
+    ("Cyber Security Engineer", "security-engineer"),
+    ("Lead Engineer", "technical-lead"),
+])
+def test_spellings_of_a_role_share_its_key(resolver, role, key):
+    assert resolver.canonical_key(role) == key
+
+
+@pytest.mark.parametrize("role, not_key", [
+    ("Java Developer", "backend-engineer"),
+    ("Python Developer", "backend-engineer"),
+    ("Network Security Engineer", "network-engineer"),
+    ("React Native Developer", "frontend-engineer"),
+    ("Node Developer", "backend-engineer"),
+])
+def test_similar_roles_with_different_words_are_not_merged(resolver, role, not_key):
+    match = resolver.resolve(role)
+    assert match.key != not_key
+    assert match.outcome == "unmatched"
+    assert match.key == RoleResolver.role_key(role)
+
+
+@pytest.mark.parametrize("role", ["Engineer", "Senior Developer", "Staff Engineer"])
+def test_generic_titles_are_never_matched_or_learned(resolver, role):
+    assert resolver.resolve(role).outcome == "unmatched"
+    assert resolver.learn_role(role) is None
+
+
+def test_unmatched_roles_are_not_learned_by_lookups(resolver):
+    size = resolver.size
+    for role in ["Doctor", "Bakcned Devloper", "Java Developer"]:
+        resolver.resolve(role)
+        resolver.canonical_key(role)
+    assert resolver.size == size
+
+
+def test_learned_role_keeps_its_key_and_is_saved():
+    async def scenario():
+        resolver, store = RoleResolver(learn=True), RoleStore()
+        await resolver.load(store)
+        before = resolver.canonical_key("Java Developer")
+        learned = resolver.learn_role("Java Developer")
+        await asyncio.sleep(0)
+        assert learned.outcome == "learned" and learned.key == before
+        assert store.roles == [{"_id": "java-developer", "name": "Java Developer"}]
+        assert resolver.resolve("Sr. Java Dev").key == "java-developer"
+        # Known roles are not learned again
+        assert resolver.learn_role("Java Developer") is None
+        assert resolver.learn_role("Backend Developer") is None
+
+        # Another worker loads it from the store
+        other = RoleResolver()
+        await other.load(RoleStore(store.roles))
+        assert other.resolve("java developer").key == "java-developer"
+
+    asyncio.run(scenario())
+
+
+def test_learning_respects_the_switch_and_the_catalog_size():
+    assert RoleResolver(learn=False).learn_role("Java Developer") is None
+    seeded = RoleResolver(learn=True, max_roles=0)
+    assert seeded.learn_role("Java Developer") is None
+
+
+def test_role_cache_learns_only_roles_the_model_answered_for():
+    async def scenario():
+        resolver = RoleResolver(learn=True)
+        size = resolver.size
+
+        failing = RoleCache(FakeAI(fail=True), resolver, MemoryState(), ttl=60)
+        analysis = await failing.analyze(["Python"], "Doctor")
+        assert analysis["required_skills"]  # generic fallback content
+        await failing.requirements("Doctor")
+        assert resolver.size == size and resolver.resolve("Doctor").outcome == "unmatched"
+
+        ai = FakeAI()
+        cache = RoleCache(ai, resolver, MemoryState(), ttl=60)
+        analysis = await cache.analyze(["Python"], "Java Developer")
+        assert analysis["matching_skills"] == ["Python"]
+        assert resolver.size == size + 1
+        assert resolver.resolve("Java Dev").key == "java-developer"
+        # The requirements were cached under the same key before and after learning
+        await cache.analyze(["SQL"], "Sr. Java Developer")
+        assert ai.calls == ["Java Developer"]
+
+    asyncio.run(scenario())
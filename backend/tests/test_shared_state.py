@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from app.utils import shared_state
+from app.utils.shared_state import ConcurrencyGovernor, MemoryState, SharedState, SQLiteState
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(shared_state.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def state(request, tmp_path, clock):
+    if request.param == "memory":
+        backend = MemoryState()
+    else:
+        backend = SQLiteState(str(tmp_path / "state.db"))
+    yield backend
+    backend.close()
+
+
+def _stored(state):
+    """(keys, buckets) physically held by a backend"""
+    if isinstance(state, MemoryState):
+        return set(state._values), set(state._buckets)
+    conn = state._conn
+    return ({row[0] for row in conn.execute("SELECT key FROM kv")},
+            {row[0] for row in conn.execute("SELECT key FROM buckets")})
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SharedState()
+
+
+def test_get_set_delete(state):
+    async def scenario():
+        assert await state.get("missing") is None
+        await state.set("user", {"skills": ["Python"], "score": 1.5})
+        assert await state.get("user") == {"skills": ["Python"], "score": 1.5}
+        await state.set("user", [1, 2])
+        assert await state.get("user") == [1, 2]
+        await state.delete("user")
+        await state.delete("user")
+        assert await state.get("user") is None
+    run(scenario())
+
+
+def test_pop_returns_once(state):
+    async def scenario():
+        await state.set("result", "value")
+        assert await state.pop("result") == "value"
+        assert await state.pop("result") is None
+        assert await state.get("result") is None
+    run(scenario())
+
+
+def test_ttl_expiry(state, clock):
+    async def scenario():
+        await state.set("short", 1, ttl=10)
+        await state.set("forever", 2)
+        clock[0] += 9
+        assert await state.get("short") == 1
+        clock[0] += 2
+        assert await state.get("short") is None
+        assert await state.pop("short") is None
+        assert await state.get("forever") == 2
+    run(scenario())
+
+
+def test_incr_keeps_first_expiry(state, clock):
+    async def scenario():
+        assert await state.incr("count", ttl=10) == 1
+        clock[0] += 5
+        assert await state.incr("count", 2, ttl=10) == 3
+        clock[0] += 6
+        # Expired 10 s after creation, not after the last increment
+        assert await state.get("count") is None
+        assert await state.incr("count") == 1
+    run(scenario())
+
+
+def test_take_tokens(state, clock):
+    async def scenario():
+        assert await state.take_tokens("bucket", rate=1, capacity=2) == (True, 0.0)
+        assert await state.take_tokens("bucket", rate=1, capacity=2) == (True, 0.0)
+        allowed, retry_after = await state.take_tokens("bucket", rate=1, capacity=2)
+        assert not allowed and retry_after == pytest.approx(1)
+        clock[0] += 1
+        assert (await state.take_tokens("bucket", rate=1, capacity=2))[0]
+    run(scenario())
+
+
+def test_slots_limit_release_and_lease_expiry(state, clock):
+    async def scenario():
+        first = await state.acquire_slot("llm", 2, lease_seconds=30)
+        second = await state.acquire_slot("llm", 2, lease_seconds=30)
+        assert first and second and first != second
+        assert await state.acquire_slot("llm", 2, lease_seconds=30) is None
+        await state.release_slot("llm", first)
+        third = await state.acquire_slot("llm", 2, lease_seconds=30)
+        assert third is not None
+        # A crashed holder's lease runs out
+        clock[0] += 31
+        assert await state.acquire_slot("llm", 2, lease_seconds=30) is not None
+    run(scenario())
+
+
+def test_sweep_drops_expired_keys_and_idle_buckets(monkeypatch, tmp_path, clock):
+    monkeypatch.setenv("SHARED_STATE_SWEEP_SECONDS", "60")
+    monkeypatch.setenv("SHARED_STATE_BUCKET_IDLE_SECONDS", "600")
+
+    async def scenario(state):
+        for user in range(20):
+            await state.set(f"result:{user}", user, ttl=30)
+            await state.take_tokens(f"ratelimit:{user}", rate=1, capacity=5)
+        await state.set("kept", 1)
+        clock[0] += 700
+        # Any write past the sweep interval sweeps, without reading the keys
+        await state.set("trigger", 1, ttl=30)
+        assert _stored(state) == ({"kept", "trigger"}, set())
+
+    for backend in (MemoryState(), SQLiteState(str(tmp_path / "sweep.db"))):
+        run(scenario(backend))
+        backend.close()
+
+
+def test_sqlite_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "shared.db")
+    one, two = SQLiteState(path), SQLiteState(path)
+
+    async def scenario():
+        await one.set("key", "from one")
+        assert await two.get("key") == "from one"
+        assert await one.incr("n") == 1
+        assert await two.incr("n") == 2
+        token = await one.acquire_slot("llm", 1, lease_seconds=30)
+        assert await two.acquire_slot("llm", 1, lease_seconds=30) is None
+        await one.release_slot("llm", token)
+        assert await two.acquire_slot("llm", 1, lease_seconds=30) is not None
+
+    run(scenario())
+    one.close()
+    two.close()
+
+
+def test_governor_caps_concurrency():
+    async def scenario():
+        governor = ConcurrencyGovernor(MemoryState(), "llm", 2)
+        active, peak = [0], [0]
+
+        async def call():
+            async with governor.slot():
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+
+        await asyncio.gather(*(call() for _ in range(6)))
+        assert peak[0] == 2
+
+    run(scenario())
@@ -0,0 +1,132 @@
+import asyncio
+
+from app.services.role_cache import RoleCache
+from app.services.role_resolver import RoleResolver
+from app.services.speculation import SkillAnalysisSpeculator
+from app.utils.shared_state import MemoryState
+from conftest import FakeAI
+
+
+def _speculator(ai):
+    state = MemoryState()
+    speculator = SkillAnalysisSpeculator(RoleCache(ai, RoleResolver(learn=True), state, ttl=60), state)
+    speculator.enabled = True
+    return speculator
+
+
+def _counts(speculator):
+    return {key: value for key, value in speculator.stats.items() if value}
+
+
+def test_take_waits_for_a_running_speculation():
+    async def scenario():
+        ai = FakeAI(delay=0.01)
+        speculator = _speculator(ai)
+        assert await speculator.speculate("u1", ["Python"], "Back-end Developer")
+        analysis = await speculator.take("u1", "Sr. Backend Engineer")
+        assert analysis["matching_skills"] == ["Python"]
+        # Asked about the canonical role, through the role cache
+        assert ai.calls == ["Backend Engineer"]
+        assert _counts(speculator) == {"started": 1, "hits": 1}
+        assert await speculator.state.get(speculator._key("u1")) is None
+
+    asyncio.run(scenario())
+
+
+def test_take_claims_a_finished_speculation_once():
+    async def scenario():
+        speculator = _speculator(FakeAI())
+        await speculator.speculate("u1", ["SQL"], "Data Scientist")
+        await asyncio.sleep(0.01)
+        assert not speculator._running
+        assert (await speculator.take("u1", "data scientist"))["matching_skills"] == ["SQL"]
+        assert await speculator.take("u1", "data scientist") is None
+        assert _counts(speculator) == {"started": 1, "hits": 1, "misses": 1}
+
+    asyncio.run(scenario())
+
+
+def test_speculation_for_a_cached_role_needs_no_model_call():
+    async def scenario():
+        ai = FakeAI()
+        speculator = _speculator(ai)
+        await speculator.role_cache.analyze(["Python"], "Backend Engineer")
+        await speculator.speculate("u1", ["Docker"], "Backend Developer")
+        assert (await speculator.take("u1", "Backend Developer"))["matching_skills"] == ["Docker"]
+        assert ai.calls == ["Backend Engineer"]
+
+    asyncio.run(scenario())
+
+
+def test_speculation_for_a_different_role_is_wasted():
+    async def scenario():
+        ai = FakeAI(delay=0.05)
+        speculator = _speculator(ai)
+        await speculator.speculate("u1", ["Python"], "Data Scientist")
+        task = speculator._running["u1"]["task"]
+        assert await speculator.take("u1", "Frontend Engineer") is None
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert _counts(speculator) == {"started": 1, "wasted": 1, "misses": 1}
+
+        # A finished one for another role is wasted too
+        speculator.role_cache.ai_service.delay = 0
+        await speculator.speculate("u2", ["Python"], "Data Scientist")
+        await asyncio.sleep(0.01)
+        assert await speculator.take("u2", "Frontend Engineer") is None
+        assert speculator.stats["wasted"] == 2
+        assert await speculator.state.get(speculator._key("u2")) is None
+
+    asyncio.run(scenario())
+
+
+def test_new_upload_wastes_the_previous_speculation():
+    async def scenario():
+        speculator = _speculator(FakeAI())
+        await speculator.speculate("u1", ["Python"], "Data Scientist")
+        await asyncio.sleep(0.01)
+        await speculator.speculate("u1", ["Python"], "Data Engineer")
+        assert speculator.stats["wasted"] == 1
+        assert (await speculator.take("u1", "Data Engineer")) is not None
+
+    asyncio.run(scenario())
+
+
+def test_failed_speculation_is_dropped_not_served_as_fallback():
+    async def scenario():
+        ai = FakeAI(fail=True)
+        speculator = _speculator(ai)
+        await speculator.speculate("u1", ["Python"], "Data Scientist")
+        assert await speculator.take("u1", "Data Scientist") is None
+        assert _counts(speculator) == {"started": 1, "wasted": 1, "misses": 1}
+        assert await speculator.state.get(speculator._key("u1")) is None
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_take_does_not_cancel_the_speculation():
+    async def scenario():
+        speculator = _speculator(FakeAI(delay=0.02))
+        await speculator.speculate("u1", ["Python"], "Data Scientist")
+        task = speculator._running["u1"]["task"]
+        waiter = asyncio.create_task(speculator.take("u1", "Data Scientist"))
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        await asyncio.sleep(0.03)
+        assert task.done() and not task.cancelled()
+        # The result is still there for the retried request
+        assert (await speculator.take("u1", "Data Scientist"))["matching_skills"] == ["Python"]
+
+    asyncio.run(scenario())
+
+
+def test_budget_limits_concurrent_speculations():
+    async def scenario():
+        speculator = _speculator(FakeAI(delay=0.01))
+        speculator.max_in_flight = 1
+        assert await speculator.speculate("u1", ["Python"], "Data Scientist")
+        assert not await speculator.speculate("u2", ["Python"], "Data Scientist")
+        assert speculator.stats["skipped_budget"] == 1
+        await speculator.take("u1", "Data Scientist")
+
+    asyncio.run(scenario())